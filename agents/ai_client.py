@@ -1,7 +1,12 @@
-import json
-import requests
+import logging
 from datetime import datetime
 
+from agents.prompts import cv_analysis_messages, job_analysis_messages, parse_json_response
+from utils.llm_clients import get_http_session
+from utils.text_budget import map_reduce_extract
+
+logger = logging.getLogger(__name__)
+
 class AIClient:
     def __init__(self, api_key):
         self.api_key = api_key
@@ -11,6 +16,50 @@ class AIClient:
             "Content-Type": "application/json"
         }
         self.model = "llama3-70b-8192"  # Groq's model
+        self.session = get_http_session()  # Pooled keep-alive connections shared across clients
+    
+    def generate_completion(self, messages, temperature=0.2, max_tokens=1024, stream=False, force_cache=False, model=None):
+        """
+        Generate a completion through the Groq REST API
+        
+        Args:
+            messages: List of message dictionaries with 'role' and 'content'
+            temperature: Controls randomness (0 to 1)
+            max_tokens: Maximum tokens in completion
+            stream: Ignored, the REST client always returns the full response
+            force_cache: Ignored, this client has no cache
+            model: Groq model to use instead of self.model
+        
+        Returns:
+            dict: {"success": bool, "content" or "error": str, "cached": False}
+        """
+        payload = {
+            "model": model or self.model,
+            "messages": messages,
+            "temperature": temperature,
+            "max_tokens": max_tokens
+        }
+        
+        try:
+            response = self.session.post(self.api_url, headers=self.headers, json=payload)
+            response.raise_for_status()
+            
+            response_data = response.json()
+            return {
+                "success": True,
+                "content": response_data["choices"][0]["message"]["content"],
+                "cached": False
+            }
+        except Exception as e:
+            # Keep the response body, it carries the rate limit details
+            error = str(e)
+            if getattr(e, "response", None) is not None:
+                error = f"{error}: {e.response.text}"
+            return {
+                "success": False,
+                "error": error,
+                "cached": False
+            }
     
     def analyze_cv(self, cv_text, candidate_name):
         """
@@ -21,58 +70,23 @@ class AIClient:
             candidate_name: The name of the candidate
             
         Returns:
-            dict: Structured information extracted from the CV
+            dict: Structured information extracted from the CV, with the
+                  preprocessing token report under 'token_report'
         """
+        # Long CVs are cleaned and, if still over budget, analyzed chunk by chunk
+        result, report = map_reduce_extract(cv_text, lambda text: self._analyze_cv_text(text, candidate_name))
+        result['token_report'] = report
+        return result
+    
+    def _analyze_cv_text(self, cv_text, candidate_name):
+        """Analyze one budget-sized piece of CV text"""
         try:
-            prompt = f"""
-            I need you to analyze this CV/resume for {candidate_name} and extract the following information in JSON format:
-            
-            1. Skills (technical and soft skills as a list of strings)
-            2. Years of experience (total professional experience as a number)
-            3. Education level (highest degree: e.g., "Bachelor's", "Master's", "PhD", etc.)
-            4. Key technologies or tools the candidate is proficient with (as a list of strings)
-            5. Previous job titles (as a list of strings)
-            
-            Return ONLY the JSON object without any explanations or markdown. Format should be:
-            {{
-                "skills": ["skill1", "skill2", ...],
-                "experience_years": X,
-                "education": "Highest degree",
-                "technologies": ["tech1", "tech2", ...],
-                "job_titles": ["title1", "title2", ...]
-            }}
-            
-            Here is the CV text:
-            {cv_text}
-            """
-            
-            payload = {
-                "model": self.model,
-                "messages": [
-                    {"role": "system", "content": "You are an AI assistant that extracts structured information from CVs."},
-                    {"role": "user", "content": prompt}
-                ],
-                "temperature": 0.2
-            }
-            
-            response = requests.post(self.api_url, headers=self.headers, json=payload)
-            response.raise_for_status()
-            
-            response_data = response.json()
-            assistant_message = response_data["choices"][0]["message"]["content"]
+            response = self.generate_completion(cv_analysis_messages(cv_text, candidate_name), temperature=0.2)
+            if not response["success"]:
+                raise Exception(response["error"])
             
             # Extract the JSON object from the response
-            try:
-                # Try to parse the response as JSON
-                result = json.loads(assistant_message)
-            except json.JSONDecodeError:
-                # If that fails, try to extract JSON from the text (in case there's additional text)
-                import re
-                json_match = re.search(r'({.*})', assistant_message.replace('\n', ''), re.DOTALL)
-                if json_match:
-                    result = json.loads(json_match.group(1))
-                else:
-                    raise Exception("Failed to extract JSON from response")
+            result = parse_json_response(response["content"])
             
             # Add timestamp
             result['timestamp'] = datetime.now().isoformat()
@@ -80,7 +94,7 @@ class AIClient:
             return result
             
         except Exception as e:
-            print(f"Error analyzing CV with Groq API: {str(e)}")
+            logger.error("Error analyzing CV with Groq API: %s", e)
             # Return a minimal structure in case of error
             return {
                 "skills": [],
@@ -104,55 +118,12 @@ class AIClient:
             dict: Structured requirements extracted from the job description
         """
         try:
-            prompt = f"""
-            I need you to analyze this job description for a {job_title} position and extract the following information in JSON format:
-            
-            1. Required skills (as a list of strings)
-            2. Preferred/nice-to-have skills (as a list of strings)
-            3. Years of experience required (as a number, use the minimum if a range is specified)
-            4. Education level required (e.g., "Bachelor's", "Master's", "PhD", etc.)
-            5. Key technologies or tools mentioned (as a list of strings)
-            
-            Return ONLY the JSON object without any explanations or markdown. Format should be:
-            {{
-                "required_skills": ["skill1", "skill2", ...],
-                "preferred_skills": ["skill1", "skill2", ...],
-                "experience_years": X,
-                "education_level": "Required degree",
-                "technologies": ["tech1", "tech2", ...]
-            }}
-            
-            Here is the job description:
-            {job_description}
-            """
-            
-            payload = {
-                "model": self.model,
-                "messages": [
-                    {"role": "system", "content": "You are an AI assistant that extracts structured information from job descriptions."},
-                    {"role": "user", "content": prompt}
-                ],
-                "temperature": 0.2
-            }
-            
-            response = requests.post(self.api_url, headers=self.headers, json=payload)
-            response.raise_for_status()
-            
-            response_data = response.json()
-            assistant_message = response_data["choices"][0]["message"]["content"]
+            response = self.generate_completion(job_analysis_messages(job_title, job_description), temperature=0.2)
+            if not response["success"]:
+                raise Exception(response["error"])
             
             # Extract the JSON object from the response
-            try:
-                # Try to parse the response as JSON
-                result = json.loads(assistant_message)
-            except json.JSONDecodeError:
-                # If that fails, try to extract JSON from the text (in case there's additional text)
-                import re
-                json_match = re.search(r'({.*})', assistant_message.replace('\n', ''), re.DOTALL)
-                if json_match:
-                    result = json.loads(json_match.group(1))
-                else:
-                    raise Exception("Failed to extract JSON from response")
+            result = parse_json_response(response["content"])
             
             # Add timestamp
             result['timestamp'] = datetime.now().isoformat()
@@ -160,7 +131,7 @@ class AIClient:
             return result
             
         except Exception as e:
-            print(f"Error analyzing job description with Groq API: {str(e)}")
+            logger.error("Error analyzing job description with Groq API: %s", e)
             # Return a minimal structure in case of error
             return {
                 "required_skills": [],
@@ -170,4 +141,4 @@ class AIClient:
                 "technologies": [],
                 "error": str(e),
                 "timestamp": datetime.now().isoformat()
-            }
\ No newline at end of file
+            }
@@ -0,0 +1,202 @@
+import json
+import re
+import time
+
+from utils.text_budget import estimate_tokens
+
+# Output tokens a single-document analysis may use, and the most one batched request asks for
+OUTPUT_TOKENS_PER_DOCUMENT = 1024
+MAX_BATCH_OUTPUT_TOKENS = 8192
+
+# More documents than this would get less output room each than a single call does
+MAX_BATCH_DOCUMENTS = MAX_BATCH_OUTPUT_TOKENS // OUTPUT_TOKENS_PER_DOCUMENT
+
+
+def estimate_message_tokens(messages):
+    """Estimate the prompt tokens of a chat message list"""
+    return sum(estimate_tokens(message.get("content", "")) + 4 for message in messages)
+
+
+def pack_documents(documents, token_budget, max_documents=None):
+    """
+    Pack documents into batches that fit a prompt token budget
+
+    Args:
+        documents: List of dicts with 'id' and 'text' keys
+        token_budget: Maximum estimated tokens of document text per batch
+        max_documents: Optional cap on the number of documents per batch (never
+                       more than MAX_BATCH_DOCUMENTS)
+
+    Returns:
+        tuple: (batches, oversized) where batches is a list of document lists and
+               oversized holds documents too large to share a request
+    """
+    max_documents = min(max_documents or MAX_BATCH_DOCUMENTS, MAX_BATCH_DOCUMENTS)
+
+    batches = []
+    oversized = []
+    current = []
+    current_tokens = 0
+
+    for document in documents:
+        doc_tokens = estimate_tokens(document["text"])
+
+        # A document that alone exceeds the budget gets its own single call
+        if doc_tokens > token_budget:
+            oversized.append(document)
+            continue
+
+        batch_full = len(current) >= max_documents
+        if current and (current_tokens + doc_tokens > token_budget or batch_full):
+            batches.append(current)
+            current = []
+            current_tokens = 0
+
+        current.append(document)
+        current_tokens += doc_tokens
+
+    if current:
+        batches.append(current)
+
+    return batches, oversized
+
+
+def batch_output_tokens(document_count):
+    """max_tokens for a batched request: the single-document budget for each document"""
+    return min(OUTPUT_TOKENS_PER_DOCUMENT * document_count, MAX_BATCH_OUTPUT_TOKENS)
+
+
+def build_batch_prompt(documents, kind, instructions):
+    """
+    Build the user prompt for a batch of documents
+
+    Args:
+        documents: List of dicts with 'id', 'text' and optional 'label' keys
+        kind: Document kind used in the prompt (e.g. "CV", "job description")
+        instructions: What to extract from each document
+
+    Returns:
+        str: The user prompt content
+    """
+    parts = [
+        f"Analyze each of the following {len(documents)} {kind}s independently.",
+        f"For each {kind}, {instructions}",
+        "",
+        "Respond ONLY with a JSON array containing one object per document, in any order.",
+        'Each object must have a "document_id" field copied exactly from the document header',
+        'and an "analysis" field holding the extracted information.',
+        ""
+    ]
+
+    for document in documents:
+        label = document.get("label")
+        header = f"=== DOCUMENT {document['id']}"
+        if label:
+            header += f" ({label})"
+        parts.append(header + " ===")
+        parts.append(document["text"])
+        parts.append(f"=== END DOCUMENT {document['id']} ===")
+        parts.append("")
+
+    return "\n".join(parts)
+
+
+def parse_batch_response(content, expected_ids):
+    """
+    Validate a batched response and split it per document
+
+    Args:
+        content: Raw LLM response text
+        expected_ids: IDs of the documents that were sent
+
+    Returns:
+        dict: Mapping of document ID (as string) to its analysis; documents that
+              are missing or malformed in the response are left out
+    """
+    if not content:
+        return {}
+
+    # Strip markdown fences and any prose around the array
+    fenced = re.search(r'```(?:json)?\s*([\s\S]+?)\s*```', content)
+    if fenced:
+        content = fenced.group(1)
+
+    array_match = re.search(r'(\[[\s\S]*\])', content)
+    try:
+        items = json.loads(array_match.group(1)) if array_match else None
+    except json.JSONDecodeError:
+        items = None
+
+    # A response cut off at max_tokens still holds the documents before the cut
+    if not isinstance(items, list):
+        items = _complete_items(content)
+
+    expected = {str(doc_id) for doc_id in expected_ids}
+    analyses = {}
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+
+        doc_id = str(item.get("document_id", ""))
+        analysis = item.get("analysis")
+        if doc_id not in expected or doc_id in analyses or analysis in (None, "", {}, []):
+            continue
+
+        analyses[doc_id] = analysis
+
+    return analyses
+
+
+def _complete_items(content):
+    """Decode the complete elements of a JSON array, ignoring a truncated tail"""
+    start = content.find("[")
+    if start == -1:
+        return []
+
+    decoder = json.JSONDecoder()
+    items = []
+    position = start + 1
+    while True:
+        while position < len(content) and content[position] in " \t\r\n,":
+            position += 1
+        if position >= len(content) or content[position] == "]":
+            break
+        try:
+            item, position = decoder.raw_decode(content, position)
+        except json.JSONDecodeError:
+            break
+        items.append(item)
+
+    return items
+
+
+class BatchStats:
+    """Collects token and throughput figures for an analysis run"""
+
+    def __init__(self, mode):
+        self.mode = mode
+        self.documents = 0
+        self.requests = 0
+        self.prompt_tokens = 0
+        self.fallbacks = 0
+        self.started_at = time.time()
+
+    def record_request(self, messages, documents):
+        """Record one LLM request covering the given number of documents"""
+        self.requests += 1
+        self.documents += documents
+        self.prompt_tokens += estimate_message_tokens(messages)
+
+    def summary(self):
+        """Return tokens/document and documents/minute for the run"""
+        elapsed = max(time.time() - self.started_at, 1e-6)
+        return {
+            "mode": self.mode,
+            "documents": self.documents,
+            "requests": self.requests,
+            "fallbacks": self.fallbacks,
+            "prompt_tokens": self.prompt_tokens,
+            "tokens_per_document": round(self.prompt_tokens / self.documents, 1) if self.documents else 0,
+            "documents_per_minute": round(self.documents * 60 / elapsed, 1),
+            "elapsed_seconds": round(elapsed, 2)
+        }
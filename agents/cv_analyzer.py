@@ -1,17 +1,42 @@
+import json
 from datetime import datetime
 
+from agents.batching import (
+    MAX_BATCH_DOCUMENTS, OUTPUT_TOKENS_PER_DOCUMENT, BatchStats,
+    batch_output_tokens, build_batch_prompt, pack_documents, parse_batch_response
+)
+from utils.llm_clients import get_llm_router
+
+SYSTEM_PROMPT = "You are an expert HR recruiter and CV analyzer. Extract key information from the CV."
+EXTRACTION_INSTRUCTIONS = "extract the following information: skills, experience, education, certifications, and career highlights."
+
 class CVAnalyzer:
     def __init__(self, generate_completion_fn, neo4j_connector):
         """
         Initialize the CV Analyzer
         
         Args:
-            generate_completion_fn: Function that calls the Groq API
+            generate_completion_fn: Function that calls the LLM (None uses the shared
+                                    LLMRouter from utils.llm_clients, which fails
+                                    over when Groq is rate limited)
             neo4j_connector: Connector to the Neo4j database
         """
-        self.generate_completion = generate_completion_fn
+        self.generate_completion = generate_completion_fn or get_llm_router().generate_completion
         self.neo4j_connector = neo4j_connector
     
+    def _build_messages(self, cv_text, candidate_name):
+        """Create the single-CV prompt for Groq"""
+        return [
+            {
+                "role": "system",
+                "content": SYSTEM_PROMPT
+            },
+            {
+                "role": "user",
+                "content": f"Analyze the following CV for {candidate_name}:\n\n{cv_text}\n\nExtract the following information: skills, experience, education, certifications, and career highlights. Format your response as JSON."
+            }
+        ]
+    
     def analyze_cv(self, cv_text, candidate_name):
         """
         Analyze a CV using the Groq API
@@ -23,23 +48,13 @@ class CVAnalyzer:
         Returns:
             dict: The analysis results
         """
-        # Create the prompt for Groq
-        messages = [
-            {
-                "role": "system",
-                "content": "You are an expert HR recruiter and CV analyzer. Extract key information from the CV."
-            },
-            {
-                "role": "user",
-                "content": f"Analyze the following CV for {candidate_name}:\n\n{cv_text}\n\nExtract the following information: skills, experience, education, certifications, and career highlights. Format your response as JSON."
-            }
-        ]
+        messages = self._build_messages(cv_text, candidate_name)
         
         # Call Groq API
         response = self.generate_completion(
             messages=messages,
             temperature=0.3,  # Lower temperature for more consistent results
-            max_tokens=1024,
+            max_tokens=OUTPUT_TOKENS_PER_DOCUMENT,
             stream=False
         )
         
@@ -56,18 +71,68 @@ class CVAnalyzer:
             "timestamp": datetime.now().isoformat()
         }
     
-    def analyze_candidate(self, candidate_id):
+    def analyze_cvs_batch(self, documents):
+        """
+        Analyze several CVs in a single Groq request
+        
+        Args:
+            documents: List of dicts with 'id', 'text' and 'label' (candidate name)
+            
+        Returns:
+            tuple: (analyses, messages) where analyses maps candidate ID to its
+                   analysis result and messages is the prompt that was sent
+        """
+        messages = [
+            {
+                "role": "system",
+                "content": SYSTEM_PROMPT
+            },
+            {
+                "role": "user",
+                "content": build_batch_prompt(documents, "CV", EXTRACTION_INSTRUCTIONS)
+            }
+        ]
+        
+        # Call Groq API once for the whole batch
+        response = self.generate_completion(
+            messages=messages,
+            temperature=0.3,
+            max_tokens=batch_output_tokens(len(documents)),
+            stream=False
+        )
+        
+        if not response["success"]:
+            return {}, messages
+        
+        timestamp = datetime.now().isoformat()
+        parsed = parse_batch_response(response["content"], [doc["id"] for doc in documents])
+        analyses = {
+            doc_id: {
+                "analysis": json.dumps(analysis),
+                "model": "llama-3.3-70b-versatile",
+                "batched": True,
+                "timestamp": timestamp
+            }
+            for doc_id, analysis in parsed.items()
+        }
+        return analyses, messages
+    
+    def analyze_candidate(self, candidate_id, stats=None, candidate_data=None):
         """
         Analyze a candidate's CV and store the results
         
         Args:
             candidate_id: The ID of the candidate to analyze
+            stats: Optional BatchStats collecting token usage
+            candidate_data: Candidate as returned by get_candidate_by_id, if
+                            already fetched (skips the lookup)
             
         Returns:
             dict: The analysis results
         """
         # Get candidate data from Neo4j
-        candidate_data = self.neo4j_connector.get_candidate_by_id(candidate_id)
+        if candidate_data is None:
+            candidate_data = self.neo4j_connector.get_candidate_by_id(candidate_id)
         
         if not candidate_data:
             return {
@@ -87,6 +152,8 @@ class CVAnalyzer:
         
         # Analyze CV using Groq API
         analysis_result = self.analyze_cv(cv_text, candidate_name)
+        if stats:
+            stats.record_request(self._build_messages(cv_text, candidate_name), 1)
         
         # Store analysis results in Neo4j
         storage_success = self.neo4j_connector.store_candidate_analysis(
@@ -100,15 +167,20 @@ class CVAnalyzer:
             "analysis_result": analysis_result
         }
     
-    def analyze_all_candidates(self, limit=None):
+    def analyze_all_candidates(self, limit=None, batched=False, token_budget=6000, max_batch_size=MAX_BATCH_DOCUMENTS):
         """
         Analyze all candidates' CVs and store the results
         
         Args:
             limit: Optional limit on number of candidates to analyze
+            batched: Pack several CVs into each LLM request
+            token_budget: Maximum estimated CV tokens per batched request
+            max_batch_size: Maximum number of CVs per batched request
+                            (capped at MAX_BATCH_DOCUMENTS)
             
         Returns:
-            dict: Summary of the analysis results
+            dict: Summary of the analysis results, including token and
+                  throughput stats under 'stats'
         """
         # Get all candidates from Neo4j
         all_candidates = self.neo4j_connector.get_all_candidates()
@@ -123,19 +195,72 @@ class CVAnalyzer:
             "details": []
         }
         
-        for candidate in all_candidates:
-            result = self.analyze_candidate(candidate['id'])
+        stats = BatchStats("batched" if batched else "single")
+        
+        if batched:
+            self._analyze_candidates_batched(all_candidates, results, stats, token_budget, max_batch_size)
+        else:
+            for candidate in all_candidates:
+                self._record_result(results, candidate, self.analyze_candidate(candidate['id'], stats))
+        
+        results['stats'] = stats.summary()
+        return results
+    
+    def _analyze_candidates_batched(self, candidates, results, stats, token_budget, max_batch_size):
+        """Run batched analysis, falling back to single calls for failed documents"""
+        documents = []
+        for candidate in candidates:
+            candidate_data = self.neo4j_connector.get_candidate_by_id(candidate['id'])
+            cv_text = candidate_data.get('cv_text', '') if candidate_data else ''
             
-            if result['success']:
-                results['success'] += 1
-            else:
-                results['failed'] += 1
+            if not cv_text:
+                # Let the single-document path report the reason
+                result = self.analyze_candidate(candidate['id'], stats, candidate_data=candidate_data or {})
+                self._record_result(results, candidate, result)
+                continue
             
-            results['details'].append({
-                "candidate_id": candidate['id'],
-                "candidate_name": candidate['name'],
-                "success": result['success'],
-                "error": result.get('error', None)
+            documents.append({
+                "id": str(candidate['id']),
+                "label": candidate.get('name', 'Unknown Candidate'),
+                "text": cv_text,
+                "candidate": candidate,
+                "data": candidate_data
             })
         
-        return results
\ No newline at end of file
+        batches, oversized = pack_documents(documents, token_budget, max_batch_size)
+        
+        fallback = list(oversized)
+        for batch in batches:
+            analyses, messages = self.analyze_cvs_batch(batch)
+            stats.record_request(messages, len(analyses))
+            
+            for document in batch:
+                analysis_result = analyses.get(document["id"])
+                if not analysis_result:
+                    fallback.append(document)
+                    continue
+                
+                storage_success = self.neo4j_connector.store_candidate_analysis(
+                    document["candidate"]['id'], analysis_result
+                )
+                self._record_result(results, document["candidate"], {"success": storage_success})
+        
+        # Documents that could not be parsed out of a batch are retried alone
+        stats.fallbacks += len(fallback)
+        for document in fallback:
+            result = self.analyze_candidate(document["candidate"]['id'], stats, candidate_data=document["data"])
+            self._record_result(results, document["candidate"], result)
+    
+    def _record_result(self, results, candidate, result):
+        """Add a per-candidate outcome to the run summary"""
+        if result['success']:
+            results['success'] += 1
+        else:
+            results['failed'] += 1
+        
+        results['details'].append({
+            "candidate_id": candidate['id'],
+            "candidate_name": candidate['name'],
+            "success": result['success'],
+            "error": result.get('error', None)
+        })
@@ -1,13 +1,53 @@
 import google.generativeai as genai
-import json
+import logging
 from datetime import datetime
 
+from agents.prompts import cv_analysis_prompt, job_analysis_prompt, parse_json_response
+from utils.text_budget import map_reduce_extract
+
+logger = logging.getLogger(__name__)
+
 class GeminiClient:
     def __init__(self, api_key):
         self.api_key = api_key
         genai.configure(api_key=api_key)
         self.model = genai.GenerativeModel('gemini-pro')
     
+    def generate_completion(self, messages, temperature=0.2, max_tokens=1024, stream=False, force_cache=False, model=None):
+        """
+        Generate a completion with Gemini from chat-style messages
+        
+        Args:
+            messages: List of message dictionaries with 'role' and 'content'
+            temperature: Controls randomness (0 to 1)
+            max_tokens: Maximum tokens in completion
+            stream: Ignored, Gemini responses are returned in full
+            force_cache: Ignored, this client has no cache
+            model: Ignored, Groq model names do not apply to Gemini
+        
+        Returns:
+            dict: {"success": bool, "content" or "error": str, "cached": False}
+        """
+        # gemini-pro has no system role, so the conversation is flattened into one prompt
+        prompt = "\n\n".join(message["content"] for message in messages)
+        
+        try:
+            response = self.model.generate_content(
+                prompt,
+                generation_config={"temperature": temperature, "max_output_tokens": max_tokens}
+            )
+            return {
+                "success": True,
+                "content": response.text,
+                "cached": False
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "error": str(e),
+                "cached": False
+            }
+    
     def analyze_cv(self, cv_text, candidate_name):
         """
         Analyze a CV using Gemini API to extract structured information
@@ -17,45 +57,21 @@ class GeminiClient:
             candidate_name: The name of the candidate
             
         Returns:
-            dict: Structured information extracted from the CV
+            dict: Structured information extracted from the CV, with the
+                  preprocessing token report under 'token_report'
         """
+        # Long CVs are cleaned and, if still over budget, analyzed chunk by chunk
+        result, report = map_reduce_extract(cv_text, lambda text: self._analyze_cv_text(text, candidate_name))
+        result['token_report'] = report
+        return result
+    
+    def _analyze_cv_text(self, cv_text, candidate_name):
+        """Analyze one budget-sized piece of CV text"""
         try:
-            prompt = f"""
-            I need you to analyze this CV/resume for {candidate_name} and extract the following information in JSON format:
-            
-            1. Skills (technical and soft skills as a list of strings)
-            2. Years of experience (total professional experience as a number)
-            3. Education level (highest degree: e.g., "Bachelor's", "Master's", "PhD", etc.)
-            4. Key technologies or tools the candidate is proficient with (as a list of strings)
-            5. Previous job titles (as a list of strings)
-            
-            Return ONLY the JSON object without any explanations or markdown. Format should be:
-            {{
-                "skills": ["skill1", "skill2", ...],
-                "experience_years": X,
-                "education": "Highest degree",
-                "technologies": ["tech1", "tech2", ...],
-                "job_titles": ["title1", "title2", ...]
-            }}
-            
-            Here is the CV text:
-            {cv_text}
-            """
-            
-            response = self.model.generate_content(prompt)
+            response = self.model.generate_content(cv_analysis_prompt(cv_text, candidate_name))
             
             # Extract the JSON object from the response
-            try:
-                # Try to parse the response as JSON
-                result = json.loads(response.text)
-            except json.JSONDecodeError:
-                # If that fails, try to extract JSON from the text (in case there's additional text)
-                import re
-                json_match = re.search(r'({.*})', response.text.replace('\n', ''), re.DOTALL)
-                if json_match:
-                    result = json.loads(json_match.group(1))
-                else:
-                    raise Exception("Failed to extract JSON from response")
+            result = parse_json_response(response.text)
             
             # Add timestamp
             result['timestamp'] = datetime.now().isoformat()
@@ -63,7 +79,7 @@ class GeminiClient:
             return result
             
         except Exception as e:
-            print(f"Error analyzing CV with Gemini API: {str(e)}")
+            logger.error("Error analyzing CV with Gemini API: %s", e)
             # Return a minimal structure in case of error
             return {
                 "skills": [],
@@ -87,42 +103,10 @@ class GeminiClient:
             dict: Structured requirements extracted from the job description
         """
         try:
-            prompt = f"""
-            I need you to analyze this job description for a {job_title} position and extract the following information in JSON format:
-            
-            1. Required skills (as a list of strings)
-            2. Preferred/nice-to-have skills (as a list of strings)
-            3. Years of experience required (as a number, use the minimum if a range is specified)
-            4. Education level required (e.g., "Bachelor's", "Master's", "PhD", etc.)
-            5. Key technologies or tools mentioned (as a list of strings)
-            
-            Return ONLY the JSON object without any explanations or markdown. Format should be:
-            {{
-                "required_skills": ["skill1", "skill2", ...],
-                "preferred_skills": ["skill1", "skill2", ...],
-                "experience_years": X,
-                "education_level": "Required degree",
-                "technologies": ["tech1", "tech2", ...]
-            }}
-            
-            Here is the job description:
-            {job_description}
-            """
-            
-            response = self.model.generate_content(prompt)
+            response = self.model.generate_content(job_analysis_prompt(job_title, job_description))
             
             # Extract the JSON object from the response
-            try:
-                # Try to parse the response as JSON
-                result = json.loads(response.text)
-            except json.JSONDecodeError:
-                # If that fails, try to extract JSON from the text (in case there's additional text)
-                import re
-                json_match = re.search(r'({.*})', response.text.replace('\n', ''), re.DOTALL)
-                if json_match:
-                    result = json.loads(json_match.group(1))
-                else:
-                    raise Exception("Failed to extract JSON from response")
+            result = parse_json_response(response.text)
             
             # Add timestamp
             result['timestamp'] = datetime.now().isoformat()
@@ -130,7 +114,7 @@ class GeminiClient:
             return result
             
         except Exception as e:
-            print(f"Error analyzing job description with Gemini API: {str(e)}")
+            logger.error("Error analyzing job description with Gemini API: %s", e)
             # Return a minimal structure in case of error
             return {
                 "required_skills": [],
@@ -140,4 +124,4 @@ class GeminiClient:
                 "technologies": [],
                 "error": str(e),
                 "timestamp": datetime.now().isoformat()
-            }
\ No newline at end of file
+            }
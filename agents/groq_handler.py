@@ -2,9 +2,18 @@ import time
 import re
 import random
 import json
+import logging
 import os
+import threading
 from datetime import datetime
 
+from utils.tracing import record_cache, record_llm_usage
+
+logger = logging.getLogger(__name__)
+
+# Model used when the caller does not ask for one
+DEFAULT_MODEL = "llama-3.3-70b-versatile"
+
 class GroqLimitHandler:
     def __init__(self, groq_client, cache_dir="./.cache"):
         self.groq_client = groq_client
@@ -19,6 +28,7 @@ class GroqLimitHandler:
         
         # Load any cached results
         self.in_memory_cache = {}
+        self._cache_lock = threading.Lock()
         self._load_cache()
     
     def _load_cache(self):
@@ -28,20 +38,25 @@ class GroqLimitHandler:
             try:
                 with open(cache_file, 'r') as f:
                     self.in_memory_cache = json.load(f)
-                print(f"Loaded {len(self.in_memory_cache)} cached API responses")
+                logger.info("Loaded %d cached API responses", len(self.in_memory_cache))
             except Exception as e:
-                print(f"Error loading cache: {str(e)}")
+                logger.error("Error loading cache: %s", e)
     
     def _save_cache(self):
         """Save the current cache to disk"""
         cache_file = os.path.join(self.cache_dir, "groq_responses.json")
         try:
-            with open(cache_file, 'w') as f:
-                json.dump(self.in_memory_cache, f)
+            # Several threads may save at once; write a snapshot and swap the file in
+            with self._cache_lock:
+                snapshot = dict(self.in_memory_cache)
+                tmp_file = cache_file + ".tmp"
+                with open(tmp_file, 'w') as f:
+                    json.dump(snapshot, f)
+                os.replace(tmp_file, cache_file)
         except Exception as e:
-            print(f"Error saving cache: {str(e)}")
+            logger.error("Error saving cache: %s", e)
     
-    def _get_cache_key(self, messages, temperature, max_tokens):
+    def _get_cache_key(self, messages, temperature, max_tokens, model=DEFAULT_MODEL):
         """Generate a cache key from request parameters"""
         # We exclude 'stream' from the key since we always want non-streaming for caching
         key_parts = []
@@ -49,6 +64,9 @@ class GroqLimitHandler:
             key_parts.append(f"{message['role']}:{message['content']}")
         
         key_str = "|||".join(key_parts) + f"|||temp:{temperature}|||tokens:{max_tokens}"
+        # Only other models extend the key, so responses cached for the default stay valid
+        if model != DEFAULT_MODEL:
+            key_str += f"|||model:{model}"
         
         # Use a hash of the string as the key to keep it manageable
         import hashlib
@@ -63,14 +81,15 @@ class GroqLimitHandler:
         if self.daily_reset_time:
             current_time = time.time()
             if current_time > self.daily_reset_time:
-                print("Daily limit cooldown period has ended, resetting API availability")
+                logger.info("Daily limit cooldown period has ended, resetting API availability")
                 self.daily_limit_reached = False
                 self.daily_reset_time = None
                 return True
         
         return False
     
-    def generate_completion(self, messages, temperature=1, max_tokens=1024, stream=False, max_retries=5, force_cache=False):
+    def generate_completion(self, messages, temperature=1, max_tokens=1024, stream=False, max_retries=5, force_cache=False,
+                            model=None):
         """
         Generate a completion using Groq LLM with rate limit handling and caching
         
@@ -81,23 +100,26 @@ class GroqLimitHandler:
             stream: Whether to stream the response
             max_retries: Maximum number of retries on rate limit
             force_cache: Force use of cache even if API is available
+            model: Groq model to use (defaults to DEFAULT_MODEL)
             
         Returns:
             dict: Response from Groq API or cache
         """
+        model = model or DEFAULT_MODEL
+        
         # Check if we're in daily limit cooldown and need to use cache
         if not self.is_api_available() or force_cache:
             # If streaming is requested but we're using cache, we can't stream
             if stream:
-                print("Warning: Streaming requested but using cache instead due to API limits")
+                logger.warning("Streaming requested but using cache instead due to API limits")
                 stream = False
             
             # Generate cache key
-            cache_key = self._get_cache_key(messages, temperature, max_tokens)
+            cache_key = self._get_cache_key(messages, temperature, max_tokens, model)
             
             # Check if we have this in cache
             if cache_key in self.in_memory_cache:
-                print("Using cached response due to daily API limit")
+                logger.debug("Using cached response due to daily API limit", extra={"sample_key": "groq_cache_fallback"})
                 return {
                     "success": True,
                     "content": self.in_memory_cache[cache_key],
@@ -112,9 +134,10 @@ class GroqLimitHandler:
                 }
         
         # Check cache before making API call
-        cache_key = self._get_cache_key(messages, temperature, max_tokens)
+        cache_key = self._get_cache_key(messages, temperature, max_tokens, model)
+        record_cache("groq_responses", cache_key in self.in_memory_cache)
         if cache_key in self.in_memory_cache:
-            print("Using cached response")
+            logger.debug("Using cached response", extra={"sample_key": "groq_cache_hit"})
             return {
                 "success": True,
                 "content": self.in_memory_cache[cache_key],
@@ -128,7 +151,7 @@ class GroqLimitHandler:
         while retries <= max_retries:
             try:
                 completion = self.groq_client.chat.completions.create(
-                    model="llama-3.3-70b-versatile",
+                    model=model,
                     messages=messages,
                     temperature=temperature,
                     max_completion_tokens=max_tokens,
@@ -142,6 +165,7 @@ class GroqLimitHandler:
                 else:
                     # Cache the successful response
                     content = completion.choices[0].message.content
+                    record_llm_usage(getattr(completion, "usage", None))
                     self.in_memory_cache[cache_key] = content
                     self._save_cache()
                     
@@ -153,11 +177,11 @@ class GroqLimitHandler:
                     
             except Exception as e:
                 error_str = str(e)
-                print(f"Error calling Groq API: {error_str}")
+                logger.warning("Error calling Groq API: %s", error_str)
                 
                 # Check if it's a daily limit error
                 if "tokens per day (TPD)" in error_str:
-                    print("Daily token limit reached")
+                    logger.warning("Daily token limit reached")
                     self.daily_limit_reached = True
                     
                     # Try to extract the wait time
@@ -168,11 +192,11 @@ class GroqLimitHandler:
                         total_seconds = (minutes * 60) + seconds
                         self.daily_reset_time = time.time() + total_seconds
                         reset_time_str = datetime.fromtimestamp(self.daily_reset_time).strftime('%H:%M:%S')
-                        print(f"API will be available again at approximately: {reset_time_str}")
+                        logger.warning("API will be available again at approximately: %s", reset_time_str)
                     
                     # Switch to cache mode
                     if cache_key in self.in_memory_cache:
-                        print("Using cached response due to daily API limit")
+                        logger.debug("Using cached response due to daily API limit", extra={"sample_key": "groq_cache_fallback"})
                         return {
                             "success": True,
                             "content": self.in_memory_cache[cache_key],
@@ -198,7 +222,7 @@ class GroqLimitHandler:
                         else:
                             wait_time = backoff
                             
-                        print(f"Rate limit exceeded. Waiting {wait_time:.2f} seconds before retry {retries + 1}/{max_retries}...")
+                        logger.info("Rate limit exceeded. Waiting %.2f seconds before retry %d/%d...", wait_time, retries + 1, max_retries)
                         time.sleep(wait_time)
                         
                         # Exponential backoff for next attempt
@@ -218,4 +242,54 @@ class GroqLimitHandler:
             "success": False,
             "error": "Maximum retries exceeded for rate limit",
             "cached": False
-        }
\ No newline at end of file
+        }
+    
+    def stream_completion(self, messages, temperature=1, max_tokens=1024):
+        """
+        Stream a completion from Groq, caching the full text once it is complete
+        
+        Args:
+            messages: List of message dictionaries with 'role' and 'content'
+            temperature: Controls randomness (0 to 1)
+            max_tokens: Maximum tokens in completion
+            
+        Yields:
+            str: Text deltas as they arrive (a single chunk on a cache hit)
+            
+        Raises:
+            RuntimeError: If no completion can be produced from the API or cache
+        """
+        cache_key = self._get_cache_key(messages, temperature, max_tokens)
+        
+        # Cached responses are replayed as one chunk
+        if cache_key in self.in_memory_cache:
+            yield self.in_memory_cache[cache_key]
+            return
+        
+        response = self.generate_completion(
+            messages=messages,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            stream=True
+        )
+        
+        if not response["success"]:
+            raise RuntimeError(response.get("error", "Unknown error calling Groq API"))
+        
+        # Daily-limit fallback returns cached content instead of a stream
+        if "stream" not in response:
+            yield response["content"]
+            return
+        
+        parts = []
+        for chunk in response["stream"]:
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if delta:
+                parts.append(delta)
+                yield delta
+        
+        # Only a fully received completion is cached
+        self.in_memory_cache[cache_key] = "".join(parts)
+        self._save_cache()
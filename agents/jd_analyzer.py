@@ -1,17 +1,42 @@
+import json
 from datetime import datetime
 
+from agents.batching import (
+    MAX_BATCH_DOCUMENTS, OUTPUT_TOKENS_PER_DOCUMENT, BatchStats,
+    batch_output_tokens, build_batch_prompt, pack_documents, parse_batch_response
+)
+from utils.llm_clients import get_llm_router
+
+SYSTEM_PROMPT = "You are an expert HR recruiter specializing in job description analysis. Extract key information from job descriptions."
+EXTRACTION_INSTRUCTIONS = "extract the following information: required skills, required experience, education requirements, responsibilities, and key qualifications."
+
 class JDAnalyzer:
     def __init__(self, generate_completion_fn, mysql_connector):
         """
         Initialize the Job Description Analyzer
         
         Args:
-            generate_completion_fn: Function that calls the Groq API
+            generate_completion_fn: Function that calls the LLM (None uses the shared
+                                    LLMRouter from utils.llm_clients, which fails
+                                    over when Groq is rate limited)
             mysql_connector: Connector to the MySQL database
         """
-        self.generate_completion = generate_completion_fn
+        self.generate_completion = generate_completion_fn or get_llm_router().generate_completion
         self.mysql_connector = mysql_connector
     
+    def _build_messages(self, job_title, job_description):
+        """Create the single-job prompt for Groq"""
+        return [
+            {
+                "role": "system",
+                "content": SYSTEM_PROMPT
+            },
+            {
+                "role": "user",
+                "content": f"Analyze the following job description for '{job_title}':\n\n{job_description}\n\nExtract the following information: required skills, required experience, education requirements, responsibilities, and key qualifications. Format your response as JSON."
+            }
+        ]
+    
     def analyze_job_description(self, job_title, job_description):
         """
         Analyze a job description using the Groq API
@@ -23,23 +48,13 @@ class JDAnalyzer:
         Returns:
             dict: The analysis results
         """
-        # Create the prompt for Groq
-        messages = [
-            {
-                "role": "system",
-                "content": "You are an expert HR recruiter specializing in job description analysis. Extract key information from job descriptions."
-            },
-            {
-                "role": "user",
-                "content": f"Analyze the following job description for '{job_title}':\n\n{job_description}\n\nExtract the following information: required skills, required experience, education requirements, responsibilities, and key qualifications. Format your response as JSON."
-            }
-        ]
+        messages = self._build_messages(job_title, job_description)
         
         # Call Groq API
         response = self.generate_completion(
             messages=messages,
             temperature=0.3,  # Lower temperature for more consistent results
-            max_tokens=1024,
+            max_tokens=OUTPUT_TOKENS_PER_DOCUMENT,
             stream=False
         )
         
@@ -56,18 +71,68 @@ class JDAnalyzer:
             "timestamp": datetime.now().isoformat()
         }
     
-    def analyze_job(self, job_id):
+    def analyze_job_descriptions_batch(self, documents):
+        """
+        Analyze several job descriptions in a single Groq request
+        
+        Args:
+            documents: List of dicts with 'id', 'text' and 'label' (job title)
+            
+        Returns:
+            tuple: (analyses, messages) where analyses maps job ID to its
+                   analysis result and messages is the prompt that was sent
+        """
+        messages = [
+            {
+                "role": "system",
+                "content": SYSTEM_PROMPT
+            },
+            {
+                "role": "user",
+                "content": build_batch_prompt(documents, "job description", EXTRACTION_INSTRUCTIONS)
+            }
+        ]
+        
+        # Call Groq API once for the whole batch
+        response = self.generate_completion(
+            messages=messages,
+            temperature=0.3,
+            max_tokens=batch_output_tokens(len(documents)),
+            stream=False
+        )
+        
+        if not response["success"]:
+            return {}, messages
+        
+        timestamp = datetime.now().isoformat()
+        parsed = parse_batch_response(response["content"], [doc["id"] for doc in documents])
+        analyses = {
+            doc_id: {
+                "analysis": json.dumps(analysis),
+                "model": "llama-3.3-70b-versatile",
+                "batched": True,
+                "timestamp": timestamp
+            }
+            for doc_id, analysis in parsed.items()
+        }
+        return analyses, messages
+    
+    def analyze_job(self, job_id, stats=None, job_data=None):
         """
         Analyze a job description and store the results
         
         Args:
             job_id: The ID of the job to analyze
+            stats: Optional BatchStats collecting token usage
+            job_data: Job row as returned by get_job_by_id, if already
+                      fetched (skips the lookup)
             
         Returns:
             dict: The analysis results
         """
         # Get job data from MySQL
-        job_data = self.mysql_connector.get_job_by_id(job_id)
+        if job_data is None:
+            job_data = self.mysql_connector.get_job_by_id(job_id)
         
         if not job_data:
             return {
@@ -87,6 +152,8 @@ class JDAnalyzer:
         
         # Analyze job description using Groq API
         analysis_result = self.analyze_job_description(job_title, job_description)
+        if stats:
+            stats.record_request(self._build_messages(job_title, job_description), 1)
         
         # Store analysis results in MySQL
         storage_success = self.mysql_connector.store_job_analysis(
@@ -100,15 +167,20 @@ class JDAnalyzer:
             "analysis_result": analysis_result
         }
     
-    def analyze_all_jobs(self, limit=None):
+    def analyze_all_jobs(self, limit=None, batched=False, token_budget=6000, max_batch_size=MAX_BATCH_DOCUMENTS):
         """
         Analyze all job descriptions and store the results
         
         Args:
             limit: Optional limit on number of jobs to analyze
+            batched: Pack several job descriptions into each LLM request
+            token_budget: Maximum estimated description tokens per batched request
+            max_batch_size: Maximum number of job descriptions per batched request
+                            (capped at MAX_BATCH_DOCUMENTS)
             
         Returns:
-            dict: Summary of the analysis results
+            dict: Summary of the analysis results, including token and
+                  throughput stats under 'stats'
         """
         # Get all jobs from MySQL
         all_jobs = self.mysql_connector.get_all_jobs()
@@ -123,19 +195,69 @@ class JDAnalyzer:
             "details": []
         }
         
-        for job in all_jobs:
-            result = self.analyze_job(job['id'])
+        stats = BatchStats("batched" if batched else "single")
+        
+        if batched:
+            self._analyze_jobs_batched(all_jobs, results, stats, token_budget, max_batch_size)
+        else:
+            for job in all_jobs:
+                self._record_result(results, job, self.analyze_job(job['id'], stats))
+        
+        results['stats'] = stats.summary()
+        return results
+    
+    def _analyze_jobs_batched(self, jobs, results, stats, token_budget, max_batch_size):
+        """Run batched analysis, falling back to single calls for failed documents"""
+        documents = []
+        for job in jobs:
+            job_description = job.get('job_description', '')
             
-            if result['success']:
-                results['success'] += 1
-            else:
-                results['failed'] += 1
+            if not job_description:
+                # Let the single-document path report the reason
+                self._record_result(results, job, self.analyze_job(job['id'], stats, job_data=job))
+                continue
             
-            results['details'].append({
-                "job_id": job['id'],
-                "job_title": job['job_title'],
-                "success": result['success'],
-                "error": result.get('error', None)
+            documents.append({
+                "id": str(job['id']),
+                "label": job.get('job_title', 'Unknown Position'),
+                "text": job_description,
+                "job": job
             })
         
-        return results
\ No newline at end of file
+        batches, oversized = pack_documents(documents, token_budget, max_batch_size)
+        
+        fallback = list(oversized)
+        for batch in batches:
+            analyses, messages = self.analyze_job_descriptions_batch(batch)
+            stats.record_request(messages, len(analyses))
+            
+            for document in batch:
+                analysis_result = analyses.get(document["id"])
+                if not analysis_result:
+                    fallback.append(document)
+                    continue
+                
+                storage_success = self.mysql_connector.store_job_analysis(
+                    document["job"]['id'], analysis_result
+                )
+                self._record_result(results, document["job"], {"success": storage_success})
+        
+        # Documents that could not be parsed out of a batch are retried alone
+        stats.fallbacks += len(fallback)
+        for document in fallback:
+            result = self.analyze_job(document["job"]['id'], stats, job_data=document["job"])
+            self._record_result(results, document["job"], result)
+    
+    def _record_result(self, results, job, result):
+        """Add a per-job outcome to the run summary"""
+        if result['success']:
+            results['success'] += 1
+        else:
+            results['failed'] += 1
+        
+        results['details'].append({
+            "job_id": job['id'],
+            "job_title": job['job_title'],
+            "success": result['success'],
+            "error": result.get('error', None)
+        })
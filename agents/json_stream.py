@@ -0,0 +1,110 @@
+import json
+
+
+class IncrementalJSONParser:
+    """
+    Parses a JSON object while it is still being streamed from an LLM
+
+    Each call to feed() returns the fields that are complete so far. Values are
+    only exposed once they have been fully received, so a half-streamed string
+    never shows up in the partial result.
+    """
+
+    _CLOSERS = {"{": "}", "[": "]"}
+
+    def __init__(self):
+        self.buffer = ""
+        self._pos = 0
+        self._started = False
+        self._start = 0
+        self._stack = []
+        self._in_string = False
+        self._escape = False
+        # Last position where the document can be cut and closed to valid JSON
+        self._cut = None
+        self._cut_stack = ()
+        self._last_result = {}
+
+    def feed(self, chunk):
+        """
+        Add a streamed chunk and return the partial object parsed so far
+
+        Args:
+            chunk: Next piece of the LLM response text
+
+        Returns:
+            dict: Fields whose values have been fully received
+        """
+        if chunk:
+            self.buffer += chunk
+            self._scan()
+        return self.partial()
+
+    def partial(self):
+        """Return the best-effort object for the text received so far"""
+        if self._cut is None:
+            return self._last_result
+
+        text = self.buffer[self._start:self._cut].rstrip().rstrip(",")
+        text += "".join(self._CLOSERS[opener] for opener in reversed(self._cut_stack))
+
+        try:
+            result = json.loads(text)
+        except json.JSONDecodeError:
+            return self._last_result
+
+        if isinstance(result, dict):
+            self._last_result = result
+        return self._last_result
+
+    def is_complete(self):
+        """True once the top-level object has been closed"""
+        return self._started and not self._stack
+
+    def _mark_cut(self, pos):
+        self._cut = pos
+        self._cut_stack = tuple(self._stack)
+
+    def _scan(self):
+        buffer = self.buffer
+        pos = self._pos
+
+        # Skip any prose or markdown fence before the opening brace
+        if not self._started:
+            start = buffer.find("{", pos)
+            if start == -1:
+                self._pos = len(buffer)
+                return
+            self._started = True
+            self._start = start
+            self._stack.append("{")
+            pos = start + 1
+            self._mark_cut(pos)
+
+        while pos < len(buffer) and self._stack:
+            char = buffer[pos]
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    # A finished string inside an array is a complete item
+                    if self._stack[-1] == "[":
+                        self._mark_cut(pos + 1)
+            elif char == '"':
+                self._in_string = True
+            elif char in "{[":
+                self._stack.append(char)
+                self._mark_cut(pos + 1)
+            elif char in "}]":
+                self._stack.pop()
+                self._mark_cut(pos + 1)
+            elif char == ",":
+                self._mark_cut(pos)
+
+            pos += 1
+
+        self._pos = pos
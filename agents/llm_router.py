@@ -0,0 +1,380 @@
+import contextvars
+import logging
+import random
+import re
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime
+
+from agents.prompts import cv_analysis_messages, job_analysis_messages, parse_json_response
+from utils.text_budget import map_reduce_extract
+
+logger = logging.getLogger(__name__)
+
+# Error fragments that mean "this provider is out of quota for now"
+RATE_LIMIT_MARKERS = (
+    "rate_limit",
+    "rate limit",
+    "429",
+    "tokens per day",
+    "daily api limit",
+    "quota",
+    "resource_exhausted"
+)
+
+
+def is_rate_limit_error(error):
+    """Check whether a provider error is a rate limit or quota error"""
+    error = (error or "").lower()
+    return any(marker in error for marker in RATE_LIMIT_MARKERS)
+
+
+class ProviderStats:
+    """Rolling latency and error rate for one provider"""
+
+    def __init__(self, window=100):
+        self.samples = deque(maxlen=window)
+        self.cooldown_until = 0.0
+        self.lock = threading.Lock()
+
+    def record(self, latency, success):
+        with self.lock:
+            self.samples.append((latency, success))
+
+    def percentile(self, pct):
+        """Latency percentile (seconds) over successful calls, or None without data"""
+        with self.lock:
+            latencies = sorted(latency for latency, success in self.samples if success)
+        if not latencies:
+            return None
+        index = min(len(latencies) - 1, int(round(pct / 100 * (len(latencies) - 1))))
+        return latencies[index]
+
+    def error_rate(self):
+        with self.lock:
+            if not self.samples:
+                return 0.0
+            return sum(1 for _, success in self.samples if not success) / len(self.samples)
+
+    def snapshot(self):
+        return {
+            "calls": len(self.samples),
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "error_rate": round(self.error_rate(), 3),
+            "cooling_down": time.time() < self.cooldown_until
+        }
+
+
+class FakeProvider:
+    """
+    In-process provider for offline tests and benchmarks
+
+    Args:
+        name: Provider name
+        latency: Base latency in seconds
+        jitter: Random extra latency in seconds
+        error_rate: Probability of a generic failure
+        rate_limited: Always answer with a rate limit error
+        responder: Optional function(messages) -> response text
+    """
+
+    def __init__(self, name="fake", latency=0.05, jitter=0.0, error_rate=0.0, rate_limited=False, responder=None):
+        self.name = name
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rate_limited = rate_limited
+        self.responder = responder or (lambda messages: "{}")
+        self.calls = 0
+
+    def generate_completion(self, messages, temperature=1, max_tokens=1024, stream=False, force_cache=False, model=None):
+        self.calls += 1
+        time.sleep(self.latency + random.uniform(0, self.jitter))
+
+        if self.rate_limited:
+            return {"success": False, "error": "Error code: 429 - rate_limit_exceeded", "cached": False}
+        if random.random() < self.error_rate:
+            return {"success": False, "error": f"{self.name} provider error", "cached": False}
+
+        return {"success": True, "content": self.responder(messages), "cached": False}
+
+
+class LLMRouter:
+    """
+    Routes completions across several providers
+
+    Providers are tried fastest-healthy-first based on rolling p50 latency of
+    uncached calls. A request still running after the hedge deadline (the
+    provider's p95, but never less than hedge_after) is duplicated to the next
+    provider and the first successful answer wins. Rate limited providers are
+    put in a cooldown and skipped until it expires, unless every provider is
+    cooling down (their own caches may still answer).
+
+    Any object with a generate_completion(messages, temperature, max_tokens, ...)
+    method returning {"success", "content"/"error"} can be a provider, which
+    covers GroqLimitHandler, AIClient, GeminiClient and FakeProvider.
+    """
+
+    def __init__(self, providers, hedge_after=5.0, max_error_rate=0.5, rate_limit_cooldown=60.0, window=100, explore_rate=0.05,
+                 max_workers=None):
+        """
+        Initialize the router
+
+        Args:
+            providers: Dict of provider name -> provider, in preference order
+            hedge_after: Minimum seconds to wait before hedging; also the deadline
+                         while a provider has no p95 yet
+            max_error_rate: Providers above this error rate are treated as unhealthy
+            rate_limit_cooldown: Seconds to skip a provider after a rate limit error
+            window: Number of recent calls kept per provider
+            explore_rate: Share of requests sent to a random healthy provider so
+                          latency estimates for slower-ranked providers stay fresh
+            max_workers: Provider calls in flight across all requests (defaults to
+                         twice the number of providers, at least 4)
+        """
+        self.providers = dict(providers)
+        self.order = list(self.providers)
+        self.hedge_after = hedge_after
+        self.max_error_rate = max_error_rate
+        self.rate_limit_cooldown = rate_limit_cooldown
+        self.explore_rate = explore_rate
+        self.stats = {name: ProviderStats(window) for name in self.providers}
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_workers or max(4, 2 * len(self.providers)),
+            thread_name_prefix="llm-router"
+        )
+
+    def _is_cooling_down(self, name):
+        return time.time() < self.stats[name].cooldown_until
+
+    def _is_healthy(self, name):
+        stats = self.stats[name]
+        if self._is_cooling_down(name):
+            return False
+        return len(stats.samples) < 5 or stats.error_rate() <= self.max_error_rate
+
+    def ranked_providers(self):
+        """
+        Provider names ordered healthy-first, then by p50 latency
+
+        Providers cooling down after a rate limit are left out while any other
+        provider is available.
+        """
+        def sort_key(name):
+            p50 = self.stats[name].percentile(50)
+            # Providers without data keep their configured order ahead of slow ones
+            return (not self._is_healthy(name), p50 if p50 is not None else 0.0, self.order.index(name))
+
+        available = [name for name in self.order if not self._is_cooling_down(name)]
+        ranked = sorted(available or self.order, key=sort_key)
+
+        healthy = [name for name in ranked if self._is_healthy(name)]
+        if len(healthy) > 1 and random.random() < self.explore_rate:
+            explored = random.choice(healthy[1:])
+            ranked.remove(explored)
+            ranked.insert(0, explored)
+        return ranked
+
+    def _hedge_deadline(self, name):
+        p95 = self.stats[name].percentile(95)
+        return max(p95, self.hedge_after) if p95 is not None else self.hedge_after
+
+    def _call(self, name, messages, temperature, max_tokens, model=None):
+        started = time.time()
+        try:
+            response = self.providers[name].generate_completion(
+                messages=messages,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                stream=False,
+                model=model
+            )
+        except Exception as e:
+            response = {"success": False, "error": str(e), "cached": False}
+
+        latency = time.time() - started
+        success = bool(response.get("success"))
+        # Cache hits say nothing about the provider's latency and would drag the p95 towards zero
+        if not response.get("cached"):
+            self.stats[name].record(latency, success)
+
+        if not success and is_rate_limit_error(response.get("error")):
+            self.stats[name].cooldown_until = time.time() + self._cooldown_seconds(response.get("error"))
+
+        response = dict(response)
+        response["provider"] = name
+        response["latency"] = round(latency, 3)
+        return response
+
+    def _cooldown_seconds(self, error):
+        """Use the provider's own retry hint when the error carries one"""
+        wait_match = re.search(r"try again in (?:(\d+)m)?(\d+(?:\.\d+)?)s", error or "")
+        if wait_match:
+            return int(wait_match.group(1) or 0) * 60 + float(wait_match.group(2))
+        return self.rate_limit_cooldown
+
+    def generate_completion(self, messages, temperature=1, max_tokens=1024, stream=False, force_cache=False, model=None,
+                            **kwargs):
+        """
+        Generate a completion on the best available provider
+
+        Args:
+            messages: List of message dictionaries with 'role' and 'content'
+            temperature: Controls randomness (0 to 1)
+            max_tokens: Maximum tokens in completion
+            stream: Ignored, routed completions are always returned in full
+            force_cache: Ignored, provider caches are used by the providers themselves
+            model: Groq model to ask for; providers that cannot serve it use their own
+
+        Returns:
+            dict: Provider response plus the 'provider' that answered
+        """
+        candidates = self.ranked_providers()
+        pending = {}
+        errors = []
+
+        def launch_next():
+            while candidates:
+                name = candidates.pop(0)
+                # Run in the caller's context so provider calls show up in its trace
+                future = self.executor.submit(contextvars.copy_context().run, self._call, name, messages,
+                                              temperature, max_tokens, model)
+                pending[future] = name
+                return name
+            return None
+
+        current = launch_next()
+        while pending:
+            done, _ = wait(list(pending), timeout=self._hedge_deadline(current), return_when=FIRST_COMPLETED)
+
+            if not done:
+                # Slow request: hedge on the next provider, keep waiting on both
+                hedged = launch_next()
+                if hedged:
+                    current = hedged
+                else:
+                    done, _ = wait(list(pending), return_when=FIRST_COMPLETED)
+
+            for future in done:
+                pending.pop(future)
+                response = future.result()
+                if response.get("success"):
+                    return response
+                errors.append(f"{response['provider']}: {response.get('error')}")
+
+            # Fail over once nothing is left in flight
+            if not pending:
+                current = launch_next() or current
+
+        return {
+            "success": False,
+            "error": "All LLM providers failed: " + "; ".join(errors),
+            "cached": False
+        }
+
+    def close(self):
+        """Stop the worker threads (calls in flight finish in the background)"""
+        self.executor.shutdown(wait=False)
+
+    def provider_stats(self):
+        """Rolling latency and health per provider"""
+        return {name: self.stats[name].snapshot() for name in self.order}
+
+    def analyze_cv(self, cv_text, candidate_name):
+        """
+        Analyze a CV on the best available provider
+
+        Args:
+            cv_text: The text content of the CV
+            candidate_name: The name of the candidate
+
+        Returns:
+            dict: Structured information extracted from the CV, with the
+                  preprocessing token report under 'token_report'
+        """
+        # Long CVs are cleaned and, if still over budget, analyzed chunk by chunk
+        result, report = map_reduce_extract(cv_text, lambda text: self._analyze_cv_text(text, candidate_name))
+        result['token_report'] = report
+        return result
+
+    def _analyze_cv_text(self, cv_text, candidate_name):
+        """Analyze one budget-sized piece of CV text"""
+        response = self.generate_completion(cv_analysis_messages(cv_text, candidate_name), temperature=0.2)
+        try:
+            if not response["success"]:
+                raise Exception(response["error"])
+            result = parse_json_response(response["content"])
+            result['provider'] = response["provider"]
+            result['timestamp'] = datetime.now().isoformat()
+            return result
+        except Exception as e:
+            logger.error("Error analyzing CV through LLM router: %s", e)
+            return {
+                "skills": [],
+                "experience_years": 0,
+                "education": "Unknown",
+                "technologies": [],
+                "job_titles": [],
+                "error": str(e),
+                "timestamp": datetime.now().isoformat()
+            }
+
+    def analyze_job_description(self, job_title, job_description):
+        """
+        Analyze a job description on the best available provider
+
+        Args:
+            job_title: The title of the job
+            job_description: The text of the job description
+
+        Returns:
+            dict: Structured requirements extracted from the job description
+        """
+        response = self.generate_completion(job_analysis_messages(job_title, job_description), temperature=0.2)
+        try:
+            if not response["success"]:
+                raise Exception(response["error"])
+            result = parse_json_response(response["content"])
+            result['provider'] = response["provider"]
+            result['timestamp'] = datetime.now().isoformat()
+            return result
+        except Exception as e:
+            logger.error("Error analyzing job description through LLM router: %s", e)
+            return {
+                "required_skills": [],
+                "preferred_skills": [],
+                "experience_years": 0,
+                "education_level": "Unknown",
+                "technologies": [],
+                "error": str(e),
+                "timestamp": datetime.now().isoformat()
+            }
+
+
+# Offline benchmark of routing, hedging and failover with fake providers
+if __name__ == "__main__":
+    router = LLMRouter({
+        "groq": FakeProvider("groq", latency=0.05, jitter=0.4),
+        "gemini": FakeProvider("gemini", latency=0.15, jitter=0.05),
+        "local": FakeProvider("local", latency=0.3)
+    }, hedge_after=0.2)
+
+    started = time.time()
+    latencies = []
+    for _ in range(200):
+        request_started = time.time()
+        router.generate_completion([{"role": "user", "content": "ping"}])
+        latencies.append(time.time() - request_started)
+    latencies.sort()
+    print(f"200 requests in {time.time() - started:.2f}s, "
+          f"p50={latencies[100]:.3f}s p95={latencies[189]:.3f}s")
+    for name, snapshot in router.provider_stats().items():
+        print(f"  {name}: {snapshot}")
+
+    # Groq out of quota: every request should fail over
+    router.providers["groq"].rate_limited = True
+    response = router.generate_completion([{"role": "user", "content": "ping"}])
+    print(f"Rate limited primary -> answered by {response['provider']}")
@@ -1,13 +1,21 @@
 import numpy as np
 from datetime import datetime
 import json
+import logging
 import os
 
+from utils.llm_clients import get_llm_router
+from utils.skill_taxonomy import get_skill_taxonomy
+from utils.text_budget import map_reduce_extract
+
+logger = logging.getLogger(__name__)
+
 class MatchingEngine:
     def __init__(self, neo4j_connector, mysql_connector, generate_completion_fn, cache_dir="./.cache/matches"):
         self.neo4j_connector = neo4j_connector
         self.mysql_connector = mysql_connector
-        self.generate_completion = generate_completion_fn
+        # None uses the shared LLMRouter: Groq's pooled client and cache, with failover on rate limits
+        self.generate_completion = generate_completion_fn or get_llm_router().generate_completion
         self.cache_dir = cache_dir
         
         # Create cache directory if it doesn't exist
@@ -57,7 +65,7 @@ class MatchingEngine:
             with open(cache_path, 'w') as f:
                 json.dump(result, f)
         except Exception as e:
-            print(f"Error saving match cache: {str(e)}")
+            logger.error("Error saving match cache: %s", e)
     
     def analyze_job_description(self, job_title, job_description, force_cache=False):
         """
@@ -145,6 +153,15 @@ class MatchingEngine:
         Returns:
             dict: The analysis results
         """
+        # Long CVs are cleaned and, if still over budget, analyzed chunk by chunk
+        result, report = map_reduce_extract(
+            cv_text, lambda text: self._analyze_cv_text(text, candidate_name, force_cache)
+        )
+        result['token_report'] = report
+        return result
+    
+    def _analyze_cv_text(self, cv_text, candidate_name, force_cache=False):
+        """Analyze one budget-sized piece of CV text"""
         # Create the prompt for LLM
         messages = [
             {
@@ -265,19 +282,11 @@ class MatchingEngine:
         if not required_skills or not candidate_skills:
             return 0.5  # Default score if no skills data
         
-        # Convert lists to strings if needed
-        if isinstance(required_skills, list):
-            required_skills = ', '.join(required_skills)
-        if isinstance(candidate_skills, list):
-            candidate_skills = ', '.join(candidate_skills)
-        
-        # Convert to string to be safe
-        required_skills = str(required_skills).lower()
-        candidate_skills = str(candidate_skills).lower()
-        
-        # Check for direct keyword matches
-        required_keywords = set(required_skills.replace(',', ' ').split())
-        candidate_keywords = set(candidate_skills.replace(',', ' ').split())
+        # Compare canonical skill ids so "JS", "JavaScript" and "ECMAScript" match;
+        # a candidate's skills also count for the skills they imply (Node.js -> JavaScript)
+        taxonomy = get_skill_taxonomy()
+        required_keywords = taxonomy.skill_keys(required_skills)
+        candidate_keywords = taxonomy.skill_keys(candidate_skills, expand=True)
         
         if not required_keywords:
             return 0.5
@@ -350,7 +359,8 @@ class MatchingEngine:
         if use_cache:
             cached_result = self._check_match_cache(candidate_id, job_id)
             if cached_result:
-                print(f"Using cached match result for candidate {candidate_id} and job {job_id}")
+                logger.debug("Using cached match result for candidate %s and job %s", candidate_id, job_id,
+                             extra={"sample_key": "match_cache_hit"})
                 return cached_result
         
         # Get candidate data from Neo4j
@@ -435,7 +445,7 @@ class MatchingEngine:
         # Process jobs in batches
         for i in range(0, len(all_jobs), batch_size):
             batch = all_jobs[i:i+batch_size]
-            print(f"Processing job batch {i//batch_size + 1} of {(len(all_jobs) // batch_size) + 1} ({len(batch)} jobs)")
+            logger.info("Processing job batch %d of %d (%d jobs)", i//batch_size + 1, (len(all_jobs) // batch_size) + 1, len(batch))
             
             for job in batch:
                 # First check if we already have this match cached
@@ -481,7 +491,7 @@ class MatchingEngine:
         # Process candidates in batches
         for i in range(0, len(all_candidates), batch_size):
             batch = all_candidates[i:i+batch_size]
-            print(f"Processing candidate batch {i//batch_size + 1} of {(len(all_candidates) // batch_size) + 1} ({len(batch)} candidates)")
+            logger.info("Processing candidate batch %d of %d (%d candidates)", i//batch_size + 1, (len(all_candidates) // batch_size) + 1, len(batch))
             
             for candidate in batch:
                 # First check if we already have this match cached
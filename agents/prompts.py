@@ -0,0 +1,95 @@
+import json
+import re
+
+CV_SYSTEM_PROMPT = "You are an AI assistant that extracts structured information from CVs."
+JD_SYSTEM_PROMPT = "You are an AI assistant that extracts structured information from job descriptions."
+
+
+def cv_analysis_prompt(cv_text, candidate_name):
+    """Prompt asking for the structured CV summary shared by all providers"""
+    return f"""
+            I need you to analyze this CV/resume for {candidate_name} and extract the following information in JSON format:
+
+            1. Skills (technical and soft skills as a list of strings)
+            2. Years of experience (total professional experience as a number)
+            3. Education level (highest degree: e.g., "Bachelor's", "Master's", "PhD", etc.)
+            4. Key technologies or tools the candidate is proficient with (as a list of strings)
+            5. Previous job titles (as a list of strings)
+
+            Return ONLY the JSON object without any explanations or markdown. Format should be:
+            {{
+                "skills": ["skill1", "skill2", ...],
+                "experience_years": X,
+                "education": "Highest degree",
+                "technologies": ["tech1", "tech2", ...],
+                "job_titles": ["title1", "title2", ...]
+            }}
+
+            Here is the CV text:
+            {cv_text}
+            """
+
+
+def job_analysis_prompt(job_title, job_description):
+    """Prompt asking for the structured job requirements shared by all providers"""
+    return f"""
+            I need you to analyze this job description for a {job_title} position and extract the following information in JSON format:
+
+            1. Required skills (as a list of strings)
+            2. Preferred/nice-to-have skills (as a list of strings)
+            3. Years of experience required (as a number, use the minimum if a range is specified)
+            4. Education level required (e.g., "Bachelor's", "Master's", "PhD", etc.)
+            5. Key technologies or tools mentioned (as a list of strings)
+
+            Return ONLY the JSON object without any explanations or markdown. Format should be:
+            {{
+                "required_skills": ["skill1", "skill2", ...],
+                "preferred_skills": ["skill1", "skill2", ...],
+                "experience_years": X,
+                "education_level": "Required degree",
+                "technologies": ["tech1", "tech2", ...]
+            }}
+
+            Here is the job description:
+            {job_description}
+            """
+
+
+def cv_analysis_messages(cv_text, candidate_name):
+    """Chat messages for a CV analysis request"""
+    return [
+        {"role": "system", "content": CV_SYSTEM_PROMPT},
+        {"role": "user", "content": cv_analysis_prompt(cv_text, candidate_name)}
+    ]
+
+
+def job_analysis_messages(job_title, job_description):
+    """Chat messages for a job description analysis request"""
+    return [
+        {"role": "system", "content": JD_SYSTEM_PROMPT},
+        {"role": "user", "content": job_analysis_prompt(job_title, job_description)}
+    ]
+
+
+def parse_json_response(text):
+    """
+    Parse the JSON object out of an LLM response
+
+    Args:
+        text: Raw response text
+
+    Returns:
+        dict: The parsed object
+
+    Raises:
+        Exception: If no JSON object can be extracted
+    """
+    try:
+        # Try to parse the response as JSON
+        return json.loads(text)
+    except json.JSONDecodeError:
+        # If that fails, try to extract JSON from the text (in case there's additional text)
+        json_match = re.search(r'({.*})', text.replace('\n', ''), re.DOTALL)
+        if json_match:
+            return json.loads(json_match.group(1))
+        raise Exception("Failed to extract JSON from response")
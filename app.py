@@ -1,37 +1,120 @@
 # app.py - Main Flask application
 
-from flask import Flask, render_template, request, redirect, url_for, flash, session
+from flask import Flask, render_template, request, redirect, url_for, flash, session, Response, stream_with_context, current_app, jsonify
+import atexit
 import os
+import json
+import threading
+import click
+from werkzeug.local import LocalProxy
 from werkzeug.utils import secure_filename
-from db.db_integration import initialize_databases, CandidateManager, MatchingEngine
+from db.db_integration import MySQLConnection, Neo4jConnection, CandidateManager, MatchingEngine
+from db.instrumentation import QUERY_PROFILE_SAMPLE_RATE, query_metrics
+from db.job_sync import JOB_SYNC_INTERVAL, JobSyncScheduler
+from db.schema import SchemaManager
 from utils.pdf_parser import extract_text_from_pdf
 from utils.api_clients import get_linkedin_data, get_github_data
 from utils.llm_matching import LLMMatchingEngine
+from utils.llm_clients import warm_up as warm_up_llm_clients
+from utils.pdf_service import PDF_WORKERS, get_pdf_service
+from utils.nlp import PRELOAD_SPACY, preload_nlp
+from utils.render_cache import RenderCache
+from utils.batch_evaluation import BatchEvaluationManager
+from utils.tracing import span, start_trace, tag_trace, trace_store, waterfall
+from utils.logging_setup import configure_logging
 import PyPDF2
 import io
 from datetime import datetime
 
-app = Flask(__name__)
-app.config.from_pyfile('config.py')
 
-# Set secret key for sessions
-app.secret_key = app.config.get('SECRET_KEY', 'dev_secret_key')
+class AppResources:
+    """Database connections and engines, created on first use instead of at import"""
+    
+    def __init__(self):
+        # Reentrant: factories use other resources (e.g. the engines need neo4j_conn)
+        self._lock = threading.RLock()
+        self._resources = {}
+    
+    def _get(self, name, factory):
+        resource = self._resources.get(name)
+        if resource is None:
+            with self._lock:
+                resource = self._resources.get(name)
+                if resource is None:
+                    resource = factory()
+                    self._resources[name] = resource
+        return resource
+    
+    @property
+    def mysql_conn(self):
+        # MySQLConnection connects on its first query
+        return self._get("mysql_conn", MySQLConnection)
+    
+    @property
+    def neo4j_conn(self):
+        def connect():
+            connection = Neo4jConnection()
+            connection.connect()
+            return connection
+        return self._get("neo4j_conn", connect)
+    
+    @property
+    def candidate_manager(self):
+        return self._get("candidate_manager", lambda: CandidateManager(self.neo4j_conn.driver))
+    
+    @property
+    def matching_engine(self):
+        return self._get("matching_engine", lambda: MatchingEngine(self.neo4j_conn.driver))
+    
+    @property
+    def llm_matching_engine(self):
+        return self._get("llm_matching_engine", lambda: LLMMatchingEngine(self.neo4j_conn.driver))
+    
+    @property
+    def batch_evaluator(self):
+        return self._get(
+            "batch_evaluator",
+            lambda: BatchEvaluationManager(self.neo4j_conn.driver, self.llm_matching_engine)
+        )
+    
+    def close(self):
+        """Close the database connections (called once at process exit)"""
+        with self._lock:
+            # Write buffered results while the driver is still open
+            batch_evaluator = self._resources.get("batch_evaluator")
+            if batch_evaluator is not None:
+                batch_evaluator.shutdown()
+            matching_engine = self._resources.get("matching_engine")
+            if matching_engine is not None:
+                matching_engine.close()
+            for name in ("mysql_conn", "neo4j_conn"):
+                connection = self._resources.pop(name, None)
+                if connection is not None:
+                    connection.close()
+            self._resources.clear()
+
+
+def _resources():
+    return current_app.extensions["resources"]
+
+# Views use these like the old module globals; they resolve against the current app
+mysql_conn = LocalProxy(lambda: _resources().mysql_conn)
+neo4j_conn = LocalProxy(lambda: _resources().neo4j_conn)
+candidate_manager = LocalProxy(lambda: _resources().candidate_manager)
+matching_engine = LocalProxy(lambda: _resources().matching_engine)
+llm_matching_engine = LocalProxy(lambda: _resources().llm_matching_engine)
+batch_evaluator = LocalProxy(lambda: _resources().batch_evaluator)
 
-# Initialize databases
-mysql_conn, neo4j_conn = initialize_databases()
-candidate_manager = CandidateManager(neo4j_conn.driver)
-matching_engine = MatchingEngine(neo4j_conn.driver)
-llm_matching_engine = LLMMatchingEngine(neo4j_conn.driver)
+# Rendered candidate pages, keyed by candidate and the version of their data
+candidate_page_cache = RenderCache()
 
 # Home page route
-@app.route('/')
 def index():
     # Get list of jobs for the dropdown
     jobs = mysql_conn.get_job_titles_for_dropdown()
     return render_template('index.html', jobs=jobs)
 
 # Application form route
-@app.route('/apply', methods=['GET', 'POST'])
 def apply():
     if request.method == 'GET':
         # Get job ID from query parameter
@@ -48,82 +131,94 @@ def apply():
         return render_template('apply.html', jobs=jobs, job=job)
     
     elif request.method == 'POST':
-        # Get form data
-        name = request.form.get('name')
-        email = request.form.get('email')
-        phone = request.form.get('phone')
-        job_id = request.form.get('job_id')
-        linkedin_url = request.form.get('linkedin_url')
-        github_url = request.form.get('github_url')
-        
-        # Process resume file
-        if 'resume' not in request.files:
-            flash('No resume file uploaded')
-            return redirect(request.url)
-        
-        resume_file = request.files['resume']
-        if resume_file.filename == '':
-            flash('No resume file selected')
-            return redirect(request.url)
-        
-        # Extract text from resume PDF
-        try:
+        # Traced, so /admin/trace/<candidate_id> shows where submit time goes
+        with start_trace("apply", job_id=request.form.get('job_id')):
+            return submit_application()
+
+def submit_application():
+    """Parse, enrich and store a submitted application"""
+    # Get form data
+    name = request.form.get('name')
+    email = request.form.get('email')
+    phone = request.form.get('phone')
+    job_id = request.form.get('job_id')
+    linkedin_url = request.form.get('linkedin_url')
+    github_url = request.form.get('github_url')
+    
+    # Process resume file
+    if 'resume' not in request.files:
+        flash('No resume file uploaded')
+        return redirect(request.url)
+    
+    resume_file = request.files['resume']
+    if resume_file.filename == '':
+        flash('No resume file selected')
+        return redirect(request.url)
+    
+    # Extract text from resume PDF
+    try:
+        with span("extract_text_from_pdf"):
             resume_text = extract_text_from_pdf(resume_file)
-        except Exception as e:
-            flash(f'Error extracting text from PDF: {str(e)}')
-            return redirect(request.url)
-        
-        # Get LinkedIn data if URL provided
-        linkedin_data = None
-        if linkedin_url:
-            try:
+    except Exception as e:
+        flash(f'Error extracting text from PDF: {str(e)}')
+        return redirect(request.url)
+    
+    # Get LinkedIn data if URL provided
+    linkedin_data = None
+    if linkedin_url:
+        try:
+            with span("get_linkedin_data"):
                 linkedin_data = get_linkedin_data(linkedin_url)
-            except Exception as e:
-                flash(f'Error fetching LinkedIn data: {str(e)}')
-        
-        # Get GitHub data if URL provided
-        github_data = None
-        if github_url:
-            try:
-                github_data = get_github_data(github_url)
-            except Exception as e:
-                flash(f'Error fetching GitHub data: {str(e)}')
-        
-        # Store candidate data
-        form_data = {
-            'name': name,
-            'email': email,
-            'phone': phone,
-            'job_id': job_id
-        }
-        
+        except Exception as e:
+            flash(f'Error fetching LinkedIn data: {str(e)}')
+    
+    # Get GitHub data if URL provided
+    github_data = None
+    if github_url:
         try:
+            with span("get_github_data"):
+                github_data = get_github_data(github_url)
+        except Exception as e:
+            flash(f'Error fetching GitHub data: {str(e)}')
+    
+    # Store candidate data
+    form_data = {
+        'name': name,
+        'email': email,
+        'phone': phone,
+        'job_id': job_id
+    }
+    
+    try:
+        with span("store_candidate"):
             candidate_id = candidate_manager.store_candidate(
                 form_data, resume_text, linkedin_data, github_data
             )
+        
+        if candidate_id:
+            tag_trace("application.id", candidate_id)
             
-            if candidate_id:
-                # Calculate match score
-                match_result = matching_engine.match_candidate_to_job(candidate_id, job_id)
-                
-                flash('Application submitted successfully!')
-                return redirect(url_for('index'))
-            else:
-                flash('Error storing candidate data')
-                return redirect(request.url)
-        except Exception as e:
-            flash(f'Error processing application: {str(e)}')
+            # Calculate match score (written in the background with other applications)
+            with span("queue_match"):
+                matching_engine.queue_match(candidate_id, job_id, resume_text)
+            
+            flash('Application submitted successfully!')
+            return redirect(url_for('index'))
+        else:
+            flash('Error storing candidate data')
             return redirect(request.url)
+    except Exception as e:
+        flash(f'Error processing application: {str(e)}')
+        return redirect(request.url)
 
 # Admin routes
-@app.route('/admin/login', methods=['GET', 'POST'])
 def admin_login():
     if request.method == 'POST':
         username = request.form.get('username')
         password = request.form.get('password')
         
         # Simple authentication for demo purposes
-        if username == app.config.get('ADMIN_USERNAME', 'admin') and password == app.config.get('ADMIN_PASSWORD', 'password'):
+        if username == current_app.config.get('ADMIN_USERNAME', 'admin') and password == current_app.config.get('ADMIN_PASSWORD', 'password'):
             session['admin_logged_in'] = True
             return redirect(url_for('admin_dashboard'))
         else:
@@ -131,12 +226,10 @@ def admin_login():
     
     return render_template('admin/login.html')
 
-@app.route('/admin/logout')
 def admin_logout():
     session.pop('admin_logged_in', None)
     return redirect(url_for('index'))
 
-@app.route('/admin/dashboard')
 def admin_dashboard():
     # Check if admin is logged in
     if not session.get('admin_logged_in'):
@@ -245,6 +338,7 @@ def admin_dashboard():
     with neo4j_conn.driver.session() as session_db:
         result = session_db.run("""
             MATCH (c:Candidate)-[a:APPLIED_FOR]->(j:Job)
+            WHERE a.date IS NOT NULL
             OPTIONAL MATCH (c)-[m:MATCHES]->(j)
             RETURN 
                 c.id AS candidate_id,
@@ -277,7 +371,6 @@ def admin_dashboard():
         match_distribution=match_distribution
     )
 
-@app.route('/admin/job/<job_id>')
 def admin_job_candidates(job_id):
     # Check if admin is logged in
     if not session.get('admin_logged_in'):
@@ -286,96 +379,131 @@ def admin_job_candidates(job_id):
     # Get job details
     job = mysql_conn.get_job_by_id(job_id)
     
-    # Get all candidates for this job with LLM scores
-    with neo4j_conn.driver.session() as session_db:
-       # For the admin_job_candidates function:
-        result = session_db.run("""
-            MATCH (c:Candidate)-[a:APPLIED_FOR]->(j:Job {job_id: $job_id})
-            OPTIONAL MATCH (c)-[m:MATCHES]->(j)
-            RETURN 
-                c.id AS candidate_id,
-                c.name AS name,
-                c.email AS email,
-                a.date AS application_date,
-                a.status AS application_status,
-                COALESCE(m.llm_score, m.score, 0) AS match_score,
-                COALESCE(m.llm_category, m.category, 'Not Evaluated') AS match_category
-            ORDER BY match_score DESC
-        """, job_id=job_id)
-        
-        candidates = [dict(record) for record in result]
+    # Filters and the keyset cursor (score and id of the last candidate on the previous page)
+    category = request.args.get('category') or None
+    status = request.args.get('status') or None
+    after = None
+    if request.args.get('after_score') and request.args.get('after_id'):
+        try:
+            after = (float(request.args['after_score']), request.args['after_id'])
+        except ValueError:
+            after = None
+    
+    candidates, next_cursor = matching_engine.get_candidates_page(
+        job_id,
+        limit=current_app.config.get('CANDIDATES_PER_PAGE', 50),
+        after=after,
+        category=category,
+        status=status
+    )
+    
+    next_url = None
+    if next_cursor:
+        next_url = url_for(
+            'admin_job_candidates', job_id=job_id, category=category, status=status,
+            after_score=next_cursor[0], after_id=next_cursor[1]
+        )
     
     return render_template(
         'admin/job_candidates.html', 
         job=job, 
-        candidates=candidates
+        candidates=candidates,
+        category=category,
+        status=status,
+        is_first_page=after is None,
+        next_url=next_url
     )
 
-@app.route('/admin/candidate/<candidate_id>')
+def evaluate_all_pending(job_id):
+    """Queue every applicant of the job without an LLM evaluation"""
+    if not session.get('admin_logged_in'):
+        return Response(status=401)
+    
+    return jsonify(batch_evaluator.start(job_id))
+
+def evaluate_all_progress(job_id):
+    """Progress of the job's batch evaluation, polled by the candidates page"""
+    if not session.get('admin_logged_in'):
+        return Response(status=401)
+    
+    return jsonify(batch_evaluator.progress(job_id) or {"job_id": job_id, "status": "idle"})
+
 def admin_candidate_details(candidate_id):
     # Check if admin is logged in
     if not session.get('admin_logged_in'):
         return redirect(url_for('admin_login'))
     
-    # Get comprehensive candidate details from Neo4j
-    with neo4j_conn.driver.session() as session_db:
-        # Get basic candidate information with job match
-       # Replace the query in admin_candidate_details
-        result = session_db.run("""
-            MATCH (c:Candidate {id: $candidate_id})
-            OPTIONAL MATCH (c)-[a:APPLIED_FOR]->(j:Job)
-            OPTIONAL MATCH (c)-[m:MATCHES]->(j)
-            OPTIONAL MATCH (c)-[:HAS_PROFILE]->(l:LinkedInProfile)
-            OPTIONAL MATCH (c)-[:HAS_GITHUB]->(g:GitHubProfile)
-            RETURN c, m, j, l, g, a
-            ORDER BY CASE WHEN m.llm_score IS NULL THEN 0 ELSE m.llm_score END DESC
-            LIMIT 1
-        """, candidate_id=candidate_id)
-        
-        record = result.single()
-        if not record:
-            flash("Candidate not found", "danger")
-            return redirect(url_for('admin_dashboard'))
-        
-        # Extract candidate details
-        c_node = record["c"]
-        m_rel = record["m"] if record["m"] else {}
-        j_node = record["j"] if record["j"] else {}
-        l_node = record["l"] if record["l"] else {}
-        g_node = record["g"] if record["g"] else {}
-        a_rel = record["a"] if record["a"] else {}
-        
-        # Format basic candidate data using llm_score instead of score
-        candidate = {
-            "id": c_node["id"],
-            "name": c_node.get("name", ""),
-            "email": c_node.get("email", ""),
-            "phone": c_node.get("phone", ""),
-            "resume_text": c_node.get("resume_text", ""),
-            "match_score": m_rel.get("llm_score", m_rel.get("score", 0)),  # Prefer llm_score, fall back to score
-            "match_category": m_rel.get("llm_category", m_rel.get("category", "Not evaluated")),
-            "job_title": j_node.get("title", ""),
-            "job_id": j_node.get("job_id", ""),
-            "application_status": a_rel.get("status", "Applied"),
-            "matched_skills": m_rel.get("llm_strengths", m_rel.get("matched_skills", [])),
-            "skills": [],
-            "linkedin_url": c_node.get("linkedin_url", ""),
-            "github_url": c_node.get("github_url", "")
-        }
-        
-        # Rest of the function remains the same
-        # ...
-    return render_template('admin/candidate.html', candidate=candidate)
+    # Application to focus on (defaults to the best match)
+    job_id = request.args.get('job_id')
+    
+    # Serve a cached page while neither the candidate nor their jobs changed.
+    # Pages with pending flash messages are rendered fresh so the messages show once.
+    version = candidate_manager.get_profile_version(candidate_id)
+    if version is None:
+        flash("Candidate not found", "danger")
+        return redirect(url_for('admin_dashboard'))
+    
+    cache_key = (candidate_id, job_id, version)
+    use_cache = not session.get('_flashes')
+    if use_cache:
+        html = candidate_page_cache.get(cache_key)
+        if html is not None:
+            return html
+    
+    profile = candidate_manager.get_candidate_profile(candidate_id)
+    if not profile:
+        flash("Candidate not found", "danger")
+        return redirect(url_for('admin_dashboard'))
+    
+    applications = profile["applications"]
+    primary = next((a for a in applications if a["job_id"] == job_id), applications[0] if applications else {})
+    
+    candidate = {
+        "id": profile["id"],
+        "name": profile["name"] or "",
+        "email": profile["email"] or "",
+        "phone": profile["phone"] or "",
+        "linkedin_url": profile["linkedin_url"] or "",
+        "github_url": profile["github_url"] or "",
+        "match_score": primary.get("match_score", 0),
+        "match_category": primary.get("match_category", "Not Evaluated"),
+        "matched_skills": primary.get("matched_skills", []),
+        "job_title": primary.get("job_title") or "",
+        "job_id": primary.get("job_id") or "",
+        "application_status": primary.get("application_status", "Applied"),
+        "skills": [skill["name"] for skill in profile["skills"]],
+        "education": profile["education"],
+        "experience": profile["experience"],
+        "applications": applications,
+        "potential_jobs": [
+            {"title": a["job_title"], "score": a["match_score"], "job_id": a["job_id"]}
+            for a in applications if a is not primary
+        ]
+    }
+    
+    html = render_template('admin/candidate.html', candidate=candidate)
+    if use_cache:
+        candidate_page_cache.put(cache_key, html)
+    return html
+
+def admin_candidate_resume(candidate_id):
+    """Resume text for the candidate page, fetched when the admin opens it"""
+    if not session.get('admin_logged_in'):
+        return Response(status=401)
+    
+    resume_text = candidate_manager.get_resume_text(candidate_id)
+    if resume_text is None:
+        return Response("Candidate not found", status=404, mimetype='text/plain')
+    
+    response = Response(resume_text, mimetype='text/plain')
+    response.add_etag()
+    return response.make_conditional(request)
 
-@app.route('/admin/evaluate/<candidate_id>/<job_id>')
 def evaluate_candidate(candidate_id, job_id):
     # Check if admin is logged in
     if not session.get('admin_logged_in'):
         return redirect(url_for('admin_login'))
     
-    # Run LLM evaluation
-    evaluation = llm_matching_engine.evaluate_candidate_for_job(candidate_id, job_id)
-    
     # Get candidate details
     with neo4j_conn.driver.session() as session_db:
         candidate_result = session_db.run("""
@@ -401,15 +529,40 @@ def evaluate_candidate(candidate_id, job_id):
     candidate_dict = dict(candidate)
     job_dict = dict(job)
     
+    # ?stream=0 keeps the blocking evaluation for clients without EventSource
+    stream_url = None
+    if request.args.get('stream') == '0':
+        evaluation = llm_matching_engine.evaluate_candidate_for_job(candidate_id, job_id)
+    else:
+        # Render straight away and let the page fill in from the event stream
+        evaluation = {"match_score": 0, "match_category": "Evaluating...", "strengths": [], "gaps": [], "recommendations": []}
+        stream_url = url_for('evaluate_candidate_stream', candidate_id=candidate_id, job_id=job_id)
+    
     return render_template(
         'admin/evaluation.html',
         candidate=candidate_dict,
         job=job_dict,
-        evaluation=evaluation
+        evaluation=evaluation,
+        stream_url=stream_url
+    )
+
+def evaluate_candidate_stream(candidate_id, job_id):
+    """Server-sent events with partial evaluations while the LLM is generating"""
+    # Check if admin is logged in
+    if not session.get('admin_logged_in'):
+        return Response(status=401)
+    
+    def generate():
+        for event, evaluation in llm_matching_engine.stream_candidate_evaluation(candidate_id, job_id):
+            yield f"event: {event}\ndata: {json.dumps(evaluation)}\n\n"
+    
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
     )
 
 
-@app.route('/admin/candidate/<candidate_id>/job/<job_id>/status/<status>')
 def update_candidate_status(candidate_id, job_id, status):
     # Check if admin is logged in
     if not session.get('admin_logged_in'):
@@ -420,7 +573,8 @@ def update_candidate_status(candidate_id, job_id, status):
         session_db.run("""
             MATCH (c:Candidate {id: $candidate_id})-[a:APPLIED_FOR]->(j:Job {job_id: $job_id})
             SET a.status = $status,
-                a.updated_at = datetime()
+                a.updated_at = datetime(),
+                c.updated_at = datetime()
         """, candidate_id=candidate_id, job_id=job_id, status=status)
     
     # Flash a message
@@ -430,15 +584,179 @@ def update_candidate_status(candidate_id, job_id, status):
     return redirect(url_for('admin_job_candidates', job_id=job_id))
 
 
-# Clean up database connections when the application exits
-@app.teardown_appcontext
-def cleanup_connections(exception=None):
-    """Close database connections when the application context ends"""
-    if hasattr(mysql_conn, 'close'):
-        mysql_conn.close()
-    if hasattr(neo4j_conn, 'close'):
-        neo4j_conn.close()
-    print("Database connections closed")
+def admin_trace(application_id):
+    """Waterfall of the traced /apply request that created this application"""
+    if not session.get('admin_logged_in'):
+        return redirect(url_for('admin_login'))
+    
+    spans = trace_store.find("application.id", application_id)
+    if not spans:
+        flash('No trace recorded for this application', 'warning')
+        return redirect(url_for('admin_candidate_details', candidate_id=application_id))
+    
+    rows = waterfall(spans)
+    totals = {}
+    for row in rows:
+        for key, value in row["attributes"].items():
+            if key.startswith(("llm.", "cache.", "db.")):
+                totals[key] = totals.get(key, 0) + value
+    
+    return render_template('admin/trace.html', application_id=application_id, spans=rows, totals=totals)
+
+
+def admin_metrics():
+    """Per-query latency histograms, rows and db hits since the process started"""
+    if not session.get('admin_logged_in'):
+        return Response(status=401)
+    
+    return jsonify(
+        slow_query_ms=query_metrics.slow_query_ms,
+        profile_sample_rate=QUERY_PROFILE_SAMPLE_RATE,
+        queries=query_metrics.snapshot()
+    )
+
+
+def healthz():
+    """Cheap readiness check: one round trip per database, no graph scans"""
+    checks = {}
+    
+    try:
+        neo4j_conn.driver.verify_connectivity()
+        checks["neo4j"] = "ok"
+    except Exception as e:
+        checks["neo4j"] = f"error: {str(e)}"
+    
+    try:
+        connection = mysql_conn.connection or mysql_conn.connect()
+        if connection is None:
+            raise mysql_conn.last_error
+        connection.ping(reconnect=True)
+        checks["mysql"] = "ok"
+    except Exception as e:
+        checks["mysql"] = f"error: {str(e)}"
+    
+    healthy = all(check == "ok" for check in checks.values())
+    return jsonify(status="ok" if healthy else "degraded", checks=checks), 200 if healthy else 503
+
+
+def register_cli_commands(app):
+    """Schema setup and data sync run explicitly instead of on every worker start"""
+    
+    @app.cli.command("init-db")
+    def init_db_command():
+        """Apply the Neo4j schema (db.schema) and merge skill variants"""
+        resources = app.extensions["resources"]
+        resources.neo4j_conn.setup_database()
+        resources.neo4j_conn.merge_skill_variants()
+        click.echo("Database initialized")
+    
+    @app.cli.command("migrate-resumes")
+    @click.option("--batch-size", default=500, help="Candidates migrated per transaction")
+    def migrate_resumes_command(batch_size):
+        """Move resume text from Candidate nodes to the blob store"""
+        migrated = app.extensions["resources"].neo4j_conn.migrate_resume_text(batch_size)
+        click.echo(f"Migrated {migrated} resumes")
+    
+    @app.cli.command("rematch-job")
+    @click.argument("job_id")
+    def rematch_job_command(job_id):
+        """Recalculate keyword match scores for every applicant of a job"""
+        scored = app.extensions["resources"].matching_engine.rematch_job(job_id)
+        click.echo(f"Scored {scored} applicants")
+    
+    @app.cli.command("backfill-match-scores")
+    @click.option("--batch-size", default=10000, help="Relationships updated per transaction")
+    def backfill_match_scores_command(batch_size):
+        """Store final_score on MATCHES relationships created before it existed"""
+        updated = app.extensions["resources"].neo4j_conn.backfill_match_scores(batch_size)
+        click.echo(f"Backfilled {updated} matches")
+    
+    @app.cli.command("check-schema")
+    def check_schema_command():
+        """EXPLAIN the hot queries and fail if any of them scans a whole label"""
+        schema = SchemaManager(app.extensions["resources"].neo4j_conn.driver)
+        problems = schema.verify()
+        for name, scans in problems:
+            click.echo(f"{name}: {', '.join(scans)}")
+        if problems:
+            raise SystemExit(1)
+        click.echo("All hot queries use indexes")
+    
+    @app.cli.command("sync-jobs")
+    @click.option("--full", is_flag=True, help="Rewrite every job, not only changed ones")
+    def sync_jobs_command(full):
+        """Copy new and changed jobs from MySQL into Neo4j and archive removed ones"""
+        resources = app.extensions["resources"]
+        stats = resources.neo4j_conn.sync_jobs_from_mysql(resources.mysql_conn, full=full)
+        click.echo(f"Jobs synced: {stats}")
+
+
+def create_app(config_file='config.py'):
+    """
+    Create the Flask application
+    
+    Database connections are opened on first use, so creating the app does no I/O.
+    Run `flask init-db` and `flask sync-jobs` to set up the schema and copy jobs.
+    
+    Args:
+        config_file: Config file loaded with app.config.from_pyfile
+    
+    Returns:
+        Flask application
+    """
+    # Queue-based logging, so request and batch threads never block on stdout
+    configure_logging()
+    
+    app = Flask(__name__)
+    app.config.from_pyfile(config_file)
+    
+    # Set secret key for sessions
+    app.secret_key = app.config.get('SECRET_KEY', 'dev_secret_key')
+    
+    # Create the shared LLM clients once per process
+    warm_up_llm_clients()
+    
+    # Optionally load spaCy here so preforked workers share one read-only copy
+    if PRELOAD_SPACY:
+        preload_nlp()
+    
+    # Fork the PDF parser processes before any request threads exist
+    if PDF_WORKERS > 0:
+        get_pdf_service()
+    
+    resources = AppResources()
+    app.extensions["resources"] = resources
+    
+    # Close connections once when the process exits, not after every request
+    atexit.register(resources.close)
+    
+    # Keep Neo4j jobs in step with MySQL in the background (JOB_SYNC_INTERVAL=0 disables it)
+    if JOB_SYNC_INTERVAL > 0:
+        scheduler = JobSyncScheduler(LocalProxy(lambda: resources.neo4j_conn), MySQLConnection())
+        app.extensions["job_sync"] = scheduler.start()
+        atexit.register(scheduler.stop)
+    
+    app.add_url_rule('/', view_func=index)
+    app.add_url_rule('/apply', view_func=apply, methods=['GET', 'POST'])
+    app.add_url_rule('/admin/login', view_func=admin_login, methods=['GET', 'POST'])
+    app.add_url_rule('/admin/logout', view_func=admin_logout)
+    app.add_url_rule('/admin/dashboard', view_func=admin_dashboard)
+    app.add_url_rule('/admin/job/<job_id>', view_func=admin_job_candidates)
+    app.add_url_rule('/admin/job/<job_id>/evaluate-all', view_func=evaluate_all_pending, methods=['POST'])
+    app.add_url_rule('/admin/job/<job_id>/evaluate-all/progress', view_func=evaluate_all_progress)
+    app.add_url_rule('/admin/candidate/<candidate_id>', view_func=admin_candidate_details)
+    app.add_url_rule('/admin/candidate/<candidate_id>/resume', view_func=admin_candidate_resume)
+    app.add_url_rule('/admin/evaluate/<candidate_id>/<job_id>', view_func=evaluate_candidate)
+    app.add_url_rule('/admin/evaluate/<candidate_id>/<job_id>/stream', view_func=evaluate_candidate_stream)
+    app.add_url_rule('/admin/candidate/<candidate_id>/job/<job_id>/status/<status>', view_func=update_candidate_status)
+    app.add_url_rule('/admin/trace/<application_id>', view_func=admin_trace)
+    app.add_url_rule('/admin/metrics', view_func=admin_metrics)
+    app.add_url_rule('/healthz', view_func=healthz)
+    
+    register_cli_commands(app)
+    return app
+
 
+# Importing this module only defines the app; wsgi.py creates the instance servers load
 if __name__ == '__main__':
-    app.run(debug=True)
\ No newline at end of file
+    create_app().run(debug=True)
@@ -0,0 +1,265 @@
+# benchmarks/fake_services.py
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from utils.synthetic_data import SKILLS
+
+# Simulated response times of the external services, in milliseconds
+FAKE_LLM_LATENCY_MS = float(os.getenv("FAKE_LLM_LATENCY_MS", "300"))
+FAKE_LINKEDIN_LATENCY_MS = float(os.getenv("FAKE_LINKEDIN_LATENCY_MS", "150"))
+FAKE_GITHUB_LATENCY_MS = float(os.getenv("FAKE_GITHUB_LATENCY_MS", "80"))
+
+
+def _skills_in(text):
+    lowered = text.lower()
+    return [skill for skill in SKILLS if skill.lower() in lowered]
+
+
+def _score(text):
+    """Deterministic 0-1 score for a prompt, so repeated runs do the same work"""
+    return int(hashlib.sha256(text.encode("utf-8")).hexdigest()[:4], 16) / 0xFFFF
+
+
+def fake_completion(prompt):
+    """
+    The JSON answer a model would give to one of the application's prompts
+
+    Args:
+        prompt: Text of the last user message
+
+    Returns:
+        str: Response content
+    """
+    if "Parse the following resume" in prompt:
+        from utils.pdf_parser import extract_structured_info
+
+        resume_text = prompt.split("Here is the resume text:", 1)[-1].rsplit("Respond ONLY", 1)[0]
+        info = extract_structured_info(resume_text)
+        return json.dumps({key: info.get(key, []) for key in ("skills", "education", "experience", "contact")},
+                          default=str)
+
+    skills = _skills_in(prompt)
+    if "Evaluate the candidate below" in prompt:
+        score = round(_score(prompt), 2)
+        return json.dumps({
+            "overall_score": score,
+            "match_category": "Excellent Match" if score > 0.8 else "Good Match" if score > 0.6
+            else "Moderate Match" if score > 0.4 else "Low Match",
+            "strengths": [f"Experience with {skill}" for skill in skills[:3]],
+            "gaps": ["No production experience with Kubernetes"],
+            "recommendations": ["Ask about system design in the interview"]
+        })
+    if "Analyze the following job description" in prompt:
+        return json.dumps({
+            "required_skills": skills,
+            "experience_years": int(_score(prompt) * 8),
+            "education_level": "bachelor",
+            "responsibilities": ["Build and run services"]
+        })
+    if "Analyze the following CV" in prompt:
+        return json.dumps({"skills": skills, "experience_years": int(_score(prompt) * 12), "education": "bachelor"})
+    return "{}"
+
+
+def services_environment(url):
+    """Environment variables that send the application's external calls to fake services at url"""
+    return {
+        "GROQ_BASE_URL": url,
+        "GROQ_API_KEY": "fake",
+        "LINKEDIN_API_URL": url,
+        "GITHUB_API_URL": url
+    }
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out as separate writes; without this, delayed ACKs add ~40 ms per response
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, payload, status=200):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _sleep(self, milliseconds):
+        if milliseconds:
+            time.sleep(milliseconds / 1000)
+
+    def do_GET(self):
+        services = self.server.services
+        url = urlparse(self.path)
+        services.count(url.path)
+
+        if url.path == "/profile":
+            self._sleep(services.linkedin_latency_ms)
+            username = parse_qs(url.query).get("username", [""])[0]
+            return self._send_json({
+                "full_name": username.replace("-", " ").title(),
+                "headline": "Software Engineer",
+                "summary": "Builds web services.",
+                "location": "Bengaluru",
+                "connections": 500,
+                "skills": [{"name": skill} for skill in SKILLS[:8]],
+                "experiences": [{"title": "Software Engineer", "company": "Acme Corp",
+                                 "description": "APIs and data pipelines", "date_range": "2019 - Present"}],
+                "education": [{"school": "IIT Madras", "degree": "B.Tech", "field_of_study": "Computer Science",
+                               "date_range": "2015 - 2019"}]
+            })
+
+        match = re.fullmatch(r"/users/([^/]+)(/repos)?", url.path)
+        if match:
+            self._sleep(services.github_latency_ms)
+            username = match.group(1)
+            if match.group(2):
+                return self._send_json([{
+                    "name": f"project-{n}",
+                    "description": "A side project",
+                    "language": SKILLS[n % len(SKILLS)],
+                    "stargazers_count": n * 3,
+                    "forks_count": n,
+                    "html_url": f"https://github.com/{username}/project-{n}"
+                } for n in range(12)])
+            return self._send_json({
+                "login": username,
+                "name": username.title(),
+                "bio": "Engineer",
+                "location": "Pune",
+                "email": None,
+                "followers": 42,
+                "following": 7,
+                "public_repos": 12,
+                "repos_url": f"{services.url}/users/{username}/repos"
+            })
+
+        self._send_json({"error": "not found"}, status=404)
+
+    def do_POST(self):
+        services = self.server.services
+        url = urlparse(self.path)
+        services.count(url.path)
+        length = int(self.headers.get("Content-Length") or 0)
+        request = json.loads(self.rfile.read(length) or b"{}")
+
+        if not url.path.endswith("/chat/completions"):
+            return self._send_json({"error": "not found"}, status=404)
+
+        self._sleep(services.llm_latency_ms)
+        prompt = request.get("messages", [{}])[-1].get("content", "")
+        content = fake_completion(prompt)
+        prompt_tokens = sum(len(message.get("content", "")) for message in request.get("messages", [])) // 4
+        completion_id = f"chatcmpl-{uuid.uuid4().hex}"
+        created = int(time.time())
+        model = request.get("model", "fake-model")
+
+        if request.get("stream"):
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Connection", "close")
+            self.end_headers()
+            for start in range(0, len(content), 24):
+                chunk = {
+                    "id": completion_id, "object": "chat.completion.chunk", "created": created, "model": model,
+                    "choices": [{"index": 0, "delta": {"content": content[start:start + 24]}, "finish_reason": None}]
+                }
+                self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+            done = {
+                "id": completion_id, "object": "chat.completion.chunk", "created": created, "model": model,
+                "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]
+            }
+            self.wfile.write(f"data: {json.dumps(done)}\n\ndata: [DONE]\n\n".encode("utf-8"))
+            self.close_connection = True
+            return
+
+        self._send_json({
+            "id": completion_id,
+            "object": "chat.completion",
+            "created": created,
+            "model": model,
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+            "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": len(content) // 4,
+                      "total_tokens": prompt_tokens + len(content) // 4}
+        })
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    # The default backlog of 5 overflows when many app threads call at once, and
+    # connections dropped from a full accept queue stall for seconds
+    request_queue_size = 128
+
+
+class FakeServices:
+    """
+    Local HTTP stand-ins for the Groq API, the LinkedIn RapidAPI and the GitHub API
+
+    One threaded server answers all three with canned data after a configurable
+    delay. environment() gives the variables that point the application at it.
+    """
+
+    def __init__(self, llm_latency_ms=None, linkedin_latency_ms=None, github_latency_ms=None, port=0):
+        self.llm_latency_ms = FAKE_LLM_LATENCY_MS if llm_latency_ms is None else llm_latency_ms
+        self.linkedin_latency_ms = FAKE_LINKEDIN_LATENCY_MS if linkedin_latency_ms is None else linkedin_latency_ms
+        self.github_latency_ms = FAKE_GITHUB_LATENCY_MS if github_latency_ms is None else github_latency_ms
+        self.port = port
+        self.requests = {}
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self._server.server_address[1]}"
+
+    def count(self, path):
+        with self._lock:
+            self.requests[path] = self.requests.get(path, 0) + 1
+
+    def start(self):
+        self._server = _Server(("127.0.0.1", self.port), _Handler)
+        self._server.services = self
+        self._thread = threading.Thread(target=self._server.serve_forever, name="fake-services", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def environment(self):
+        """Environment variables that send the application's external calls here"""
+        return services_environment(self.url)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+# Run the fake services on their own, e.g. for a load test against a separately started app:
+#   python -m benchmarks.fake_services 8100
+if __name__ == "__main__":
+    import sys
+
+    services = FakeServices(port=int(sys.argv[1]) if len(sys.argv) > 1 else 8100).start()
+    for name, value in services.environment().items():
+        print(f"export {name}={value}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        services.stop()
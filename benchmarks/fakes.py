@@ -0,0 +1,410 @@
+# benchmarks/fakes.py
+import random
+import re
+import time
+import uuid
+from collections import Counter
+
+from neo4j.time import DateTime
+
+from utils.synthetic_data import FIRST_NAMES, LAST_NAMES, SKILLS, synthetic_job_description, synthetic_resume_text
+
+CATEGORIES = ["Excellent Match", "Good Match", "Moderate Match", "Low Match"]
+
+
+def _category(score):
+    return CATEGORIES[0] if score > 0.8 else CATEGORIES[1] if score > 0.6 else CATEGORIES[2] if score > 0.4 else CATEGORIES[3]
+
+
+class SyntheticDataset:
+    """Reproducible jobs, candidates, applications and matches for the fake databases"""
+
+    def __init__(self, candidates=200, jobs=10, seed=42):
+        rng = random.Random(seed)
+        now = DateTime.now()
+
+        self.jobs = []
+        for job_id in range(1, jobs + 1):
+            title, description = synthetic_job_description(rng)
+            self.jobs.append({"id": job_id, "job title": title, "job_description": description})
+        self.jobs_by_id = {str(job["id"]): job for job in self.jobs}
+
+        self.candidates = {}
+        self.applications = []
+        for n in range(candidates):
+            candidate_id = str(uuid.UUID(int=rng.getrandbits(128)))
+            name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+            job = rng.choice(self.jobs)
+            score = round(rng.random(), 2)
+            self.candidates[candidate_id] = {
+                "id": candidate_id,
+                "name": name,
+                "email": f"candidate{n}@example.com",
+                "phone": f"+91 98{rng.randint(10000000, 99999999)}",
+                "resume_text": synthetic_resume_text(rng),
+                "skills": sorted(rng.sample(SKILLS, 8)),
+                "updated_at": str(now)
+            }
+            self.applications.append({
+                "candidate_id": candidate_id,
+                "job_id": str(job["id"]),
+                "status": rng.choice(["Applied", "Applied", "Shortlisted", "Rejected"]),
+                "date": now,
+                "score": score,
+                "category": _category(score)
+            })
+        self.candidate_ids = list(self.candidates)
+
+    def applications_for(self, job_id):
+        return [application for application in self.applications if application["job_id"] == str(job_id)]
+
+
+class FakeRecord(dict):
+    """Dict with the parts of the neo4j.Record API the application uses"""
+
+    def data(self):
+        return dict(self)
+
+    def value(self, key=0):
+        return list(self.values())[key] if isinstance(key, int) else self[key]
+
+
+class FakeSummary:
+    def __init__(self):
+        self.profile = None
+        self.plan = None
+        self.result_available_after = 0
+        self.result_consumed_after = 0
+
+
+class FakeResult:
+    def __init__(self, records):
+        self._records = [FakeRecord(record) for record in records]
+
+    def __iter__(self):
+        return iter(self._records)
+
+    def single(self, strict=False):
+        return self._records[0] if self._records else None
+
+    def peek(self):
+        return self._records[0] if self._records else None
+
+    def data(self, *keys):
+        return [record.data() for record in self._records]
+
+    def value(self, key=0, default=None):
+        return [record.value(key) for record in self._records]
+
+    def values(self, *keys):
+        return [list(record.values()) for record in self._records]
+
+    def consume(self):
+        return FakeSummary()
+
+
+class FakeSession:
+    def __init__(self, driver):
+        self.driver = driver
+
+    def run(self, query, parameters=None, **kwargs):
+        return self.driver._answer(query, {**(parameters or {}), **kwargs})
+
+    def execute_read(self, work, *args, **kwargs):
+        return work(self, *args, **kwargs)
+
+    def execute_write(self, work, *args, **kwargs):
+        return work(self, *args, **kwargs)
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+class ScriptedNeo4jDriver:
+    """
+    Stand-in for the Neo4j driver that answers the application's queries from a SyntheticDataset
+
+    Each query is matched on a fragment of its text (see RULES) and answered in
+    Python; unknown queries, including all writes except match scoring, return
+    no rows. Every query is counted in self.queries, so benchmarks can check how
+    many round trips a code path makes. latency_ms is slept once per query to
+    stand in for the network round trip.
+    """
+
+    RULES = [
+        ("CREATE (c:Candidate {", "_create_candidate"),
+        ("count(c) AS total", "_total_applicants"),
+        ("AS new_count", "_new_applications"),
+        ("AS avg_score", "_average_score"),
+        ("AS excellent", "_distribution"),
+        ("AS applicant_count", "_applicant_count"),
+        ("AS avg_match", "_job_average"),
+        ("ORDER BY a.date DESC", "_recent_applications"),
+        ("ORDER BY m.final_score DESC, c.id ASC", "_candidates_page"),
+        ("$not_evaluated AS match_category", "_unmatched_candidates"),
+        ("WHERE m IS NULL OR m.llm_score IS NULL", "_pending_candidates"),
+        ("AS jobs_updated_at", "_profile_version"),
+        ("AS profile", "_profile"),
+        ("j.description AS job_description", "_evaluation_context"),
+        ("c.resume_text AS resume_text", "_resume"),
+        ("RETURN c.name AS name, c.email AS email", "_candidate_summary"),
+        ("RETURN j.title AS title, j.job_id AS id", "_job_summary"),
+        ("split(toLower(row.resume_text)", "_score_matches"),
+    ]
+
+    def __init__(self, dataset, latency_ms=0):
+        self.dataset = dataset
+        self.latency = latency_ms / 1000
+        self.queries = Counter()
+
+    def session(self, **kwargs):
+        return FakeSession(self)
+
+    def verify_connectivity(self):
+        pass
+
+    def close(self):
+        pass
+
+    def _answer(self, query, params):
+        if self.latency:
+            time.sleep(self.latency)
+        for fragment, method in self.RULES:
+            if fragment in query:
+                self.queries[method] += 1
+                return FakeResult(getattr(self, method)(params))
+        self.queries["other"] += 1
+        return FakeResult([])
+
+    def _create_candidate(self, params):
+        return [{"candidate_id": str(uuid.uuid4())}]
+
+    def _total_applicants(self, params):
+        return [{"total": len(self.dataset.applications)}]
+
+    def _new_applications(self, params):
+        return [{"new_count": len(self.dataset.applications)}]
+
+    def _average_score(self, params):
+        scores = [application["score"] for application in self.dataset.applications]
+        return [{"avg_score": sum(scores) / len(scores) if scores else None}]
+
+    def _distribution(self, params):
+        counts = Counter(application["category"] for application in self.dataset.applications)
+        return [{"excellent": counts[CATEGORIES[0]], "good": counts[CATEGORIES[1]],
+                 "moderate": counts[CATEGORIES[2]], "low": counts[CATEGORIES[3]]}]
+
+    def _applicant_count(self, params):
+        return [{"applicant_count": len(self.dataset.applications_for(params["job_id"]))}]
+
+    def _job_average(self, params):
+        scores = [application["score"] for application in self.dataset.applications_for(params["job_id"])]
+        return [{"avg_match": sum(scores) / len(scores) if scores else None}]
+
+    def _recent_applications(self, params):
+        job_titles = {job_id: job["job title"] for job_id, job in self.dataset.jobs_by_id.items()}
+        return [{
+            "candidate_id": application["candidate_id"],
+            "name": self.dataset.candidates[application["candidate_id"]]["name"],
+            "job_title": job_titles[application["job_id"]],
+            "date": application["date"],
+            "match_score": application["score"]
+        } for application in self.dataset.applications[-5:]]
+
+    def _candidates_page(self, params):
+        rows = []
+        for application in self.dataset.applications_for(params["job_id"]):
+            if params.get("category") and application["category"] != params["category"]:
+                continue
+            if params.get("status") and application["status"] != params["status"]:
+                continue
+            after_score = params.get("after_score")
+            if after_score is not None and not (
+                application["score"] < after_score
+                or (application["score"] == after_score and application["candidate_id"] > params["after_id"])
+            ):
+                continue
+            candidate = self.dataset.candidates[application["candidate_id"]]
+            rows.append({
+                "candidate_id": candidate["id"],
+                "name": candidate["name"],
+                "email": candidate["email"],
+                "application_date": application["date"],
+                "application_status": application["status"],
+                "match_score": application["score"],
+                "match_category": application["category"]
+            })
+        rows.sort(key=lambda row: (-row["match_score"], row["candidate_id"]))
+        return rows[:params["limit"]]
+
+    def _unmatched_candidates(self, params):
+        # Every synthetic application has a score
+        return []
+
+    def _pending_candidates(self, params):
+        return [{"candidate_id": application["candidate_id"], "score": application["score"]}
+                for application in self.dataset.applications_for(params["job_id"])]
+
+    def _profile_version(self, params):
+        candidate = self.dataset.candidates.get(params["candidate_id"])
+        return [{"updated_at": candidate["updated_at"], "jobs_updated_at": None}] if candidate else []
+
+    def _profile(self, params):
+        candidate = self.dataset.candidates.get(params["candidate_id"])
+        if not candidate:
+            return []
+        applications = [a for a in self.dataset.applications if a["candidate_id"] == candidate["id"]]
+        return [{"profile": {
+            "id": candidate["id"],
+            "name": candidate["name"],
+            "email": candidate["email"],
+            "phone": candidate["phone"],
+            "linkedin_url": None,
+            "github_url": None,
+            "updated_at": candidate["updated_at"],
+            "skills": [{"name": skill, "category": "technical"} for skill in candidate["skills"]],
+            "education": [{"degree": "B.Tech", "field": "Computer Science", "start_date": "2014",
+                           "end_date": "2018", "gpa": "", "university": "IIT Madras"}],
+            "experience": [{"title": "Software Engineer", "start_date": "2018", "end_date": "",
+                            "is_current": True, "description": "", "company": "Acme Corp",
+                            "responsibilities": ["Built APIs", "Ran the on-call rota"]}],
+            "applications": [{
+                "job_id": application["job_id"],
+                "job_title": self.dataset.jobs_by_id[application["job_id"]]["job title"],
+                "application_status": application["status"],
+                "application_date": str(application["date"]),
+                "match_score": application["score"],
+                "match_category": application["category"],
+                "matched_skills": candidate["skills"][:3]
+            } for application in applications]
+        }}]
+
+    def _evaluation_context(self, params):
+        candidate = self.dataset.candidates.get(params["candidate_id"])
+        job = self.dataset.jobs_by_id.get(str(params["job_id"]))
+        if not candidate or not job:
+            return []
+        return [{
+            "name": candidate["name"],
+            "resume_hash": None,
+            "resume_text": candidate["resume_text"],
+            "skills": candidate["skills"],
+            "job_title": job["job title"],
+            "job_description": job["job_description"]
+        }]
+
+    def _resume(self, params):
+        candidate = self.dataset.candidates.get(params["candidate_id"])
+        return [{"resume_hash": None, "resume_text": candidate["resume_text"]}] if candidate else []
+
+    def _candidate_summary(self, params):
+        candidate = self.dataset.candidates.get(params["candidate_id"])
+        return [{key: candidate[key] for key in ("name", "email", "phone")}] if candidate else []
+
+    def _job_summary(self, params):
+        job = self.dataset.jobs_by_id.get(str(params["job_id"]))
+        return [{"title": job["job title"], "id": str(job["id"])}] if job else []
+
+    def _score_matches(self, params):
+        # The same keyword overlap the Cypher computes, so result sizes are realistic
+        rows = []
+        for row in params.get("rows", []):
+            job = self.dataset.jobs_by_id.get(str(row["job_id"]))
+            if not job:
+                continue
+            job_words = job["job_description"].lower().split(" ")
+            job_set = set(job_words)
+            matched = [word for word in row["resume_text"].lower().split(" ") if word in job_set]
+            score = len(matched) / len(job_words)
+            rows.append({
+                "candidate_id": row["candidate_id"],
+                "job_id": str(row["job_id"]),
+                "match_score": score,
+                "match_category": _category(score),
+                "match_count": len(matched),
+                "total_keywords": len(job_words)
+            })
+        return rows
+
+
+class FakeMySQLCursor:
+    def __init__(self, connection, dictionary=False):
+        self.connection = connection
+        self.dictionary = dictionary
+        self._rows = []
+
+    def execute(self, operation, params=None):
+        if self.connection.latency:
+            time.sleep(self.connection.latency)
+        jobs = self.connection.dataset.jobs
+        if "SHA2(" in operation:
+            rows = [{"id": job["id"], "hash": str(hash((job["job title"], job["job_description"])))} for job in jobs]
+        elif "WHERE id IN" in operation:
+            wanted = {str(job_id) for job_id in params}
+            rows = [job for job in jobs if str(job["id"]) in wanted]
+        elif "WHERE id = %s" in operation:
+            rows = [job for job in jobs if str(job["id"]) == str(params[0])]
+        elif re.search(r"SELECT id, `job title`", operation):
+            rows = [{"id": job["id"], "job title": job["job title"]} for job in jobs]
+        elif "FROM job_description" in operation:
+            rows = list(jobs)
+        else:
+            rows = []
+        self.connection.queries[operation.split(" WHERE")[0]] += 1
+        self._rows = [dict(row) if self.dictionary else tuple(row.values()) for row in rows]
+
+    def fetchall(self):
+        rows, self._rows = self._rows, []
+        return rows
+
+    def fetchone(self):
+        return self._rows.pop(0) if self._rows else None
+
+    def close(self):
+        pass
+
+
+class FakeMySQLConnection:
+    """Stand-in for a mysql.connector connection serving the job_description table from a SyntheticDataset"""
+
+    def __init__(self, dataset, latency_ms=0):
+        self.dataset = dataset
+        self.latency = latency_ms / 1000
+        self.queries = Counter()
+
+    def cursor(self, dictionary=False, **kwargs):
+        return FakeMySQLCursor(self, dictionary)
+
+    def is_connected(self):
+        return True
+
+    def ping(self, reconnect=False):
+        pass
+
+    def close(self):
+        pass
+
+
+class FakeMatchingConnectors:
+    """The connector methods agents.matching_engine.MatchingEngine calls, served from a SyntheticDataset"""
+
+    def __init__(self, dataset):
+        self.dataset = dataset
+        self.stored = 0
+
+    def get_candidate_by_id(self, candidate_id):
+        candidate = self.dataset.candidates.get(candidate_id)
+        return {"name": candidate["name"], "cv_text": candidate["resume_text"]} if candidate else None
+
+    def get_job_by_id(self, job_id):
+        job = self.dataset.jobs_by_id.get(str(job_id))
+        return {"job_title": job["job title"], "job_description": job["job_description"]} if job else None
+
+    def store_match_results(self, candidate_id, job_id, score, details):
+        self.stored += 1
@@ -0,0 +1,607 @@
+# benchmarks/load_test.py
+"""
+Load-test the app with scripted traffic mixes and find where a worker saturates
+
+    python -m benchmarks.load_test                              # mixed traffic at 1..32 users
+    python -m benchmarks.load_test --mix apply --mix browse --users 1,4,16,64 --duration 30
+    python -m benchmarks.load_test --url http://127.0.0.1:5000  # an app started separately
+
+By default one app worker (a threaded WSGI server using the fake databases) and
+the fake LLM, LinkedIn and GitHub services run in processes of their own, so the
+load driver, the app and the fakes do not share a GIL. Each step runs a fixed
+number of virtual users in a closed loop for --duration seconds and reports
+throughput and latency percentiles. The saturation point is the last step whose
+throughput still grew by LOAD_SATURATION_GAIN over the step before it.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import re
+import socket
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+import uuid
+from collections import Counter, defaultdict
+from urllib.parse import urlencode, urlparse
+
+from benchmarks.run import RESULTS_DIR, _git_commit, _percentile
+from utils.synthetic_data import synthetic_resume_pdf
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LOAD_RESULTS_DIR = os.path.join(RESULTS_DIR, "load")
+
+# Concurrent users per step, and how long each step runs in seconds
+LOAD_USERS = os.getenv("LOAD_USERS", "1,2,4,8,16,32")
+LOAD_STEP_SECONDS = float(os.getenv("LOAD_STEP_SECONDS", "20"))
+# Unrecorded single-user traffic before the first step, to warm caches and connections
+LOAD_WARMUP_SECONDS = float(os.getenv("LOAD_WARMUP_SECONDS", "5"))
+# Pause between a user's scenarios
+LOAD_THINK_TIME_MS = float(os.getenv("LOAD_THINK_TIME_MS", "0"))
+# Requests taking longer than this count as failed
+LOAD_REQUEST_TIMEOUT = float(os.getenv("LOAD_REQUEST_TIMEOUT", "60"))
+# A step is below saturation while throughput grows by at least this fraction
+LOAD_SATURATION_GAIN = float(os.getenv("LOAD_SATURATION_GAIN", "0.1"))
+# Latency target reported against: highest concurrency with p99 under it and under 1% errors
+LOAD_P99_TARGET_MS = float(os.getenv("LOAD_P99_TARGET_MS", "2000"))
+# How often the bulk evaluation scenario polls for progress
+LOAD_POLL_SECONDS = float(os.getenv("LOAD_POLL_SECONDS", "0.5"))
+
+# Scenario weights of each traffic mix
+MIXES = {
+    "apply": {"apply": 1},
+    "browse": {"browse": 1},
+    "evaluate": {"evaluate": 1},
+    "mixed": {"apply": 6, "browse": 3, "evaluate": 1}
+}
+
+# Recorded like a request, but covers a whole batch from start to finish
+BATCH_METRIC = "batch evaluate-all (end to end)"
+
+
+class HTTPResponse:
+    def __init__(self, status, headers, body):
+        self.status = status
+        self.headers = headers
+        self.body = body
+
+    @property
+    def text(self):
+        return self.body.decode("utf-8", "replace")
+
+    def json(self):
+        return json.loads(self.body)
+
+
+def _dechunk(body):
+    chunks = []
+    while body:
+        size_line, _, body = body.partition(b"\r\n")
+        size = int(size_line.split(b";")[0], 16)
+        if size == 0:
+            break
+        chunks.append(body[:size])
+        body = body[size + 2:]
+    return b"".join(chunks)
+
+
+def _multipart(fields, files):
+    """Encode form fields and (filename, content, content type) files as multipart/form-data"""
+    boundary = uuid.uuid4().hex
+    parts = []
+    for name, value in fields.items():
+        parts.append(f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'.encode("utf-8"))
+    for name, (filename, content, content_type) in files.items():
+        parts.append(f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"; filename="{filename}"\r\n'
+                     f'Content-Type: {content_type}\r\n\r\n'.encode("utf-8") + content + b"\r\n")
+    parts.append(f"--{boundary}--\r\n".encode("utf-8"))
+    return b"".join(parts), f"multipart/form-data; boundary={boundary}"
+
+
+class StepStats:
+    """Latencies and errors of one step, per endpoint; nothing is recorded after the step ends"""
+
+    def __init__(self, duration):
+        self.deadline = time.perf_counter() + duration
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(Counter)
+        self.scenarios = Counter()
+
+    @property
+    def open(self):
+        return time.perf_counter() <= self.deadline
+
+    def record(self, name, latency_ms, error=None):
+        if not self.open:
+            return
+        if error:
+            self.errors[name][error] += 1
+        else:
+            self.latencies[name].append(latency_ms)
+
+    def scenario_done(self, name):
+        if self.open:
+            self.scenarios[name] += 1
+
+
+class VirtualUser:
+    """One simulated browser: a cookie jar and raw HTTP/1.1 requests over asyncio streams"""
+
+    def __init__(self, host, port, stats, rng):
+        self.host = host
+        self.port = port
+        self.stats = stats
+        self.rng = rng
+        self.cookies = {}
+        self.logged_in = False
+        self.job_ids = []
+
+    async def _send(self, method, path, body, content_type):
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+        try:
+            head = [f"{method} {path} HTTP/1.1", f"Host: {self.host}:{self.port}", "Connection: close",
+                    f"Content-Length: {len(body)}"]
+            if content_type:
+                head.append(f"Content-Type: {content_type}")
+            if self.cookies:
+                head.append("Cookie: " + "; ".join(f"{name}={value}" for name, value in self.cookies.items()))
+            writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + body)
+            await writer.drain()
+            raw = await reader.read()
+        finally:
+            writer.close()
+
+        head, _, body = raw.partition(b"\r\n\r\n")
+        lines = head.decode("latin-1").split("\r\n")
+        status = int(lines[0].split(" ", 2)[1])
+        headers = {}
+        for line in lines[1:]:
+            name, _, value = line.partition(":")
+            name, value = name.strip().lower(), value.strip()
+            if name == "set-cookie":
+                cookie_name, _, cookie_value = value.split(";", 1)[0].partition("=")
+                if cookie_value:
+                    self.cookies[cookie_name] = cookie_value
+                else:
+                    self.cookies.pop(cookie_name, None)
+            headers[name] = value
+        if headers.get("transfer-encoding") == "chunked":
+            body = _dechunk(body)
+        return HTTPResponse(status, headers, body)
+
+    async def request(self, method, path, name, body=b"", content_type=None, ok=None):
+        """
+        Send one request and record its latency under name
+
+        Args:
+            ok: Check of the response (defaults to status below 400)
+
+        Returns:
+            HTTPResponse: The response, or None if it failed
+        """
+        started = time.perf_counter()
+        try:
+            response = await asyncio.wait_for(self._send(method, path, body, content_type), LOAD_REQUEST_TIMEOUT)
+        except asyncio.TimeoutError:
+            self.stats.record(name, None, "timeout")
+            return None
+        except (OSError, ValueError, IndexError) as e:
+            self.stats.record(name, None, type(e).__name__)
+            return None
+        latency_ms = (time.perf_counter() - started) * 1000
+
+        if not (ok(response) if ok else response.status < 400):
+            self.stats.record(name, latency_ms, f"HTTP {response.status}")
+            return None
+        self.stats.record(name, latency_ms)
+        return response
+
+    async def login(self):
+        if self.logged_in:
+            return True
+        body = urlencode({"username": os.getenv("ADMIN_USERNAME", "admin"),
+                          "password": os.getenv("ADMIN_PASSWORD", "password")}).encode("utf-8")
+        response = await self.request("POST", "/admin/login", "POST /admin/login", body,
+                                      "application/x-www-form-urlencoded",
+                                      ok=lambda r: r.status == 302 and "/admin/dashboard" in r.headers.get("location", ""))
+        self.logged_in = response is not None
+        return self.logged_in
+
+    async def dashboard(self):
+        response = await self.request("GET", "/admin/dashboard", "GET /admin/dashboard")
+        if response:
+            self.job_ids = sorted(set(re.findall(r'/admin/job/([^/"?]+)"', response.text))) or self.job_ids
+        return response
+
+
+async def scenario_apply(user):
+    """A candidate opens the form and submits it with a PDF resume and profile links"""
+    page = await user.request("GET", "/apply", "GET /apply")
+    if not page:
+        return False
+    job_ids = [job_id for job_id in re.findall(r'<option value="([^"]+)"', page.text) if job_id]
+    if not job_ids:
+        return False
+
+    n = user.rng.randrange(1_000_000)
+    # A fresh resume each time, so the LLM response cache does not answer the extraction
+    resume = synthetic_resume_pdf(user.rng, pages=user.rng.randint(1, 3))
+    body, content_type = _multipart({
+        "name": f"Load Candidate {n}",
+        "email": f"load{n}@example.com",
+        "phone": "",
+        "job_id": user.rng.choice(job_ids),
+        "linkedin_url": f"https://www.linkedin.com/in/load-candidate-{n}",
+        "github_url": f"https://github.com/load-candidate-{n}"
+    }, {"resume": ("resume.pdf", resume, "application/pdf")})
+    # Success redirects home; errors redirect back to the form
+    response = await user.request("POST", "/apply", "POST /apply", body, content_type,
+                                  ok=lambda r: r.status == 302 and urlparse(r.headers.get("location", "")).path == "/")
+    return response is not None
+
+
+async def scenario_browse(user):
+    """An admin opens the dashboard, a job's candidate list and a couple of candidates"""
+    if not await user.login() or not await user.dashboard() or not user.job_ids:
+        return False
+    job_id = user.rng.choice(user.job_ids)
+    page = await user.request("GET", f"/admin/job/{job_id}", "GET /admin/job/<id>")
+    if not page:
+        return False
+
+    candidate_ids = sorted(set(re.findall(r'/admin/candidate/([^/"?]+)[?"]', page.text)))
+    for candidate_id in user.rng.sample(candidate_ids, min(2, len(candidate_ids))):
+        if not await user.request("GET", f"/admin/candidate/{candidate_id}", "GET /admin/candidate/<id>"):
+            return False
+        if not await user.request("GET", f"/admin/candidate/{candidate_id}/resume", "GET /admin/candidate/<id>/resume"):
+            return False
+    return True
+
+
+async def scenario_evaluate(user):
+    """An admin evaluates all of a job's pending applicants and watches the progress bar"""
+    if not await user.login():
+        return False
+    if not user.job_ids and not await user.dashboard():
+        return False
+    if not user.job_ids:
+        return False
+    job_id = user.rng.choice(user.job_ids)
+
+    started = time.perf_counter()
+    if not await user.request("POST", f"/admin/job/{job_id}/evaluate-all", "POST /admin/job/<id>/evaluate-all"):
+        return False
+    while user.stats.open:
+        await asyncio.sleep(LOAD_POLL_SECONDS)
+        progress = await user.request("GET", f"/admin/job/{job_id}/evaluate-all/progress",
+                                      "GET /admin/job/<id>/evaluate-all/progress")
+        if not progress:
+            return False
+        if progress.json().get("status") != "running":
+            break
+    else:
+        return False
+    user.stats.record(BATCH_METRIC, (time.perf_counter() - started) * 1000)
+    return True
+
+
+SCENARIOS = {
+    "apply": scenario_apply,
+    "browse": scenario_browse,
+    "evaluate": scenario_evaluate
+}
+
+
+async def _user_loop(user, weights, think_time_ms):
+    names = list(weights)
+    # Checked as well as cancelled: wait_for can swallow a cancellation that races a finished request
+    while user.stats.open:
+        name = user.rng.choices(names, [weights[n] for n in names])[0]
+        if await SCENARIOS[name](user):
+            user.stats.scenario_done(name)
+        if think_time_ms:
+            await asyncio.sleep(think_time_ms / 1000)
+        else:
+            # Let other users run even when every request fails instantly
+            await asyncio.sleep(0)
+
+
+async def run_step(host, port, users, weights, duration, think_time_ms, seed):
+    """
+    Run a number of users against the app for a while
+
+    Returns:
+        StepStats: What was recorded while the step ran
+    """
+    stats = StepStats(duration)
+    tasks = [
+        asyncio.create_task(_user_loop(VirtualUser(host, port, stats, random.Random(seed * 1000 + n)),
+                                       weights, think_time_ms))
+        for n in range(users)
+    ]
+    await asyncio.sleep(duration)
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    return stats
+
+
+def _latency_summary(latencies):
+    latencies = sorted(latencies)
+    if not latencies:
+        return {"p50_ms": None, "p90_ms": None, "p99_ms": None, "max_ms": None}
+    return {
+        "p50_ms": round(_percentile(latencies, 0.50), 1),
+        "p90_ms": round(_percentile(latencies, 0.90), 1),
+        "p99_ms": round(_percentile(latencies, 0.99), 1),
+        "max_ms": round(latencies[-1], 1)
+    }
+
+
+def summarize(stats, users, duration):
+    """
+    Throughput and latency percentiles of a step
+
+    Returns:
+        dict: Totals over all requests plus a breakdown per endpoint and scenario
+    """
+    endpoints = {}
+    for name in sorted(set(stats.latencies) | set(stats.errors)):
+        endpoints[name] = {
+            "ok": len(stats.latencies[name]),
+            "errors": dict(stats.errors[name]),
+            "throughput_rps": round(len(stats.latencies[name]) / duration, 2),
+            **_latency_summary(stats.latencies[name])
+        }
+
+    requests = [latency for name, values in stats.latencies.items() if name != BATCH_METRIC for latency in values]
+    errors = sum(sum(counts.values()) for name, counts in stats.errors.items() if name != BATCH_METRIC)
+    total = len(requests) + errors
+    return {
+        "users": users,
+        "requests": total,
+        "errors": errors,
+        "error_rate": round(errors / total, 4) if total else 0.0,
+        "throughput_rps": round(len(requests) / duration, 2),
+        "scenarios_per_s": {name: round(count / duration, 3) for name, count in stats.scenarios.items()},
+        **_latency_summary(requests),
+        "endpoints": endpoints
+    }
+
+
+def saturation_point(steps, gain=None):
+    """
+    The step after which adding users stopped adding throughput
+
+    Args:
+        steps: Step summaries in order of increasing users
+        gain: Smallest throughput growth that counts as scaling (defaults to LOAD_SATURATION_GAIN)
+
+    Returns:
+        dict: The saturating step, or None if throughput still grew at the last step
+    """
+    gain = LOAD_SATURATION_GAIN if gain is None else gain
+    for previous, step in zip(steps, steps[1:]):
+        if step["throughput_rps"] < previous["throughput_rps"] * (1 + gain):
+            return previous
+    return None
+
+
+def within_target(steps, p99_target_ms=None):
+    """The highest-concurrency step with p99 under the target and under 1% errors, or None"""
+    p99_target_ms = LOAD_P99_TARGET_MS if p99_target_ms is None else p99_target_ms
+    passing = [step for step in steps
+               if step["p99_ms"] is not None and step["p99_ms"] <= p99_target_ms and step["error_rate"] < 0.01]
+    return passing[-1] if passing else None
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _wait_until_ready(url, process, timeout=120):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"{' '.join(process.args)} exited with status {process.returncode}")
+        try:
+            with urllib.request.urlopen(url, timeout=5) as response:
+                if response.status < 500:
+                    return
+        except urllib.error.HTTPError as e:
+            if e.code < 500:
+                return
+        except OSError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"{url} was not ready after {timeout} seconds")
+
+
+class LocalTarget:
+    """
+    One app worker and the fake services, each in its own process
+
+    The worker is a threaded WSGI server whose resources use the fake
+    databases (see serve()); its external calls go to benchmarks.fake_services.
+    """
+
+    def __init__(self):
+        self.processes = []
+        self.url = None
+
+    def __enter__(self):
+        services_url = f"http://127.0.0.1:{_free_port()}"
+        services = subprocess.Popen([sys.executable, "-m", "benchmarks.fake_services", str(urlparse(services_url).port)],
+                                    cwd=ROOT, stdout=subprocess.DEVNULL)
+        self.processes.append(services)
+        _wait_until_ready(f"{services_url}/users/ready", services)
+
+        self.url = f"http://127.0.0.1:{_free_port()}"
+        worker = subprocess.Popen([sys.executable, "-m", "benchmarks.load_test", "--serve", str(urlparse(self.url).port),
+                                   "--services-url", services_url], cwd=ROOT)
+        self.processes.append(worker)
+        _wait_until_ready(f"{self.url}/healthz", worker)
+        return self
+
+    def __exit__(self, *exc_info):
+        for process in reversed(self.processes):
+            process.terminate()
+        for process in self.processes:
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+
+
+def serve(port, services_url):
+    """Serve the app on port with the fake databases, sending external calls to services_url"""
+    from werkzeug.serving import make_server
+
+    from benchmarks.suite import BenchmarkEnvironment
+
+    # One access log line per request would cost the worker more than some of the requests
+    logging.getLogger("werkzeug").setLevel(logging.WARNING)
+    env = BenchmarkEnvironment(services_url=services_url)
+    # Relative paths, like the Groq response cache's, resolve to the scratch directory
+    os.chdir(env.tmp)
+    server = make_server("127.0.0.1", port, env.app(), threaded=True)
+    try:
+        server.serve_forever()
+    finally:
+        env.close()
+
+
+async def load_test(url, weights, users_per_step, duration, warmup, think_time_ms):
+    """
+    Run the steps of one traffic mix against the app at url
+
+    Returns:
+        list: Step summaries
+    """
+    target = urlparse(url)
+    host, port = target.hostname, target.port or 80
+
+    if warmup:
+        await run_step(host, port, 1, weights, warmup, think_time_ms, seed=0)
+
+    steps = []
+    for users in users_per_step:
+        stats = await run_step(host, port, users, weights, duration, think_time_ms, seed=users)
+        step = summarize(stats, users, duration)
+        steps.append(step)
+        print(_format_step(step), flush=True)
+    return steps
+
+
+def _ms(value):
+    return f"{value:9.1f}" if value is not None else f"{'-':>9}"
+
+
+def _format_step(step):
+    return (f"{step['users']:6d} {step['throughput_rps']:9.2f} {step['error_rate']:8.2%} "
+            f"{_ms(step['p50_ms'])} {_ms(step['p90_ms'])} {_ms(step['p99_ms'])}   "
+            + ", ".join(f"{name} {rate}/s" for name, rate in sorted(step["scenarios_per_s"].items())))
+
+
+def _format_endpoints(step):
+    lines = [f"    {'endpoint':<46} {'req/s':>8} {'errors':>7} {'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9}"]
+    for name, endpoint in step["endpoints"].items():
+        lines.append(f"    {name:<46} {endpoint['throughput_rps']:8.2f} {sum(endpoint['errors'].values()):7d} "
+                     f"{_ms(endpoint['p50_ms'])} {_ms(endpoint['p90_ms'])} {_ms(endpoint['p99_ms'])}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--mix", action="append", choices=sorted(MIXES),
+                        help="Traffic mix to run; repeat for several (default: mixed)")
+    parser.add_argument("--users", default=LOAD_USERS, help="Comma-separated concurrent users per step")
+    parser.add_argument("--duration", type=float, default=LOAD_STEP_SECONDS, help="Seconds per step")
+    parser.add_argument("--warmup", type=float, default=LOAD_WARMUP_SECONDS, help="Unrecorded seconds before the steps")
+    parser.add_argument("--think-time", type=float, default=LOAD_THINK_TIME_MS, help="Milliseconds between scenarios")
+    parser.add_argument("--url", help="Test an app that is already running instead of starting one with fakes")
+    parser.add_argument("--no-save", action="store_true", help="Do not write the results file")
+    parser.add_argument("--serve", type=int, metavar="PORT", help=argparse.SUPPRESS)
+    parser.add_argument("--services-url", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.serve:
+        serve(args.serve, args.services_url)
+        return 0
+
+    from benchmarks.fake_services import FAKE_GITHUB_LATENCY_MS, FAKE_LINKEDIN_LATENCY_MS, FAKE_LLM_LATENCY_MS
+    from benchmarks.suite import BENCHMARK_CANDIDATES, BENCHMARK_JOBS, FAKE_DB_LATENCY_MS
+
+    users_per_step = [int(users) for users in args.users.split(",") if users.strip()]
+    runs = {}
+    for mix in args.mix or ["mixed"]:
+        weights = MIXES[mix]
+        print(f"\nmix {mix!r} ({', '.join(f'{name} {weight}' for name, weight in weights.items())}) "
+              f"{'against ' + args.url if args.url else 'against one local worker'}")
+        print(f"{'users':>6} {'req/s':>9} {'errors':>8} {'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9}   scenarios")
+
+        run_args = (weights, users_per_step, args.duration, args.warmup, args.think_time)
+        if args.url:
+            steps = asyncio.run(load_test(args.url, *run_args))
+        else:
+            with LocalTarget() as target:
+                steps = asyncio.run(load_test(target.url, *run_args))
+
+        saturated = saturation_point(steps)
+        passing = within_target(steps)
+        if saturated:
+            print(f"Saturation at {saturated['users']} users: {saturated['throughput_rps']} req/s, "
+                  f"p99 {saturated['p99_ms']} ms")
+        else:
+            print(f"No saturation up to {users_per_step[-1]} users; throughput was still growing")
+        if passing:
+            print(f"p99 within {LOAD_P99_TARGET_MS:.0f} ms up to {passing['users']} users")
+        else:
+            print(f"p99 above {LOAD_P99_TARGET_MS:.0f} ms (or errors above 1%) at every step")
+        print(_format_endpoints(saturated or steps[-1]))
+
+        runs[mix] = {
+            "weights": weights,
+            "steps": steps,
+            "saturation_users": saturated["users"] if saturated else None,
+            "max_users_within_target": passing["users"] if passing else None
+        }
+
+    if not args.no_save:
+        commit = _git_commit()
+        os.makedirs(LOAD_RESULTS_DIR, exist_ok=True)
+        path = os.path.join(LOAD_RESULTS_DIR, f"{time.strftime('%Y%m%d-%H%M%S')}-{commit or 'unknown'}.json")
+        with open(path, "w") as f:
+            json.dump({
+                "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "commit": commit,
+                "target": args.url or "local worker with fakes",
+                "machine": f"{sys.platform} ({os.cpu_count()} CPUs)",
+                "config": {
+                    "users": users_per_step,
+                    "step_seconds": args.duration,
+                    "think_time_ms": args.think_time,
+                    "p99_target_ms": LOAD_P99_TARGET_MS,
+                    "saturation_gain": LOAD_SATURATION_GAIN,
+                    "candidates": BENCHMARK_CANDIDATES,
+                    "jobs": BENCHMARK_JOBS,
+                    "db_latency_ms": FAKE_DB_LATENCY_MS,
+                    "llm_latency_ms": FAKE_LLM_LATENCY_MS,
+                    "linkedin_latency_ms": FAKE_LINKEDIN_LATENCY_MS,
+                    "github_latency_ms": FAKE_GITHUB_LATENCY_MS
+                },
+                "runs": runs
+            }, f, indent=2)
+        print(f"\nSaved {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
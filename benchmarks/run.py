@@ -0,0 +1,178 @@
+# benchmarks/run.py
+"""
+Run the benchmark suite against local fakes and compare with the previous run
+
+    python -m benchmarks.run                  # everything, saved to benchmarks/results/
+    python -m benchmarks.run -k routes        # only benchmarks whose name contains "routes"
+    python -m benchmarks.run --baseline benchmarks/results/<file>.json --fail-on-regression
+
+Nothing external is contacted: the LLM, LinkedIn and GitHub are served by
+benchmarks.fake_services and the databases by benchmarks.fakes.
+"""
+import argparse
+import glob
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+# Keep benchmark runs from touching real services or the working tree
+os.environ.setdefault("GROQ_API_KEY", "fake")
+os.environ.setdefault("JOB_SYNC_INTERVAL", "0")
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+os.environ.setdefault("SLOW_QUERY_MS", "100000")
+os.environ.setdefault("TRACE_EXPORT_PATH", "")
+os.environ.setdefault("RESUME_STORE_PATH", os.path.join(os.getenv("TMPDIR", "/tmp"), "benchmark-resumes"))
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+# A benchmark regresses when its median is this much slower than the baseline...
+BENCHMARK_REGRESSION_THRESHOLD = float(os.getenv("BENCHMARK_REGRESSION_THRESHOLD", "0.2"))
+# ...and the difference is larger than timer noise
+BENCHMARK_NOISE_MS = float(os.getenv("BENCHMARK_NOISE_MS", "0.05"))
+
+
+def _percentile(sorted_values, fraction):
+    return sorted_values[min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))]
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(RESULTS_DIR)).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def run_benchmark(env, setup, repeat):
+    """
+    Time one benchmark
+
+    Returns:
+        dict: Timing statistics in milliseconds and Neo4j queries per call
+    """
+    operation = setup(env)
+    operation()  # warm up caches and connections
+
+    queries_before = sum(env.fake_driver.queries.values())
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        operation()
+        timings.append((time.perf_counter() - started) * 1000)
+    queries = sum(env.fake_driver.queries.values()) - queries_before
+
+    timings.sort()
+    return {
+        "repeat": repeat,
+        "median_ms": round(statistics.median(timings), 4),
+        "mean_ms": round(statistics.fmean(timings), 4),
+        "min_ms": round(timings[0], 4),
+        "p95_ms": round(_percentile(timings, 0.95), 4),
+        "stdev_ms": round(statistics.stdev(timings), 4) if len(timings) > 1 else 0.0,
+        "neo4j_queries_per_call": round(queries / repeat, 2)
+    }
+
+
+def latest_result(exclude=None):
+    """Path of the most recent saved run, or None"""
+    paths = sorted(path for path in glob.glob(os.path.join(RESULTS_DIR, "*.json")) if path != exclude)
+    return paths[-1] if paths else None
+
+
+def compare(results, baseline):
+    """
+    Find benchmarks that got slower or make more queries than in the baseline
+
+    Returns:
+        list: (name, message) for each regression
+    """
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if not previous:
+            continue
+        slower = current["median_ms"] - previous["median_ms"]
+        if slower > BENCHMARK_NOISE_MS and current["median_ms"] > previous["median_ms"] * (1 + BENCHMARK_REGRESSION_THRESHOLD):
+            regressions.append((name, f"median {previous['median_ms']:.3f} -> {current['median_ms']:.3f} ms "
+                                      f"({current['median_ms'] / previous['median_ms'] - 1:+.0%})"))
+        # Query counts are deterministic, so any increase is a real change
+        if current["neo4j_queries_per_call"] > previous.get("neo4j_queries_per_call", current["neo4j_queries_per_call"]):
+            regressions.append((name, f"Neo4j queries per call {previous['neo4j_queries_per_call']} -> "
+                                      f"{current['neo4j_queries_per_call']}"))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("-k", "--filter", default="", help="Only run benchmarks whose name contains this")
+    parser.add_argument("--repeat", type=int, help="Timed calls per benchmark (overrides each benchmark's default)")
+    parser.add_argument("--baseline", help="Results file to compare with (defaults to the previous run)")
+    parser.add_argument("--no-save", action="store_true", help="Do not write the results file")
+    parser.add_argument("--fail-on-regression", action="store_true", help="Exit with status 1 on regressions")
+    args = parser.parse_args(argv)
+
+    from benchmarks.fake_services import FAKE_GITHUB_LATENCY_MS, FAKE_LINKEDIN_LATENCY_MS, FAKE_LLM_LATENCY_MS
+    from benchmarks.suite import (BENCHMARK_CANDIDATES, BENCHMARK_JOBS, BENCHMARKS, FAKE_DB_LATENCY_MS,
+                                  BenchmarkEnvironment)
+
+    selected = {name: entry for name, entry in BENCHMARKS.items() if args.filter in name}
+    if not selected:
+        raise SystemExit(f"No benchmark matches {args.filter!r}; available: {', '.join(BENCHMARKS)}")
+
+    env = BenchmarkEnvironment()
+    results = {}
+    try:
+        for name, (setup, repeat) in selected.items():
+            result = run_benchmark(env, setup, args.repeat or repeat)
+            results[name] = result
+            print(f"{name:<45} median {result['median_ms']:10.3f} ms   p95 {result['p95_ms']:10.3f} ms   "
+                  f"{result['neo4j_queries_per_call']:6.1f} queries/call   (n={result['repeat']})")
+    finally:
+        env.close()
+
+    run = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "machine": f"{platform.system()} {platform.machine()} ({os.cpu_count()} CPUs)",
+        "config": {
+            "candidates": BENCHMARK_CANDIDATES,
+            "jobs": BENCHMARK_JOBS,
+            "db_latency_ms": FAKE_DB_LATENCY_MS,
+            "llm_latency_ms": FAKE_LLM_LATENCY_MS,
+            "linkedin_latency_ms": FAKE_LINKEDIN_LATENCY_MS,
+            "github_latency_ms": FAKE_GITHUB_LATENCY_MS
+        },
+        "results": results
+    }
+
+    saved = None
+    if not args.no_save:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        saved = os.path.join(RESULTS_DIR, f"{time.strftime('%Y%m%d-%H%M%S')}-{run['commit'] or 'unknown'}.json")
+        with open(saved, "w") as f:
+            json.dump(run, f, indent=2)
+        print(f"\nSaved {saved}")
+
+    baseline_path = args.baseline or latest_result(exclude=saved)
+    if not baseline_path:
+        return 0
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    if baseline.get("config") != run["config"]:
+        print(f"Baseline {baseline_path} used a different configuration; timings may not be comparable")
+
+    regressions = compare(results, baseline["results"])
+    print(f"\nCompared with {os.path.basename(baseline_path)} (commit {baseline.get('commit')}): "
+          f"{len(regressions)} regression(s)")
+    for name, message in regressions:
+        print(f"  REGRESSION {name}: {message}")
+    return 1 if regressions and args.fail_on_regression else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
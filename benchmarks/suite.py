@@ -0,0 +1,269 @@
+# benchmarks/suite.py
+import io
+import itertools
+import os
+import shutil
+import tempfile
+
+from benchmarks.fake_services import FakeServices, services_environment
+from benchmarks.fakes import (FakeMatchingConnectors, FakeMySQLConnection, ScriptedNeo4jDriver,
+                              SyntheticDataset)
+
+# Size of the synthetic dataset and simulated database round trip
+BENCHMARK_CANDIDATES = int(os.getenv("BENCHMARK_CANDIDATES", "500"))
+BENCHMARK_JOBS = int(os.getenv("BENCHMARK_JOBS", "10"))
+FAKE_DB_LATENCY_MS = float(os.getenv("FAKE_DB_LATENCY_MS", "0"))
+
+# name -> (setup function, default repeat)
+BENCHMARKS = {}
+
+
+def benchmark(name, repeat=20):
+    """
+    Register a benchmark
+
+    The decorated function receives the BenchmarkEnvironment, does any setup
+    and returns a callable that performs one operation; only that call is timed.
+    """
+    def register(setup):
+        BENCHMARKS[name] = (setup, repeat)
+        return setup
+    return register
+
+
+class BenchmarkEnvironment:
+    """Fake services, fake databases and a Flask test client shared by all benchmarks"""
+
+    def __init__(self, services_url=None):
+        """
+        Args:
+            services_url: Fake services already running elsewhere (e.g. in their own
+                process); by default they are started in a thread here
+        """
+        self.tmp = tempfile.mkdtemp(prefix="benchmarks-")
+        self.services = None
+        if services_url is None:
+            self.services = FakeServices().start()
+            services_url = self.services.url
+        os.environ.update(services_environment(services_url))
+
+        import utils.api_clients as api_clients
+        from utils.llm_clients import reset_clients
+
+        api_clients.LINKEDIN_API_URL = services_url
+        api_clients.GITHUB_API_URL = services_url
+        # Rebuild the shared Groq client against the fake server
+        reset_clients()
+
+        from db.db_integration import MySQLConnection, Neo4jConnection
+        from db.instrumentation import instrument_mysql, instrument_neo4j
+        from utils.synthetic_data import synthetic_resume_corpus
+
+        self.dataset = SyntheticDataset(candidates=BENCHMARK_CANDIDATES, jobs=BENCHMARK_JOBS)
+        self.fake_driver = ScriptedNeo4jDriver(self.dataset, latency_ms=FAKE_DB_LATENCY_MS)
+        self.fake_mysql = FakeMySQLConnection(self.dataset, latency_ms=FAKE_DB_LATENCY_MS)
+
+        # The real connection classes around the fakes, instrumented like in production
+        self.neo4j_conn = Neo4jConnection()
+        self.neo4j_conn.driver = instrument_neo4j(self.fake_driver)
+        self.mysql_conn = MySQLConnection()
+        self.mysql_conn.connection = instrument_mysql(self.fake_mysql)
+
+        self.pdfs = synthetic_resume_corpus(20)
+        self._app = None
+        self._client = None
+
+    @property
+    def driver(self):
+        return self.neo4j_conn.driver
+
+    def app(self):
+        """The Flask application, with its resources using the fake databases"""
+        from app import create_app
+
+        if self._app is None:
+            self._app = create_app()
+        flask_app = self._app
+        resources = flask_app.extensions["resources"]
+        resources._resources["neo4j_conn"] = self.neo4j_conn
+        resources._resources["mysql_conn"] = self.mysql_conn
+        return flask_app
+
+    def client(self):
+        """Logged-in Flask test client whose resources use the fake databases"""
+        if self._client is None:
+            self._client = self.app().test_client()
+            with self._client.session_transaction() as session:
+                session["admin_logged_in"] = True
+        return self._client
+
+    def groq_handler(self):
+        """GroqLimitHandler with a private cache directory"""
+        from agents.groq_handler import GroqLimitHandler
+        from utils.llm_clients import get_groq_client
+
+        return GroqLimitHandler(get_groq_client(), cache_dir=os.path.join(self.tmp, "groq"))
+
+    def close(self):
+        if self.services is not None:
+            self.services.stop()
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+
+def _cycle(items):
+    return itertools.cycle(items).__next__
+
+
+@benchmark("pdf.extract_text_from_pdf")
+def bench_extract_text_from_pdf(env):
+    from utils.pdf_parser import extract_text_from_pdf
+
+    next_pdf = _cycle(env.pdfs)
+    return lambda: extract_text_from_pdf(io.BytesIO(next_pdf()))
+
+
+@benchmark("pdf.extract_structured_info", repeat=200)
+def bench_extract_structured_info(env):
+    from utils.pdf_parser import extract_structured_info
+
+    next_resume = _cycle([candidate["resume_text"] for candidate in env.dataset.candidates.values()])
+    return lambda: extract_structured_info(next_resume())
+
+
+@benchmark("llm.extract_structured_info_with_llm", repeat=5)
+def bench_extract_structured_info_with_llm(env):
+    from utils.llm_clients import get_groq_client
+    from utils.pdf_parser import extract_structured_info_with_llm
+
+    next_resume = _cycle([candidate["resume_text"] for candidate in env.dataset.candidates.values()])
+    return lambda: extract_structured_info_with_llm(next_resume(), get_groq_client())
+
+
+@benchmark("db.store_candidate", repeat=5)
+def bench_store_candidate(env):
+    from db.db_integration import CandidateManager
+
+    manager = CandidateManager(env.driver)
+    next_resume = _cycle([candidate["resume_text"] for candidate in env.dataset.candidates.values()])
+    form_data = {"name": "Bench Candidate", "email": "bench@example.com", "phone": "", "job_id": "1"}
+    return lambda: manager.store_candidate(form_data, next_resume())
+
+
+@benchmark("matching.store_matches[200]")
+def bench_store_matches(env):
+    from db.db_integration import MatchingEngine
+
+    engine = MatchingEngine(env.driver)
+    rows = [{"candidate_id": a["candidate_id"], "job_id": a["job_id"],
+             "resume_text": env.dataset.candidates[a["candidate_id"]]["resume_text"]}
+            for a in env.dataset.applications[:200]]
+    return lambda: engine.store_matches(rows)
+
+
+@benchmark("matching.match_candidate_to_job", repeat=200)
+def bench_match_candidate_to_job(env):
+    from db.db_integration import MatchingEngine
+
+    engine = MatchingEngine(env.driver)
+    next_application = _cycle(env.dataset.applications)
+
+    def run():
+        application = next_application()
+        resume_text = env.dataset.candidates[application["candidate_id"]]["resume_text"]
+        return engine.match_candidate_to_job(application["candidate_id"], application["job_id"], resume_text)
+    return run
+
+
+@benchmark("matching.agents_match_candidate_to_job", repeat=5)
+def bench_agents_match_candidate_to_job(env):
+    from agents.matching_engine import MatchingEngine
+
+    connectors = FakeMatchingConnectors(env.dataset)
+    handler = env.groq_handler()
+    engine = MatchingEngine(connectors, connectors, handler.generate_completion,
+                            cache_dir=os.path.join(env.tmp, "matches"))
+    next_application = _cycle(env.dataset.applications)
+
+    def run():
+        # Measure the uncached path: both LLM analyses and the scoring
+        handler.in_memory_cache.clear()
+        application = next_application()
+        return engine.match_candidate_to_job(application["candidate_id"], application["job_id"], use_cache=False)
+    return run
+
+
+@benchmark("matching.llm_evaluate_candidate_for_job", repeat=5)
+def bench_llm_evaluate(env):
+    from utils.llm_matching import LLMMatchingEngine
+
+    handler = env.groq_handler()
+    engine = LLMMatchingEngine(env.driver, groq_handler=handler)
+    next_application = _cycle(env.dataset.applications)
+
+    def run():
+        handler.in_memory_cache.clear()
+        application = next_application()
+        return engine.evaluate_candidate_for_job(application["candidate_id"], application["job_id"])
+    return run
+
+
+@benchmark("routes.admin_dashboard")
+def bench_dashboard(env):
+    client = env.client()
+    return lambda: client.get("/admin/dashboard")
+
+
+@benchmark("routes.admin_job_candidates", repeat=50)
+def bench_job_candidates(env):
+    client = env.client()
+    next_job = _cycle(env.dataset.jobs)
+    return lambda: client.get(f"/admin/job/{next_job()['id']}")
+
+
+@benchmark("routes.admin_candidate_details[uncached]", repeat=50)
+def bench_candidate_details(env):
+    from app import candidate_page_cache
+
+    client = env.client()
+    next_candidate = _cycle(env.dataset.candidate_ids)
+
+    def run():
+        candidate_page_cache.clear()
+        return client.get(f"/admin/candidate/{next_candidate()}")
+    return run
+
+
+@benchmark("routes.admin_candidate_details[cached]", repeat=200)
+def bench_candidate_details_cached(env):
+    client = env.client()
+    candidate_id = env.dataset.candidate_ids[0]
+    client.get(f"/admin/candidate/{candidate_id}")
+    return lambda: client.get(f"/admin/candidate/{candidate_id}")
+
+
+@benchmark("routes.admin_candidate_resume", repeat=200)
+def bench_candidate_resume(env):
+    client = env.client()
+    next_candidate = _cycle(env.dataset.candidate_ids)
+    return lambda: client.get(f"/admin/candidate/{next_candidate()}/resume")
+
+
+@benchmark("routes.apply", repeat=5)
+def bench_apply(env):
+    client = env.client()
+    next_pdf = _cycle(env.pdfs)
+
+    def run():
+        response = client.post("/apply", data={
+            "name": "Bench Candidate",
+            "email": "bench@example.com",
+            "phone": "",
+            "job_id": "1",
+            "linkedin_url": "https://www.linkedin.com/in/bench-candidate",
+            "github_url": "https://github.com/bench-candidate",
+            "resume": (io.BytesIO(next_pdf()), "resume.pdf")
+        }, content_type="multipart/form-data")
+        if response.status_code != 302:
+            raise RuntimeError(f"/apply answered {response.status_code}")
+        return response
+    return run
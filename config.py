@@ -9,6 +9,9 @@ MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16 MB max file size for uploads
 UPLOAD_FOLDER = os.path.join(os.getcwd(), 'uploads')
 ALLOWED_EXTENSIONS = {'pdf'}
 
+# Applicants shown per page on the job candidates listing
+CANDIDATES_PER_PAGE = int(os.getenv('CANDIDATES_PER_PAGE', '50'))
+
 # Session configuration
 PERMANENT_SESSION_LIFETIME = timedelta(hours=2)
 
@@ -1,12 +1,30 @@
 # db_integration.py
+import logging
 import os
 import mysql.connector
 from neo4j import GraphDatabase
 from dotenv import load_dotenv
 
+from db.instrumentation import instrument_mysql, instrument_neo4j
+from db.schema import SchemaManager
+from db.write_buffer import WRITE_BUFFER_SIZE, WriteBehindBuffer
+from utils.blob_store import get_blob_store
+from utils.pdf_parser import extract_structured_info_with_llm
+from utils.llm_clients import get_llm_router
+from utils.skill_taxonomy import get_skill_taxonomy
+from utils.tracing import span
+
 # Load environment variables from .env file
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
+# Category shown for applicants whose match has not been scored yet
+NOT_EVALUATED = "Not Evaluated"
+
+# Cursor score for pages past the scored applicants (real scores are never negative)
+UNMATCHED_CURSOR_SCORE = -1.0
+
 class MySQLConnection:
     def __init__(self):
         """Initialize MySQL connection using environment variables or default values"""
@@ -15,27 +33,32 @@ class MySQLConnection:
         self.password = os.getenv("MYSQL_PASSWORD", "")
         self.database = os.getenv("MYSQL_DATABASE", "job")
         self.connection = None
+        # Why the last connect() failed, for health checks
+        self.last_error = None
     
     def connect(self):
         """Establish connection to MySQL database"""
         try:
-            self.connection = mysql.connector.connect(
+            # Cursors record each statement in the query metrics
+            self.connection = instrument_mysql(mysql.connector.connect(
                 host=self.host,
                 user=self.user,
                 password=self.password,
                 database=self.database
-            )
-            print("MySQL connection established successfully")
+            ))
+            logger.info("MySQL connection established successfully")
+            self.last_error = None
             return self.connection
         except mysql.connector.Error as err:
-            print(f"Error connecting to MySQL database: {err}")
+            logger.error("Error connecting to MySQL database: %s", err)
+            self.last_error = err
             return None
     
     def close(self):
         """Close the MySQL connection"""
         if self.connection and self.connection.is_connected():
             self.connection.close()
-            print("MySQL connection closed")
+            logger.info("MySQL connection closed")
     
     def get_all_jobs(self):
         """Retrieve all jobs from the job_description table"""
@@ -72,6 +95,48 @@ class MySQLConnection:
         job_titles = cursor.fetchall()
         cursor.close()
         return job_titles
+    
+    def get_job_hashes(self):
+        """
+        Retrieve a content hash for every job, computed by MySQL
+        
+        Returns:
+            dict: Job ID (str) -> SHA-256 of the job's title and description
+        """
+        if not self.connection or not self.connection.is_connected():
+            self.connect()
+        
+        cursor = self.connection.cursor()
+        query = "SELECT id, SHA2(CONCAT_WS(CHAR(31), `job title`, job_description), 256) FROM job_description"
+        cursor.execute(query)
+        hashes = {str(job_id): content_hash for job_id, content_hash in cursor.fetchall()}
+        cursor.close()
+        return hashes
+    
+    def get_jobs_by_ids(self, job_ids, batch_size=1000):
+        """
+        Retrieve several jobs by ID
+        
+        Args:
+            job_ids: Job IDs
+            batch_size: Maximum IDs per query
+            
+        Returns:
+            list: Job rows
+        """
+        if not self.connection or not self.connection.is_connected():
+            self.connect()
+        
+        job_ids = list(job_ids)
+        jobs = []
+        cursor = self.connection.cursor(dictionary=True)
+        for start in range(0, len(job_ids), batch_size):
+            batch = job_ids[start:start + batch_size]
+            placeholders = ", ".join(["%s"] * len(batch))
+            cursor.execute(f"SELECT * FROM job_description WHERE id IN ({placeholders})", batch)
+            jobs.extend(cursor.fetchall())
+        cursor.close()
+        return jobs
 
 class Neo4jConnection:
     def __init__(self):
@@ -84,92 +149,239 @@ class Neo4jConnection:
     def connect(self):
         """Establish connection to Neo4j database"""
         try:
-            self.driver = GraphDatabase.driver(self.uri, auth=(self.user, self.password))
-            # Test connection
-            with self.driver.session() as session:
-                result = session.run("MATCH (n) RETURN count(n) AS count")
-                count = result.single()["count"]
-                print(f"Neo4j connection established successfully. Database contains {count} nodes.")
+            # Sessions record each query in the query metrics
+            self.driver = instrument_neo4j(GraphDatabase.driver(self.uri, auth=(self.user, self.password)))
+            # Test connection with a single round trip (counting nodes scans the whole graph)
+            self.driver.verify_connectivity()
+            logger.info("Neo4j connection established successfully")
             return self.driver
         except Exception as e:
-            print(f"Error connecting to Neo4j database: {e}")
+            logger.error("Error connecting to Neo4j database: %s", e)
             return None
     
     def close(self):
         """Close the Neo4j connection"""
         if self.driver:
             self.driver.close()
-            print("Neo4j connection closed")
+            logger.info("Neo4j connection closed")
     
     def setup_database(self):
-        """Setup the Neo4j database with constraints and indexes"""
+        """Setup the Neo4j database with constraints and indexes (see db.schema)"""
         if not self.driver:
             self.connect()
         
+        SchemaManager(self.driver).apply()
+        logger.info("Neo4j database setup completed")
+    
+    def sync_jobs_from_mysql(self, mysql_connection, full=False, batch_size=1000):
+        """
+        Sync jobs from MySQL to Neo4j, sending only jobs that changed
+        
+        MySQL computes a content hash per row; it is stored on the Job node, so
+        jobs whose hash matches are skipped. Changed jobs are written with one
+        UNWIND query per batch, and jobs deleted from MySQL are archived (not
+        deleted) so their applications and matches are kept.
+        
+        Args:
+            mysql_connection: MySQLConnection instance
+            full: Rewrite every job even if its hash is unchanged
+            batch_size: Jobs per UNWIND query
+            
+        Returns:
+            dict: Counts of changed, unchanged and archived jobs
+        """
+        if not self.driver:
+            self.connect()
+        
+        source_hashes = mysql_connection.get_job_hashes()
+        
         with self.driver.session() as session:
-            # Create constraints for uniqueness
-            constraints = [
-                # Candidate constraints
-                """CREATE CONSTRAINT candidate_email_unique IF NOT EXISTS
-                   FOR (c:Candidate) REQUIRE c.email IS UNIQUE""",
-                
-                # Job constraints
-                """CREATE CONSTRAINT job_id_unique IF NOT EXISTS
-                   FOR (j:Job) REQUIRE j.job_id IS UNIQUE""",
-                
-                # Skill constraints
-                """CREATE CONSTRAINT skill_name_unique IF NOT EXISTS
-                   FOR (s:Skill) REQUIRE s.name IS UNIQUE"""
-            ]
+            stored = {
+                record["job_id"]: (record["content_hash"], record["archived"])
+                for record in session.run("""
+                    MATCH (j:Job)
+                    RETURN j.job_id AS job_id, j.content_hash AS content_hash,
+                           coalesce(j.archived, false) AS archived
+                """)
+            }
             
-            # Create indexes for faster querying
-            indexes = [
-                """CREATE INDEX candidate_name IF NOT EXISTS
-                   FOR (c:Candidate) ON (c.name)""",
-                
-                """CREATE INDEX job_title IF NOT EXISTS
-                   FOR (j:Job) ON (j.title)"""
+            changed_ids = [
+                job_id for job_id, content_hash in source_hashes.items()
+                if full or stored.get(job_id) != (content_hash, False)
+            ]
+            archived_ids = [
+                job_id for job_id, (_, archived) in stored.items()
+                if job_id not in source_hashes and not archived
             ]
             
-            # Execute all constraints and indexes
-            for constraint in constraints:
-                try:
-                    session.run(constraint)
-                except Exception as e:
-                    print(f"Error creating constraint: {e}")
+            jobs = mysql_connection.get_jobs_by_ids(changed_ids) if changed_ids else []
+            rows = [{
+                "job_id": str(job["id"]),
+                "title": job["job title"],  # Note the space instead of underscore
+                "description": job["job_description"],
+                "content_hash": source_hashes[str(job["id"])]
+            } for job in jobs]
             
-            for index in indexes:
-                try:
-                    session.run(index)
-                except Exception as e:
-                    print(f"Error creating index: {e}")
+            for start in range(0, len(rows), batch_size):
+                session.run("""
+                    UNWIND $rows AS row
+                    MERGE (j:Job {job_id: row.job_id})
+                    SET j.title = row.title,
+                        j.description = row.description,
+                        j.content_hash = row.content_hash,
+                        j.archived = false,
+                        j.updated_at = datetime()
+                    REMOVE j.archived_at
+                """, rows=rows[start:start + batch_size]).consume()
             
-            print("Neo4j database setup completed")
+            for start in range(0, len(archived_ids), batch_size):
+                session.run("""
+                    UNWIND $job_ids AS job_id
+                    MATCH (j:Job {job_id: job_id})
+                    SET j.archived = true,
+                        j.archived_at = datetime()
+                """, job_ids=archived_ids[start:start + batch_size]).consume()
+        
+        stats = {
+            "changed": len(rows),
+            "unchanged": len(source_hashes) - len(changed_ids),
+            "archived": len(archived_ids)
+        }
+        logger.info("Synced jobs from MySQL to Neo4j: %d changed, %d unchanged, %d archived",
+                    stats['changed'], stats['unchanged'], stats['archived'], extra=stats)
+        return stats
     
-    def sync_jobs_from_mysql(self, mysql_connection):
+    def backfill_match_scores(self, batch_size=10000):
         """
-        Sync jobs from MySQL to Neo4j
+        Set final_score, final_category and job_id on MATCHES written before they existed
         
         Args:
-            mysql_connection: MySQLConnection instance
+            batch_size: Relationships updated per transaction
+            
+        Returns:
+            Number of relationships updated
         """
         if not self.driver:
             self.connect()
         
-        jobs = mysql_connection.get_all_jobs()
+        updated = 0
+        # Walk forward by element ID: a relationship that still matches after its
+        # update (e.g. its Job has no job_id) must not be picked up again
+        after = ""
         with self.driver.session() as session:
-            for job in jobs:
-                # Update these lines to match your actual column names
-                session.run("""
-                    MERGE (j:Job {job_id: $job_id})
-                    SET j.title = $job_title,
-                        j.description = $job_description,
-                        j.updated_at = datetime()
-                """, job_id=str(job["id"]), 
-                    job_title=job["job title"],  # Note the space instead of underscore
-                    job_description=job["job_description"])
+            while True:
+                record = session.run("""
+                    MATCH (:Candidate)-[m:MATCHES]->(j:Job)
+                    WHERE (m.final_score IS NULL OR m.job_id IS NULL) AND elementId(m) > $after
+                    WITH m, j ORDER BY elementId(m) LIMIT $batch_size
+                    SET m.final_score = coalesce(m.llm_score, m.score, 0),
+                        m.final_category = coalesce(m.llm_category, m.category, 'Not Evaluated'),
+                        m.job_id = j.job_id
+                    RETURN count(m) AS updated, max(elementId(m)) AS last_id
+                """, batch_size=batch_size, after=after).single()
+                
+                if not record or record["updated"] == 0:
+                    break
+                updated += record["updated"]
+                after = record["last_id"]
+        
+        logger.info("Backfilled final scores on %d MATCHES relationships", updated)
+        return updated
+    
+    def migrate_resume_text(self, batch_size=500):
+        """
+        Move resume_text off Candidate nodes into the blob store
+        
+        Args:
+            batch_size: Candidates migrated per transaction
+            
+        Returns:
+            Number of candidates migrated
+        """
+        if not self.driver:
+            self.connect()
+        
+        store = get_blob_store()
+        migrated = 0
+        # Walk forward by element ID, so a candidate the update misses is not selected again
+        after = ""
+        with self.driver.session() as session:
+            while True:
+                records = list(session.run("""
+                    MATCH (c:Candidate)
+                    WHERE c.resume_text IS NOT NULL AND elementId(c) > $after
+                    RETURN elementId(c) AS node_id, c.resume_text AS resume_text
+                    ORDER BY node_id
+                    LIMIT $batch_size
+                """, batch_size=batch_size, after=after))
+                if not records:
+                    break
+                after = records[-1]["node_id"]
+                
+                # Write the blobs before dropping the text from the graph
+                rows = [{
+                    "node_id": record["node_id"],
+                    "resume_hash": store.put(record["resume_text"])
+                } for record in records]
+                
+                record = session.run("""
+                    UNWIND $rows AS row
+                    MATCH (c:Candidate)
+                    WHERE elementId(c) = row.node_id
+                    SET c.resume_hash = row.resume_hash
+                    REMOVE c.resume_text
+                    RETURN count(c) AS migrated
+                """, rows=rows).single()
+                migrated += record["migrated"] if record else 0
+        
+        logger.info("Moved resume text of %d candidates to %s", migrated, store.root)
+        return migrated
+    
+    def merge_skill_variants(self):
+        """
+        Fold Skill nodes stored under synonyms into their canonical skill
+        
+        Returns:
+            Number of variant Skill nodes merged away
+        """
+        if not self.driver:
+            self.connect()
+        
+        taxonomy = get_skill_taxonomy()
+        merged = 0
+        with self.driver.session() as session:
+            records = list(session.run("MATCH (s:Skill) RETURN s.name AS name, s.id AS skill_id"))
             
-            print(f"Synced {len(jobs)} jobs from MySQL to Neo4j")
+            for record in records:
+                name = record["name"]
+                skill = taxonomy.canonicalize(name)
+                
+                # Skip unknown skills and canonical nodes that are already tagged
+                if not skill or (name == skill["name"] and record["skill_id"] == skill["id"]):
+                    continue
+                
+                # Tag the canonical node and move candidates over from the variant
+                session.run("""
+                    MERGE (canonical:Skill {name: $canonical_name})
+                    ON CREATE SET canonical.created_at = datetime()
+                    SET canonical.id = $skill_id,
+                        canonical.category = $category
+                    WITH canonical
+                    MATCH (variant:Skill {name: $name})
+                    WHERE variant <> canonical
+                    OPTIONAL MATCH (c:Candidate)-[r:HAS_SKILL]->(variant)
+                    FOREACH (_ IN CASE WHEN c IS NULL THEN [] ELSE [1] END |
+                        MERGE (c)-[:HAS_SKILL]->(canonical))
+                    DELETE r
+                    WITH DISTINCT variant
+                    DETACH DELETE variant
+                """, name=name, canonical_name=skill["name"], skill_id=skill["id"], category=skill["category"])
+                
+                if name != skill["name"]:
+                    merged += 1
+        
+        logger.info("Merged %d skill variants into canonical skills", merged)
+        return merged
 
 
 class CandidateManager:
@@ -192,15 +404,13 @@ class CandidateManager:
         Returns:
             Candidate ID
         """
-        from utils.pdf_parser import extract_structured_info_with_llm
-        from groq import Groq
-        import os
-        
-        # Initialize LLM client
-        llm_client = Groq(api_key=os.getenv("GROQ_API_KEY"))
-        
         # Extract structured information from resume text using LLM
-        structured_info = extract_structured_info_with_llm(resume_text, llm_client)
+        with span("extract_structured_info_with_llm"):
+            structured_info = extract_structured_info_with_llm(resume_text, get_llm_router())
+        
+        # The resume text lives in the blob store; the node keeps only its hash
+        with span("blob_store.put"):
+            resume_hash = get_blob_store().put(resume_text)
         
         with self.driver.session() as session:
             # Create candidate node
@@ -210,15 +420,16 @@ class CandidateManager:
                     name: $name,
                     email: $email,
                     phone: $phone,
-                    resume_text: $resume_text,
-                    created_at: datetime()
+                    resume_hash: $resume_hash,
+                    created_at: datetime(),
+                    updated_at: datetime()
                 })
                 RETURN c.id as candidate_id
             """, 
                 name=form_data.get("name", ""),
                 email=form_data.get("email", ""),
                 phone=form_data.get("phone", ""),
-                resume_text=resume_text)
+                resume_hash=resume_hash)
             
             record = result.single()
             if not record:
@@ -226,20 +437,27 @@ class CandidateManager:
             
             candidate_id = record["candidate_id"]
             
-            # Add skills from resume
+            # Add skills from resume, merged on the canonical skill so variants share one node
+            taxonomy = get_skill_taxonomy()
             skills = structured_info.get("skills", [])
             for skill in skills:
                 if not skill or len(skill.strip()) < 2:
                     continue
-                    
+                
+                canonical = taxonomy.canonicalize(skill)
                 session.run("""
                     MATCH (c:Candidate {id: $candidate_id})
                     MERGE (s:Skill {name: $skill_name})
                     ON CREATE SET s.created_at = datetime()
-                    CREATE (c)-[r:HAS_SKILL {created_at: datetime()}]->(s)
+                    SET s.id = coalesce($skill_id, s.id),
+                        s.category = coalesce($category, s.category)
+                    MERGE (c)-[r:HAS_SKILL]->(s)
+                    ON CREATE SET r.created_at = datetime()
                 """, 
                     candidate_id=candidate_id,
-                    skill_name=skill)
+                    skill_name=canonical["name"] if canonical else skill.strip(),
+                    skill_id=canonical["id"] if canonical else None,
+                    category=canonical["category"] if canonical else None)
             
             # Add education from resume
             education_entries = structured_info.get("education", [])
@@ -378,6 +596,12 @@ class CandidateManager:
                     
                     session.run(update_query, **update_fields)
             
+            # Profile pages are cached by updated_at; bump it once everything is written
+            session.run("""
+                MATCH (c:Candidate {id: $candidate_id})
+                SET c.updated_at = datetime()
+            """, candidate_id=candidate_id)
+            
             return candidate_id
     def _store_linkedin_data(self, candidate_id, linkedin_data):
         """Store LinkedIn profile data"""
@@ -465,33 +689,161 @@ class CandidateManager:
                         forks=repo.get("forks", 0),
                         url=repo.get("url", ""))
     
+    def get_resume_text(self, candidate_id):
+        """
+        Load a candidate's resume text from the blob store
+        
+        Args:
+            candidate_id: Candidate's ID
+            
+        Returns:
+            Resume text, or None if the candidate does not exist
+        """
+        with self.driver.session() as session:
+            record = session.run("""
+                MATCH (c:Candidate {id: $candidate_id})
+                RETURN c.resume_hash AS resume_hash, c.resume_text AS resume_text
+            """, candidate_id=candidate_id).single()
+        
+        if not record:
+            return None
+        # Candidates not yet migrated still carry the text on the node
+        if record["resume_text"] is not None:
+            return record["resume_text"]
+        return get_blob_store().get(record["resume_hash"]) or ""
+    
+    def get_profile_version(self, candidate_id):
+        """
+        Cheap version stamp for a candidate's profile page
+        
+        Args:
+            candidate_id: Candidate's ID
+            
+        Returns:
+            Tuple of the candidate's updated_at and the latest updated_at of the
+            jobs they applied for, or None if the candidate does not exist
+        """
+        with self.driver.session() as session:
+            record = session.run("""
+                MATCH (c:Candidate {id: $candidate_id})
+                OPTIONAL MATCH (c)-[:APPLIED_FOR]->(j:Job)
+                RETURN toString(c.updated_at) AS updated_at,
+                       toString(max(j.updated_at)) AS jobs_updated_at
+            """, candidate_id=candidate_id).single()
+        
+        if not record:
+            return None
+        return (record["updated_at"], record["jobs_updated_at"])
+    
+    def get_candidate_profile(self, candidate_id):
+        """
+        Read model for the candidate profile page
+        
+        One query returns a projection of the candidate with their skills,
+        education, experience and a match summary for every application, so no
+        whole nodes cross the wire and there is no row fan-out to sort.
+        
+        Args:
+            candidate_id: Candidate's ID
+            
+        Returns:
+            Dictionary with the profile, or None if the candidate does not exist
+        """
+        with self.driver.session() as session:
+            record = session.run("""
+                MATCH (c:Candidate {id: $candidate_id})
+                RETURN c {
+                    .id, .name, .email, .phone, .linkedin_url, .github_url,
+                    updated_at: toString(c.updated_at),
+                    skills: COLLECT {
+                        MATCH (c)-[:HAS_SKILL]->(s:Skill)
+                        WITH s ORDER BY s.name
+                        RETURN s {.name, .category}
+                    },
+                    education: COLLECT {
+                        MATCH (c)-[:HAS_EDUCATION]->(e:Education)
+                        OPTIONAL MATCH (e)-[:AT_UNIVERSITY]->(u:University)
+                        WITH e, u ORDER BY e.end_date DESC
+                        RETURN e {.degree, .field, .start_date, .end_date, .gpa, university: u.name}
+                    },
+                    experience: COLLECT {
+                        MATCH (c)-[:HAS_EXPERIENCE]->(e:Experience)
+                        OPTIONAL MATCH (e)-[:AT_COMPANY]->(co:Company)
+                        WITH e, co ORDER BY e.is_current DESC, e.end_date DESC
+                        RETURN e {
+                            .title, .start_date, .end_date, .is_current, .description,
+                            company: co.name,
+                            responsibilities: COLLECT {
+                                MATCH (e)-[:INCLUDES]->(r:Responsibility)
+                                RETURN r.description
+                            }
+                        }
+                    },
+                    applications: COLLECT {
+                        MATCH (c)-[a:APPLIED_FOR]->(j:Job)
+                        OPTIONAL MATCH (c)-[m:MATCHES]->(j)
+                        WITH a, j, m, COALESCE(m.final_score, m.llm_score, m.score, 0) AS score
+                        ORDER BY score DESC
+                        RETURN {
+                            job_id: j.job_id,
+                            job_title: j.title,
+                            application_status: COALESCE(a.status, 'Applied'),
+                            application_date: toString(a.date),
+                            match_score: score,
+                            match_category: COALESCE(m.final_category, m.llm_category, m.category, 'Not Evaluated'),
+                            matched_skills: COALESCE(m.llm_strengths, m.matched_skills, [])
+                        }
+                    }
+                } AS profile
+            """, candidate_id=candidate_id).single()
+        
+        return record["profile"] if record else None
+    
     # In your llm_matching.py file or wherever your LLM matching code is located
     def _store_llm_evaluation(self, candidate_id, job_id, evaluation):
         """Store the LLM evaluation results in Neo4j"""
+        self._store_llm_evaluations([(candidate_id, job_id, evaluation)])
+    
+    def _store_llm_evaluations(self, evaluations):
+        """
+        Store several LLM evaluations in one transaction
+        
+        Args:
+            evaluations: List of (candidate_id, job_id, evaluation) tuples
+        """
+        rows = [{
+            "candidate_id": candidate_id,
+            "job_id": job_id,
+            "score": evaluation.get("overall_score", 0),
+            "category": evaluation.get("match_category", ""),
+            "strengths": evaluation.get("strengths", []),
+            "gaps": evaluation.get("gaps", []),
+            "recommendations": evaluation.get("recommendations", [])
+        } for candidate_id, job_id, evaluation in evaluations]
+        if not rows:
+            return
+        
         with self.driver.session() as session:
-            session.run("""
-                MATCH (c:Candidate {id: $candidate_id})
-                MATCH (j:Job {job_id: $job_id})
+            session.execute_write(lambda tx: tx.run("""
+                UNWIND $rows AS row
+                MATCH (c:Candidate {id: row.candidate_id})
+                MATCH (j:Job {job_id: row.job_id})
                 
                 // Create or update the MATCHES relationship
                 MERGE (c)-[m:MATCHES]->(j)
-                SET m.llm_score = $score,
-                    m.llm_category = $category,
-                    m.llm_strengths = $strengths,
-                    m.llm_gaps = $gaps,
-                    m.llm_recommendations = $recommendations,
-                    m.score = $score,  // Set the regular score to match the LLM score
-                    m.category = $category,  // Also update the regular category
-                    m.updated_at = datetime()
-            """, 
-                candidate_id=candidate_id,
-                job_id=job_id,
-                score=evaluation.get("overall_score", 0),
-                category=evaluation.get("match_category", ""),
-                strengths=evaluation.get("strengths", []),
-                gaps=evaluation.get("gaps", []),
-                recommendations=evaluation.get("recommendations", [])
-            )
+                SET m.llm_score = row.score,
+                    m.llm_category = row.category,
+                    m.llm_strengths = row.strengths,
+                    m.llm_gaps = row.gaps,
+                    m.llm_recommendations = row.recommendations,
+                    m.score = row.score,  // Set the regular score to match the LLM score
+                    m.category = row.category,  // Also update the regular category
+                    m.final_score = row.score,
+                    m.final_category = row.category,
+                    m.job_id = j.job_id,
+                    m.updated_at = datetime(),
+                    c.updated_at = datetime()
+            """, rows=rows).consume())
 
 class MatchingEngine:
     """Matches candidates to jobs using Neo4j graph algorithms"""
@@ -499,28 +851,85 @@ class MatchingEngine:
     def __init__(self, neo4j_driver):
         """Initialize with Neo4j driver"""
         self.driver = neo4j_driver
+        self._match_buffer = None
+    
+    @property
+    def match_buffer(self):
+        """Write-behind buffer for queue_match, created on first use"""
+        if self._match_buffer is None:
+            self._match_buffer = WriteBehindBuffer(self.store_matches, name="match-writes")
+        return self._match_buffer
+    
+    def flush(self):
+        """Write any queued matches now"""
+        if self._match_buffer is not None:
+            self._match_buffer.flush()
+    
+    def close(self):
+        """Stop the background match writer after writing what is queued"""
+        if self._match_buffer is not None:
+            self._match_buffer.close()
     
-    def match_candidate_to_job(self, candidate_id, job_id):
+    def match_candidate_to_job(self, candidate_id, job_id, resume_text=None):
         """
         Calculate match score between candidate and job
         
         Args:
             candidate_id: Candidate's ID
             job_id: Job's ID
+            resume_text: Candidate's resume text (loaded from the blob store if omitted)
             
         Returns:
             Dictionary with match details and score
         """
+        if resume_text is None:
+            resume_text = CandidateManager(self.driver).get_resume_text(candidate_id) or ""
+        
+        results = self.store_matches([{
+            "candidate_id": candidate_id,
+            "job_id": job_id,
+            "resume_text": resume_text
+        }])
+        return results[0] if results else None
+    
+    def queue_match(self, candidate_id, job_id, resume_text):
+        """
+        Score a candidate against a job in the background
+        
+        The pair is written with other queued pairs in one UNWIND transaction
+        (see db.write_buffer), so the MATCHES relationship appears shortly after.
+        
+        Args:
+            candidate_id: Candidate's ID
+            job_id: Job's ID
+            resume_text: Candidate's resume text
+        """
+        self.match_buffer.add({"candidate_id": candidate_id, "job_id": job_id, "resume_text": resume_text or ""})
+    
+    def store_matches(self, rows):
+        """
+        Score and store several candidate/job pairs in one transaction
+        
+        Args:
+            rows: List of dicts with candidate_id, job_id and resume_text
+            
+        Returns:
+            List of dicts with the match details of each stored pair
+        """
+        if not rows:
+            return []
+        
         with self.driver.session() as session:
-            result = session.run("""
+            result = session.execute_write(lambda tx: list(tx.run("""
+                UNWIND $rows AS row
                 // Match candidate and job
-                MATCH (c:Candidate {id: $candidate_id})
-                MATCH (j:Job {job_id: $job_id})
+                MATCH (c:Candidate {id: row.candidate_id})
+                MATCH (j:Job {job_id: row.job_id})
                 
                 // Calculate match (simplified algorithm)
                 WITH c, j,
                      // Extract keywords from resume text (simplified)
-                     split(toLower(c.resume_text), ' ') AS resumeWords,
+                     split(toLower(row.resume_text), ' ') AS resumeWords,
                      // Extract keywords from job description (simplified)
                      split(toLower(j.description), ' ') AS jobWords
                 
@@ -548,18 +957,52 @@ class MatchingEngine:
                     m.match_count = matchCount,
                     m.total_keywords = totalKeywords,
                     m.category = matchCategory,
-                    m.updated_at = datetime()
+                    // An LLM score, once stored, stays the final score
+                    m.final_score = coalesce(m.llm_score, rawScore),
+                    m.final_category = coalesce(m.llm_category, matchCategory),
+                    m.job_id = j.job_id,
+                    m.updated_at = datetime(),
+                    c.updated_at = datetime()
                 
-                RETURN m.score AS match_score,
+                RETURN c.id AS candidate_id,
+                       j.job_id AS job_id,
+                       m.score AS match_score,
                        m.category AS match_category,
                        m.match_count AS match_count,
                        m.total_keywords AS total_keywords
-            """, candidate_id=candidate_id, job_id=job_id)
+            """, rows=rows)))
+        
+        return [dict(record) for record in result]
+    
+    def rematch_job(self, job_id, batch_size=None):
+        """
+        Recalculate keyword match scores for every applicant of a job
+        
+        Args:
+            job_id: Job's ID
+            batch_size: Pairs per transaction (defaults to the write buffer size)
             
-            record = result.single()
-            if record:
-                return dict(record)
-            return None
+        Returns:
+            Number of applicants scored
+        """
+        with self.driver.session() as session:
+            applicants = list(session.run("""
+                MATCH (c:Candidate)-[:APPLIED_FOR]->(:Job {job_id: $job_id})
+                RETURN c.id AS candidate_id, c.resume_hash AS resume_hash, c.resume_text AS resume_text
+            """, job_id=job_id))
+        
+        store = get_blob_store()
+        batch_size = batch_size or WRITE_BUFFER_SIZE
+        scored = 0
+        for start in range(0, len(applicants), batch_size):
+            rows = [{
+                "candidate_id": applicant["candidate_id"],
+                "job_id": job_id,
+                "resume_text": applicant["resume_text"] or store.get(applicant["resume_hash"]) or ""
+            } for applicant in applicants[start:start + batch_size]]
+            scored += len(self.store_matches(rows))
+        
+        return scored
     
     def get_best_matches_for_job(self, job_id, limit=10):
         """
@@ -613,9 +1056,110 @@ class MatchingEngine:
             return [dict(record) for record in result]
 
 
+    def get_candidates_page(self, job_id, limit=50, after=None, category=None, status=None):
+        """
+        Get one page of a job's applicants, best match first
+        
+        Uses keyset pagination on (final_score, candidate id) so each page is an
+        index seek on MATCHES(job_id, final_score) rather than a sort of every applicant.
+        Once the scored applicants run out, the page continues with applicants that
+        have no scored match yet (still queued, failed, or written before
+        `flask backfill-match-scores`), listed as "Not Evaluated" in candidate id order.
+        
+        Args:
+            job_id: Job's ID
+            limit: Page size
+            after: (final_score, candidate_id) of the last row of the previous page;
+                   the score is UNMATCHED_CURSOR_SCORE once past the scored applicants
+            category: Only candidates with this match category
+            status: Only applications with this status
+            
+        Returns:
+            Tuple of (candidates, cursor for the next page or None)
+        """
+        past_scored = after is not None and after[0] == UNMATCHED_CURSOR_SCORE
+        
+        candidates = []
+        if not past_scored:
+            candidates = self._scored_candidates(job_id, limit + 1, after, category, status)
+        scored_count = len(candidates)
+        
+        if scored_count <= limit and category in (None, NOT_EVALUATED):
+            candidates += self._unmatched_candidates(
+                job_id, limit + 1 - scored_count, after[1] if past_scored else None, status
+            )
+        
+        # One extra row tells whether there is a next page
+        next_cursor = None
+        if len(candidates) > limit:
+            candidates = candidates[:limit]
+            last = candidates[-1]
+            score = last["match_score"] if limit <= scored_count else UNMATCHED_CURSOR_SCORE
+            next_cursor = (score, last["candidate_id"])
+        
+        return candidates, next_cursor
+    
+    def _scored_candidates(self, job_id, limit, after, category, status):
+        """Applicants with a scored MATCHES relationship, best first, from the score index"""
+        conditions = ["m.job_id = $job_id", "m.final_score IS NOT NULL"]
+        if after:
+            # The range predicate can use the index; the OR breaks ties on candidate id
+            conditions.append("m.final_score <= $after_score")
+            conditions.append("(m.final_score < $after_score OR c.id > $after_id)")
+        if category:
+            conditions.append("m.final_category = $category")
+        
+        with self.driver.session() as session:
+            result = session.run(f"""
+                MATCH (c:Candidate)-[m:MATCHES]->(j:Job)
+                WHERE {" AND ".join(conditions)}
+                MATCH (c)-[a:APPLIED_FOR]->(j)
+                WHERE $status IS NULL OR a.status = $status
+                RETURN c.id AS candidate_id,
+                       c.name AS name,
+                       c.email AS email,
+                       a.date AS application_date,
+                       a.status AS application_status,
+                       m.final_score AS match_score,
+                       m.final_category AS match_category
+                ORDER BY m.final_score DESC, c.id ASC
+                LIMIT $limit
+            """, job_id=job_id, limit=limit, category=category, status=status,
+                after_score=after[0] if after else None, after_id=after[1] if after else None)
+            
+            return [dict(record) for record in result]
+    
+    def _unmatched_candidates(self, job_id, limit, after_id, status):
+        """Applicants without a scored MATCHES relationship, in candidate id order"""
+        with self.driver.session() as session:
+            result = session.run("""
+                MATCH (c:Candidate)-[a:APPLIED_FOR]->(j:Job {job_id: $job_id})
+                WHERE ($status IS NULL OR a.status = $status)
+                  AND ($after_id IS NULL OR c.id > $after_id)
+                  AND NOT EXISTS { MATCH (c)-[m:MATCHES]->(j) WHERE m.final_score IS NOT NULL }
+                RETURN c.id AS candidate_id,
+                       c.name AS name,
+                       c.email AS email,
+                       a.date AS application_date,
+                       a.status AS application_status,
+                       0.0 AS match_score,
+                       $not_evaluated AS match_category
+                ORDER BY c.id ASC
+                LIMIT $limit
+            """, job_id=job_id, limit=limit, after_id=after_id, status=status, not_evaluated=NOT_EVALUATED)
+            
+            return [dict(record) for record in result]
+
+
 # Function to initialize database connections and setup
 def initialize_databases():
-    """Initialize and connect to both databases"""
+    """
+    Connect to both databases, set up the schema and sync jobs
+    
+    Used by the example below. The web app connects lazily and never calls it;
+    `flask init-db` and `flask sync-jobs` do the same steps on the app's own
+    connections.
+    """
     # Connect to MySQL
     mysql_conn = MySQLConnection()
     mysql_conn.connect()
@@ -628,6 +1172,9 @@ def initialize_databases():
     # Sync job data from MySQL to Neo4j
     neo4j_conn.sync_jobs_from_mysql(mysql_conn)
     
+    # Fold skills stored under synonyms into their canonical nodes
+    neo4j_conn.merge_skill_variants()
+    
     return mysql_conn, neo4j_conn
 
 
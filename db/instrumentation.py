@@ -0,0 +1,408 @@
+# db/instrumentation.py
+import logging
+import os
+import random
+import sys
+import threading
+import time
+
+from utils.tracing import count
+
+# Queries slower than this (milliseconds) are logged
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "200"))
+
+# Fraction of Cypher queries run with PROFILE to collect db hits (0 disables)
+QUERY_PROFILE_SAMPLE_RATE = float(os.getenv("QUERY_PROFILE_SAMPLE_RATE", "0"))
+
+# Set QUERY_METRICS=0 to hand out the plain driver and connections
+QUERY_METRICS = os.getenv("QUERY_METRICS", "1").lower() not in ("0", "false", "no")
+
+# Upper bounds (ms) of the latency histogram buckets; the last bucket is open-ended
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+# Schema and admin statements that cannot be prefixed with PROFILE
+_NOT_PROFILABLE = ("EXPLAIN", "PROFILE", "SHOW", "CALL", "CREATE CONSTRAINT", "CREATE INDEX", "DROP", "USE")
+
+_THIS_FILE = os.path.abspath(__file__)
+
+logger = logging.getLogger(__name__)
+
+
+def parameter_shape(parameters):
+    """Describe parameters without their values, e.g. 'job_id:str, rows:list[25]'"""
+    if not parameters:
+        return ""
+    if isinstance(parameters, dict):
+        items = sorted(parameters.items())
+    else:
+        items = list(enumerate(parameters))
+
+    parts = []
+    for key, value in items:
+        if isinstance(value, (list, tuple)):
+            parts.append(f"{key}:list[{len(value)}]")
+        else:
+            parts.append(f"{key}:{type(value).__name__}")
+    return ", ".join(parts)
+
+
+def query_name(query):
+    """
+    Name a query by the function that issued it and its first line
+
+    Returns:
+        str: e.g. "admin_job_candidates: MATCH (c:Candidate)-[m:MATCHES]->(j:Job)"
+    """
+    lines = (line.strip() for line in str(getattr(query, "text", query)).splitlines())
+    first_line = next((line for line in lines if line and not line.startswith("//")), "")
+    if len(first_line) > 80:
+        first_line = first_line[:77] + "..."
+
+    # First frame outside this module and the database drivers
+    frame = sys._getframe(1)
+    while frame and (
+        os.path.abspath(frame.f_code.co_filename) == _THIS_FILE
+        or "site-packages" in frame.f_code.co_filename
+    ):
+        frame = frame.f_back
+    caller = frame.f_code.co_name if frame else "?"
+    return f"{caller}: {first_line}"
+
+
+def _db_hits(profile):
+    """Total db hits of a PROFILE plan tree"""
+    if not profile:
+        return 0
+    hits = profile.get("dbHits", 0) or profile.get("args", {}).get("DbHits", 0)
+    return hits + sum(_db_hits(child) for child in profile.get("children", []))
+
+
+class QueryMetrics:
+    """Aggregates per-query latency histograms, row counts and db hits"""
+
+    def __init__(self, slow_query_ms=None):
+        self.slow_query_ms = SLOW_QUERY_MS if slow_query_ms is None else slow_query_ms
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def record(self, backend, name, shape, seconds, rows, db_hits=None, error=None):
+        """
+        Record one query execution
+
+        Args:
+            backend: "neo4j" or "mysql"
+            name: Query name (see query_name)
+            shape: Parameter shape (see parameter_shape)
+            seconds: Wall time from sending the query to reading the last row
+            rows: Rows returned
+            db_hits: Database hits when the query was profiled
+            error: Exception message if the query failed
+        """
+        ms = seconds * 1000
+        bucket = next((i for i, bound in enumerate(LATENCY_BUCKETS_MS) if ms <= bound), len(LATENCY_BUCKETS_MS))
+
+        with self._lock:
+            stats = self._stats.get((backend, name))
+            if stats is None:
+                stats = self._stats[(backend, name)] = {
+                    "backend": backend,
+                    "query": name,
+                    "count": 0,
+                    "errors": 0,
+                    "total_ms": 0.0,
+                    "max_ms": 0.0,
+                    "rows": 0,
+                    "profiled": 0,
+                    "db_hits": 0,
+                    "histogram": [0] * (len(LATENCY_BUCKETS_MS) + 1),
+                    "parameters": shape
+                }
+            stats["count"] += 1
+            stats["total_ms"] += ms
+            stats["max_ms"] = max(stats["max_ms"], ms)
+            stats["rows"] += rows
+            stats["histogram"][bucket] += 1
+            stats["parameters"] = shape
+            if error:
+                stats["errors"] += 1
+            if db_hits is not None:
+                stats["profiled"] += 1
+                stats["db_hits"] += db_hits
+
+        # Per-request totals for the trace waterfall
+        count(f"db.{backend}.queries")
+        count(f"db.{backend}.ms", round(ms, 2))
+
+        if ms >= self.slow_query_ms:
+            logger.warning("Slow %s query (%.0f ms, %d rows%s): %s [%s]", backend, ms, rows,
+                           f", {db_hits} db hits" if db_hits is not None else "", name, shape,
+                           extra={"query": name, "duration_ms": round(ms, 2), "rows": rows, "db_hits": db_hits})
+
+    def snapshot(self):
+        """
+        All query statistics, slowest total time first
+
+        Returns:
+            list: One dict per query with count, mean/max latency, rows, db hits and histogram
+        """
+        with self._lock:
+            stats = [dict(entry, histogram=list(entry["histogram"])) for entry in self._stats.values()]
+
+        for entry in stats:
+            entry["mean_ms"] = round(entry["total_ms"] / entry["count"], 2) if entry["count"] else 0
+            entry["total_ms"] = round(entry["total_ms"], 2)
+            entry["max_ms"] = round(entry["max_ms"], 2)
+            entry["histogram"] = {
+                (f"<={bound}ms" if i < len(LATENCY_BUCKETS_MS) else f">{LATENCY_BUCKETS_MS[-1]}ms"): count
+                for i, (bound, count) in enumerate(zip(LATENCY_BUCKETS_MS + (None,), entry["histogram"]))
+                if count
+            }
+        return sorted(stats, key=lambda entry: entry["total_ms"], reverse=True)
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+
+
+query_metrics = QueryMetrics()
+
+
+class InstrumentedResult:
+    """Wraps a neo4j Result and records the query once its records have been read"""
+
+    def __init__(self, result, name, shape, started, metrics, profiled):
+        self._result = result
+        self._name = name
+        self._shape = shape
+        self._started = started
+        self._metrics = metrics
+        self._profiled = profiled
+        self._rows = 0
+        self._recorded = False
+
+    def _record(self, error=None):
+        if self._recorded:
+            return
+        self._recorded = True
+        db_hits = None
+        if self._profiled and error is None:
+            try:
+                db_hits = _db_hits(self._result.consume().profile)
+            except Exception:
+                db_hits = None
+        self._metrics.record("neo4j", self._name, self._shape, time.perf_counter() - self._started,
+                             self._rows, db_hits, error)
+
+    def __iter__(self):
+        try:
+            for record in self._result:
+                self._rows += 1
+                yield record
+        except Exception as e:
+            self._record(str(e))
+            raise
+        self._record()
+
+    def single(self, *args, **kwargs):
+        try:
+            record = self._result.single(*args, **kwargs)
+        except Exception as e:
+            self._record(str(e))
+            raise
+        self._rows += 1 if record is not None else 0
+        self._record()
+        return record
+
+    def data(self, *keys):
+        records = self._result.data(*keys)
+        self._rows += len(records)
+        self._record()
+        return records
+
+    def consume(self):
+        try:
+            summary = self._result.consume()
+        except Exception as e:
+            self._record(str(e))
+            raise
+        self._record()
+        return summary
+
+    def __getattr__(self, name):
+        return getattr(self._result, name)
+
+
+class _InstrumentedRunner:
+    """run() wrapper shared by sessions and transactions"""
+
+    def __init__(self, target, metrics, profile_rate):
+        self._target = target
+        self._metrics = metrics
+        self._profile_rate = profile_rate
+        self._results = []
+
+    def run(self, query, parameters=None, **kwargs):
+        name = query_name(query)
+        shape = parameter_shape({**(parameters or {}), **kwargs})
+
+        profiled = False
+        stripped = query.lstrip().upper()
+        if self._profile_rate and random.random() < self._profile_rate and not stripped.startswith(_NOT_PROFILABLE):
+            query = "PROFILE " + query
+            profiled = True
+
+        started = time.perf_counter()
+        try:
+            result = self._target.run(query, parameters, **kwargs)
+        except Exception as e:
+            self._metrics.record("neo4j", name, shape, time.perf_counter() - started, 0, error=str(e))
+            raise
+
+        wrapped = InstrumentedResult(result, name, shape, started, self._metrics, profiled)
+        self._results.append(wrapped)
+        return wrapped
+
+    def _record_pending(self):
+        # Results that were never read to the end still count, with the rows seen
+        for result in self._results:
+            result._record()
+        self._results = []
+
+    def __getattr__(self, name):
+        return getattr(self._target, name)
+
+
+class InstrumentedTransaction(_InstrumentedRunner):
+    pass
+
+
+class InstrumentedSession(_InstrumentedRunner):
+    """Neo4j session whose run() calls, including those in transaction functions, are recorded"""
+
+    def _wrap_work(self, work):
+        def instrumented_work(tx, *args, **kwargs):
+            transaction = InstrumentedTransaction(tx, self._metrics, self._profile_rate)
+            try:
+                return work(transaction, *args, **kwargs)
+            finally:
+                transaction._record_pending()
+        return instrumented_work
+
+    def execute_read(self, work, *args, **kwargs):
+        return self._target.execute_read(self._wrap_work(work), *args, **kwargs)
+
+    def execute_write(self, work, *args, **kwargs):
+        return self._target.execute_write(self._wrap_work(work), *args, **kwargs)
+
+    def close(self):
+        self._record_pending()
+        self._target.close()
+
+    def __enter__(self):
+        self._target.__enter__()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._record_pending()
+        return self._target.__exit__(*exc_info)
+
+
+class InstrumentedDriver:
+    """Neo4j driver that hands out instrumented sessions"""
+
+    def __init__(self, driver, metrics=None, profile_rate=None):
+        self._driver = driver
+        self._metrics = metrics or query_metrics
+        self._profile_rate = QUERY_PROFILE_SAMPLE_RATE if profile_rate is None else profile_rate
+
+    def session(self, **kwargs):
+        return InstrumentedSession(self._driver.session(**kwargs), self._metrics, self._profile_rate)
+
+    def __getattr__(self, name):
+        return getattr(self._driver, name)
+
+
+class InstrumentedCursor:
+    """MySQL cursor that records each statement when its rows have been fetched"""
+
+    def __init__(self, cursor, metrics):
+        self._cursor = cursor
+        self._metrics = metrics
+        self._pending = None
+
+    def _record_pending(self, error=None):
+        if self._pending is None:
+            return
+        name, shape, started, rows = self._pending
+        self._pending = None
+        self._metrics.record("mysql", name, shape, time.perf_counter() - started, rows, error=error)
+
+    def execute(self, operation, params=None, *args, **kwargs):
+        self._record_pending()
+        name = query_name(operation)
+        shape = parameter_shape(params)
+        started = time.perf_counter()
+        self._pending = (name, shape, started, 0)
+        try:
+            return self._cursor.execute(operation, params, *args, **kwargs)
+        except Exception as e:
+            self._record_pending(str(e))
+            raise
+
+    def _add_rows(self, count):
+        if self._pending is not None:
+            name, shape, started, rows = self._pending
+            self._pending = (name, shape, started, rows + count)
+
+    def fetchall(self):
+        rows = self._cursor.fetchall()
+        self._add_rows(len(rows))
+        self._record_pending()
+        return rows
+
+    def fetchone(self):
+        row = self._cursor.fetchone()
+        self._add_rows(1 if row is not None else 0)
+        return row
+
+    def fetchmany(self, size=1):
+        rows = self._cursor.fetchmany(size)
+        self._add_rows(len(rows))
+        return rows
+
+    def close(self):
+        self._record_pending()
+        return self._cursor.close()
+
+    def __iter__(self):
+        for row in self._cursor:
+            self._add_rows(1)
+            yield row
+        self._record_pending()
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+
+class InstrumentedConnection:
+    """MySQL connection that hands out instrumented cursors"""
+
+    def __init__(self, connection, metrics=None):
+        self._connection = connection
+        self._metrics = metrics or query_metrics
+
+    def cursor(self, *args, **kwargs):
+        return InstrumentedCursor(self._connection.cursor(*args, **kwargs), self._metrics)
+
+    def __getattr__(self, name):
+        return getattr(self._connection, name)
+
+
+def instrument_neo4j(driver):
+    """Wrap a Neo4j driver unless instrumentation is disabled"""
+    return InstrumentedDriver(driver) if QUERY_METRICS and driver is not None else driver
+
+
+def instrument_mysql(connection):
+    """Wrap a MySQL connection unless instrumentation is disabled"""
+    return InstrumentedConnection(connection) if QUERY_METRICS and connection is not None else connection
@@ -0,0 +1,137 @@
+# db/job_sync.py
+import hashlib
+import logging
+import os
+import threading
+import time
+
+# Seconds between background job syncs; 0 disables the scheduler
+JOB_SYNC_INTERVAL = float(os.getenv("JOB_SYNC_INTERVAL", "0"))
+
+logger = logging.getLogger(__name__)
+
+
+class JobSyncScheduler:
+    """Runs the MySQL -> Neo4j job sync periodically on a daemon thread"""
+
+    def __init__(self, neo4j_conn, mysql_conn, interval=None):
+        """
+        Args:
+            neo4j_conn: Neo4jConnection to write jobs to
+            mysql_conn: MySQLConnection used only by this scheduler (MySQL
+                        connections must not be shared between threads)
+            interval: Seconds between syncs (defaults to JOB_SYNC_INTERVAL)
+        """
+        self.neo4j_conn = neo4j_conn
+        self.mysql_conn = mysql_conn
+        self.interval = JOB_SYNC_INTERVAL if interval is None else interval
+        self.last_stats = None
+        self.last_error = None
+        self.last_run = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def run_once(self):
+        """Sync now; errors are recorded and logged instead of raised"""
+        try:
+            self.last_stats = self.neo4j_conn.sync_jobs_from_mysql(self.mysql_conn)
+            self.last_error = None
+        except Exception as e:
+            self.last_error = str(e)
+            logger.error("Error syncing jobs: %s", e)
+        self.last_run = time.time()
+        return self.last_stats
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.run_once()
+            self._stop.wait(self.interval)
+
+    def start(self):
+        """Start the background thread (no-op when the interval is 0 or it is running)"""
+        if self.interval <= 0 or (self._thread and self._thread.is_alive()):
+            return self
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="job-sync", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, timeout=5):
+        """Stop the background thread and close the scheduler's MySQL connection"""
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+        self.mysql_conn.close()
+
+
+class _SyntheticJobSource:
+    """Benchmark stand-in for MySQLConnection serving generated job rows"""
+
+    def __init__(self, count):
+        self.jobs = {
+            str(n): {"id": n, "job title": f"Engineer {n}", "job_description": f"Build and run service {n}. " * 20}
+            for n in range(count)
+        }
+
+    def _hash(self, job):
+        return hashlib.sha256(f"{job['job title']}\x1f{job['job_description']}".encode()).hexdigest()
+
+    def get_job_hashes(self):
+        return {job_id: self._hash(job) for job_id, job in self.jobs.items()}
+
+    def get_jobs_by_ids(self, job_ids):
+        return [self.jobs[job_id] for job_id in job_ids]
+
+    def get_all_jobs(self):
+        return list(self.jobs.values())
+
+
+# Benchmark: per-row MERGE versus incremental sync for 10k jobs.
+# Writes Job nodes, so it only runs against an empty (scratch) Neo4j database.
+if __name__ == "__main__":
+    from db.db_integration import Neo4jConnection
+
+    count = int(os.getenv("JOB_SYNC_BENCHMARK_JOBS", "10000"))
+    neo4j_conn = Neo4jConnection()
+    if not neo4j_conn.connect():
+        raise SystemExit("Neo4j is not reachable")
+
+    with neo4j_conn.driver.session() as session:
+        existing = session.run("MATCH (j:Job) RETURN count(j) AS count").single()["count"]
+    if existing:
+        raise SystemExit(f"Refusing to run: the database already has {existing} Job nodes")
+
+    source = _SyntheticJobSource(count)
+
+    def timed(label, action):
+        started = time.perf_counter()
+        result = action()
+        print(f"{label:<40} {time.perf_counter() - started:8.2f} s   {result or ''}")
+
+    def per_row_merge():
+        # The previous implementation: one round trip per job on every sync
+        with neo4j_conn.driver.session() as session:
+            for job in source.get_all_jobs():
+                session.run("""
+                    MERGE (j:Job {job_id: $job_id})
+                    SET j.title = $job_title,
+                        j.description = $job_description,
+                        j.updated_at = datetime()
+                """, job_id=str(job["id"]), job_title=job["job title"],
+                    job_description=job["job_description"]).consume()
+
+    try:
+        neo4j_conn.setup_database()
+        timed(f"per-row MERGE ({count} jobs)", per_row_merge)
+        timed("incremental, first sync", lambda: neo4j_conn.sync_jobs_from_mysql(source))
+        timed("incremental, nothing changed", lambda: neo4j_conn.sync_jobs_from_mysql(source))
+
+        for n in range(0, count, 100):
+            source.jobs[str(n)]["job_description"] += " Updated."
+        for n in range(1, count, 200):
+            del source.jobs[str(n)]
+        timed("incremental, 1% changed, 0.5% removed", lambda: neo4j_conn.sync_jobs_from_mysql(source))
+    finally:
+        with neo4j_conn.driver.session() as session:
+            session.run("MATCH (j:Job) DETACH DELETE j").consume()
+        neo4j_conn.close()
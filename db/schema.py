@@ -0,0 +1,222 @@
+# db/schema.py
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Constraints and indexes the application's queries rely on.
+# Each entry is (name, statement); statements use IF NOT EXISTS so applying is idempotent.
+CONSTRAINTS = [
+    # Every candidate lookup is by id
+    ("candidate_id_unique", """CREATE CONSTRAINT candidate_id_unique IF NOT EXISTS
+        FOR (c:Candidate) REQUIRE c.id IS UNIQUE"""),
+
+    ("job_id_unique", """CREATE CONSTRAINT job_id_unique IF NOT EXISTS
+        FOR (j:Job) REQUIRE j.job_id IS UNIQUE"""),
+
+    # Skills are MERGEd on their canonical name
+    ("skill_name_unique", """CREATE CONSTRAINT skill_name_unique IF NOT EXISTS
+        FOR (s:Skill) REQUIRE s.name IS UNIQUE"""),
+]
+
+INDEXES = [
+    # Candidates may apply more than once with the same email, so this is not unique
+    ("candidate_email", """CREATE INDEX candidate_email IF NOT EXISTS
+        FOR (c:Candidate) ON (c.email)"""),
+
+    ("candidate_name", """CREATE INDEX candidate_name IF NOT EXISTS
+        FOR (c:Candidate) ON (c.name)"""),
+
+    ("job_title", """CREATE INDEX job_title IF NOT EXISTS
+        FOR (j:Job) ON (j.title)"""),
+
+    ("skill_id", """CREATE INDEX skill_id IF NOT EXISTS
+        FOR (s:Skill) ON (s.id)"""),
+
+    # MERGE targets in store_candidate
+    ("university_name", """CREATE INDEX university_name IF NOT EXISTS
+        FOR (u:University) ON (u.name)"""),
+
+    ("company_name", """CREATE INDEX company_name IF NOT EXISTS
+        FOR (co:Company) ON (co.name)"""),
+
+    # Recent applications on the dashboard
+    ("applied_for_date", """CREATE INDEX applied_for_date IF NOT EXISTS
+        FOR ()-[a:APPLIED_FOR]-() ON (a.date)"""),
+
+    # Job candidates listing: equality on job_id, ordered by final_score
+    ("matches_job_final_score", """CREATE INDEX matches_job_final_score IF NOT EXISTS
+        FOR ()-[m:MATCHES]-() ON (m.job_id, m.final_score)"""),
+]
+
+# Schema objects from earlier versions that must be removed
+OBSOLETE = [
+    # store_candidate creates a new candidate per application, so emails repeat
+    ("candidate_email_unique", "DROP CONSTRAINT candidate_email_unique IF EXISTS"),
+]
+
+# Lookups issued on every request; none of them may scan a whole label or relationship type.
+# Each entry is (name, query, parameters).
+HOT_QUERIES = [
+    ("candidate by id",
+     "MATCH (c:Candidate {id: $candidate_id}) RETURN c.name",
+     {"candidate_id": ""}),
+
+    ("job by id",
+     "MATCH (j:Job {job_id: $job_id}) RETURN j.title",
+     {"job_id": ""}),
+
+    ("candidate application",
+     """MATCH (c:Candidate {id: $candidate_id})-[a:APPLIED_FOR]->(j:Job {job_id: $job_id})
+        RETURN a.status""",
+     {"candidate_id": "", "job_id": ""}),
+
+    ("job candidates page",
+     """MATCH (c:Candidate)-[m:MATCHES]->(j:Job)
+        WHERE m.job_id = $job_id AND m.final_score IS NOT NULL AND m.final_score <= $after_score
+        RETURN c.id, m.final_score
+        ORDER BY m.final_score DESC, c.id ASC
+        LIMIT 51""",
+     {"job_id": "", "after_score": 1.0}),
+
+    ("job unmatched applicants",
+     """MATCH (c:Candidate)-[a:APPLIED_FOR]->(j:Job {job_id: $job_id})
+        WHERE NOT EXISTS { MATCH (c)-[m:MATCHES]->(j) WHERE m.final_score IS NOT NULL }
+        RETURN c.id
+        ORDER BY c.id ASC
+        LIMIT 51""",
+     {"job_id": ""}),
+
+    ("recent applications",
+     """MATCH (c:Candidate)-[a:APPLIED_FOR]->(j:Job)
+        WHERE a.date IS NOT NULL
+        RETURN c.id, j.title, a.date
+        ORDER BY a.date DESC
+        LIMIT 5""",
+     {}),
+
+    ("skill by name",
+     "MERGE (s:Skill {name: $name}) RETURN s.id",
+     {"name": ""}),
+
+    ("skill by id",
+     "MATCH (s:Skill {id: $skill_id}) RETURN s.name",
+     {"skill_id": ""}),
+
+    ("university by name",
+     "MERGE (u:University {name: $name}) RETURN u",
+     {"name": ""}),
+
+    ("company by name",
+     "MERGE (co:Company {name: $name}) RETURN co",
+     {"name": ""}),
+]
+
+# Plan operators that read every node of a label or every relationship of a type
+SCAN_OPERATORS = {
+    "AllNodesScan",
+    "NodeByLabelScan",
+    "DirectedAllRelationshipsScan",
+    "UndirectedAllRelationshipsScan",
+    "DirectedRelationshipTypeScan",
+    "UndirectedRelationshipTypeScan",
+}
+
+
+def _plan_operators(plan):
+    """Yield the operator names of an EXPLAIN plan tree (without the '@neo4j' suffix)"""
+    yield plan["operatorType"].split("@")[0]
+    for child in plan.get("children", []):
+        yield from _plan_operators(child)
+
+
+class SchemaManager:
+    """Applies the declared constraints and indexes and checks that hot queries use them"""
+
+    def __init__(self, driver):
+        """
+        Args:
+            driver: Neo4j driver
+        """
+        self.driver = driver
+
+    def existing(self):
+        """
+        Names of the constraints and indexes in the database
+
+        Returns:
+            dict: {"constraints": set of names, "indexes": dict of name -> state}
+        """
+        with self.driver.session() as session:
+            constraints = {record["name"] for record in session.run("SHOW CONSTRAINTS YIELD name")}
+            indexes = {
+                record["name"]: record["state"]
+                for record in session.run("SHOW INDEXES YIELD name, state")
+            }
+        return {"constraints": constraints, "indexes": indexes}
+
+    def apply(self, wait_seconds=300):
+        """
+        Bring the schema up to date; safe to run any number of times
+
+        Args:
+            wait_seconds: How long to wait for new indexes to come online (0 to not wait)
+
+        Returns:
+            dict: Names of the objects created, dropped and already present
+        """
+        current = self.existing()
+        present = current["constraints"] | set(current["indexes"])
+        summary = {"created": [], "dropped": [], "present": []}
+
+        with self.driver.session() as session:
+            for name, statement in OBSOLETE:
+                if name in present:
+                    session.run(statement).consume()
+                    summary["dropped"].append(name)
+
+            for name, statement in CONSTRAINTS + INDEXES:
+                if name in present:
+                    summary["present"].append(name)
+                    continue
+                try:
+                    session.run(statement).consume()
+                    summary["created"].append(name)
+                except Exception as e:
+                    # e.g. duplicate values already in the data; report and keep going
+                    logger.error("Error creating %s: %s", name, e)
+
+            if summary["created"] and wait_seconds:
+                session.run("CALL db.awaitIndexes($timeout)", timeout=wait_seconds).consume()
+
+        logger.info("Neo4j schema: created %d, dropped %d, %d already present",
+                    len(summary['created']), len(summary['dropped']), len(summary['present']))
+        return summary
+
+    def explain(self, query, parameters=None):
+        """
+        Operators the planner would use for a query
+
+        Args:
+            query: Cypher query (run with EXPLAIN, so nothing is executed)
+            parameters: Query parameters
+
+        Returns:
+            list: Operator names of the plan
+        """
+        with self.driver.session() as session:
+            summary = session.run("EXPLAIN " + query, parameters or {}).consume()
+        return list(_plan_operators(summary.plan)) if summary.plan else []
+
+    def verify(self):
+        """
+        EXPLAIN every hot query and report the ones that would scan
+
+        Returns:
+            list: (query name, scanning operators) for each query that scans; empty when all use indexes
+        """
+        problems = []
+        for name, query, parameters in HOT_QUERIES:
+            scans = [operator for operator in self.explain(query, parameters) if operator in SCAN_OPERATORS]
+            if scans:
+                problems.append((name, scans))
+        return problems
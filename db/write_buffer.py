@@ -0,0 +1,209 @@
+# db/write_buffer.py
+import atexit
+import logging
+import os
+import threading
+import time
+
+# Flush when this many rows are waiting...
+WRITE_BUFFER_SIZE = int(os.getenv("WRITE_BUFFER_SIZE", "200"))
+# ...or when the oldest row has waited this many seconds
+WRITE_BUFFER_SECONDS = float(os.getenv("WRITE_BUFFER_SECONDS", "1.0"))
+
+# A batch that fails is retried this many times, waiting RETRY_SECONDS, then twice as long, ...
+WRITE_BUFFER_RETRIES = int(os.getenv("WRITE_BUFFER_RETRIES", "3"))
+WRITE_BUFFER_RETRY_SECONDS = float(os.getenv("WRITE_BUFFER_RETRY_SECONDS", "0.5"))
+
+logger = logging.getLogger(__name__)
+
+
+class WriteBehindBuffer:
+    """
+    Collects rows and writes them in batches on a background thread
+
+    A batch is flushed when max_size rows are waiting or the oldest row has
+    waited max_delay seconds, whichever comes first. A batch that fails is
+    retried with exponential backoff; rows that still cannot be written are
+    dropped and counted in rows_dropped. close() flushes what is left and is
+    registered with atexit while the writer runs, so queued rows are written
+    on a normal shutdown.
+    """
+
+    def __init__(self, flush_fn, max_size=None, max_delay=None, name="write-buffer", retries=None,
+                 retry_delay=None):
+        """
+        Args:
+            flush_fn: Called with a list of rows; should write them in one transaction
+            max_size: Rows per batch (defaults to WRITE_BUFFER_SIZE)
+            max_delay: Seconds a row may wait (defaults to WRITE_BUFFER_SECONDS)
+            name: Thread name, also used in log messages
+            retries: Retries of a failed batch (defaults to WRITE_BUFFER_RETRIES)
+            retry_delay: Seconds before the first retry (defaults to WRITE_BUFFER_RETRY_SECONDS)
+        """
+        self.flush_fn = flush_fn
+        self.max_size = WRITE_BUFFER_SIZE if max_size is None else max_size
+        self.max_delay = WRITE_BUFFER_SECONDS if max_delay is None else max_delay
+        self.retries = WRITE_BUFFER_RETRIES if retries is None else retries
+        self.retry_delay = WRITE_BUFFER_RETRY_SECONDS if retry_delay is None else retry_delay
+        self.name = name
+        self.rows_written = 0
+        self.rows_retried = 0
+        self.rows_dropped = 0
+        self.flushes = 0
+
+        self._rows = []
+        self._oldest = None
+        self._closed = False
+        self._condition = threading.Condition()
+        # Held while a batch is being written, so flush() returns only after earlier batches
+        self._flush_lock = threading.Lock()
+        self._thread = None
+
+    def __len__(self):
+        with self._condition:
+            return len(self._rows)
+
+    def add(self, row):
+        """Queue one row; starts the background writer on first use"""
+        with self._condition:
+            if self._closed:
+                raise RuntimeError(f"{self.name} is closed")
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+                self._thread.start()
+                atexit.register(self.close)
+            first = not self._rows
+            if first:
+                self._oldest = time.monotonic()
+            self._rows.append(row)
+            # The writer sleeps without a timeout while the buffer is empty; wake it to start the timer
+            if first or len(self._rows) >= self.max_size:
+                self._condition.notify()
+
+    def _take(self):
+        rows, self._rows, self._oldest = self._rows, [], None
+        return rows
+
+    def _write(self, rows):
+        for start in range(0, len(rows), self.max_size):
+            chunk = rows[start:start + self.max_size]
+            attempt = 0
+            while True:
+                try:
+                    self.flush_fn(chunk)
+                    self.rows_written += len(chunk)
+                    break
+                except Exception as e:
+                    if attempt >= self.retries:
+                        self.rows_dropped += len(chunk)
+                        logger.error("%s: dropped %d rows after %d attempts: %s", self.name, len(chunk),
+                                     attempt + 1, e)
+                        break
+                    delay = self.retry_delay * 2 ** attempt
+                    attempt += 1
+                    self.rows_retried += len(chunk)
+                    logger.warning("%s: could not write %d rows, retrying in %.1fs: %s", self.name, len(chunk),
+                                   delay, e)
+                    # New rows keep queueing meanwhile and go out in the next batch
+                    time.sleep(delay)
+            self.flushes += 1
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._closed:
+                    if len(self._rows) >= self.max_size:
+                        break
+                    if self._rows and time.monotonic() - self._oldest >= self.max_delay:
+                        break
+                    timeout = self.max_delay - (time.monotonic() - self._oldest) if self._rows else None
+                    self._condition.wait(timeout)
+                if self._closed:
+                    return
+            self.flush()
+
+    def flush(self):
+        """Write everything queued so far before returning"""
+        with self._flush_lock:
+            with self._condition:
+                rows = self._take()
+            self._write(rows)
+
+    def close(self):
+        """Stop the background writer and flush the remaining rows"""
+        with self._condition:
+            if self._closed:
+                return
+            self._closed = True
+            self._condition.notify()
+        if self._thread is not None:
+            self._thread.join()
+            atexit.unregister(self.close)
+        self.flush()
+
+    def stats(self):
+        return {
+            "queued": len(self),
+            "rows_written": self.rows_written,
+            "rows_retried": self.rows_retried,
+            "rows_dropped": self.rows_dropped,
+            "flushes": self.flushes
+        }
+
+
+# Benchmark: match pairs written per second, one transaction per pair versus
+# buffered UNWIND batches. Uses Candidate and Job nodes with "bench-" ids and
+# deletes them afterwards.
+if __name__ == "__main__":
+    from db.db_integration import MatchingEngine, Neo4jConnection
+    from utils.synthetic_data import synthetic_resume_text
+
+    pairs = int(os.getenv("WRITE_BUFFER_BENCHMARK_PAIRS", "2000"))
+    neo4j_conn = Neo4jConnection()
+    if not neo4j_conn.connect():
+        raise SystemExit("Neo4j is not reachable")
+
+    resumes = [synthetic_resume_text(pages=1) for _ in range(50)]
+    job_count = 20
+    candidate_count = pairs // job_count
+
+    try:
+        with neo4j_conn.driver.session() as session:
+            session.run("""
+                UNWIND range(0, $jobs - 1) AS n
+                CREATE (:Job {job_id: 'bench-' + n, description: 'python sql docker aws react kubernetes flask git'})
+            """, jobs=job_count).consume()
+            session.run("""
+                UNWIND range(0, $candidates - 1) AS n
+                CREATE (:Candidate {id: 'bench-' + n})
+            """, candidates=candidate_count).consume()
+
+        work = [
+            (f"bench-{c}", f"bench-{j}", resumes[c % len(resumes)])
+            for c in range(candidate_count) for j in range(job_count)
+        ]
+        engine = MatchingEngine(neo4j_conn.driver)
+
+        sample = work[:min(len(work), 500)]
+        started = time.perf_counter()
+        for candidate_id, job_id, resume_text in sample:
+            engine.match_candidate_to_job(candidate_id, job_id, resume_text)
+        single = len(sample) / (time.perf_counter() - started)
+
+        started = time.perf_counter()
+        for candidate_id, job_id, resume_text in work:
+            engine.queue_match(candidate_id, job_id, resume_text)
+        engine.match_buffer.close()
+        buffered = len(work) / (time.perf_counter() - started)
+
+        print(f"one transaction per pair: {single:8.0f} pairs/s ({len(sample)} pairs)")
+        print(f"write-behind UNWIND:      {buffered:8.0f} pairs/s ({len(work)} pairs, "
+              f"{engine.match_buffer.flushes} flushes of up to {engine.match_buffer.max_size})")
+    finally:
+        with neo4j_conn.driver.session() as session:
+            session.run("""
+                MATCH (n)
+                WHERE (n:Candidate AND n.id STARTS WITH 'bench-') OR (n:Job AND n.job_id STARTS WITH 'bench-')
+                DETACH DELETE n
+            """).consume()
+        neo4j_conn.close()
@@ -0,0 +1,9 @@
+# tests/conftest.py
+import os
+import sys
+
+# Modules import each other as top-level packages (agents, db, utils), like app.py does
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# The shared LLM clients need a key to be built; nothing in the tests calls Groq
+os.environ.setdefault("GROQ_API_KEY", "test")
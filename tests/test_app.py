@@ -0,0 +1,22 @@
+# tests/test_app.py
+import os
+import subprocess
+import sys
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_importing_app_starts_no_threads_and_creates_no_instance():
+    # A fresh interpreter, since other tests may already have created apps
+    output = subprocess.run(
+        [sys.executable, "-c", "import threading, app; print(threading.active_count(), hasattr(app, 'app'))"],
+        cwd=PROJECT_ROOT, capture_output=True, text=True, check=True
+    )
+    assert output.stdout.split() == ["1", "False"]
+
+
+def test_create_app_registers_the_cli_commands():
+    from app import create_app
+
+    commands = create_app().cli.commands
+    assert {"init-db", "sync-jobs", "migrate-resumes", "backfill-match-scores"} <= set(commands)
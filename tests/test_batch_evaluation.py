@@ -0,0 +1,81 @@
+# tests/test_batch_evaluation.py
+import threading
+import time
+
+import pytest
+
+from utils.batch_evaluation import BatchEvaluationManager
+
+
+class FakeCandidateManager:
+    def __init__(self):
+        self.stored = []
+
+    def _store_llm_evaluations(self, rows):
+        self.stored.extend(rows)
+
+
+class FakeEngine:
+    """LLMMatchingEngine stand-in whose evaluations wait until `release` is set"""
+
+    def __init__(self):
+        self.candidate_manager = FakeCandidateManager()
+        self.release = threading.Event()
+        self.started = threading.Event()
+
+    def _get_evaluation_context(self, candidate_id, job_id):
+        return {"candidate_id": candidate_id, "job_id": job_id}
+
+    def _build_messages(self, context):
+        return [{"role": "user", "content": f"evaluate {context['candidate_id']}"}]
+
+    def evaluate_messages(self, messages):
+        self.started.set()
+        self.release.wait(5)
+        return {"score": 80, "category": "Good Match"}
+
+
+def manager_for(engine, candidate_ids, monkeypatch, **kwargs):
+    manager = BatchEvaluationManager(driver=None, llm_matching_engine=engine, **kwargs)
+    monkeypatch.setattr(manager, "_pending_candidates", lambda job_id: list(candidate_ids))
+    return manager
+
+
+def test_batch_finishes_once_every_evaluation_is_written(monkeypatch):
+    engine = FakeEngine()
+    engine.release.set()
+    manager = manager_for(engine, ["c1", "c2", "c3"], monkeypatch, workers=2)
+    manager.start("j1")
+
+    # A row queued just after the last worker's flush waits for the buffer's timer
+    deadline = time.time() + 10
+    while manager.progress("j1")["status"] == "running" and time.time() < deadline:
+        time.sleep(0.02)
+    progress = manager.progress("j1")
+    manager.shutdown()
+
+    assert progress["status"] == "finished"
+    assert progress["completed"] == 3
+    assert sorted(row[0] for row in engine.candidate_manager.stored) == ["c1", "c2", "c3"]
+
+
+def test_shutdown_marks_unfinished_batches_cancelled(monkeypatch):
+    engine = FakeEngine()
+    manager = manager_for(engine, ["c1", "c2", "c3", "c4"], monkeypatch, workers=1)
+    manager.start("j1")
+    assert engine.started.wait(5)
+
+    manager.shutdown()
+    progress = manager.progress("j1")
+    assert progress["status"] == "cancelled"
+    assert progress["cancelled"] == 4
+    assert "Stopped by shutdown" in progress["errors"][-1]
+
+    # The call that was in flight finishes after the buffer closed and is not written
+    engine.release.set()
+    manager.executor.shutdown(wait=True)
+    assert engine.candidate_manager.stored == []
+    assert manager.progress("j1")["status"] == "cancelled"
+
+    with pytest.raises(RuntimeError):
+        manager.start("j2")
@@ -0,0 +1,47 @@
+# tests/test_batching.py
+from agents.batching import (
+    MAX_BATCH_DOCUMENTS, OUTPUT_TOKENS_PER_DOCUMENT, batch_output_tokens, pack_documents, parse_batch_response
+)
+
+
+def documents(count, chars=40):
+    return [{"id": str(i), "text": "x" * chars} for i in range(count)]
+
+
+def test_batches_are_capped_so_each_document_keeps_the_single_call_output_budget():
+    batches, oversized = pack_documents(documents(20), token_budget=100000, max_documents=10)
+
+    assert [len(batch) for batch in batches] == [MAX_BATCH_DOCUMENTS, MAX_BATCH_DOCUMENTS, 4]
+    assert oversized == []
+    assert batch_output_tokens(MAX_BATCH_DOCUMENTS) // MAX_BATCH_DOCUMENTS == OUTPUT_TOKENS_PER_DOCUMENT
+
+
+def test_batches_respect_the_prompt_budget_and_set_aside_oversized_documents():
+    docs = documents(3, chars=400) + [{"id": "big", "text": "x" * 4000}]
+    batches, oversized = pack_documents(docs, token_budget=250)
+
+    assert [[doc["id"] for doc in batch] for batch in batches] == [["0", "1"], ["2"]]
+    assert [doc["id"] for doc in oversized] == ["big"]
+
+
+def test_parse_keeps_expected_documents_only():
+    content = """Here you go:
+```json
+[{"document_id": "1", "analysis": {"skills": ["Go"]}},
+ {"document_id": "9", "analysis": {"skills": ["Rust"]}},
+ {"document_id": "2", "analysis": {}}]
+```"""
+    assert parse_batch_response(content, ["1", "2"]) == {"1": {"skills": ["Go"]}}
+
+
+def test_parse_keeps_the_complete_items_of_a_truncated_array():
+    content = ('[{"document_id": "1", "analysis": {"a": 1}}, '
+               '{"document_id": "2", "analysis": {"b": [1, 2]}}, '
+               '{"document_id": "3", "analysis": {"c": "cut o')
+
+    assert parse_batch_response(content, [1, 2, 3]) == {"1": {"a": 1}, "2": {"b": [1, 2]}}
+
+
+def test_parse_without_an_array_returns_nothing():
+    assert parse_batch_response("Sorry, I cannot help with that.", ["1"]) == {}
+    assert parse_batch_response("", ["1"]) == {}
@@ -0,0 +1,186 @@
+# tests/test_candidates_page.py
+import pytest
+
+from db.db_integration import NOT_EVALUATED, UNMATCHED_CURSOR_SCORE, MatchingEngine
+
+# candidate id -> (application status, MATCHES properties or None)
+APPLICANTS = {
+    "c01": ("New", {"llm_score": 91.0, "llm_category": "Strong Match", "score": 40.0, "category": "Weak Match"}),
+    "c02": ("New", {"score": 75.0, "category": "Good Match"}),
+    "c03": ("Shortlisted", {"llm_score": 75.0, "llm_category": "Good Match"}),
+    "c04": ("New", None),
+    "c05": ("Rejected", {"score": 20.0, "category": "Weak Match"}),
+    "c06": ("New", {"score": 0.0, "category": "Weak Match"}),
+    "c07": ("Shortlisted", None),
+    "c08": ("New", {"llm_score": 75.0, "llm_category": "Good Match"}),
+    # Written by the write-behind buffer later, or before final_score existed
+    "c09": ("New", {"score": 55.0, "category": "Average Match", "pending": True}),
+    "c10": ("New", None),
+}
+
+
+def final(match):
+    """final_score/final_category as store_matches and backfill-match-scores write them"""
+    return (
+        match.get("llm_score", match.get("score", 0)),
+        match.get("llm_category", match.get("category", NOT_EVALUATED))
+    )
+
+
+def row(candidate_id, status, score, category):
+    return {
+        "candidate_id": candidate_id,
+        "name": f"Name {candidate_id}",
+        "email": f"{candidate_id}@example.com",
+        "application_date": "2024-01-01",
+        "application_status": status,
+        "match_score": score,
+        "match_category": category
+    }
+
+
+class FakeResult(list):
+    pass
+
+
+class PageDriver:
+    """Answers the two page queries of get_candidates_page from APPLICANTS"""
+
+    def __init__(self):
+        self.queries = []
+
+    def session(self):
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def run(self, query, **params):
+        if "ORDER BY m.final_score DESC, c.id ASC" in query:
+            self.queries.append("scored")
+            return FakeResult(self.scored(params))
+        if "$not_evaluated AS match_category" in query:
+            self.queries.append("unmatched")
+            return FakeResult(self.unmatched(params))
+        raise AssertionError(f"unexpected query: {query}")
+
+    def scored(self, params):
+        rows = []
+        for candidate_id, (status, match) in APPLICANTS.items():
+            if match is None or match.get("pending"):
+                continue
+            score, category = final(match)
+            if params["status"] is not None and status != params["status"]:
+                continue
+            if params["category"] and category != params["category"]:
+                continue
+            after_score = params["after_score"]
+            if after_score is not None and not (
+                score < after_score or (score == after_score and candidate_id > params["after_id"])
+            ):
+                continue
+            rows.append(row(candidate_id, status, score, category))
+        rows.sort(key=lambda item: (-item["match_score"], item["candidate_id"]))
+        return rows[:params["limit"]]
+
+    def unmatched(self, params):
+        rows = [
+            row(candidate_id, status, 0.0, params["not_evaluated"])
+            for candidate_id, (status, match) in sorted(APPLICANTS.items())
+            if (match is None or match.get("pending"))
+            and (params["status"] is None or status == params["status"])
+            and (params["after_id"] is None or candidate_id > params["after_id"])
+        ]
+        return rows[:params["limit"]]
+
+
+def baseline_candidates(status=None, category=None):
+    """The applicant list the job page showed before paging: every applicant, best match first"""
+    rows = []
+    for candidate_id, (application_status, match) in APPLICANTS.items():
+        if match is None:
+            score, category_value = 0, NOT_EVALUATED
+        else:
+            score = match.get("llm_score", match.get("score", 0))
+            category_value = match.get("llm_category", match.get("category", NOT_EVALUATED))
+        rows.append((candidate_id, application_status, score, category_value))
+    return [item for item in rows
+            if (status is None or item[1] == status) and (category is None or item[3] == category)]
+
+
+def all_pages(engine, limit, **filters):
+    pages = []
+    after = None
+    while True:
+        candidates, after = engine.get_candidates_page("j1", limit=limit, after=after, **filters)
+        pages.append(candidates)
+        if after is None:
+            return pages
+        assert len(pages) < 50, "pagination does not terminate"
+
+
+@pytest.fixture
+def engine():
+    matching_engine = MatchingEngine.__new__(MatchingEngine)
+    matching_engine.driver = PageDriver()
+    return matching_engine
+
+
+@pytest.mark.parametrize("limit", [1, 2, 3, 4, 7, 10, 50])
+def test_pages_list_every_applicant_once_best_first(engine, limit):
+    pages = all_pages(engine, limit)
+    rows = [item for page in pages for item in page]
+
+    assert all(len(page) <= limit for page in pages)
+    assert len(pages) == max(1, -(-len(APPLICANTS) // limit))
+    assert [item["candidate_id"] for item in rows] == [
+        "c01", "c02", "c03", "c08", "c05", "c06", "c04", "c07", "c09", "c10"
+    ]
+    scores = [item["match_score"] for item in rows]
+    assert scores == sorted(scores, reverse=True)
+
+
+@pytest.mark.parametrize("status,category", [
+    (None, None), ("New", None), ("Shortlisted", None), (None, "Good Match"), (None, NOT_EVALUATED),
+    ("New", NOT_EVALUATED), (None, "Weak Match")
+])
+def test_pages_hold_the_same_applicants_as_the_unpaged_baseline(engine, status, category):
+    rows = [item for page in all_pages(engine, 3, status=status, category=category) for item in page]
+    expected = baseline_candidates(status, category)
+
+    # Matches the write-behind buffer has not scored yet are listed as not evaluated for now
+    pending = {candidate_id for candidate_id, (_, match) in APPLICANTS.items() if match and match.get("pending")}
+    if category is None:
+        assert {item["candidate_id"] for item in rows} == {item[0] for item in expected}
+    else:
+        assert {item["candidate_id"] for item in rows} - pending == {item[0] for item in expected} - pending
+
+    for item in rows:
+        if item["candidate_id"] not in pending:
+            _, application_status, score, category_value = next(
+                expected_row for expected_row in expected if expected_row[0] == item["candidate_id"]
+            )
+            assert (item["application_status"], item["match_score"], item["match_category"]) == \
+                (application_status, score, category_value)
+
+
+def test_cursor_switches_to_unmatched_applicants_after_the_scored_ones(engine):
+    candidates, after = engine.get_candidates_page("j1", limit=7)
+    assert candidates[-1]["candidate_id"] == "c04"
+    assert after == (UNMATCHED_CURSOR_SCORE, "c04")
+
+    engine.driver.queries.clear()
+    candidates, after = engine.get_candidates_page("j1", limit=7, after=after)
+    assert [item["candidate_id"] for item in candidates] == ["c07", "c09", "c10"]
+    assert after is None
+    # Past the scored applicants only the unmatched query runs
+    assert engine.driver.queries == ["unmatched"]
+
+
+def test_category_filter_skips_the_unmatched_query(engine):
+    candidates, after = engine.get_candidates_page("j1", limit=10, category="Good Match")
+    assert [item["candidate_id"] for item in candidates] == ["c02", "c03", "c08"]
+    assert engine.driver.queries == ["scored"]
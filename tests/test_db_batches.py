@@ -0,0 +1,97 @@
+# tests/test_db_batches.py
+import db.db_integration as db_integration
+from db.db_integration import Neo4jConnection
+
+
+class FakeResult:
+    def __init__(self, records):
+        self.records = records
+
+    def __iter__(self):
+        return iter(self.records)
+
+    def single(self):
+        return self.records[0] if self.records else None
+
+    def consume(self):
+        return None
+
+
+class StuckGraph:
+    """
+    Answers the batch queries from a dict of element ID -> properties
+
+    Elements listed in `stuck` keep matching the batch filter after every
+    update, like a MATCHES relationship whose Job has no job_id.
+    """
+
+    def __init__(self, elements, stuck=()):
+        self.elements = elements
+        self.stuck = set(stuck)
+        self.queries = 0
+
+    def session(self):
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def pending(self, after, limit):
+        ids = sorted(element_id for element_id, properties in self.elements.items()
+                     if properties.get("pending") and element_id > after)
+        return ids[:limit]
+
+    def run(self, query, **parameters):
+        self.queries += 1
+        assert self.queries < 100, "batch loop does not terminate"
+
+        if "RETURN count(m) AS updated" in query:
+            ids = self.pending(parameters["after"], parameters["batch_size"])
+            for element_id in ids:
+                self.elements[element_id]["pending"] = element_id in self.stuck
+            return FakeResult([{"updated": len(ids), "last_id": max(ids) if ids else None}])
+
+        if "RETURN elementId(c) AS node_id" in query:
+            ids = self.pending(parameters["after"], parameters["batch_size"])
+            return FakeResult([{"node_id": element_id, "resume_text": f"resume {element_id}"} for element_id in ids])
+
+        if "REMOVE c.resume_text" in query:
+            moved = [row["node_id"] for row in parameters["rows"] if row["node_id"] not in self.stuck]
+            for element_id in moved:
+                self.elements[element_id]["pending"] = False
+            return FakeResult([{"migrated": len(moved)}])
+
+        raise AssertionError(f"unexpected query: {query}")
+
+
+class FakeBlobStore:
+    root = "memory"
+
+    def put(self, text):
+        return str(hash(text))
+
+
+def connection(graph):
+    neo4j_conn = Neo4jConnection()
+    neo4j_conn.driver = graph
+    return neo4j_conn
+
+
+def test_backfill_match_scores_passes_stuck_relationships_once():
+    graph = StuckGraph({f"r{n:02d}": {"pending": True} for n in range(10)}, stuck=["r00", "r01", "r02"])
+    updated = connection(graph).backfill_match_scores(batch_size=3)
+
+    assert updated == 10
+    assert all(not graph.elements[f"r{n:02d}"]["pending"] for n in range(3, 10))
+
+
+def test_migrate_resume_text_skips_candidates_the_update_misses(monkeypatch):
+    monkeypatch.setattr(db_integration, "get_blob_store", FakeBlobStore)
+    graph = StuckGraph({f"c{n:02d}": {"pending": True} for n in range(7)}, stuck=["c03"])
+    migrated = connection(graph).migrate_resume_text(batch_size=2)
+
+    assert migrated == 6
+    assert [element_id for element_id, properties in graph.elements.items() if properties["pending"]] == ["c03"]
@@ -0,0 +1,233 @@
+# tests/test_instrumentation.py
+import pytest
+
+from db.instrumentation import (
+    InstrumentedConnection, InstrumentedDriver, QueryMetrics, _db_hits, parameter_shape, query_name
+)
+
+
+class FakeSummary:
+    def __init__(self, profile=None):
+        self.profile = profile
+
+
+class FakeResult:
+    def __init__(self, records, profile=None):
+        self.records = records
+        self.profile = profile
+        self.keys_called = False
+
+    def __iter__(self):
+        return iter(self.records)
+
+    def single(self):
+        return self.records[0] if self.records else None
+
+    def data(self):
+        return list(self.records)
+
+    def consume(self):
+        return FakeSummary(self.profile)
+
+    def keys(self):
+        self.keys_called = True
+        return ["n"]
+
+
+class FakeTransaction:
+    def __init__(self, session):
+        self.session = session
+
+    def run(self, query, parameters=None, **kwargs):
+        return self.session.run(query, parameters, **kwargs)
+
+
+class FakeSession:
+    def __init__(self, rows=3, fail=False):
+        self.rows = rows
+        self.fail = fail
+        self.queries = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def run(self, query, parameters=None, **kwargs):
+        self.queries.append(query)
+        if self.fail:
+            raise RuntimeError("syntax error")
+        profile = {"dbHits": 4, "children": [{"dbHits": 6, "children": []}]} if query.startswith("PROFILE") else None
+        return FakeResult([{"n": n} for n in range(self.rows)], profile)
+
+    def execute_read(self, work, *args, **kwargs):
+        return work(FakeTransaction(self), *args, **kwargs)
+
+    def close(self):
+        pass
+
+
+class FakeDriver:
+    def __init__(self, **session_kwargs):
+        self.session_kwargs = session_kwargs
+        self.sessions = []
+
+    def session(self, **kwargs):
+        session = FakeSession(**self.session_kwargs)
+        self.sessions.append(session)
+        return session
+
+
+def only(metrics):
+    stats = metrics.snapshot()
+    assert len(stats) == 1
+    return stats[0]
+
+
+def test_parameter_shape_hides_values():
+    assert parameter_shape({"job_id": "j1", "rows": [1, 2, 3], "limit": 5}) == "job_id:str, limit:int, rows:list[3]"
+    assert parameter_shape(("a", 1)) == "0:str, 1:int"
+    assert parameter_shape(None) == ""
+
+
+def test_query_name_uses_the_calling_function_and_first_line():
+    def load_page():
+        return query_name("\n  // comment\n  MATCH (c:Candidate)\n  RETURN c")
+    assert load_page() == "load_page: MATCH (c:Candidate)"
+
+
+def test_db_hits_sum_the_plan_tree():
+    assert _db_hits({"dbHits": 1, "children": [{"args": {"DbHits": 2}, "children": [{"dbHits": 3}]}]}) == 6
+    assert _db_hits(None) == 0
+
+
+def test_session_records_rows_once_the_result_is_read():
+    metrics = QueryMetrics(slow_query_ms=10000)
+    driver = InstrumentedDriver(FakeDriver(rows=3), metrics, profile_rate=0)
+
+    with driver.session() as session:
+        result = session.run("MATCH (n) RETURN n", job_id="j1")
+        assert metrics.snapshot() == []
+        assert len(list(result)) == 3
+
+    stats = only(metrics)
+    assert (stats["backend"], stats["count"], stats["rows"], stats["errors"]) == ("neo4j", 1, 3, 0)
+    assert stats["parameters"] == "job_id:str"
+    assert sum(stats["histogram"].values()) == 1
+
+
+def test_unread_results_are_recorded_when_the_session_closes():
+    metrics = QueryMetrics(slow_query_ms=10000)
+    driver = InstrumentedDriver(FakeDriver(rows=3), metrics, profile_rate=0)
+
+    with driver.session() as session:
+        session.run("MATCH (n) RETURN n")
+    assert only(metrics)["rows"] == 0
+    assert only(metrics)["count"] == 1
+
+
+def test_transaction_functions_are_recorded():
+    metrics = QueryMetrics(slow_query_ms=10000)
+    driver = InstrumentedDriver(FakeDriver(rows=2), metrics, profile_rate=0)
+
+    with driver.session() as session:
+        record = session.execute_read(lambda tx: tx.run("MATCH (n) RETURN n").single())
+    assert record == {"n": 0}
+    assert only(metrics)["rows"] == 1
+
+
+def test_failed_query_is_counted_as_an_error():
+    metrics = QueryMetrics(slow_query_ms=10000)
+    driver = InstrumentedDriver(FakeDriver(fail=True), metrics, profile_rate=0)
+
+    with driver.session() as session:
+        with pytest.raises(RuntimeError):
+            session.run("MATCH (n RETURN n")
+    assert only(metrics)["errors"] == 1
+
+
+def test_sampled_queries_are_profiled_except_schema_commands():
+    metrics = QueryMetrics(slow_query_ms=10000)
+    fake = FakeDriver(rows=1)
+    driver = InstrumentedDriver(fake, metrics, profile_rate=1.0)
+
+    with driver.session() as session:
+        list(session.run("MATCH (n) RETURN n"))
+        session.run("CREATE INDEX candidate_id IF NOT EXISTS FOR (c:Candidate) ON (c.id)").consume()
+
+    assert fake.sessions[0].queries[0].startswith("PROFILE MATCH")
+    assert fake.sessions[0].queries[1].startswith("CREATE INDEX")
+    profiled = [stats for stats in metrics.snapshot() if stats["profiled"]]
+    assert len(profiled) == 1 and profiled[0]["db_hits"] == 10
+
+
+def test_slow_queries_are_logged(caplog):
+    metrics = QueryMetrics(slow_query_ms=0)
+    with caplog.at_level("WARNING", logger="db.instrumentation"):
+        metrics.record("neo4j", "load: MATCH (n)", "", 0.5, 2)
+    assert "Slow neo4j query" in caplog.text
+
+
+def test_wrappers_pass_other_attributes_through():
+    driver = InstrumentedDriver(FakeDriver(), QueryMetrics(), profile_rate=0)
+    with driver.session() as session:
+        assert session.run("MATCH (n) RETURN n").keys() == ["n"]
+
+
+class FakeCursor:
+    def __init__(self, rows):
+        self.rows = rows
+        self.statements = []
+
+    def execute(self, operation, params=None):
+        self.statements.append(operation)
+        if "BROKEN" in operation:
+            raise RuntimeError("You have an error in your SQL syntax")
+
+    def fetchall(self):
+        return list(self.rows)
+
+    def fetchone(self):
+        return self.rows[0] if self.rows else None
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def cursor(self, dictionary=False):
+        return FakeCursor(self.rows)
+
+    def commit(self):
+        return "committed"
+
+
+def test_mysql_statements_are_recorded_when_fetched_or_replaced():
+    metrics = QueryMetrics(slow_query_ms=10000)
+    connection = InstrumentedConnection(FakeConnection([(1,), (2,)]), metrics)
+
+    cursor = connection.cursor(dictionary=True)
+    cursor.execute("SELECT id FROM jobs WHERE id = %s", ("j1",))
+    assert cursor.fetchall() == [(1,), (2,)]
+    cursor.execute("SELECT title FROM jobs")
+    cursor.fetchone()
+    cursor.close()
+
+    stats = {entry["query"].split(": ", 1)[1]: entry for entry in metrics.snapshot()}
+    assert stats["SELECT id FROM jobs WHERE id = %s"]["rows"] == 2
+    assert stats["SELECT id FROM jobs WHERE id = %s"]["parameters"] == "0:str"
+    assert stats["SELECT title FROM jobs"]["rows"] == 1
+    assert all(entry["backend"] == "mysql" for entry in stats.values())
+    assert connection.commit() == "committed"
+
+
+def test_failed_mysql_statement_is_counted_as_an_error():
+    metrics = QueryMetrics(slow_query_ms=10000)
+    cursor = InstrumentedConnection(FakeConnection([]), metrics).cursor()
+    with pytest.raises(RuntimeError):
+        cursor.execute("BROKEN SQL")
+    assert only(metrics)["errors"] == 1
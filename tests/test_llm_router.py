@@ -0,0 +1,147 @@
+# tests/test_llm_router.py
+import time
+
+import pytest
+
+from agents.llm_router import FakeProvider, LLMRouter, is_rate_limit_error
+
+MESSAGES = [{"role": "user", "content": "ping"}]
+
+
+class RecordingProvider(FakeProvider):
+    """FakeProvider that keeps the arguments of each call and can answer from its cache"""
+
+    def __init__(self, name, cached=False, **kwargs):
+        super().__init__(name, **kwargs)
+        self.cached = cached
+        self.models = []
+
+    def generate_completion(self, messages, temperature=1, max_tokens=1024, stream=False, force_cache=False, model=None):
+        self.models.append(model)
+        response = super().generate_completion(messages, temperature, max_tokens, stream, force_cache, model)
+        if response["success"] and self.cached:
+            response["cached"] = True
+        return response
+
+
+@pytest.fixture
+def make_router():
+    routers = []
+
+    def make(providers, **kwargs):
+        kwargs.setdefault("explore_rate", 0)
+        router = LLMRouter(providers, **kwargs)
+        routers.append(router)
+        return router
+
+    yield make
+    for router in routers:
+        router.close()
+
+
+def test_rate_limit_errors_are_recognised():
+    assert is_rate_limit_error("Error code: 429 - rate_limit_exceeded")
+    assert is_rate_limit_error("Daily API limit reached and no cached response available")
+    assert not is_rate_limit_error("Connection reset by peer")
+    assert not is_rate_limit_error(None)
+
+
+def test_first_provider_answers_when_healthy(make_router):
+    router = make_router({"groq": FakeProvider("groq", latency=0), "gemini": FakeProvider("gemini", latency=0)})
+    response = router.generate_completion(MESSAGES)
+    assert response["success"] and response["provider"] == "groq"
+    assert router.providers["gemini"].calls == 0
+
+
+def test_rate_limited_provider_fails_over_and_cools_down(make_router):
+    router = make_router({
+        "groq": FakeProvider("groq", latency=0, rate_limited=True),
+        "gemini": FakeProvider("gemini", latency=0)
+    }, rate_limit_cooldown=60)
+
+    assert router.generate_completion(MESSAGES)["provider"] == "gemini"
+    assert router.provider_stats()["groq"]["cooling_down"]
+
+    # Skipped while cooling down
+    assert router.generate_completion(MESSAGES)["provider"] == "gemini"
+    assert router.providers["groq"].calls == 1
+
+
+def test_cooldown_uses_the_providers_retry_hint(make_router):
+    router = make_router({"groq": FakeProvider("groq")}, rate_limit_cooldown=60)
+    assert router._cooldown_seconds("Rate limit reached. Please try again in 1m30.5s") == 90.5
+    assert router._cooldown_seconds("Please try again in 7.2s") == 7.2
+    assert router._cooldown_seconds("rate_limit_exceeded") == 60
+
+
+def test_every_provider_failing_reports_all_errors(make_router):
+    router = make_router({
+        "groq": FakeProvider("groq", latency=0, error_rate=1.0),
+        "gemini": FakeProvider("gemini", latency=0, error_rate=1.0)
+    })
+    response = router.generate_completion(MESSAGES)
+    assert not response["success"]
+    assert "groq: groq provider error" in response["error"]
+    assert "gemini: gemini provider error" in response["error"]
+
+
+def test_provider_exceptions_count_as_failures(make_router):
+    broken = FakeProvider("groq", latency=0)
+    broken.generate_completion = lambda *args, **kwargs: 1 / 0
+    router = make_router({"groq": broken, "gemini": FakeProvider("gemini", latency=0)})
+
+    assert router.generate_completion(MESSAGES)["provider"] == "gemini"
+    assert router.provider_stats()["groq"]["error_rate"] == 1.0
+
+
+def test_slow_provider_is_hedged_and_the_first_answer_wins(make_router):
+    router = make_router({
+        "groq": FakeProvider("groq", latency=1.0),
+        "gemini": FakeProvider("gemini", latency=0.01)
+    }, hedge_after=0.05)
+
+    started = time.time()
+    response = router.generate_completion(MESSAGES)
+    assert response["provider"] == "gemini"
+    assert time.time() - started < 0.5
+    assert router.providers["groq"].calls == 1
+
+
+def test_hedge_deadline_is_the_p95_floored_at_hedge_after(make_router):
+    router = make_router({"groq": FakeProvider("groq")}, hedge_after=0.2)
+    assert router._hedge_deadline("groq") == 0.2
+
+    for latency in (0.01, 0.02, 0.03):
+        router.stats["groq"].record(latency, True)
+    assert router._hedge_deadline("groq") == 0.2
+
+    for _ in range(20):
+        router.stats["groq"].record(1.5, True)
+    assert router._hedge_deadline("groq") == 1.5
+
+
+def test_cache_hits_are_not_recorded_as_latency(make_router):
+    router = make_router({"groq": RecordingProvider("groq", latency=0, cached=True)})
+    for _ in range(5):
+        assert router.generate_completion(MESSAGES)["cached"]
+    assert router.provider_stats()["groq"]["calls"] == 0
+
+
+def test_faster_provider_is_ranked_first(make_router):
+    router = make_router({"groq": FakeProvider("groq"), "gemini": FakeProvider("gemini")})
+    for _ in range(10):
+        router.stats["groq"].record(0.9, True)
+        router.stats["gemini"].record(0.1, True)
+    assert router.ranked_providers() == ["gemini", "groq"]
+
+    # Mostly failing providers drop behind healthy ones however fast they are
+    for _ in range(15):
+        router.stats["gemini"].record(0.1, False)
+    assert router.ranked_providers() == ["groq", "gemini"]
+
+
+def test_model_is_passed_to_the_providers(make_router):
+    router = make_router({"groq": RecordingProvider("groq", latency=0)})
+    router.generate_completion(MESSAGES, model="gemma2-9b-it")
+    router.generate_completion(MESSAGES)
+    assert router.providers["groq"].models == ["gemma2-9b-it", None]
@@ -0,0 +1,98 @@
+# tests/test_pdf_service.py
+import os
+import random
+import time
+
+import pytest
+
+from utils import pdf_parser
+from utils.pdf_service import PDFParsingService
+from utils.synthetic_data import build_pdf, synthetic_resume_pdf
+from utils.text_budget import PAGE_BREAK
+
+pytestmark = pytest.mark.skipif(not hasattr(os, "fork"), reason="workers inherit the patched parser through fork")
+
+real_iter_pdf_pages = pdf_parser.iter_pdf_pages
+
+
+def misbehaving_iter_pdf_pages(pdf_file, max_pages=None, page_timeout=None):
+    """Hang on b"hang", kill the worker on b"crash", parse anything else"""
+    content = pdf_file.read()
+    if content == b"hang":
+        time.sleep(60)
+    if content == b"crash":
+        os._exit(1)
+    pdf_file.seek(0)
+    yield from real_iter_pdf_pages(pdf_file, max_pages, page_timeout)
+
+
+@pytest.fixture
+def service(monkeypatch):
+    # Patched before the workers fork, so they run the misbehaving parser
+    monkeypatch.setattr(pdf_parser, "iter_pdf_pages", misbehaving_iter_pdf_pages)
+    parsing_service = PDFParsingService(workers=1, timeout=1.0, cpu_seconds=0, memory_mb=0, start_method="fork")
+    yield parsing_service
+    parsing_service.close()
+
+
+def test_parses_pdf_bytes_and_paths(service, tmp_path):
+    pdf = build_pdf(["Jane Doe\nSkills: Python", "Experience\nAcme"])
+    path = tmp_path / "resume.pdf"
+    path.write_bytes(pdf)
+
+    for source in (pdf, str(path)):
+        result = service.parse(source)
+        assert result["success"], result
+        assert result["pages"] == 2
+        assert "Skills: Python" in result["text"] and PAGE_BREAK in result["text"]
+
+
+def test_hanging_document_times_out_and_the_worker_is_replaced(service):
+    worker = service._workers[0]
+    started = time.perf_counter()
+    result = service.parse(b"hang")
+
+    assert not result["success"]
+    assert "exceeded 1.0s" in result["error"]
+    assert time.perf_counter() - started < 10
+    assert service.stats["timeouts"] == 1 and service.stats["failures"] == 1
+    assert not worker.process.is_alive()
+    assert service._workers[0] is not worker
+
+    # The replacement worker takes the next document
+    assert service.parse(synthetic_resume_pdf(random.Random(1)))["success"]
+
+
+def test_crashed_worker_is_replaced(service):
+    result = service.parse(b"crash")
+    assert not result["success"]
+    assert "killed" in result["error"]
+    assert service.stats["crashes"] == 1
+    assert service.parse(build_pdf(["Still working"]))["success"]
+
+
+def test_unparseable_document_fails_without_losing_the_worker(service):
+    worker = service._workers[0]
+    result = service.parse(b"not a pdf")
+    assert not result["success"]
+    assert result["error"].startswith("Could not parse PDF")
+    assert service._workers[0] is worker
+
+
+def test_workers_are_recycled_after_max_jobs(monkeypatch):
+    monkeypatch.setattr(pdf_parser, "iter_pdf_pages", misbehaving_iter_pdf_pages)
+    service = PDFParsingService(workers=1, timeout=5.0, cpu_seconds=0, memory_mb=0, max_jobs_per_worker=2,
+                                start_method="fork")
+    try:
+        pdf = build_pdf(["Page"])
+        results = service.parse_many([pdf, pdf, pdf])
+        assert all(result["success"] for result in results)
+        assert service.stats["recycled"] == 1
+    finally:
+        service.close()
+
+
+def test_parse_after_close_raises(service):
+    service.close()
+    with pytest.raises(RuntimeError):
+        service.parse(b"%PDF")
@@ -0,0 +1,170 @@
+# tests/test_resume_parser.py
+import re
+
+import pytest
+
+from utils import pdf_parser
+from utils.pdf_parser import SKILLS_KEYWORDS, EDUCATION_KEYWORDS, EXPERIENCE_KEYWORDS
+from utils.resume_segmenter import ResumeSegmenter
+from utils.text_budget import PAGE_BREAK
+
+SAMPLES = {
+    "inline_then_unknown_title": "Skills: Python, SQL, Docker\n\nLeadership\n- Led a team of 5\n- Mentored interns",
+    "classic": """Jane Doe
+jane.doe@example.com | +1 (555) 123-4567 | linkedin.com/in/janedoe | github.com/janedoe
+
+Summary
+Backend engineer with eight years of experience building APIs.
+
+Skills
+- Python
+- JavaScript
+- PostgreSQL
+- Docker
+
+Experience
+Senior Software Engineer at Acme Technologies, Jan 2020 - Present
+- Designed the billing service
+- Cut p95 latency by 40%
+Software Engineer at Globex Solutions, Jun 2016 - Dec 2019
+- Built the reporting pipeline
+
+Education
+Bachelor of Science in Computer Science, State University, 2012 - 2016, GPA: 3.8/4.0
+""",
+    "colon_headings": """John Smith
+john@example.org
+Technical Skills: Java, Spring, Kubernetes; AWS
+Work Experience:
+Backend Developer - Initech Systems - 2018 - 2022
+- Migrated services to Kubernetes
+Education:
+M.Tech in Software Systems, National Institute of Technology, 2016 - 2018
+Projects: Payroll engine
+""",
+    "title_line_ends_section": """Skills
+- Go
+- Rust
+Languages: English, German
+
+Experience
+Data Engineer, Hooli Corporation, Mar 2019 - Present
+""",
+    "blank_line_after_heading": "Skills\n\n- Python\n- Flask\n",
+    "page_break": "Skills\n- Python\n" + PAGE_BREAK + "- Django\n\nEducation\nB.Tech, Institute of Engineering, 2010 - 2014\n",
+}
+
+
+def baseline_extract_section(text, section_keywords):
+    """extract_section as it was before the segmenter, kept here as the reference"""
+    pattern = r'(?:^|\n)(?:\s*)((?:' + '|'.join(section_keywords) + r').{0,20}?)(?::|$|(?=\n))(.*?)(?:\n\s*\n|\n(?:[A-Z][a-zA-Z\s]+(?::|$))|$)'
+    for match in re.finditer(pattern, text, re.IGNORECASE | re.DOTALL):
+        return match.group(2).strip()
+    return ""
+
+
+@pytest.mark.parametrize("name", sorted(SAMPLES))
+@pytest.mark.parametrize("keywords", [SKILLS_KEYWORDS, EDUCATION_KEYWORDS, EXPERIENCE_KEYWORDS])
+def test_sections_end_where_the_baseline_parser_ended_them(name, keywords):
+    text = SAMPLES[name]
+    # The baseline never saw page breaks; pages were joined with plain newlines
+    expected = baseline_extract_section(text.replace(PAGE_BREAK, ""), keywords)
+    assert pdf_parser.extract_section(text, list(keywords)) == expected
+
+
+def test_blank_line_ends_the_skills_section():
+    assert pdf_parser.extract_skills(SAMPLES["inline_then_unknown_title"]) == ["Python", "SQL", "Docker"]
+
+
+def test_title_line_ends_the_skills_section():
+    assert pdf_parser.extract_skills(SAMPLES["title_line_ends_section"]) == ["Go", "Rust"]
+
+
+def test_inline_and_bulleted_skills_are_merged():
+    assert pdf_parser.extract_skills("Skills: Python, SQL\n- Docker\n- Kubernetes") == [
+        "Python", "SQL", "Docker", "Kubernetes"
+    ]
+
+
+def test_every_bullet_is_a_skill():
+    # The baseline regex consumed the newline after each bullet and skipped every other one
+    assert pdf_parser.extract_skills(SAMPLES["classic"]) == ["Python", "JavaScript", "PostgreSQL", "Docker"]
+
+
+def test_a_section_continues_across_a_page_break():
+    assert pdf_parser.extract_skills(SAMPLES["page_break"]) == ["Python", "Django"]
+
+
+def test_empty_skills_section_falls_back_to_scanning_the_text():
+    assert pdf_parser.extract_skills(SAMPLES["blank_line_after_heading"]) == ["Python", "Flask"]
+
+
+def test_parse_classic_resume():
+    info = pdf_parser.extract_structured_info(SAMPLES["classic"])
+
+    assert info["contact"]["email"] == "jane.doe@example.com"
+    assert info["contact"]["linkedin"] == "linkedin.com/in/janedoe"
+    assert info["contact"]["github"] == "github.com/janedoe"
+
+    assert [entry["title"] for entry in info["experience"]] == ["Senior Software Engineer", "Software Engineer"]
+    assert info["experience"][0]["responsibilities"] == ["Designed the billing service", "Cut p95 latency by 40%"]
+    assert info["experience"][1]["date_range"] == "Jun 2016 - Dec 2019"
+
+    assert len(info["education"]) == 1
+    education = info["education"][0]
+    assert education["degree"] == "Bachelor of Science"
+    assert education["university"] == "State University"
+    assert education["gpa"] == "3.8/4.0"
+
+
+def test_segmenter_classifies_headings():
+    segmenter = ResumeSegmenter({"skills": ("skills", "technical skills")})
+
+    assert segmenter.classify("Technical Skills: Python") == (True, "skills", "Python")
+    assert segmenter.classify("## SKILLS ##") == (True, "skills", "")
+    assert segmenter.classify("Projects") == (True, None, "")
+    assert segmenter.classify("Skills in many areas of modern backend engineering") == (False, None, "")
+    assert segmenter.classify("Skills learned on the job.") == (False, None, "")
+
+
+def test_segmenter_collects_every_span_of_a_section():
+    segments = ResumeSegmenter({"skills": ("skills",)}).segment("Skills\n- Go\nProjects\n- Bot\nSkills\n- Rust")
+
+    assert segments.section_lines("skills") == ["- Go", "- Rust"]
+    assert "education" not in segments
+    assert segments.section_text("education") == ""
+
+
+def test_segmenter_puts_inline_heading_content_in_the_section():
+    segments = ResumeSegmenter({"skills": ("technical skills", "skills")}).segment("Technical Skills: Python, SQL\n- Go")
+
+    assert segments.lines == ["Technical Skills: Python, SQL", "Python, SQL", "- Go"]
+    assert segments.spans == {"skills": [(1, 3)]}
+
+
+@pytest.mark.parametrize("text,expected", [
+    ("Skills\n- Go\n\n- Not a skill", ["- Go"]),
+    ("Skills\n- Go\nLeadership: chaired a club\n- Rust", ["- Go"]),
+    ("Skills\n- Go\nInterests\n- Chess", ["- Go"]),
+    ("Skills\n- Go\n" + PAGE_BREAK + "- Rust\n", ["- Go", "- Rust"]),
+    ("Skills & Tools\n- Go", ["- Go"]),
+])
+def test_segmenter_section_boundaries(text, expected):
+    segmenter = ResumeSegmenter({"skills": ("skills",), "experience": ("experience",)})
+    assert segmenter.segment(text).section_lines("skills") == expected
+
+
+def test_segmenter_prefers_the_longest_matching_heading():
+    segmenter = ResumeSegmenter({"experience": ("work experience",), "work": ("work",)})
+    assert segmenter.classify("Work Experience")[1] == "experience"
+    assert segmenter.classify("Work")[1] == "work"
+    assert segmenter.classify("Work history and other notes here")[0] is False
+
+
+def test_known_heading_ends_a_section_unlike_the_baseline():
+    # The one deliberate difference: the baseline ran "SKILLS" on into the next sections
+    text = "SKILLS\nPython, Flask\nEDUCATION\nMaster of Science in Data Science, 2012\n"
+
+    assert "EDUCATION" in baseline_extract_section(text, SKILLS_KEYWORDS)
+    assert pdf_parser.extract_section(text, list(SKILLS_KEYWORDS)) == "Python, Flask"
+    assert pdf_parser.extract_skills(text) == ["Python", "Flask"]
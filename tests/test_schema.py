@@ -0,0 +1,112 @@
+# tests/test_schema.py
+import os
+
+import pytest
+
+from db.schema import HOT_QUERIES, INDEXES, OBSOLETE, SchemaManager, _plan_operators
+
+
+def plan(operator, *children):
+    return {"operatorType": f"{operator}@neo4j", "children": list(children)}
+
+
+class FakeSummary:
+    def __init__(self, plan):
+        self.plan = plan
+
+
+class FakeResult:
+    def __init__(self, plan):
+        self.plan = plan
+
+    def consume(self):
+        return FakeSummary(self.plan)
+
+
+class FakeSession:
+    def __init__(self, driver):
+        self.driver = driver
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def run(self, query, parameters=None, **kwargs):
+        self.driver.queries.append(query)
+        return FakeResult(self.driver.plan_for(query))
+
+
+class CannedPlanDriver:
+    """Answers EXPLAIN with an index seek, or with a scan for queries containing a marker"""
+
+    def __init__(self, scanning=()):
+        self.scanning = scanning
+        self.queries = []
+
+    def plan_for(self, query):
+        if any(marker in query for marker in self.scanning):
+            return plan("ProduceResults", plan("Filter", plan("NodeByLabelScan")))
+        return plan("ProduceResults", plan("Expand(All)", plan("NodeUniqueIndexSeek")))
+
+    def session(self):
+        return FakeSession(self)
+
+
+def test_plan_operators_walks_the_tree_and_drops_the_runtime_suffix():
+    tree = plan("ProduceResults", plan("Sort", plan("NodeIndexSeek")), plan("Argument"))
+    assert list(_plan_operators(tree)) == ["ProduceResults", "Sort", "NodeIndexSeek", "Argument"]
+
+
+def test_verify_passes_when_every_hot_query_uses_an_index():
+    driver = CannedPlanDriver()
+    assert SchemaManager(driver).verify() == []
+    assert driver.queries == ["EXPLAIN " + query for _, query, _ in HOT_QUERIES]
+
+
+def test_verify_reports_the_scanning_queries():
+    problems = SchemaManager(CannedPlanDriver(scanning=["m.final_score <= $after_score"])).verify()
+    assert problems == [("job candidates page", ["NodeByLabelScan"])]
+
+
+def test_explain_without_a_plan_returns_no_operators():
+    driver = CannedPlanDriver()
+    driver.plan_for = lambda query: None
+    assert SchemaManager(driver).explain("RETURN 1") == []
+
+
+def test_candidates_page_keeps_its_score_index():
+    names = {name for name, _ in INDEXES}
+    assert "matches_job_final_score" in names
+    assert "matches_job_final_score" not in {name for name, _ in OBSOLETE}
+
+    query = dict((name, query) for name, query, _ in HOT_QUERIES)["job candidates page"]
+    assert "MATCHES" in query and "m.job_id = $job_id" in query and "ORDER BY m.final_score DESC" in query
+
+
+@pytest.fixture
+def live_driver():
+    # Only against a database named explicitly, never the default one in db_integration
+    uri = os.getenv("NEO4J_TEST_URI")
+    if not uri:
+        pytest.skip("NEO4J_TEST_URI is not set")
+
+    from neo4j import GraphDatabase
+
+    driver = GraphDatabase.driver(
+        uri, auth=(os.getenv("NEO4J_TEST_USERNAME", "neo4j"), os.getenv("NEO4J_TEST_PASSWORD", ""))
+    )
+    try:
+        driver.verify_connectivity()
+    except Exception as e:
+        driver.close()
+        pytest.skip(f"Neo4j is not available: {e}")
+    yield driver
+    driver.close()
+
+
+def test_hot_queries_use_indexes_on_a_live_database(live_driver):
+    schema = SchemaManager(live_driver)
+    schema.apply(wait_seconds=60)
+    assert schema.verify() == []
@@ -0,0 +1,86 @@
+# tests/test_skill_matcher.py
+import json
+import re
+
+import pytest
+
+from utils.skill_matcher import DEFAULT_SKILLS, SkillMatcher, tokenize
+
+
+def regex_matches(skills, text):
+    """One word-boundary regex per skill, the approach the trie replaced"""
+    return {skill for skill in skills if re.search(r'\b' + re.escape(skill) + r'\b', text, re.IGNORECASE)}
+
+
+def test_tokenize_keeps_punctuated_skill_names_whole():
+    assert tokenize("C++, C#, Node.js and ASP.NET; Scikit-learn!") == [
+        "c++", "c#", "node.js", "and", "asp.net", "scikit-learn"
+    ]
+
+
+def test_find_all_reports_each_skill_once_in_order_of_appearance():
+    matcher = SkillMatcher()
+    text = "Docker and python. More Python, then Kubernetes on AWS with docker-compose"
+    assert matcher.find_all(text) == ["Docker", "Python", "Kubernetes", "AWS"]
+
+
+def test_multi_word_terms_win_over_their_prefixes():
+    matcher = SkillMatcher()
+    assert matcher.find_all("Built apps in Ruby on Rails and plain Ruby") == ["Ruby on Rails", "Ruby"]
+    assert matcher.find_all("SQL Server and SQL") == ["SQL Server", "SQL"]
+
+
+def test_skills_inside_longer_words_are_not_matched():
+    matcher = SkillMatcher()
+    assert matcher.find_all("Gopher, Rustic, Javanese, Scalable, React-ish") == []
+
+
+def test_partial_multi_word_term_falls_back_to_nothing():
+    matcher = SkillMatcher(["Travis CI"])
+    assert matcher.find_all("Travis and CI pipelines") == []
+
+
+@pytest.mark.parametrize("text", [
+    "Senior engineer: Python, Java, Go and Rust across AWS, Azure and GCP.",
+    "Stack - React / Node.js / Express / MongoDB / Redis; CI with Jenkins, CircleCI, Travis CI.",
+    "Data: Pandas, NumPy, Scikit-learn, TensorFlow, PyTorch, Keras, SQL, PostgreSQL, MySQL",
+    "Git Docker Kubernetes Terraform Ansible Webpack jQuery Bootstrap Laravel Django Flask Spring",
+])
+def test_trie_finds_what_the_per_skill_regex_found(text):
+    assert set(SkillMatcher().find_all(text)) == regex_matches(DEFAULT_SKILLS, text)
+
+
+def test_trie_finds_skills_ending_in_symbols_that_the_regex_missed():
+    text = "Python, C++ and C# services"
+    assert SkillMatcher().find_all(text) == ["Python", "C++", "C#"]
+    # \b after "+" or "#" needs a word character to follow, so the old regex never matched these
+    assert regex_matches(DEFAULT_SKILLS, text) == {"Python"}
+
+
+def test_add_with_a_value_maps_synonyms_to_one_skill():
+    matcher = SkillMatcher([])
+    matcher.add("JavaScript")
+    matcher.add("JS", "JavaScript")
+    matcher.add("ECMAScript", "JavaScript")
+    assert matcher.size == 3
+    assert matcher.find_all("JS, ECMAScript and javascript") == ["JavaScript"]
+
+
+def test_lookup_matches_whole_terms_only():
+    matcher = SkillMatcher()
+    assert matcher.lookup(" node.JS ") == "Node.js"
+    assert matcher.lookup("Ruby on") is None
+    assert matcher.lookup("Python 3") is None
+    assert matcher.lookup("") is None
+
+
+def test_from_file_reads_text_and_json_lists(tmp_path):
+    text_file = tmp_path / "skills.txt"
+    text_file.write_text("# one skill per line\nElixir\n\nPhoenix LiveView\n", encoding="utf-8")
+    json_file = tmp_path / "skills.json"
+    json_file.write_text(json.dumps(["Elixir", "Erlang"]), encoding="utf-8")
+
+    assert SkillMatcher.from_file(str(text_file)).find_all("Phoenix LiveView on Elixir") == [
+        "Phoenix LiveView", "Elixir"
+    ]
+    assert SkillMatcher.from_file(str(json_file)).size == 2
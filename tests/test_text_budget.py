@@ -0,0 +1,126 @@
+# tests/test_text_budget.py
+from utils.text_budget import (
+    PAGE_BREAK, chunk_text, estimate_tokens, map_reduce_extract, merge_extractions, normalize_whitespace,
+    prepare_text, strip_boilerplate
+)
+
+
+def resume_pages(pages, lines_per_page=40):
+    return PAGE_BREAK.join(
+        "Jane Doe - Curriculum Vitae\n"
+        + "\n".join(f"Worked on project {page}-{line} with Python and SQL" for line in range(lines_per_page))
+        + f"\n\nPage {page + 1} of {pages}"
+        for page in range(pages)
+    )
+
+
+def test_estimate_tokens():
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("abc") == 1
+    assert estimate_tokens("a" * 400) == 100
+
+
+def test_normalize_whitespace_collapses_spaces_and_blank_lines():
+    assert normalize_whitespace("  Jane\t\t Doe  \n\n\n\n Python ,  SQL ") == "Jane Doe\n\nPython , SQL"
+
+
+def test_strip_boilerplate_drops_page_numbers_and_running_headers_only_at_page_edges():
+    pages = [
+        "ACME Resume Header\nExperience\nPage 1 of 2",
+        "ACME Resume Header\nEducation\nACME Resume Header in the body\n2",
+    ]
+    text = strip_boilerplate(pages)
+    assert "Page 1 of 2" not in text
+    assert text.count("ACME Resume Header") == 2  # first header kept, body line kept
+    assert "ACME Resume Header in the body" in text
+    assert text.splitlines()[-1] == "ACME Resume Header in the body"
+
+
+def test_chunk_text_respects_the_budget_and_keeps_the_text():
+    paragraphs = [f"Paragraph {n} " + "word " * (20 + n) for n in range(30)]
+    text = "\n\n".join(paragraphs)
+    chunks = chunk_text(text, max_tokens=100)
+
+    assert len(chunks) > 1
+    assert all(len(chunk) <= 100 * 4 for chunk in chunks)
+    assert "\n\n".join(chunks) == text
+
+
+def test_chunk_text_splits_oversized_paragraphs_and_lines():
+    text = "x" * 1000 + "\n" + "short line"
+    chunks = chunk_text(text, max_tokens=50)
+    assert all(len(chunk) <= 200 for chunk in chunks)
+    assert "".join(chunk.replace("\n\n", "") for chunk in chunks) == "x" * 1000 + "short line"
+
+
+def test_prepare_text_leaves_short_resumes_as_one_chunk():
+    text = "Jane Doe\f\nPage 1\nSkills: Python"
+    chunks, report = prepare_text(text, max_tokens=1000)
+    assert len(chunks) == 1
+    # Under budget nothing but whitespace is touched, page numbers included
+    assert "Page 1" in chunks[0]
+    assert report["chunks"] == 1
+
+
+def test_prepare_text_strips_boilerplate_and_chunks_long_resumes():
+    text = resume_pages(6)
+    chunks, report = prepare_text(text, max_tokens=500)
+
+    assert report["chunks"] == len(chunks) > 1
+    assert report["tokens"] < report["original_tokens"]
+    assert report["tokens_saved"] == report["original_tokens"] - report["tokens"]
+    joined = "\n".join(chunks)
+    assert "Page 3 of 6" not in joined
+    assert joined.count("Jane Doe - Curriculum Vitae") == 1
+    assert all(estimate_tokens(chunk) <= 500 for chunk in chunks)
+    assert "Worked on project 5-39 with Python and SQL" in joined
+
+
+def test_merge_extractions_unions_lists_and_keeps_the_best_values():
+    merged = merge_extractions([
+        {"skills": ["Python", "SQL"], "experience_years": 3, "education_level": "Bachelor of Science",
+         "contact": {"email": "jane@example.com", "phone": ""}, "name": "Jane Doe"},
+        {"skills": ["sql", "Docker"], "experience_years": 7, "education_level": "Master of Science",
+         "contact": {"phone": "555-0100"}, "name": "J. Doe"},
+        {"error": "Could not parse JSON"},
+    ])
+    assert merged == {
+        "skills": ["Python", "SQL", "Docker"],
+        "experience_years": 7,
+        "education_level": "Master of Science",
+        "contact": {"email": "jane@example.com", "phone": "555-0100"},
+        "name": "Jane Doe"
+    }
+
+
+def test_merge_extractions_deduplicates_structured_items():
+    job = {"title": "Engineer", "company": "Acme"}
+    merged = merge_extractions([{"experience": [job]}, {"experience": [dict(job), {"title": "Lead"}]}])
+    assert merged["experience"] == [job, {"title": "Lead"}]
+
+
+def test_merge_extractions_returns_the_first_error_when_nothing_is_usable():
+    assert merge_extractions([{"error": "a"}, {"error": "b"}]) == {"error": "a"}
+    assert merge_extractions([]) == {}
+
+
+def test_map_reduce_extract_calls_once_per_chunk_and_merges():
+    calls = []
+
+    def extract(text):
+        calls.append(text)
+        return {"skills": [f"Skill{len(calls)}"], "experience_years": len(calls)}
+
+    result, report = map_reduce_extract(resume_pages(6), extract, max_tokens=500)
+    assert len(calls) == report["chunks"] > 1
+    assert result["skills"] == [f"Skill{n}" for n in range(1, len(calls) + 1)]
+    assert result["experience_years"] == len(calls)
+
+
+def test_map_reduce_extract_passes_short_text_straight_through():
+    result, report = map_reduce_extract("Skills: Python", lambda text: {"text": text}, max_tokens=1000)
+    assert result == {"text": "Skills: Python"}
+    assert report["chunks"] == 1
+
+    result, report = map_reduce_extract("", lambda text: {"text": text})
+    assert result == {"text": ""}
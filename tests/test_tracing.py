@@ -0,0 +1,48 @@
+# tests/test_tracing.py
+import json
+
+from utils import tracing
+from utils.tracing import TraceStore, span, start_trace, tag_trace
+
+
+def test_span_outside_a_trace_records_nothing(monkeypatch):
+    store = TraceStore(export_path="")
+    monkeypatch.setattr(tracing, "trace_store", store)
+
+    with span("background") as current:
+        assert current is None
+    assert not store._traces
+
+
+def test_trace_is_found_in_memory_by_tag(monkeypatch):
+    store = TraceStore(export_path="")
+    monkeypatch.setattr(tracing, "trace_store", store)
+
+    with start_trace("apply"):
+        tag_trace("application.id", "a1")
+        with span("store_candidate"):
+            pass
+
+    spans = store.find("application.id", "a1")
+    assert [item["name"] for item in spans] == ["apply", "store_candidate"]
+    assert spans[1]["parent_id"] == spans[0]["span_id"]
+
+
+def test_export_is_written_in_the_background_and_rotated(tmp_path, monkeypatch):
+    path = tmp_path / "traces.jsonl"
+    store = TraceStore(export_path=str(path), max_traces=1, max_export_bytes=1000)
+    monkeypatch.setattr(tracing, "trace_store", store)
+
+    for application_id in ("a1", "a2", "a3"):
+        with start_trace("apply"):
+            tag_trace("application.id", application_id)
+    store.flush()
+
+    assert (tmp_path / "traces.jsonl.1").exists()
+    assert path.stat().st_size <= 1000
+    last = json.loads(path.read_text().splitlines()[-1])
+    assert last["resourceSpans"][0]["scopeSpans"][0]["spans"][0]["name"] == "apply"
+
+    # a3 is still in memory; a2 has left the buffer and is read back from the file
+    assert store.find("application.id", "a3")[0]["attributes"]["application.id"] == "a3"
+    assert store.find("application.id", "a2")[0]["attributes"]["application.id"] == "a2"
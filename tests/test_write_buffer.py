@@ -0,0 +1,109 @@
+# tests/test_write_buffer.py
+import atexit
+import time
+
+import pytest
+
+from db.write_buffer import WriteBehindBuffer
+
+
+class FlakyWriter:
+    """Fails the first `failures` calls, then records every batch it is given"""
+
+    def __init__(self, failures=0):
+        self.failures = failures
+        self.batches = []
+
+    def __call__(self, rows):
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError("database unavailable")
+        self.batches.append(list(rows))
+
+
+def test_rows_are_written_in_batches_of_max_size():
+    writer = FlakyWriter()
+    buffer = WriteBehindBuffer(writer, max_size=3, max_delay=60)
+    for row in range(7):
+        buffer.add(row)
+    buffer.close()
+
+    assert [row for batch in writer.batches for row in batch] == list(range(7))
+    assert all(len(batch) <= 3 for batch in writer.batches)
+    assert buffer.stats()["rows_written"] == 7
+
+
+def test_flush_writes_everything_queued_so_far():
+    writer = FlakyWriter()
+    buffer = WriteBehindBuffer(writer, max_size=100, max_delay=60)
+    buffer.add("a")
+    buffer.add("b")
+    buffer.flush()
+
+    assert writer.batches == [["a", "b"]]
+    assert len(buffer) == 0
+    buffer.close()
+
+
+def test_failed_batch_is_retried_with_backoff(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr("db.write_buffer.time.sleep", sleeps.append)
+    writer = FlakyWriter(failures=2)
+    buffer = WriteBehindBuffer(writer, max_size=10, max_delay=60, retries=3, retry_delay=0.5)
+    buffer.add("a")
+    buffer.close()
+
+    assert writer.batches == [["a"]]
+    assert sleeps == [0.5, 1.0]
+    assert buffer.stats()["rows_dropped"] == 0
+    assert buffer.stats()["rows_retried"] == 2
+
+
+def test_batch_is_dropped_and_counted_once_retries_run_out(monkeypatch):
+    monkeypatch.setattr("db.write_buffer.time.sleep", lambda seconds: None)
+    writer = FlakyWriter(failures=10)
+    buffer = WriteBehindBuffer(writer, max_size=10, max_delay=60, retries=2)
+    buffer.add("a")
+    buffer.add("b")
+    buffer.close()
+
+    assert writer.batches == []
+    assert buffer.stats()["rows_dropped"] == 2
+
+
+def test_close_unregisters_its_atexit_hook(monkeypatch):
+    registered = []
+    monkeypatch.setattr(atexit, "register", registered.append)
+    monkeypatch.setattr(atexit, "unregister", registered.remove)
+
+    buffers = [WriteBehindBuffer(FlakyWriter(), max_delay=60) for _ in range(3)]
+    assert registered == []
+    for buffer in buffers:
+        buffer.add("row")
+    assert len(registered) == 3
+    for buffer in buffers:
+        buffer.close()
+    assert registered == []
+
+
+def test_add_after_close_raises():
+    buffer = WriteBehindBuffer(FlakyWriter())
+    buffer.close()
+    with pytest.raises(RuntimeError):
+        buffer.add("row")
+
+
+def test_rows_are_written_after_max_delay_without_a_flush():
+    writer = FlakyWriter()
+    buffer = WriteBehindBuffer(writer, max_size=100, max_delay=0.05)
+    buffer.add("a")
+    # Let the writer go back to sleeping on an empty buffer before the next row
+    deadline = time.time() + 5
+    while not writer.batches and time.time() < deadline:
+        time.sleep(0.01)
+    buffer.add("b")
+    while len(writer.batches) < 2 and time.time() < deadline:
+        time.sleep(0.01)
+
+    assert writer.batches == [["a"], ["b"]]
+    buffer.close()
@@ -4,6 +4,10 @@ import os
 import re
 from urllib.parse import urlparse
 
+# API base URLs; override to point enrichment at a local stand-in (see benchmarks/fake_services.py)
+LINKEDIN_API_URL = os.getenv("LINKEDIN_API_URL", "https://linkedin-data-api.p.rapidapi.com")
+GITHUB_API_URL = os.getenv("GITHUB_API_URL", "https://api.github.com")
+
 def get_linkedin_data(linkedin_url):
     """
     Get data from LinkedIn profile using RapidAPI
@@ -24,7 +28,7 @@ def get_linkedin_data(linkedin_url):
     username = path_parts[1]
     
     # RapidAPI endpoint for LinkedIn
-    url = "https://linkedin-data-api.p.rapidapi.com/profile"
+    url = f"{LINKEDIN_API_URL}/profile"
     
     # RapidAPI credentials
     headers = {
@@ -103,7 +107,7 @@ def get_linkedin_company_posts(company_username, start=0, count=10):
     Returns:
         Dictionary with company posts data
     """
-    url = "https://linkedin-data-api.p.rapidapi.com/get-company-posts"
+    url = f"{LINKEDIN_API_URL}/get-company-posts"
     
     headers = {
         "x-rapidapi-host": "linkedin-data-api.p.rapidapi.com",
@@ -154,7 +158,7 @@ def get_github_data(github_url):
     username = path_parts[0]
     
     # GitHub API endpoint
-    url = f"https://api.github.com/users/{username}"
+    url = f"{GITHUB_API_URL}/users/{username}"
     
     # GitHub token for higher rate limits (optional)
     token = os.getenv("GITHUB_TOKEN")
@@ -0,0 +1,251 @@
+# utils/batch_evaluation.py
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from agents.batching import estimate_message_tokens
+from db.write_buffer import WriteBehindBuffer
+from utils.llm_matching import EVALUATION_MAX_TOKENS
+
+# LLM calls in flight across all batches in the process
+BATCH_EVAL_WORKERS = int(os.getenv("BATCH_EVAL_WORKERS", "4"))
+
+# Per-job caps: applicants evaluated and estimated tokens spent by one batch
+BATCH_EVAL_MAX_CANDIDATES = int(os.getenv("BATCH_EVAL_MAX_CANDIDATES", "500"))
+BATCH_EVAL_TOKEN_BUDGET = int(os.getenv("BATCH_EVAL_TOKEN_BUDGET", "1000000"))
+
+# Evaluations written to Neo4j per transaction
+BATCH_EVAL_WRITE_SIZE = int(os.getenv("BATCH_EVAL_WRITE_SIZE", "25"))
+
+
+class EvaluationBatch:
+    """Progress of evaluating one job's pending applicants"""
+
+    def __init__(self, job_id, candidate_ids, skipped, token_budget):
+        self.job_id = job_id
+        self.candidate_ids = candidate_ids
+        self.total = len(candidate_ids)
+        self.completed = 0
+        self.failed = 0
+        # Applicants left out by the candidate cap, and queued ones the token budget ran out for
+        self.skipped = skipped
+        self.over_budget = 0
+        # Applicants left unevaluated or unwritten because the manager shut down
+        self.cancelled = 0
+        self.token_budget = token_budget
+        self.tokens_used = 0
+        self.errors = []
+        self.started_at = time.time()
+        self.finished_at = None
+        self.lock = threading.Lock()
+        self.remaining = len(candidate_ids)
+        # Evaluations queued for writing; the batch finishes when both reach zero
+        self.unwritten = 0
+
+    @property
+    def running(self):
+        return self.finished_at is None
+
+    @property
+    def status(self):
+        if self.running:
+            return "running"
+        return "cancelled" if self.cancelled else "finished"
+
+    def to_dict(self):
+        with self.lock:
+            return {
+                "job_id": self.job_id,
+                "status": self.status,
+                "total": self.total,
+                "completed": self.completed,
+                "failed": self.failed,
+                "skipped": self.skipped,
+                "over_budget": self.over_budget,
+                "cancelled": self.cancelled,
+                "tokens_used": self.tokens_used,
+                "token_budget": self.token_budget,
+                "errors": self.errors[-5:],
+                "elapsed": round((self.finished_at or time.time()) - self.started_at, 1)
+            }
+
+
+class BatchEvaluationManager:
+    """
+    Evaluates every unevaluated applicant of a job in the background
+
+    One thread pool bounds how many LLM calls run at once across all jobs.
+    Each job's batch stops taking new candidates once its estimated token
+    budget is spent, and results go through a write-behind buffer that
+    stores them in batched transactions.
+    """
+
+    def __init__(self, driver, llm_matching_engine, workers=None, max_candidates=None,
+                 token_budget=None, write_size=None):
+        """
+        Args:
+            driver: Neo4j driver
+            llm_matching_engine: LLMMatchingEngine used for prompts and evaluation
+            workers: Concurrent LLM calls (defaults to BATCH_EVAL_WORKERS)
+            max_candidates: Applicants evaluated per batch (defaults to BATCH_EVAL_MAX_CANDIDATES)
+            token_budget: Estimated tokens per batch (defaults to BATCH_EVAL_TOKEN_BUDGET)
+            write_size: Evaluations per write transaction (defaults to BATCH_EVAL_WRITE_SIZE)
+        """
+        self.driver = driver
+        self.engine = llm_matching_engine
+        self.max_candidates = BATCH_EVAL_MAX_CANDIDATES if max_candidates is None else max_candidates
+        self.token_budget = BATCH_EVAL_TOKEN_BUDGET if token_budget is None else token_budget
+        self.write_size = BATCH_EVAL_WRITE_SIZE if write_size is None else write_size
+        self.executor = ThreadPoolExecutor(
+            max_workers=BATCH_EVAL_WORKERS if workers is None else workers,
+            thread_name_prefix="batch-eval"
+        )
+        # Shared by all batches, so evaluations finishing together share a transaction
+        self.write_buffer = WriteBehindBuffer(self._write, max_size=self.write_size, name="evaluation-writes")
+        self._batches = {}
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def _pending_candidates(self, job_id):
+        """IDs of applicants without an LLM evaluation, best keyword match first"""
+        with self.driver.session() as session:
+            result = session.run("""
+                MATCH (c:Candidate)-[:APPLIED_FOR]->(j:Job {job_id: $job_id})
+                OPTIONAL MATCH (c)-[m:MATCHES]->(j)
+                WITH c, m
+                WHERE m IS NULL OR m.llm_score IS NULL
+                RETURN c.id AS candidate_id, coalesce(m.score, 0) AS score
+                ORDER BY score DESC, candidate_id
+            """, job_id=job_id)
+            return [record["candidate_id"] for record in result]
+
+    def start(self, job_id):
+        """
+        Queue every unevaluated applicant of a job
+
+        Args:
+            job_id: Job's ID
+
+        Returns:
+            dict: Progress of the new batch, or of the one already running for the job
+
+        Raises:
+            RuntimeError: If the manager has been shut down
+        """
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Batch evaluation has been shut down")
+            batch = self._batches.get(job_id)
+            if batch and batch.running:
+                return batch.to_dict()
+
+            pending = self._pending_candidates(job_id)
+            candidate_ids = pending[:self.max_candidates]
+            batch = EvaluationBatch(job_id, candidate_ids, len(pending) - len(candidate_ids), self.token_budget)
+            self._batches[job_id] = batch
+
+        if not candidate_ids:
+            batch.finished_at = time.time()
+        for candidate_id in candidate_ids:
+            self.executor.submit(self._evaluate, batch, candidate_id)
+        return batch.to_dict()
+
+    def progress(self, job_id):
+        """Progress of the latest batch for a job, or None"""
+        batch = self._batches.get(job_id)
+        return batch.to_dict() if batch else None
+
+    def _evaluate(self, batch, candidate_id):
+        evaluation = None
+        try:
+            context = self.engine._get_evaluation_context(candidate_id, batch.job_id)
+            if not context:
+                raise ValueError("Candidate or job not found")
+
+            messages = self.engine._build_messages(context)
+            estimated = estimate_message_tokens(messages) + EVALUATION_MAX_TOKENS
+
+            # Reserve the estimate before calling so concurrent workers cannot overspend
+            with batch.lock:
+                over_budget = batch.tokens_used + estimated > batch.token_budget
+                if not over_budget:
+                    batch.tokens_used += estimated
+
+            if over_budget:
+                with batch.lock:
+                    batch.over_budget += 1
+            else:
+                evaluation = self.engine.evaluate_messages(messages)
+                if "error" in evaluation:
+                    raise ValueError(evaluation["error"])
+        except Exception as e:
+            evaluation = None
+            with batch.lock:
+                batch.failed += 1
+                batch.errors.append(f"{candidate_id}: {str(e)}")
+
+        with batch.lock:
+            if evaluation is not None:
+                batch.unwritten += 1
+            batch.remaining -= 1
+            last = batch.remaining == 0
+
+        if evaluation is not None:
+            try:
+                self.write_buffer.add((batch, candidate_id, evaluation))
+            except RuntimeError:
+                # Finished after shutdown closed the buffer; shutdown() counted it as cancelled
+                return
+        if last:
+            # Write the tail now instead of waiting for the buffer's timer
+            self.write_buffer.flush()
+            self._finish_if_done(batch)
+
+    def _finish_if_done(self, batch):
+        with batch.lock:
+            if batch.remaining == 0 and batch.unwritten == 0 and batch.finished_at is None:
+                batch.finished_at = time.time()
+
+    def _write(self, rows):
+        """Store buffered evaluations (possibly from several jobs) in one transaction"""
+        try:
+            self.engine.candidate_manager._store_llm_evaluations(
+                [(candidate_id, batch.job_id, evaluation) for batch, candidate_id, evaluation in rows]
+            )
+            error = None
+        except Exception as e:
+            error = f"Could not store {len(rows)} evaluations: {str(e)}"
+
+        for batch in {row[0] for row in rows}:
+            count = sum(1 for row in rows if row[0] is batch)
+            with batch.lock:
+                batch.unwritten -= count
+                if error:
+                    batch.failed += count
+                    batch.errors.append(error)
+                else:
+                    batch.completed += count
+            self._finish_if_done(batch)
+
+    def shutdown(self):
+        """
+        Stop taking work and write the evaluations already finished
+
+        Queued applicants are dropped, and calls still in flight are not
+        waited for. Batches left unfinished are marked cancelled, with the
+        number of applicants they did not get to.
+        """
+        with self._lock:
+            self._closed = True
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        self.write_buffer.close()
+
+        stopped_at = time.time()
+        for batch in list(self._batches.values()):
+            with batch.lock:
+                if batch.finished_at is not None:
+                    continue
+                batch.cancelled = batch.remaining + batch.unwritten
+                batch.errors.append(f"Stopped by shutdown with {batch.cancelled} applicants not evaluated")
+                batch.finished_at = stopped_at
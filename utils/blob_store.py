@@ -0,0 +1,174 @@
+# utils/blob_store.py
+import hashlib
+import os
+import tempfile
+import threading
+import zlib
+
+# Directory holding compressed resume texts, one file per SHA-256
+RESUME_STORE_PATH = os.getenv(
+    "RESUME_STORE_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "resumes")
+)
+
+COMPRESSION_LEVEL = 6
+
+
+class BlobStore:
+    """
+    Content-addressed store for text, compressed with zlib on local disk
+
+    Each text is stored once under the SHA-256 of its content, so identical
+    resumes share a file and a hash kept in the graph is enough to find it.
+    """
+
+    def __init__(self, root=None):
+        """
+        Args:
+            root: Directory for the blobs (defaults to RESUME_STORE_PATH)
+        """
+        self.root = root or RESUME_STORE_PATH
+
+    def _path(self, digest):
+        # Two-character fan-out keeps directories small
+        return os.path.join(self.root, digest[:2], digest[2:] + ".z")
+
+    def put(self, text):
+        """
+        Store text
+
+        Args:
+            text: Text to store
+
+        Returns:
+            str: SHA-256 hex digest that addresses the text
+        """
+        data = (text or "").encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._path(digest)
+        if os.path.exists(path):
+            return digest
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write to a temporary file and rename so readers never see a partial blob
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(zlib.compress(data, COMPRESSION_LEVEL))
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        return digest
+
+    def get(self, digest):
+        """
+        Load text
+
+        Args:
+            digest: Hash returned by put()
+
+        Returns:
+            str: The text, or None when there is no such blob
+        """
+        if not digest:
+            return None
+        try:
+            with open(self._path(digest), "rb") as f:
+                return zlib.decompress(f.read()).decode("utf-8")
+        except FileNotFoundError:
+            return None
+
+    def size(self, digest):
+        """Compressed size of a blob in bytes (0 when it does not exist)"""
+        try:
+            return os.path.getsize(self._path(digest))
+        except OSError:
+            return 0
+
+
+_blob_store = None
+_blob_store_lock = threading.Lock()
+
+
+def get_blob_store():
+    """Shared resume store for the process"""
+    global _blob_store
+    if _blob_store is None:
+        with _blob_store_lock:
+            if _blob_store is None:
+                _blob_store = BlobStore()
+    return _blob_store
+
+
+# Benchmark: storage footprint of resume text in the graph versus the blob store,
+# and candidate lookup latency with and without resume text on the node.
+# The Neo4j part uses a separate BenchCandidate label and deletes it afterwards.
+if __name__ == "__main__":
+    import random
+    import statistics
+    import time
+
+    from utils.synthetic_data import synthetic_resume_text
+
+    count = int(os.getenv("BLOB_BENCHMARK_RESUMES", "1000"))
+    rng = random.Random(7)
+    resumes = [synthetic_resume_text(rng, pages=rng.randint(1, 3)) for _ in range(count)]
+
+    with tempfile.TemporaryDirectory() as root:
+        store = BlobStore(root)
+        started = time.perf_counter()
+        digests = [store.put(resume) for resume in resumes]
+        put_time = (time.perf_counter() - started) / count
+
+        started = time.perf_counter()
+        for digest in digests:
+            store.get(digest)
+        get_time = (time.perf_counter() - started) / count
+
+        raw_bytes = sum(len(resume.encode("utf-8")) for resume in resumes)
+        stored_bytes = sum(store.size(digest) for digest in set(digests))
+
+    print(f"{count} resumes: {raw_bytes / 1024 / 1024:.1f} MB of text as node properties, "
+          f"{stored_bytes / 1024 / 1024:.1f} MB compressed on disk ({raw_bytes / max(stored_bytes, 1):.1f}x), "
+          f"hash on the node: {64 * count / 1024:.0f} KB")
+    print(f"blob put {put_time * 1000:.3f} ms, get {get_time * 1000:.3f} ms")
+
+    from db.db_integration import Neo4jConnection
+
+    neo4j_conn = Neo4jConnection()
+    if not neo4j_conn.connect():
+        raise SystemExit("Neo4j is not reachable; skipping the lookup benchmark")
+
+    def lookup_latency(query, runs=200):
+        timings = []
+        with neo4j_conn.driver.session() as session:
+            for n in range(runs):
+                started = time.perf_counter()
+                session.run(query, id=f"bench-{n % count}").single()
+                timings.append(time.perf_counter() - started)
+        return statistics.median(timings) * 1000
+
+    try:
+        with neo4j_conn.driver.session() as session:
+            session.run("CREATE INDEX bench_candidate_id IF NOT EXISTS FOR (c:BenchCandidate) ON (c.id)").consume()
+            session.run("""
+                UNWIND $rows AS row
+                CREATE (:BenchCandidate {id: row.id, name: row.name, email: row.email,
+                                         resume_text: row.resume_text, resume_hash: row.resume_hash})
+            """, rows=[
+                {"id": f"bench-{n}", "name": f"Candidate {n}", "email": f"candidate{n}@example.com",
+                 "resume_text": resume, "resume_hash": digest}
+                for n, (resume, digest) in enumerate(zip(resumes, digests))
+            ]).consume()
+
+        whole = lookup_latency("MATCH (c:BenchCandidate {id: $id}) RETURN c")
+        projected = lookup_latency(
+            "MATCH (c:BenchCandidate {id: $id}) RETURN c.id AS id, c.name AS name, c.email AS email, c.resume_hash AS resume_hash"
+        )
+        print(f"candidate lookup: whole node {whole:.2f} ms, projected fields {projected:.2f} ms (median)")
+    finally:
+        with neo4j_conn.driver.session() as session:
+            session.run("MATCH (c:BenchCandidate) DETACH DELETE c").consume()
+            session.run("DROP INDEX bench_candidate_id IF EXISTS").consume()
+        neo4j_conn.close()
@@ -0,0 +1,166 @@
+# utils/llm_clients.py
+import logging
+import os
+import threading
+import time
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+
+from agents.groq_handler import GroqLimitHandler
+from agents.llm_router import LLMRouter
+
+# HTTP connection pooling for LLM providers (shared by every request in the process)
+HTTP_MAX_CONNECTIONS = int(os.getenv("LLM_HTTP_MAX_CONNECTIONS", "20"))
+HTTP_MAX_KEEPALIVE = int(os.getenv("LLM_HTTP_MAX_KEEPALIVE", "10"))
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv("LLM_HTTP_KEEPALIVE_EXPIRY", "30"))
+HTTP_TIMEOUT = float(os.getenv("LLM_HTTP_TIMEOUT", "60"))
+
+# Failover provider used by the router when Groq is rate limited (optional)
+GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
+# Seconds before a slow request is hedged, and provider calls in flight per process
+LLM_HEDGE_AFTER = float(os.getenv("LLM_HEDGE_AFTER", "10"))
+LLM_ROUTER_WORKERS = int(os.getenv("LLM_ROUTER_WORKERS", "32"))
+
+logger = logging.getLogger(__name__)
+
+# Reentrant: some factories fetch the clients they wrap through _get_or_create
+_lock = threading.RLock()
+_clients = {}
+
+
+def _get_or_create(name, factory):
+    """Return the shared client called name, creating it once under the lock"""
+    client = _clients.get(name)
+    if client is not None:
+        return client
+
+    with _lock:
+        client = _clients.get(name)
+        if client is None:
+            client = factory()
+            _clients[name] = client
+        return client
+
+
+def _build_groq_http_client():
+    return httpx.Client(
+        limits=httpx.Limits(
+            max_connections=HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=HTTP_MAX_KEEPALIVE,
+            keepalive_expiry=HTTP_KEEPALIVE_EXPIRY
+        ),
+        timeout=HTTP_TIMEOUT
+    )
+
+
+def _build_groq_client():
+    from groq import Groq
+
+    return Groq(api_key=os.getenv("GROQ_API_KEY"), http_client=_get_or_create("groq_http", _build_groq_http_client))
+
+
+def _build_http_session():
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=HTTP_MAX_KEEPALIVE, pool_maxsize=HTTP_MAX_CONNECTIONS)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def get_groq_client():
+    """Shared Groq SDK client with a pooled keep-alive HTTP connection"""
+    return _get_or_create("groq", _build_groq_client)
+
+
+def get_groq_handler():
+    """Shared GroqLimitHandler, so rate limit state and the response cache are process-wide"""
+    return _get_or_create("groq_handler", lambda: GroqLimitHandler(get_groq_client()))
+
+
+def _build_llm_router():
+    providers = {"groq": get_groq_handler()}
+    if GEMINI_API_KEY:
+        try:
+            from agents.gemini_client import GeminiClient
+            providers["gemini"] = GeminiClient(GEMINI_API_KEY)
+        except ImportError as e:
+            logger.warning("GEMINI_API_KEY is set but Gemini is unavailable: %s", e)
+    return LLMRouter(providers, hedge_after=LLM_HEDGE_AFTER, max_workers=LLM_ROUTER_WORKERS)
+
+
+def get_llm_router():
+    """
+    Shared LLMRouter for blocking completions
+
+    Groq (through the shared GroqLimitHandler) is the primary provider; when
+    GEMINI_API_KEY is set, requests fail over to Gemini while Groq is rate
+    limited or out of daily quota.
+    """
+    return _get_or_create("llm_router", _build_llm_router)
+
+
+def get_http_session():
+    """Shared requests session for REST-based LLM clients"""
+    return _get_or_create("http_session", _build_http_session)
+
+
+def warm_up():
+    """
+    Create the shared clients at startup instead of on the first application
+
+    The pooled HTTP clients are always created. Without GROQ_API_KEY the Groq
+    client is left to be built on first use, so the app can still start.
+    """
+    _get_or_create("groq_http", _build_groq_http_client)
+    get_http_session()
+
+    from groq import GroqError
+
+    try:
+        get_groq_client()
+    except GroqError as e:
+        logger.warning("Groq client not created at startup: %s", e)
+        return
+    get_groq_handler()
+    get_llm_router()
+
+
+def reset_clients():
+    """Close and forget all shared clients (e.g. after fork or in tests)"""
+    with _lock:
+        for client in _clients.values():
+            close = getattr(client, "close", None)
+            if close:
+                close()
+        _clients.clear()
+
+
+# Startup benchmark: per-application client setup versus the shared registry
+if __name__ == "__main__":
+    from groq import Groq
+
+    runs = 50
+    started = time.perf_counter()
+    for _ in range(runs):
+        client = Groq(api_key=os.getenv("GROQ_API_KEY", "benchmark"))
+        client.close()
+    per_application = (time.perf_counter() - started) / runs
+
+    os.environ.setdefault("GROQ_API_KEY", "benchmark")
+    reset_clients()
+    started = time.perf_counter()
+    warm_up()
+    startup = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for _ in range(runs):
+        get_groq_client()
+    reused = (time.perf_counter() - started) / runs
+
+    print(f"New Groq client per application: {per_application * 1000:.2f} ms")
+    print(f"One-off warm up at startup:      {startup * 1000:.2f} ms")
+    print(f"Shared client lookup:            {reused * 1000:.4f} ms")
+    print(f"Saved per application:           {(per_application - reused) * 1000:.2f} ms "
+          "(plus the TLS handshake a fresh connection pool pays on its first request)")
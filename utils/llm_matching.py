@@ -0,0 +1,258 @@
+# utils/llm_matching.py
+import json
+import logging
+import re
+
+from agents.json_stream import IncrementalJSONParser
+from db.db_integration import CandidateManager
+from utils.blob_store import get_blob_store
+from agents.llm_router import is_rate_limit_error
+from utils.llm_clients import get_groq_handler, get_llm_router
+
+logger = logging.getLogger(__name__)
+
+# Completion tokens allowed for one evaluation
+EVALUATION_MAX_TOKENS = 1024
+
+
+def _categorize(score):
+    """Map a 0-1 score to the match categories used across the admin UI"""
+    if score > 0.8:
+        return "Excellent Match"
+    if score > 0.6:
+        return "Good Match"
+    if score > 0.4:
+        return "Moderate Match"
+    return "Low Match"
+
+
+class LLMMatchingEngine:
+    """Evaluates candidates against jobs with an LLM and stores the result on MATCHES"""
+
+    def __init__(self, neo4j_driver, groq_handler=None, llm_router=None):
+        """
+        Initialize with Neo4j driver
+
+        Args:
+            neo4j_driver: Neo4j driver instance
+            groq_handler: Optional GroqLimitHandler for streaming (defaults to the shared one)
+            llm_router: Optional LLMRouter for blocking calls; defaults to the shared
+                        one, or to groq_handler alone when only that is passed
+        """
+        self.driver = neo4j_driver
+        self.groq_handler = groq_handler or get_groq_handler()
+        self.llm = llm_router or (groq_handler if groq_handler else get_llm_router())
+        self.candidate_manager = CandidateManager(neo4j_driver)
+
+    def _get_evaluation_context(self, candidate_id, job_id):
+        """Fetch the resume, skills and job description needed for the prompt"""
+        with self.driver.session() as session:
+            result = session.run("""
+                MATCH (c:Candidate {id: $candidate_id})
+                MATCH (j:Job {job_id: $job_id})
+                OPTIONAL MATCH (c)-[:HAS_SKILL]->(s:Skill)
+                RETURN c.name AS name,
+                       c.resume_hash AS resume_hash,
+                       c.resume_text AS resume_text,
+                       collect(DISTINCT s.name) AS skills,
+                       j.title AS job_title,
+                       j.description AS job_description
+            """, candidate_id=candidate_id, job_id=job_id)
+
+            record = result.single()
+            if not record:
+                return None
+
+        context = dict(record)
+        # resume_text is only on candidates that have not been migrated to the blob store
+        if context["resume_text"] is None:
+            context["resume_text"] = get_blob_store().get(context["resume_hash"]) or ""
+        return context
+
+    def _build_messages(self, context):
+        """Create the evaluation prompt"""
+        return [
+            {
+                "role": "system",
+                "content": "You are an expert HR recruiter. Evaluate how well a candidate fits a job."
+            },
+            {
+                "role": "user",
+                "content": f"""Evaluate the candidate below for the position '{context['job_title']}'.
+
+Job description:
+{context['job_description']}
+
+Candidate: {context['name']}
+Known skills: {', '.join(context['skills'] or [])}
+
+Resume:
+{context['resume_text']}
+
+Respond ONLY with a JSON object with these keys, in this order:
+- overall_score: number between 0 and 1
+- match_category: one of "Excellent Match", "Good Match", "Moderate Match", "Low Match"
+- strengths: array of short strings
+- gaps: array of short strings
+- recommendations: array of short strings
+"""
+            }
+        ]
+
+    def _normalize_evaluation(self, data):
+        """Fill in defaults and expose the score under both names the templates use"""
+        try:
+            score = float(data.get("overall_score", data.get("match_score", 0)) or 0)
+        except (TypeError, ValueError):
+            score = 0.0
+
+        # Some models answer on a 0-100 scale
+        if score > 1:
+            score = score / 100
+        score = round(max(0.0, min(score, 1.0)), 2)
+
+        return {
+            "overall_score": score,
+            "match_score": score,
+            "match_category": data.get("match_category") or _categorize(score),
+            "strengths": list(data.get("strengths") or []),
+            "gaps": list(data.get("gaps") or []),
+            "recommendations": list(data.get("recommendations") or [])
+        }
+
+    def _error_evaluation(self, message):
+        evaluation = self._normalize_evaluation({})
+        evaluation["match_category"] = "Not Evaluated"
+        evaluation["error"] = message
+        return evaluation
+
+    def _parse_response(self, content):
+        """Extract the JSON object from an LLM response"""
+        json_match = re.search(r'```json\n([\s\S]+?)\n```', content)
+        if json_match:
+            content = json_match.group(1)
+
+        json_str = re.search(r'(\{[\s\S]+\})', content)
+        if json_str:
+            content = json_str.group(1)
+
+        return json.loads(content)
+
+    def evaluate_candidate_for_job(self, candidate_id, job_id):
+        """
+        Evaluate a candidate for a job and store the result
+
+        Args:
+            candidate_id: Candidate's ID
+            job_id: Job's ID
+
+        Returns:
+            dict: Evaluation with score, category, strengths, gaps and recommendations
+        """
+        context = self._get_evaluation_context(candidate_id, job_id)
+        if not context:
+            return self._error_evaluation("Candidate or job not found")
+
+        evaluation = self.evaluate_messages(self._build_messages(context))
+        if "error" not in evaluation:
+            self.candidate_manager._store_llm_evaluation(candidate_id, job_id, evaluation)
+        return evaluation
+
+    def evaluate_messages(self, messages):
+        """
+        Run an evaluation prompt without storing the result
+
+        Args:
+            messages: Prompt from _build_messages
+
+        Returns:
+            dict: Normalized evaluation, with an 'error' key if it failed
+        """
+        response = self.llm.generate_completion(
+            messages=messages,
+            temperature=0.2,
+            max_tokens=EVALUATION_MAX_TOKENS
+        )
+
+        if not response["success"]:
+            return self._error_evaluation(response.get("error", "Unknown error evaluating candidate"))
+
+        try:
+            return self._normalize_evaluation(self._parse_response(response["content"]))
+        except (json.JSONDecodeError, AttributeError) as e:
+            return self._error_evaluation(f"Could not parse evaluation: {str(e)}")
+
+    def _evaluation_deltas(self, messages):
+        """
+        Stream an evaluation from Groq, or get it in one chunk from the router
+        while Groq is rate limited
+        """
+        can_fail_over = self.llm is not self.groq_handler
+        if self.groq_handler.is_api_available() or not can_fail_over:
+            streamed = False
+            try:
+                for delta in self.groq_handler.stream_completion(
+                    messages=messages,
+                    temperature=0.2,
+                    max_tokens=EVALUATION_MAX_TOKENS
+                ):
+                    streamed = True
+                    yield delta
+                return
+            except RuntimeError as e:
+                if streamed or not can_fail_over or not is_rate_limit_error(str(e)):
+                    raise
+
+        response = self.llm.generate_completion(
+            messages=messages,
+            temperature=0.2,
+            max_tokens=EVALUATION_MAX_TOKENS
+        )
+        if not response["success"]:
+            raise RuntimeError(response.get("error", "Unknown error evaluating candidate"))
+        yield response["content"]
+
+    def stream_candidate_evaluation(self, candidate_id, job_id):
+        """
+        Evaluate a candidate for a job, yielding partial results as tokens arrive
+
+        Args:
+            candidate_id: Candidate's ID
+            job_id: Job's ID
+
+        Yields:
+            tuple: (event, evaluation) where event is 'partial' while streaming
+                   and 'complete' or 'error' for the final evaluation
+        """
+        context = self._get_evaluation_context(candidate_id, job_id)
+        if not context:
+            yield "error", self._error_evaluation("Candidate or job not found")
+            return
+
+        parser = IncrementalJSONParser()
+        last_partial = None
+
+        try:
+            for delta in self._evaluation_deltas(self._build_messages(context)):
+                partial = parser.feed(delta)
+                if partial and partial != last_partial:
+                    last_partial = dict(partial)
+                    yield "partial", partial
+        except Exception as e:
+            yield "error", self._error_evaluation(str(e))
+            return
+
+        if not parser.is_complete():
+            yield "error", self._error_evaluation("Evaluation stream ended before the JSON object was complete")
+            return
+
+        evaluation = self._normalize_evaluation(parser.partial())
+
+        # Persist once the whole evaluation has arrived
+        try:
+            self.candidate_manager._store_llm_evaluation(candidate_id, job_id, evaluation)
+        except Exception as e:
+            logger.error("Error storing evaluation of %s for job %s: %s", candidate_id, job_id, e)
+            yield "error", self._error_evaluation(f"Evaluation finished but could not be saved: {str(e)}")
+            return
+        yield "complete", evaluation
@@ -0,0 +1,132 @@
+# utils/logging_setup.py
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import threading
+import time
+
+# Root level, and per-logger overrides such as "db.job_sync=DEBUG,agents.matching_engine=WARNING"
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_LEVELS = os.getenv("LOG_LEVELS", "")
+
+# "text" for one line per record, "json" for one JSON object per record
+LOG_FORMAT = os.getenv("LOG_FORMAT", "text").lower()
+
+# Records logged with extra={"sample_key": ...} pass for the first and then every Nth occurrence
+LOG_SAMPLE_EVERY = int(os.getenv("LOG_SAMPLE_EVERY", "100"))
+
+# Attributes every LogRecord has; anything else came from extra= and goes into the JSON output
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
+_listener = None
+_listener_lock = threading.Lock()
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record, including fields passed with extra="""
+
+    def format(self, record):
+        entry = {
+            "ts": time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(record.created)) + f".{int(record.msecs):03d}Z",
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "thread": record.threadName
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES and key not in entry:
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Thins out per-item messages
+
+    Only records with a sample_key attribute are sampled: the first one of each
+    key passes, then every Nth, carrying the number of occurrences so far.
+    """
+
+    def __init__(self, every=None):
+        super().__init__()
+        self.every = LOG_SAMPLE_EVERY if every is None else every
+        self._counts = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        key = getattr(record, "sample_key", None)
+        if key is None or self.every <= 1:
+            return True
+        with self._lock:
+            seen = self._counts.get(key, 0) + 1
+            self._counts[key] = seen
+        if seen % self.every != 1:
+            return False
+        record.occurrences = seen
+        return True
+
+
+def _parse_levels(spec):
+    levels = {}
+    for item in spec.split(","):
+        if "=" in item:
+            name, level = item.split("=", 1)
+            levels[name.strip()] = level.strip().upper()
+    return levels
+
+
+def configure_logging(level=None, levels=None, fmt=None, stream=None):
+    """
+    Route all logging through a queue drained by a background thread
+
+    Callers only format the record and put it on the queue; writing to the
+    stream happens on the listener thread. Safe to call more than once; only
+    the first call installs the handlers.
+
+    Args:
+        level: Root level (defaults to LOG_LEVEL)
+        levels: Per-logger levels as a dict or "name=LEVEL,..." string (defaults to LOG_LEVELS)
+        fmt: "text" or "json" (defaults to LOG_FORMAT)
+        stream: Output stream (defaults to stdout)
+
+    Returns:
+        logging.handlers.QueueListener: The running listener
+    """
+    global _listener
+    with _listener_lock:
+        if _listener is not None:
+            return _listener
+
+        output = logging.StreamHandler(stream or sys.stdout)
+        if (fmt or LOG_FORMAT) == "json":
+            output.setFormatter(JsonFormatter())
+        else:
+            output.setFormatter(logging.Formatter("%(asctime)s %(levelname)-7s %(name)s: %(message)s"))
+
+        records = queue.SimpleQueue()
+        handler = logging.handlers.QueueHandler(records)
+        handler.addFilter(SamplingFilter())
+
+        root = logging.getLogger()
+        for existing in list(root.handlers):
+            root.removeHandler(existing)
+        root.addHandler(handler)
+        root.setLevel(level or LOG_LEVEL)
+
+        overrides = levels if levels is not None else LOG_LEVELS
+        if isinstance(overrides, str):
+            overrides = _parse_levels(overrides)
+        for name, logger_level in overrides.items():
+            logging.getLogger(name).setLevel(logger_level)
+
+        _listener = logging.handlers.QueueListener(records, output, respect_handler_level=True)
+        _listener.start()
+        # Drain what is queued before the interpreter exits
+        atexit.register(_listener.stop)
+        return _listener
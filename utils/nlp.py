@@ -0,0 +1,53 @@
+# utils/nlp.py
+import gc
+import logging
+import os
+from functools import lru_cache
+
+SPACY_MODEL = os.getenv("SPACY_MODEL", "en_core_web_sm")
+
+# Pipeline components that are never used; excluded components are not even loaded
+SPACY_EXCLUDE = [
+    name.strip() for name in os.getenv("SPACY_EXCLUDE", "parser,lemmatizer,attribute_ruler,tagger,senter").split(",")
+    if name.strip()
+]
+
+# Load the model in the master process so forked workers share it (e.g. gunicorn --preload)
+PRELOAD_SPACY = os.getenv("PRELOAD_SPACY", "").lower() in ("1", "true", "yes")
+
+logger = logging.getLogger(__name__)
+
+
+def _passthrough_nlp(text):
+    """Minimal stand-in used when spaCy or the model is not installed"""
+    return text
+
+
+@lru_cache(maxsize=None)
+def get_nlp():
+    """
+    Load the spaCy pipeline on first use
+
+    Returns:
+        The spaCy Language object, or a passthrough function when the model is missing
+    """
+    try:
+        import spacy
+        return spacy.load(SPACY_MODEL, exclude=SPACY_EXCLUDE)
+    except (ImportError, OSError):
+        logger.warning("SpaCy model not found. Install with: python -m spacy download %s", SPACY_MODEL)
+        return _passthrough_nlp
+
+
+def preload_nlp():
+    """
+    Load the model now and freeze it for copy-on-write sharing
+
+    Call this in the parent process before workers fork. gc.freeze() moves
+    everything allocated so far out of the garbage collector's reach, so
+    collections in the children do not touch (and copy) the model's pages.
+    """
+    nlp = get_nlp()
+    gc.collect()
+    gc.freeze()
+    return nlp
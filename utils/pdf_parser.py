@@ -1,404 +1,503 @@
 # utils/pdf_parser.py
 import PyPDF2
 import io
+import json
+import logging
+import mmap
+import os
 import re
-import spacy
+import signal
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
 from datetime import datetime
+from functools import lru_cache
 
-# Try to load spaCy model
-try:
-    nlp = spacy.load("en_core_web_sm")
-except:
-    print("SpaCy model not found. Install with: python -m spacy download en_core_web_sm")
-    # Create a minimal NLP function if spaCy is not available
-    def nlp(text):
-        return text
+from utils.nlp import get_nlp
+from utils.pdf_service import PDF_WORKERS, get_pdf_service
+from utils.resume_segmenter import OTHER_HEADINGS, ResumeSegmenter
+from utils.skill_taxonomy import get_skill_taxonomy
+from utils.text_budget import PAGE_BREAK, map_reduce_extract
+from utils.tracing import annotate, record_llm_usage, span
 
-def extract_text_from_pdf(pdf_file):
+logger = logging.getLogger(__name__)
+
+def __getattr__(name):
+    # spaCy is loaded on first use of pdf_parser.nlp instead of at import time
+    if name == "nlp":
+        return get_nlp()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+# Limits that stop pathological PDFs from pinning a worker
+PDF_MAX_PAGES = int(os.getenv("PDF_MAX_PAGES", "50"))
+PDF_PAGE_TIMEOUT = float(os.getenv("PDF_PAGE_TIMEOUT", "10"))
+
+class PDFPageTimeout(Exception):
+    """Raised when extracting a single page takes longer than the page timeout"""
+
+def _open_pdf_stream(pdf_file):
     """
-    Extract text from uploaded PDF file
-    
-    Args:
-        pdf_file: File object from request.files
+    Get a seekable stream over an upload without copying it into memory again
     
     Returns:
-        Extracted text as string
+        tuple: (stream, mapped) where mapped is an mmap that must be closed
     """
-    # Reset the file pointer to the start of the file
-    pdf_file.seek(0)
+    # werkzeug's FileStorage wraps a BytesIO (small uploads) or a TemporaryFile
+    stream = getattr(pdf_file, "stream", pdf_file)
+    
+    # An in-memory SpooledTemporaryFile would be forced to disk by fileno()
+    if not getattr(stream, "_rolled", True):
+        stream.seek(0)
+        return stream, None
     
-    # Read the PDF file
-    pdf_reader = PyPDF2.PdfReader(io.BytesIO(pdf_file.read()))
+    # File-backed uploads are mapped instead of read; BytesIO has no fileno()
+    # and falls through to the plain stream
+    try:
+        mapped = mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ)
+        return mapped, mapped
+    except (AttributeError, OSError, ValueError, io.UnsupportedOperation):
+        stream.seek(0)
+        return stream, None
+
+def _can_use_alarm():
+    """SIGALRM can interrupt the parser, but only in the main thread"""
+    return hasattr(signal, "SIGALRM") and threading.current_thread() is threading.main_thread()
+
+def _extract_page_text(page, timeout, executor=None):
+    """
+    Extract one page's text, giving up after timeout seconds
     
-    # Extract text from all pages
-    text = ""
-    for page_num in range(len(pdf_reader.pages)):
-        page = pdf_reader.pages[page_num]
-        text += page.extract_text() + "\n"
+    Outside the main thread the page is parsed on executor and the caller
+    stops waiting; the helper thread cannot be interrupted and runs on.
+    """
+    if not timeout:
+        return page.extract_text() or ""
     
-    return text
+    if executor is None:
+        def on_timeout(signum, frame):
+            raise PDFPageTimeout(f"Page extraction exceeded {timeout}s")
+        
+        previous = signal.signal(signal.SIGALRM, on_timeout)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+        try:
+            return page.extract_text() or ""
+        finally:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, previous)
+    
+    future = executor.submit(page.extract_text)
+    try:
+        return future.result(timeout=timeout) or ""
+    except FutureTimeout:
+        raise PDFPageTimeout(f"Page extraction exceeded {timeout}s")
 
-def extract_structured_info(resume_text):
+def iter_pdf_pages(pdf_file, max_pages=None, page_timeout=None):
     """
-    Extract structured information from resume text
+    Yield the text of each page of an uploaded PDF
     
     Args:
-        resume_text: Text extracted from resume
+        pdf_file: File object from request.files (or any binary file object)
+        max_pages: Stop after this many pages (defaults to PDF_MAX_PAGES)
+        page_timeout: Seconds allowed per page (defaults to PDF_PAGE_TIMEOUT)
     
-    Returns:
-        Dictionary with structured information
+    Yields:
+        Text of each page, stopping early at the page limit or on a page timeout
     """
-    structured_info = {
-        "skills": extract_skills(resume_text),
-        "education": extract_education(resume_text),
-        "experience": extract_experience(resume_text),
-        "contact": extract_contact_info(resume_text)
-    }
+    max_pages = PDF_MAX_PAGES if max_pages is None else max_pages
+    page_timeout = PDF_PAGE_TIMEOUT if page_timeout is None else page_timeout
     
-    return structured_info
+    # One helper thread per document, so a timed-out page abandons at most one thread
+    executor = None
+    if page_timeout and not _can_use_alarm():
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="pdf-page")
+    
+    stream, mapped = _open_pdf_stream(pdf_file)
+    try:
+        pdf_reader = PyPDF2.PdfReader(stream)
+        
+        for page_num, page in enumerate(pdf_reader.pages):
+            if max_pages and page_num >= max_pages:
+                logger.info("PDF has more than %d pages, ignoring the rest", max_pages)
+                break
+            
+            try:
+                yield _extract_page_text(page, page_timeout, executor)
+            except PDFPageTimeout as e:
+                # A page this slow usually means the rest of the file is pathological too
+                logger.warning("Stopping PDF extraction at page %d: %s", page_num + 1, e)
+                break
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=False)
+        if mapped is not None:
+            mapped.close()
 
-def extract_skills(text):
-    """Extract skills from resume text"""
-    # Common skill keywords to look for
-    programming_languages = [
-        "Python", "Java", "JavaScript", "C\\+\\+", "C#", "Ruby", "PHP", "Swift", "Kotlin", 
-        "Go", "Rust", "Scala", "Perl", "TypeScript", "HTML", "CSS", "SQL", "R"
-    ]
-    
-    frameworks = [
-        "React", "Angular", "Vue", "Django", "Flask", "Spring", "Express", "Node\\.js",
-        "TensorFlow", "PyTorch", "Keras", "Scikit-learn", "Pandas", "NumPy",
-        "Bootstrap", "jQuery", "Laravel", "ASP\\.NET", "Ruby on Rails"
-    ]
-    
-    databases = [
-        "MySQL", "PostgreSQL", "MongoDB", "SQLite", "Oracle", "SQL Server",
-        "Redis", "Cassandra", "ElasticSearch", "DynamoDB", "Firebase"
-    ]
-    
-    tools = [
-        "Git", "Docker", "Kubernetes", "AWS", "Azure", "GCP", "Jira",
-        "Jenkins", "Travis CI", "CircleCI", "Ansible", "Terraform", "Webpack"
-    ]
-    
-    # Combine all skill categories
-    all_skills = programming_languages + frameworks + databases + tools
-    
-    # Skills section extraction
-    skills_section = extract_section(text, ["skills", "technical skills", "technologies"])
-    
-    # If a skills section is found, extract skills from it
-    extracted_skills = []
-    if skills_section:
-        # Look for list items or comma-separated skills
-        skill_items = re.findall(r'(?:^|\n)[\s•\-*•]+(.*?)(?:\n|$)', skills_section)
-        if skill_items:
-            for item in skill_items:
-                item = item.strip()
-                if item and len(item) > 1:  # Ignore single characters
-                    extracted_skills.append(item)
-        else:
-            # Try comma-separated skills
-            skill_items = re.split(r',|;', skills_section)
-            for item in skill_items:
-                item = item.strip()
-                if item and len(item) > 1:
-                    extracted_skills.append(item)
-    
-    # If no skills were found in a dedicated section, search throughout the text
-    if not extracted_skills:
-        for skill in all_skills:
-            pattern = r'\b' + skill + r'\b'
-            if re.search(pattern, text, re.IGNORECASE):
-                # Use the case from the original skill list
-                extracted_skills.append(skill)
-    
-    # Remove duplicates while preserving order
-    unique_skills = []
-    for skill in extracted_skills:
-        if skill not in unique_skills:
-            unique_skills.append(skill)
-    
-    return unique_skills
+def extract_text_from_pdf(pdf_file, max_pages=None, page_timeout=None):
+    """
+    Extract text from uploaded PDF file
+    
+    Args:
+        pdf_file: File object from request.files
+        max_pages: Optional page limit (defaults to PDF_MAX_PAGES)
+        page_timeout: Optional per-page timeout in seconds (defaults to PDF_PAGE_TIMEOUT)
+    
+    Returns:
+        Extracted text as string
+    """
+    # Parse in the worker pool so a pathological PDF cannot pin the request thread
+    if PDF_WORKERS > 0:
+        result = get_pdf_service().parse(pdf_file, max_pages, page_timeout)
+        if not result["success"]:
+            raise ValueError(result["error"])
+        return result["text"]
+    
+    # Join once instead of growing a string page by page
+    pages = list(iter_pdf_pages(pdf_file, max_pages, page_timeout))
+    return PAGE_BREAK.join(page_text + "\n" for page_text in pages)
 
-def extract_education(text):
-    """Extract education information from resume text"""
-    education_section = extract_section(text, ["education", "academic", "qualification"])
-    if not education_section:
-        education_section = text  # Fall back to full text if no education section found
-    
-    # Common degree patterns
-    degree_patterns = [
-        r"(?:B\.?S\.?|Bachelor of Science|Bachelor's)[^\n.]*?(?:in|,)?\s*([^\n.]*)",
-        r"(?:B\.?A\.?|Bachelor of Arts|Bachelor's)[^\n.]*?(?:in|,)?\s*([^\n.]*)",
-        r"(?:M\.?S\.?|Master of Science|Master's)[^\n.]*?(?:in|,)?\s*([^\n.]*)",
-        r"(?:M\.?A\.?|Master of Arts|Master's)[^\n.]*?(?:in|,)?\s*([^\n.]*)",
-        r"(?:Ph\.?D\.?|Doctor of Philosophy|Doctorate)[^\n.]*?(?:in|,)?\s*([^\n.]*)",
-        r"(?:B\.?Tech\.?|Bachelor of Technology)[^\n.]*?(?:in|,)?\s*([^\n.]*)",
-        r"(?:M\.?Tech\.?|Master of Technology)[^\n.]*?(?:in|,)?\s*([^\n.]*)"
-    ]
-    
-    # Common university/college pattern
-    university_pattern = r'([A-Z][a-zA-Z\s&]+(?:University|College|Institute|School))'
-    
-    # Date patterns
-    date_pattern = r'(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec|January|February|March|April|May|June|July|August|September|October|November|December)[a-z]*\.?[\s,-]+\d{4}'
-    year_range_pattern = r'(?:20|19)\d{2}\s*(?:-|–|to)\s*(?:(?:20|19)\d{2}|Present|Current|Now)'
-    
-    # GPA pattern
-    gpa_pattern = r'(?:GPA|Grade Point Average|CGPA)[\s:]*([0-9.]+)(?:\s*\/\s*([0-9.]+))?'
-    percentage_pattern = r'(?:Percentage|marks)[\s:]*([0-9.]+)\s*%'
-    
-    # Structured education entries
-    education_entries = []
-    
-    # Look for education paragraphs or bullet points
-    education_items = re.findall(r'(?:^|\n)(?:[•\-*]\s*|\d+\.\s*|)([^\n]+(?:university|college|institute|school|degree|bachelor|master|phd|b\.s|m\.s|b\.a|m\.a)[^\n]+)(?:\n|$)', education_section, re.IGNORECASE)
-    
-    # Process each education item
-    for item in education_items:
-        education_entry = {"degree": "", "field": "", "university": "", "date_range": "", "gpa": ""}
+# Resume section headings, per field
+SKILLS_KEYWORDS = ("skills", "technical skills", "technologies")
+EDUCATION_KEYWORDS = ("education", "academic", "qualification")
+EXPERIENCE_KEYWORDS = ("experience", "work experience", "employment", "professional experience")
+
+# Degree patterns, labelled with the degree they detect
+DEGREE_PATTERNS = [
+    ("Bachelor of Science", re.compile(r"(?:B\.?S\.?|Bachelor of Science|Bachelor's)[^\n.]*?(?:in|,)?\s*([^\n.]*)", re.IGNORECASE)),
+    ("Bachelor of Arts", re.compile(r"(?:B\.?A\.?|Bachelor of Arts|Bachelor's)[^\n.]*?(?:in|,)?\s*([^\n.]*)", re.IGNORECASE)),
+    ("Master of Science", re.compile(r"(?:M\.?S\.?|Master of Science|Master's)[^\n.]*?(?:in|,)?\s*([^\n.]*)", re.IGNORECASE)),
+    ("Master of Arts", re.compile(r"(?:M\.?A\.?|Master of Arts|Master's)[^\n.]*?(?:in|,)?\s*([^\n.]*)", re.IGNORECASE)),
+    ("PhD", re.compile(r"(?:Ph\.?D\.?|Doctor of Philosophy|Doctorate)[^\n.]*?(?:in|,)?\s*([^\n.]*)", re.IGNORECASE)),
+    ("Bachelor of Technology", re.compile(r"(?:B\.?Tech\.?|Bachelor of Technology)[^\n.]*?(?:in|,)?\s*([^\n.]*)", re.IGNORECASE)),
+    ("Master of Technology", re.compile(r"(?:M\.?Tech\.?|Master of Technology)[^\n.]*?(?:in|,)?\s*([^\n.]*)", re.IGNORECASE))
+]
+
+# Job title keywords - common job titles and seniority indicators
+TITLE_KEYWORDS = r'(?:Software|Senior|Junior|Lead|Principal|Full Stack|Backend|Frontend|Data|Machine Learning|DevOps|QA|Product|Project|Program|Technical|Chief|Director|VP|Head|Manager|Engineer|Developer|Scientist|Analyst|Specialist|Consultant|Architect|Administrator|Designer)'
+
+UNIVERSITY_PATTERN = re.compile(r'([A-Z][a-zA-Z\s&]+(?:University|College|Institute|School))')
+COMPANY_PATTERN = re.compile(r'([A-Z][a-zA-Z\s&]+(?:Pvt\.?|Private|Inc\.?|LLC|Ltd\.?|Limited|Corp\.?|Corporation|Group|Technologies|Solutions|Systems|Company))')
+TITLE_PATTERN = re.compile(TITLE_KEYWORDS)
+DATE_PATTERN = re.compile(r'(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec|January|February|March|April|May|June|July|August|September|October|November|December)[a-z]*\.?[\s,-]+\d{4}')
+YEAR_RANGE_PATTERN = re.compile(r'(?:20|19)\d{2}\s*(?:-|–|to)\s*(?:(?:20|19)\d{2}|Present|Current|Now)')
+GPA_PATTERN = re.compile(r'(?:GPA|Grade Point Average|CGPA)[\s:]*([0-9.]+)(?:\s*\/\s*([0-9.]+))?')
+PERCENTAGE_PATTERN = re.compile(r'(?:Percentage|marks)[\s:]*([0-9.]+)\s*%')
+
+# Line-level patterns; the segmenter hands each extractor the lines of its section
+BULLET_PREFIX_PATTERN = re.compile(r'^\s*(?:[•\-*]|\d+\.)\s*')
+BULLET_LINE_PATTERN = re.compile(r'^\s*[•\-*]+\s*(.+)')
+SKILL_SEPARATOR_PATTERN = re.compile(r',|;')
+EDUCATION_LINE_PATTERN = re.compile(r'university|college|institute|school|degree|bachelor|master|phd|b\.s|m\.s|b\.a|m\.a', re.IGNORECASE)
+TITLE_END_PATTERN = re.compile(r'\s+(?:at|with)\s+|[-–|,•(]')
+
+EMAIL_PATTERN = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+PHONE_PATTERN = re.compile(r'(?:\+?\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}')
+ALT_PHONE_PATTERN = re.compile(r'\b\d{10}\b')
+LINKEDIN_PATTERNS = [
+    re.compile(r'linkedin\.com/in/([a-zA-Z0-9_-]+)', re.IGNORECASE),
+    re.compile(r'linkedin:\s*([a-zA-Z0-9_-]+)', re.IGNORECASE)
+]
+GITHUB_PATTERNS = [
+    re.compile(r'github\.com/([a-zA-Z0-9_-]+)', re.IGNORECASE),
+    re.compile(r'github:\s*([a-zA-Z0-9_-]+)', re.IGNORECASE)
+]
+WEBSITE_PATTERN = re.compile(r'https?://(?:www\.)?([a-zA-Z0-9.-]+\.[a-zA-Z]{2,})(?:/\S*)?')
+
+@lru_cache(maxsize=64)
+def _section_segmenter(section_keywords):
+    """Segmenter (built once per keyword tuple) for extract_section"""
+    known_headings = SKILLS_KEYWORDS + EDUCATION_KEYWORDS + EXPERIENCE_KEYWORDS + OTHER_HEADINGS
+    return ResumeSegmenter({"section": section_keywords}, known_headings)
+
+def _find_date_range(text):
+    """Find a "Month YYYY - Month YYYY" range (or a single date, or a year range) in text"""
+    date_match = DATE_PATTERN.search(text)
+    if date_match:
+        # Look for a second date to form a range
+        second_date = DATE_PATTERN.search(text, date_match.end())
+        if second_date:
+            return text[date_match.start():second_date.end()].strip()
+        return date_match.group(0).strip()
+    
+    year_match = YEAR_RANGE_PATTERN.search(text)
+    if year_match:
+        return year_match.group(0).strip()
+    return ""
+
+def _find_degree(text):
+    """Return (degree, field) for the first degree mentioned in text"""
+    for degree_type, pattern in DEGREE_PATTERNS:
+        degree_match = pattern.search(text)
+        if degree_match:
+            return degree_type, (degree_match.group(1) or "").strip()
+    return "", ""
+
+class ResumeParser:
+    """
+    Regex-based resume parser with every pattern compiled once
+    
+    The document is split into lines and segmented into sections in a single
+    pass; each extractor then only looks at the lines of its own section.
+    """
+    
+    def __init__(self, sections=None):
+        """
+        Args:
+            sections: Optional dict of section name -> heading keywords
+        """
+        self.sections = sections or {
+            "skills": SKILLS_KEYWORDS,
+            "education": EDUCATION_KEYWORDS,
+            "experience": EXPERIENCE_KEYWORDS
+        }
+        self.segmenter = ResumeSegmenter(self.sections)
+    
+    def segment(self, text):
+        """Split resume text into sections (see ResumeSegmenter)"""
+        return self.segmenter.segment(text)
+    
+    def parse(self, resume_text):
+        """
+        Extract structured information from resume text
         
-        # Extract degree and field
-        for pattern in degree_patterns:
-            degree_match = re.search(pattern, item, re.IGNORECASE)
-            if degree_match:
-                degree_type = re.match(r"([^,]*)", pattern).group(1)
-                education_entry["degree"] = degree_type.strip()
-                education_entry["field"] = degree_match.group(1).strip()
-                break
+        Args:
+            resume_text: Text extracted from resume
+        
+        Returns:
+            Dictionary with structured information
+        """
+        segments = self.segment(resume_text)
+        return {
+            "skills": self.extract_skills(resume_text, segments.section_lines("skills")),
+            "education": self.extract_education(resume_text, segments.section_lines("education")),
+            "experience": self.extract_experience(resume_text, segments.section_lines("experience")),
+            "contact": self.extract_contact_info(resume_text)
+        }
+    
+    def extract_skills(self, text, section_lines):
+        """Extract skills from the skills section lines, or from the whole text if there are none"""
+        # Bulleted skills are one per line; other lines (e.g. "Skills: Python, SQL") are comma-separated
+        skill_items = []
+        for line in section_lines:
+            bullet_match = BULLET_LINE_PATTERN.match(line)
+            if bullet_match:
+                skill_items.append(bullet_match.group(1))
+            else:
+                skill_items.extend(SKILL_SEPARATOR_PATTERN.split(line))
         
-        # Extract university
-        uni_match = re.search(university_pattern, item)
-        if uni_match:
-            education_entry["university"] = uni_match.group(1).strip()
+        extracted_skills = []
+        for item in skill_items:
+            item = item.strip()
+            if item and len(item) > 1:  # Ignore single characters
+                extracted_skills.append(item)
         
-        # Extract date range
-        date_match = re.search(date_pattern, item)
-        if date_match:
-            education_entry["date_range"] = date_match.group(0).strip()
-        else:
-            year_match = re.search(year_range_pattern, item)
-            if year_match:
-                education_entry["date_range"] = year_match.group(0).strip()
+        taxonomy = get_skill_taxonomy()
         
-        # Extract GPA or percentage
-        gpa_match = re.search(gpa_pattern, item)
-        if gpa_match:
-            if gpa_match.group(2):  # If there's a denominator
-                education_entry["gpa"] = f"{gpa_match.group(1)}/{gpa_match.group(2)}"
-            else:
-                education_entry["gpa"] = gpa_match.group(1)
-        else:
-            percentage_match = re.search(percentage_pattern, item)
-            if percentage_match:
-                education_entry["gpa"] = f"{percentage_match.group(1)}%"
+        # If no skills were found in a dedicated section, scan the text once for known skills
+        if not extracted_skills:
+            return [skill["name"] for skill in taxonomy.find_skills(text)]
+        
+        # Use canonical names for known skills ("JS" -> "JavaScript")
+        canonical_skills = []
+        for item in extracted_skills:
+            skill = taxonomy.canonicalize(item)
+            canonical_skills.append(skill["name"] if skill else item)
         
-        # Only add non-empty entries
-        if education_entry["degree"] or education_entry["university"]:
-            education_entries.append(education_entry)
-    
-    # If no structured entries were found, try a simpler approach
-    if not education_entries:
-        # Look for university mentions
-        universities = re.findall(university_pattern, education_section)
-        for university in universities:
-            # Find nearby degree mentions
-            university_idx = education_section.find(university)
-            context = education_section[max(0, university_idx - 100):min(len(education_section), university_idx + 100)]
+        # Remove duplicates while preserving order
+        return list(dict.fromkeys(canonical_skills))
+    
+    def extract_education(self, text, section_lines):
+        """Extract education entries from the education section lines (or the whole text)"""
+        if not section_lines:
+            section_lines = text.splitlines()  # Fall back to full text if no education section found
+        
+        education_entries = []
+        
+        # Each line mentioning a degree or an institution is an entry
+        for line in section_lines:
+            if not EDUCATION_LINE_PATTERN.search(line):
+                continue
+            item = BULLET_PREFIX_PATTERN.sub("", line).strip()
             
-            education_entry = {"degree": "", "field": "", "university": university.strip(), "date_range": "", "gpa": ""}
+            education_entry = {"degree": "", "field": "", "university": "", "date_range": "", "gpa": ""}
             
-            # Try to find degree in context
-            for pattern in degree_patterns:
-                degree_match = re.search(pattern, context, re.IGNORECASE)
-                if degree_match:
-                    degree_type = re.match(r"([^,]*)", pattern).group(1)
-                    education_entry["degree"] = degree_type.strip()
-                    education_entry["field"] = degree_match.group(1).strip() if degree_match.group(1) else ""
-                    break
+            education_entry["degree"], education_entry["field"] = _find_degree(item)
             
-            # Try to find date in context
-            date_match = re.search(date_pattern, context)
-            if date_match:
-                education_entry["date_range"] = date_match.group(0).strip()
-            else:
-                year_match = re.search(year_range_pattern, context)
-                if year_match:
-                    education_entry["date_range"] = year_match.group(0).strip()
+            uni_match = UNIVERSITY_PATTERN.search(item)
+            if uni_match:
+                education_entry["university"] = uni_match.group(1).strip()
             
-            education_entries.append(education_entry)
-    
-    return education_entries
-
-def extract_experience(text):
-    """Extract work experience information from resume text"""
-    experience_section = extract_section(text, ["experience", "work experience", "employment", "professional experience"])
-    if not experience_section:
-        experience_section = text  # Fall back to full text if no experience section found
-    
-    # Job title pattern - common job titles followed by common seniority indicators
-    title_pattern = r'(?:Software|Senior|Junior|Lead|Principal|Full Stack|Backend|Frontend|Data|Machine Learning|DevOps|QA|Product|Project|Program|Technical|Chief|Director|VP|Head|Manager|Engineer|Developer|Scientist|Analyst|Specialist|Consultant|Architect|Administrator|Designer)'
-    
-    # Company pattern - look for Pvt Ltd, Inc, LLC, etc. or capitalized words
-    company_pattern = r'([A-Z][a-zA-Z\s&]+(?:Pvt\.?|Private|Inc\.?|LLC|Ltd\.?|Limited|Corp\.?|Corporation|Group|Technologies|Solutions|Systems|Company))'
-    
-    # Date patterns
-    date_pattern = r'(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec|January|February|March|April|May|June|July|August|September|October|November|December)[a-z]*\.?[\s,-]+\d{4}'
-    year_range_pattern = r'(?:20|19)\d{2}\s*(?:-|–|to)\s*(?:(?:20|19)\d{2}|Present|Current|Now)'
-    
-    # Structured experience entries
-    experience_entries = []
-    
-    # Look for experience paragraphs or bullet points
-    experience_items = re.findall(r'(?:^|\n)(?:[•\-*]\s*|\d+\.\s*|)([^\n]*?' + title_pattern + r'[^\n]*?)(?:\n|$)', experience_section)
-    
-    # Process each experience item
-    for item in experience_items:
-        experience_entry = {"title": "", "company": "", "date_range": "", "description": "", "responsibilities": []}
-        
-        # Extract job title
-        title_match = re.search(title_pattern, item)
-        if title_match:
-            # Try to find full title (position might be longer than just the matched keyword)
-            title_idx = item.find(title_match.group(0))
-            # Look for separators that might indicate the end of the title
-            separators = ["at", "with", "-", "|", ",", "•"]
-            end_idx = len(item)
-            for sep in separators:
-                sep_idx = item.find(sep, title_idx)
-                if sep_idx > title_idx and sep_idx < end_idx:
-                    end_idx = sep_idx
+            year_match = DATE_PATTERN.search(item) or YEAR_RANGE_PATTERN.search(item)
+            if year_match:
+                education_entry["date_range"] = year_match.group(0).strip()
+            
+            # Extract GPA or percentage
+            gpa_match = GPA_PATTERN.search(item)
+            if gpa_match:
+                if gpa_match.group(2):  # If there's a denominator
+                    education_entry["gpa"] = f"{gpa_match.group(1)}/{gpa_match.group(2)}"
+                else:
+                    education_entry["gpa"] = gpa_match.group(1)
+            else:
+                percentage_match = PERCENTAGE_PATTERN.search(item)
+                if percentage_match:
+                    education_entry["gpa"] = f"{percentage_match.group(1)}%"
             
-            experience_entry["title"] = item[title_idx:end_idx].strip()
+            # Only add non-empty entries
+            if education_entry["degree"] or education_entry["university"]:
+                education_entries.append(education_entry)
         
-        # Extract company
-        company_match = re.search(company_pattern, item)
-        if company_match:
-            experience_entry["company"] = company_match.group(1).strip()
+        # If no structured entries were found, look for university mentions
+        if not education_entries:
+            education_section = "\n".join(section_lines)
+            for uni_match in UNIVERSITY_PATTERN.finditer(education_section):
+                # Look for degree and dates around the university name
+                university_idx = uni_match.start()
+                context = education_section[max(0, university_idx - 100):university_idx + 100]
+                
+                degree, field = _find_degree(context)
+                year_match = DATE_PATTERN.search(context) or YEAR_RANGE_PATTERN.search(context)
+                
+                education_entries.append({
+                    "degree": degree,
+                    "field": field,
+                    "university": uni_match.group(1).strip(),
+                    "date_range": year_match.group(0).strip() if year_match else "",
+                    "gpa": ""
+                })
         
-        # Extract date range
-        date_match = re.search(date_pattern, item)
-        if date_match:
-            date_idx = item.find(date_match.group(0))
-            # Look for a second date to form a range
-            second_date = re.search(date_pattern, item[date_idx + len(date_match.group(0)):])
-            if second_date:
-                experience_entry["date_range"] = item[date_idx:date_idx + len(date_match.group(0)) + second_date.span()[1]].strip()
-            else:
-                experience_entry["date_range"] = date_match.group(0).strip()
-        else:
-            year_match = re.search(year_range_pattern, item)
-            if year_match:
-                experience_entry["date_range"] = year_match.group(0).strip()
+        return education_entries
+    
+    def extract_experience(self, text, section_lines):
+        """Extract work experience entries from the experience section lines (or the whole text)"""
+        if not section_lines:
+            section_lines = text.splitlines()  # Fall back to full text if no experience section found
         
-        # Look for responsibilities in bullet points following this entry
-        resp_pattern = r'(?:^|\n)[•\-*]\s*([^\n]+)'
-        idx = experience_section.find(item)
-        if idx != -1:
-            next_idx = idx + len(item)
-            next_section = experience_section[next_idx:next_idx + 500]  # Look ahead for bullet points
-            responsibilities = re.findall(resp_pattern, next_section)
-            experience_entry["responsibilities"] = [r.strip() for r in responsibilities[:5]]  # Limit to 5 responsibilities
+        experience_entries = []
         
-        # Only add non-empty entries
-        if experience_entry["title"] or experience_entry["company"]:
-            experience_entries.append(experience_entry)
-    
-    # If no structured entries were found, try a simpler approach
-    if not experience_entries:
-        # Look for company mentions
-        companies = re.findall(company_pattern, experience_section)
-        for company in companies:
-            # Find nearby title mentions
-            company_idx = experience_section.find(company)
-            context = experience_section[max(0, company_idx - 100):min(len(experience_section), company_idx + 200)]
+        # A line mentioning a job title starts an entry; the bullets below it are its responsibilities
+        i = 0
+        while i < len(section_lines):
+            title_match = TITLE_PATTERN.search(section_lines[i])
+            if not title_match:
+                i += 1
+                continue
             
-            experience_entry = {"title": "", "company": company.strip(), "date_range": "", "description": "", "responsibilities": []}
+            item = BULLET_PREFIX_PATTERN.sub("", section_lines[i]).strip()
+            experience_entry = {"title": "", "company": "", "date_range": "", "description": "", "responsibilities": []}
             
-            # Try to find title in context
-            title_match = re.search(title_pattern, context)
+            # The title runs from the keyword to the first separator ("at", "-", "|", ...)
+            title_match = TITLE_PATTERN.search(item)
             if title_match:
-                experience_entry["title"] = title_match.group(0).strip()
+                end_match = TITLE_END_PATTERN.search(item, title_match.end())
+                experience_entry["title"] = item[title_match.start():end_match.start() if end_match else len(item)].strip()
             
-            # Try to find date in context
-            date_match = re.search(date_pattern, context)
-            if date_match:
-                date_idx = context.find(date_match.group(0))
-                # Look for a second date to form a range
-                second_date = re.search(date_pattern, context[date_idx + len(date_match.group(0)):])
-                if second_date:
-                    experience_entry["date_range"] = context[date_idx:date_idx + len(date_match.group(0)) + second_date.span()[1]].strip()
-                else:
-                    experience_entry["date_range"] = date_match.group(0).strip()
-            else:
-                year_match = re.search(year_range_pattern, context)
-                if year_match:
-                    experience_entry["date_range"] = year_match.group(0).strip()
+            company_match = COMPANY_PATTERN.search(item)
+            if company_match:
+                experience_entry["company"] = company_match.group(1).strip()
+            
+            experience_entry["date_range"] = _find_date_range(item)
+            
+            i += 1
+            responsibilities = []
+            while i < len(section_lines):
+                bullet_match = BULLET_LINE_PATTERN.match(section_lines[i])
+                if not bullet_match:
+                    break
+                responsibilities.append(bullet_match.group(1).strip())
+                i += 1
+            experience_entry["responsibilities"] = responsibilities[:5]  # Limit to 5 responsibilities
             
-            experience_entries.append(experience_entry)
+            # Only add non-empty entries
+            if experience_entry["title"] or experience_entry["company"]:
+                experience_entries.append(experience_entry)
+        
+        # If no structured entries were found, look for company mentions
+        if not experience_entries:
+            experience_section = "\n".join(section_lines)
+            for company_match in COMPANY_PATTERN.finditer(experience_section):
+                # Look for title and dates around the company name
+                company_idx = company_match.start()
+                context = experience_section[max(0, company_idx - 100):company_idx + 200]
+                
+                title_match = TITLE_PATTERN.search(context)
+                experience_entries.append({
+                    "title": title_match.group(0).strip() if title_match else "",
+                    "company": company_match.group(1).strip(),
+                    "date_range": _find_date_range(context),
+                    "description": "",
+                    "responsibilities": []
+                })
+        
+        return experience_entries
+    
+    def extract_contact_info(self, text):
+        """Extract contact information from resume text"""
+        contact_info = {
+            "email": "",
+            "phone": "",
+            "linkedin": "",
+            "github": "",
+            "website": ""
+        }
+        
+        email_match = EMAIL_PATTERN.search(text)
+        if email_match:
+            contact_info["email"] = email_match.group(0)
+        
+        # Phone - various formats, then a bare 10-digit number
+        phone_match = PHONE_PATTERN.search(text) or ALT_PHONE_PATTERN.search(text)
+        if phone_match:
+            contact_info["phone"] = phone_match.group(0)
+        
+        for pattern in LINKEDIN_PATTERNS:
+            linkedin_match = pattern.search(text)
+            if linkedin_match:
+                contact_info["linkedin"] = f"linkedin.com/in/{linkedin_match.group(1)}"
+                break
+        
+        for pattern in GITHUB_PATTERNS:
+            github_match = pattern.search(text)
+            if github_match:
+                contact_info["github"] = f"github.com/{github_match.group(1)}"
+                break
+        
+        website_match = WEBSITE_PATTERN.search(text)
+        if website_match:
+            # Exclude LinkedIn and GitHub
+            if "linkedin.com" not in website_match.group(0) and "github.com" not in website_match.group(0):
+                contact_info["website"] = website_match.group(0)
+        
+        return contact_info
+
+# Shared parser instance used by the module-level helpers
+resume_parser = ResumeParser()
+
+def extract_structured_info(resume_text):
+    """
+    Extract structured information from resume text
     
-    return experience_entries
+    Args:
+        resume_text: Text extracted from resume
+    
+    Returns:
+        Dictionary with structured information
+    """
+    return resume_parser.parse(resume_text)
+
+def extract_skills(text):
+    """Extract skills from resume text"""
+    return resume_parser.extract_skills(text, resume_parser.segment(text).section_lines("skills"))
+
+def extract_education(text):
+    """Extract education information from resume text"""
+    return resume_parser.extract_education(text, resume_parser.segment(text).section_lines("education"))
+
+def extract_experience(text):
+    """Extract work experience information from resume text"""
+    return resume_parser.extract_experience(text, resume_parser.segment(text).section_lines("experience"))
 
 def extract_contact_info(text):
     """Extract contact information from resume text"""
-    contact_info = {
-        "email": "",
-        "phone": "",
-        "linkedin": "",
-        "github": "",
-        "website": ""
-    }
-    
-    # Email pattern
-    email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-    email_match = re.search(email_pattern, text)
-    if email_match:
-        contact_info["email"] = email_match.group(0)
-    
-    # Phone pattern - various formats
-    phone_pattern = r'(?:\+?\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}'
-    phone_match = re.search(phone_pattern, text)
-    if phone_match:
-        contact_info["phone"] = phone_match.group(0)
-    else:
-        # Try another common format (e.g., 10-digit number)
-        alt_phone_pattern = r'\b\d{10}\b'
-        alt_phone_match = re.search(alt_phone_pattern, text)
-        if alt_phone_match:
-            contact_info["phone"] = alt_phone_match.group(0)
-    
-    # LinkedIn pattern
-    linkedin_patterns = [
-        r'linkedin\.com/in/([a-zA-Z0-9_-]+)',
-        r'linkedin:\s*([a-zA-Z0-9_-]+)'
-    ]
-    for pattern in linkedin_patterns:
-        linkedin_match = re.search(pattern, text, re.IGNORECASE)
-        if linkedin_match:
-            contact_info["linkedin"] = f"linkedin.com/in/{linkedin_match.group(1)}"
-            break
-    
-    # GitHub pattern
-    github_patterns = [
-        r'github\.com/([a-zA-Z0-9_-]+)',
-        r'github:\s*([a-zA-Z0-9_-]+)'
-    ]
-    for pattern in github_patterns:
-        github_match = re.search(pattern, text, re.IGNORECASE)
-        if github_match:
-            contact_info["github"] = f"github.com/{github_match.group(1)}"
-            break
-    
-    # Website pattern
-    website_pattern = r'https?://(?:www\.)?([a-zA-Z0-9.-]+\.[a-zA-Z]{2,})(?:/\S*)?'
-    website_match = re.search(website_pattern, text)
-    if website_match:
-        # Exclude LinkedIn and GitHub
-        if "linkedin.com" not in website_match.group(0) and "github.com" not in website_match.group(0):
-            contact_info["website"] = website_match.group(0)
-    
-    return contact_info
+    return resume_parser.extract_contact_info(text)
 
 def extract_section(text, section_keywords):
     """
@@ -411,16 +510,7 @@ def extract_section(text, section_keywords):
     Returns:
         Extracted section text or empty string if not found
     """
-    # Create a pattern to match section headings
-    pattern = r'(?:^|\n)(?:\s*)((?:' + '|'.join(section_keywords) + r').{0,20}?)(?::|$|(?=\n))(.*?)(?:\n\s*\n|\n(?:[A-Z][a-zA-Z\s]+(?::|$))|$)'
-    
-    matches = re.finditer(pattern, text, re.IGNORECASE | re.DOTALL)
-    
-    for match in matches:
-        # Return the first matching section's content
-        return match.group(2).strip()
-    
-    return ""
+    return _section_segmenter(tuple(section_keywords)).segment(text).section_text("section")
 
 def extract_structured_info_with_llm(resume_text, llm_client):
     """
@@ -428,11 +518,29 @@ def extract_structured_info_with_llm(resume_text, llm_client):
     
     Args:
         resume_text: Text extracted from resume
-        llm_client: Initialized LLM client (e.g., Groq)
+        llm_client: Groq SDK client, or anything with a generate_completion()
+                    method returning {"success", "content"/"error"} (e.g. the
+                    shared LLMRouter, which fails over on rate limits)
     
     Returns:
-        Dictionary with structured information
+        Dictionary with structured information, including a 'token_report'
+        with the tokens saved by preprocessing
     """
+    try:
+        # Clean the text and, if it is still over budget, extract per chunk and merge
+        structured_info, report = map_reduce_extract(
+            resume_text, lambda text: _extract_structured_chunk_with_llm(text, llm_client)
+        )
+    except Exception as e:
+        logger.error("Error extracting structured info with LLM: %s", e)
+        # Fall back to regex-based extraction
+        return extract_structured_info(resume_text)
+    
+    structured_info["token_report"] = report
+    return structured_info
+
+def _extract_structured_chunk_with_llm(resume_text, llm_client):
+    """Run the structured extraction prompt on one budget-sized piece of resume text"""
     # Create a prompt for the LLM
     prompt = f"""Parse the following resume and extract structured information.
 Return the result as a JSON object with these keys:
@@ -449,37 +557,59 @@ Respond ONLY with valid JSON.
 """
     
     # Call the LLM
-    try:
-        messages = [{"role": "user", "content": prompt}]
-        completion = llm_client.chat.completions.create(
-            model="gemma2-9b-it",  # Or your preferred model
-            messages=messages,
-            temperature=0.2,  # Lower temperature for more structured output
-            max_tokens=2048,
-        )
+    messages = [{"role": "user", "content": prompt}]
+    if hasattr(llm_client, "generate_completion"):
+        # Same model as the direct SDK path below; providers record their own usage
+        with span("llm.extract_structured_chunk", model="gemma2-9b-it"):
+            response = llm_client.generate_completion(messages=messages, temperature=0.2, max_tokens=2048,
+                                                      model="gemma2-9b-it")
+            annotate(provider=response.get("provider"), cached=response.get("cached", False))
+        if not response["success"]:
+            raise RuntimeError(response.get("error", "Unknown LLM error"))
+        response_text = response["content"]
+    else:
+        with span("llm.extract_structured_chunk", model="gemma2-9b-it"):
+            completion = llm_client.chat.completions.create(
+                model="gemma2-9b-it",  # Or your preferred model
+                messages=messages,
+                temperature=0.2,  # Lower temperature for more structured output
+                max_tokens=2048,
+            )
+            record_llm_usage(getattr(completion, "usage", None))
         
         response_text = completion.choices[0].message.content
-        
-        # Try to extract JSON from the response
-        import json
-        import re
-        
-        # Look for JSON block
-        json_match = re.search(r'```json\n([\s\S]+?)\n```', response_text)
-        if json_match:
-            response_text = json_match.group(1)
-        
-        # Remove any non-JSON text
-        json_str = re.search(r'(\{[\s\S]+\})', response_text)
-        if json_str:
-            response_text = json_str.group(1)
-        
-        # Parse the JSON
-        structured_info = json.loads(response_text)
-        
-        return structured_info
-    except Exception as e:
-        print(f"Error extracting structured info with LLM: {str(e)}")
-        # Fall back to regex-based extraction
-        from utils.pdf_parser import extract_structured_info
-        return extract_structured_info(resume_text)
\ No newline at end of file
+    
+    # Look for JSON block
+    json_match = re.search(r'```json\n([\s\S]+?)\n```', response_text)
+    if json_match:
+        response_text = json_match.group(1)
+    
+    # Remove any non-JSON text
+    json_str = re.search(r'(\{[\s\S]+\})', response_text)
+    if json_str:
+        response_text = json_str.group(1)
+    
+    # Parse the JSON
+    return json.loads(response_text)
+
+# Micro-benchmark: resumes/sec for the regex parser on synthetic resumes
+if __name__ == "__main__":
+    import random
+    import time
+    
+    from utils.synthetic_data import synthetic_resume_text
+    
+    rng = random.Random(42)
+    resumes = [synthetic_resume_text(rng, pages=rng.randint(1, 3)) for _ in range(500)]
+    
+    # Warm up caches before timing
+    for resume in resumes[:10]:
+        extract_structured_info(resume)
+    
+    started = time.perf_counter()
+    for resume in resumes:
+        extract_structured_info(resume)
+    elapsed = time.perf_counter() - started
+    
+    print(f"extract_structured_info: {len(resumes) / elapsed:.0f} resumes/s "
+          f"({elapsed / len(resumes) * 1000:.2f} ms per resume)")
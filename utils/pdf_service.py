@@ -0,0 +1,335 @@
+# utils/pdf_service.py
+import atexit
+import io
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import resource
+except ImportError:  # Windows: no rlimits, only the wall clock timeout applies
+    resource = None
+
+from utils.text_budget import PAGE_BREAK
+
+# Number of worker processes; 0 keeps parsing in the request thread
+PDF_WORKERS = int(os.getenv("PDF_WORKERS", "0"))
+
+# Per-document limits
+PDF_JOB_TIMEOUT = float(os.getenv("PDF_JOB_TIMEOUT", "30"))
+PDF_JOB_CPU_SECONDS = int(os.getenv("PDF_JOB_CPU_SECONDS", "20"))
+PDF_WORKER_MEMORY_MB = int(os.getenv("PDF_WORKER_MEMORY_MB", "2048"))
+
+# Recycle a worker once its peak RSS or job count gets this high
+PDF_WORKER_MAX_RSS_MB = int(os.getenv("PDF_WORKER_MAX_RSS_MB", "512"))
+PDF_WORKER_MAX_JOBS = int(os.getenv("PDF_WORKER_MAX_JOBS", "500"))
+
+PDF_WORKER_START_METHOD = os.getenv("PDF_WORKER_START_METHOD", "fork" if os.name == "posix" else "spawn")
+
+
+class PDFParseTimeout(Exception):
+    """Raised when a worker does not answer within the job timeout"""
+
+
+def _peak_rss_mb():
+    if resource is None:
+        return 0.0
+    # ru_maxrss is in kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _set_cpu_budget(cpu_seconds):
+    """Allow this process cpu_seconds more CPU time; the kernel sends SIGXCPU past it"""
+    if resource is None or not cpu_seconds:
+        return
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    used = usage.ru_utime + usage.ru_stime
+    _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+    soft = int(used) + cpu_seconds + 1
+    if hard != resource.RLIM_INFINITY:
+        soft = min(soft, hard)
+    resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+
+
+def _worker_main(conn, cpu_seconds, memory_mb):
+    """
+    Worker process loop: parse jobs from the pipe until told to stop
+
+    Each job is (kind, payload, max_pages, page_timeout) where kind is 'path'
+    or 'bytes'. Workers parse in their main thread, so the per-page timeout
+    interrupts the parser with SIGALRM.
+    """
+    from utils.pdf_parser import iter_pdf_pages
+
+    if resource is not None and memory_mb:
+        limit = memory_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+    while True:
+        try:
+            job = conn.recv()
+        except EOFError:
+            break
+        if job is None:
+            break
+
+        kind, payload, max_pages, page_timeout = job
+        _set_cpu_budget(cpu_seconds)
+
+        try:
+            if kind == "path":
+                with open(payload, "rb") as pdf_file:
+                    pages = list(iter_pdf_pages(pdf_file, max_pages, page_timeout))
+            else:
+                pages = list(iter_pdf_pages(io.BytesIO(payload), max_pages, page_timeout))
+
+            result = {
+                "success": True,
+                "text": PAGE_BREAK.join(page_text + "\n" for page_text in pages),
+                "pages": len(pages)
+            }
+        except MemoryError:
+            result = {"success": False, "error": f"PDF needed more than {memory_mb} MB to parse"}
+        except Exception as e:
+            result = {"success": False, "error": f"Could not parse PDF: {str(e)}"}
+
+        result["rss_mb"] = _peak_rss_mb()
+        conn.send(result)
+
+
+class _Worker:
+    """One warm parser process and the parent end of its pipe"""
+
+    def __init__(self, context, cpu_seconds, memory_mb):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(
+            target=_worker_main,
+            args=(child_conn, cpu_seconds, memory_mb),
+            daemon=True
+        )
+        self.process.start()
+        child_conn.close()
+        self.jobs = 0
+
+    def run(self, job, timeout):
+        self.jobs += 1
+        self.conn.send(job)
+        if not self.conn.poll(timeout):
+            raise PDFParseTimeout(f"PDF parsing exceeded {timeout}s")
+        return self.conn.recv()
+
+    def stop(self, kill=False):
+        if not kill and self.process.is_alive():
+            try:
+                self.conn.send(None)
+                self.process.join(1)
+            except (OSError, BrokenPipeError):
+                pass
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.conn.close()
+
+
+class PDFParsingService:
+    """
+    Pool of warm worker processes that extract text from PDFs
+
+    A document that runs past the wall clock timeout gets its worker killed
+    and replaced. Workers also run under an RLIMIT_CPU budget per job and an
+    RLIMIT_AS cap, and are recycled when their peak RSS grows too large.
+    """
+
+    def __init__(self, workers=None, timeout=None, cpu_seconds=None, memory_mb=None,
+                 max_rss_mb=None, max_jobs_per_worker=None, start_method=None):
+        """
+        Start the worker processes
+
+        Args:
+            workers: Number of processes (defaults to PDF_WORKERS, at least 1)
+            timeout: Wall clock seconds per document
+            cpu_seconds: CPU seconds per document
+            memory_mb: Address space limit per worker (0 disables)
+            max_rss_mb: Recycle a worker whose peak RSS exceeds this
+            max_jobs_per_worker: Recycle a worker after this many documents
+            start_method: multiprocessing start method
+        """
+        self.worker_count = max(1, workers or PDF_WORKERS)
+        self.timeout = timeout or PDF_JOB_TIMEOUT
+        self.cpu_seconds = PDF_JOB_CPU_SECONDS if cpu_seconds is None else cpu_seconds
+        self.memory_mb = PDF_WORKER_MEMORY_MB if memory_mb is None else memory_mb
+        self.max_rss_mb = max_rss_mb or PDF_WORKER_MAX_RSS_MB
+        self.max_jobs_per_worker = max_jobs_per_worker or PDF_WORKER_MAX_JOBS
+        self.context = multiprocessing.get_context(start_method or PDF_WORKER_START_METHOD)
+
+        self.stats = {"jobs": 0, "failures": 0, "timeouts": 0, "crashes": 0, "recycled": 0}
+        self._stats_lock = threading.Lock()
+        self._closed = False
+
+        self._idle = queue.Queue()
+        self._workers = []
+        for _ in range(self.worker_count):
+            worker = self._spawn()
+            self._workers.append(worker)
+            self._idle.put(worker)
+
+    def _spawn(self):
+        return _Worker(self.context, self.cpu_seconds, self.memory_mb)
+
+    def _replace(self, worker, kill):
+        worker.stop(kill=kill)
+        replacement = self._spawn()
+        self._workers[self._workers.index(worker)] = replacement
+        return replacement
+
+    def _count(self, key):
+        with self._stats_lock:
+            self.stats[key] += 1
+
+    def _job_for(self, source, max_pages, page_timeout):
+        """Send a path when the document is on disk, otherwise its bytes"""
+        if isinstance(source, (str, os.PathLike)):
+            return ("path", os.fspath(source), max_pages, page_timeout)
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            return ("bytes", bytes(source), max_pages, page_timeout)
+
+        stream = getattr(source, "stream", source)
+        name = getattr(stream, "name", None)
+        if isinstance(name, str) and os.path.isfile(name):
+            return ("path", name, max_pages, page_timeout)
+
+        stream.seek(0)
+        return ("bytes", stream.read(), max_pages, page_timeout)
+
+    def parse(self, source, max_pages=None, page_timeout=None):
+        """
+        Extract text from one PDF in a worker process
+
+        Args:
+            source: File path, PDF bytes or a file object (e.g. from request.files)
+            max_pages: Optional page limit passed to the parser
+            page_timeout: Optional per-page timeout passed to the parser
+
+        Returns:
+            dict: {success, text, pages, elapsed} or {success, error, elapsed}
+        """
+        if self._closed:
+            raise RuntimeError("PDF parsing service has been shut down")
+
+        job = self._job_for(source, max_pages, page_timeout)
+        started = time.perf_counter()
+        self._count("jobs")
+
+        worker = self._idle.get()
+        try:
+            result = worker.run(job, self.timeout)
+        except PDFParseTimeout as e:
+            self._count("timeouts")
+            worker = self._replace(worker, kill=True)
+            result = {"success": False, "error": str(e)}
+        except (EOFError, OSError):
+            # The worker died mid-job, usually SIGXCPU from the CPU limit
+            self._count("crashes")
+            worker = self._replace(worker, kill=True)
+            result = {"success": False, "error": "PDF parser worker was killed (CPU or memory limit exceeded)"}
+        else:
+            if result.get("rss_mb", 0) > self.max_rss_mb or worker.jobs >= self.max_jobs_per_worker:
+                self._count("recycled")
+                worker = self._replace(worker, kill=False)
+        finally:
+            self._idle.put(worker)
+
+        if not result["success"]:
+            self._count("failures")
+
+        result.pop("rss_mb", None)
+        result["elapsed"] = time.perf_counter() - started
+        return result
+
+    def parse_many(self, sources, max_pages=None):
+        """
+        Parse a batch of PDFs across all workers (for bulk imports)
+
+        Args:
+            sources: Iterable of file paths, PDF bytes or file objects
+            max_pages: Optional page limit per document
+
+        Returns:
+            list: One result dict per source, in input order
+        """
+        with ThreadPoolExecutor(max_workers=self.worker_count) as executor:
+            return list(executor.map(lambda source: self.parse(source, max_pages), sources))
+
+    def close(self):
+        """Stop all worker processes"""
+        if self._closed:
+            return
+        self._closed = True
+        for worker in self._workers:
+            worker.stop()
+        self._workers = []
+
+
+_service = None
+_service_lock = threading.Lock()
+
+
+def get_pdf_service():
+    """Shared parsing service for the process, started on first use"""
+    global _service
+    if _service is None:
+        with _service_lock:
+            if _service is None:
+                _service = PDFParsingService()
+                atexit.register(_service.close)
+    return _service
+
+
+# Benchmark: in-process parsing versus the worker pool on a synthetic corpus
+if __name__ == "__main__":
+    from utils.pdf_parser import iter_pdf_pages
+    from utils.synthetic_data import synthetic_resume_corpus
+
+    def percentile(values, pct):
+        ordered = sorted(values)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+    def report(label, latencies, pages, elapsed):
+        print(f"{label:<28} {pages / elapsed:8.1f} pages/s   "
+              f"p50 {percentile(latencies, 50) * 1000:7.1f} ms   p99 {percentile(latencies, 99) * 1000:7.1f} ms")
+
+    corpus = synthetic_resume_corpus(int(os.getenv("PDF_BENCHMARK_DOCUMENTS", "200")))
+    # A truncated file and garbage bytes, to show failures do not take the pool down
+    corpus += [corpus[0][:len(corpus[0]) // 2], b"%PDF-1.4\n" + os.urandom(4096)]
+
+    latencies = []
+    pages = 0
+    started = time.perf_counter()
+    for document in corpus:
+        document_started = time.perf_counter()
+        try:
+            pages += len(list(iter_pdf_pages(io.BytesIO(document))))
+        except Exception:
+            pass
+        latencies.append(time.perf_counter() - document_started)
+    report("In request thread:", latencies, pages, time.perf_counter() - started)
+
+    workers = int(os.getenv("PDF_BENCHMARK_WORKERS", str(os.cpu_count() or 2)))
+    service = PDFParsingService(workers=workers)
+    try:
+        service.parse_many(corpus[:workers])  # warm up
+
+        started = time.perf_counter()
+        results = service.parse_many(corpus)
+        elapsed = time.perf_counter() - started
+
+        report(f"Process pool ({workers} workers):",
+               [result["elapsed"] for result in results],
+               sum(result.get("pages", 0) for result in results),
+               elapsed)
+        print(f"Failed documents: {sum(not result['success'] for result in results)}  stats: {service.stats}")
+    finally:
+        service.close()
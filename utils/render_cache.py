@@ -0,0 +1,51 @@
+# utils/render_cache.py
+import os
+import threading
+from collections import OrderedDict
+
+from utils.tracing import record_cache
+
+# Rendered pages kept per process
+RENDER_CACHE_SIZE = int(os.getenv("RENDER_CACHE_SIZE", "256"))
+
+
+class RenderCache:
+    """
+    Bounded LRU cache for rendered HTML
+
+    Keys should include a version of the underlying data (e.g. the node's
+    updated_at), so a changed record simply misses and old entries age out.
+    """
+
+    def __init__(self, max_entries=None):
+        self.max_entries = RENDER_CACHE_SIZE if max_entries is None else max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        """Return the cached value for key, or None"""
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+            else:
+                self.misses += 1
+        record_cache("render", value is not None)
+        return value
+
+    def put(self, key, value):
+        """Store value under key, evicting the least recently used entry when full"""
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
@@ -0,0 +1,159 @@
+# utils/resume_segmenter.py
+import re
+
+from utils.text_budget import PAGE_BREAK
+
+# Headings that start sections the parser does not extract; they still end the previous section
+OTHER_HEADINGS = (
+    "summary", "professional summary", "profile", "objective", "career objective", "about me",
+    "projects", "personal projects", "academic projects", "certifications", "certificates",
+    "achievements", "accomplishments", "awards", "honors", "publications", "interests",
+    "hobbies", "languages", "references", "personal details", "personal information",
+    "declaration", "volunteer", "volunteering", "extracurricular activities", "activities",
+    "contact", "contact information", "training", "courses", "internships"
+)
+
+# Section headings are short; longer lines are content even if they start with a keyword
+MAX_HEADING_LENGTH = 40
+
+# A heading may carry a few extra words ("Skills & Tools", "Education Details")
+MAX_EXTRA_HEADING_WORDS = 2
+
+HEADING_WORD_PATTERN = re.compile(r'[a-z]+')
+
+# "Leadership:" - a line of words ending in a colon starts a new block, like a heading
+TITLE_LINE_PATTERN = re.compile(r'[A-Za-z][A-Za-z \t]+:')
+HEADING_STRIP_CHARS = " \t•-*#=_|"
+
+
+class ResumeSegments:
+    """Lines of a resume and the line spans of each section"""
+
+    def __init__(self, lines, spans):
+        """
+        Args:
+            lines: Document lines (inline heading content split onto its own line)
+            spans: Dict of section name -> list of (start, end) line indexes, end exclusive
+        """
+        self.lines = lines
+        self.spans = spans
+
+    def __contains__(self, name):
+        return name in self.spans
+
+    def section_lines(self, name):
+        """All lines of every span of a section, in document order"""
+        return [line for start, end in self.spans.get(name, ()) for line in self.lines[start:end]]
+
+    def section_text(self, name):
+        """The section as text, or an empty string when the resume has no such section"""
+        return "\n".join(self.section_lines(name)).strip()
+
+
+class ResumeSegmenter:
+    """
+    Splits a resume into sections with one pass over its lines
+
+    Each line is classified as a heading or content by looking its first word
+    up in a keyword table built once, so segmenting is linear in the length
+    of the document regardless of how many headings are known.
+
+    A section ends where the original regex parser ended it: at a blank line
+    or at a "Title:" line. It also ends at the next known heading.
+    """
+
+    def __init__(self, sections, other_headings=OTHER_HEADINGS):
+        """
+        Build the heading table
+
+        Args:
+            sections: Dict of section name -> heading keywords
+            other_headings: Headings of sections that are not reported but end the previous one
+        """
+        self.sections = dict(sections)
+        self._table = {}
+
+        keywords = [(keyword, name) for name, section_keywords in self.sections.items() for keyword in section_keywords]
+        keywords += [(keyword, None) for keyword in other_headings]
+
+        for keyword, name in keywords:
+            words = tuple(HEADING_WORD_PATTERN.findall(keyword.lower()))
+            if words:
+                self._table.setdefault(words[0], []).append((words, name))
+
+        # Try longer headings first ("work experience" before "work")
+        for candidates in self._table.values():
+            candidates.sort(key=lambda candidate: len(candidate[0]), reverse=True)
+
+    def classify(self, line):
+        """
+        Classify one line
+
+        Args:
+            line: A line of the resume
+
+        Returns:
+            tuple: (is_heading, section, inline_content) where section is None for
+                   headings of sections that are not reported
+        """
+        stripped = line.strip(HEADING_STRIP_CHARS)
+        head, colon, rest = stripped.partition(":")
+        if not head or len(head) > MAX_HEADING_LENGTH:
+            return False, None, ""
+
+        words = HEADING_WORD_PATTERN.findall(head.lower())
+        if not words:
+            return False, None, ""
+
+        for keyword_words, name in self._table.get(words[0], ()):
+            if tuple(words[:len(keyword_words)]) != keyword_words:
+                continue
+            if len(words) - len(keyword_words) > MAX_EXTRA_HEADING_WORDS:
+                continue
+            # "Experience with Flask." is a sentence, not a heading
+            if not colon and head.rstrip().endswith("."):
+                continue
+            return True, name, rest.strip()
+
+        return False, None, ""
+
+    def segment(self, text):
+        """
+        Split text into sections
+
+        Args:
+            text: Resume text
+
+        Returns:
+            ResumeSegments
+        """
+        lines = []
+        spans = {}
+        current = None
+        start = 0
+
+        # Page breaks are not blank lines; a section may continue on the next page
+        for line in (text or "").replace(PAGE_BREAK, "").splitlines():
+            is_heading, name, inline = self.classify(line)
+            if not is_heading:
+                if current is not None and (not line.strip() or TITLE_LINE_PATTERN.match(line)):
+                    spans.setdefault(current, []).append((start, len(lines)))
+                    current = None
+                lines.append(line)
+                continue
+
+            if current is not None:
+                spans.setdefault(current, []).append((start, len(lines)))
+
+            lines.append(line)
+            current = name
+            start = len(lines)
+
+            # "Skills: Python, SQL" - the rest of the heading line is section content
+            if inline:
+                lines.append(inline)
+
+        if current is not None:
+            spans.setdefault(current, []).append((start, len(lines)))
+
+        return ResumeSegments(lines, spans)
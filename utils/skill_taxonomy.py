@@ -0,0 +1,202 @@
+# utils/skill_taxonomy.py
+import json
+import logging
+import os
+import re
+import threading
+import time
+
+from utils.skill_matcher import DEFAULT_SKILLS, SkillMatcher, tokenize
+
+# Taxonomy file with canonical skill ids, names, categories and synonyms
+SKILL_TAXONOMY_PATH = os.getenv(
+    "SKILL_TAXONOMY_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "skill_taxonomy.json")
+)
+
+# How often (seconds) to check the file for changes; 0 disables hot reload
+SKILL_TAXONOMY_RELOAD_SECONDS = float(os.getenv("SKILL_TAXONOMY_RELOAD_SECONDS", "5"))
+
+SLUG_PATTERN = re.compile(r'[^a-z0-9+#]+')
+
+logger = logging.getLogger(__name__)
+
+
+def _slug(name):
+    return SLUG_PATTERN.sub("-", name.lower()).strip("-")
+
+
+class SkillTaxonomy:
+    """
+    Canonical skills with synonyms, held in a token trie and reloaded when the file changes
+
+    Each skill is a dict with id, name, category and optional implies (ids of
+    skills it implies, e.g. Node.js implies JavaScript). Lookups return these
+    dicts, so "JS", "javascript" and "ECMAScript" all resolve to the same skill.
+    Ambiguous synonyms (e.g. "node", "collaboration") only resolve a whole
+    skills-list item and are ignored when scanning free text.
+    """
+
+    def __init__(self, path=None, reload_seconds=None):
+        """
+        Load the taxonomy
+
+        Args:
+            path: Taxonomy JSON file (defaults to SKILL_TAXONOMY_PATH); when the
+                  file is missing the built-in skill list is used
+            reload_seconds: Minimum seconds between checks for a changed file
+        """
+        self.path = path or SKILL_TAXONOMY_PATH
+        self.reload_seconds = SKILL_TAXONOMY_RELOAD_SECONDS if reload_seconds is None else reload_seconds
+        self._lock = threading.Lock()
+        self._mtime = None
+        self._checked_at = 0.0
+
+        # Replaced as a whole on reload so readers never see a half-built taxonomy
+        self._state = None
+        self.reload()
+
+    def _build(self, skills):
+        matcher = SkillMatcher([])
+        text_matcher = SkillMatcher([])
+        by_id = {}
+        for entry in skills:
+            skill = {
+                "id": entry["id"],
+                "name": entry["name"],
+                "category": entry.get("category", "Other"),
+                "implies": list(entry.get("implies", []))
+            }
+            by_id[skill["id"]] = skill
+
+            # The trie maps every spelling to the skill id
+            ambiguous = entry.get("ambiguous_synonyms", [])
+            for term in [skill["name"], skill["id"]] + entry.get("synonyms", []):
+                matcher.add(term, skill["id"])
+                if term not in ambiguous:
+                    text_matcher.add(term, skill["id"])
+            for synonym in ambiguous:
+                matcher.add(synonym, skill["id"])
+
+        return matcher, text_matcher, by_id
+
+    def reload(self):
+        """Load the taxonomy file now; keeps the current taxonomy if the file is invalid"""
+        with self._lock:
+            try:
+                mtime = os.path.getmtime(self.path)
+            except OSError:
+                mtime = None
+
+            try:
+                with open(self.path, encoding="utf-8") as f:
+                    skills = json.load(f)["skills"]
+            except FileNotFoundError:
+                skills = [{"id": _slug(name), "name": name} for name in DEFAULT_SKILLS]
+            except (OSError, ValueError, KeyError) as e:
+                logger.error("Could not load skill taxonomy from %s: %s", self.path, e)
+                skills = None if self._state else [{"id": _slug(name), "name": name} for name in DEFAULT_SKILLS]
+
+            # Remember the mtime even for a broken file so it is not re-read on every check
+            if skills is not None:
+                self._state = self._build(skills)
+            self._mtime = mtime
+            self._checked_at = time.monotonic()
+
+    def _current(self):
+        """Return (matcher, free-text matcher, skills by id), reloading first if the file changed"""
+        if self.reload_seconds and time.monotonic() - self._checked_at >= self.reload_seconds:
+            self._checked_at = time.monotonic()
+            try:
+                mtime = os.path.getmtime(self.path)
+            except OSError:
+                mtime = None
+            if mtime != self._mtime:
+                self.reload()
+        return self._state
+
+    def __len__(self):
+        return len(self._current()[2])
+
+    def get(self, skill_id):
+        """Return the skill with this id, or None"""
+        return self._current()[2].get(skill_id)
+
+    def canonicalize(self, term):
+        """
+        Resolve a skill name or synonym to its canonical skill
+
+        Args:
+            term: Skill as written, e.g. "JS" or "react.js"
+
+        Returns:
+            dict: The canonical skill, or None if the term is unknown
+        """
+        if not term:
+            return None
+        matcher, _, by_id = self._current()
+        return by_id.get(matcher.lookup(term))
+
+    def find_skills(self, text):
+        """
+        Find every known skill mentioned in free text
+
+        Args:
+            text: Text to scan
+
+        Returns:
+            list: Canonical skill dicts in order of first appearance
+        """
+        _, text_matcher, by_id = self._current()
+        return [by_id[skill_id] for skill_id in text_matcher.find_all(text or "")]
+
+    def skill_keys(self, skills, expand=False):
+        """
+        Turn a skill list into comparable keys
+
+        Known skills become their canonical ids; unknown ones fall back to their
+        lowercased words so they can still match each other.
+
+        Args:
+            skills: List of skill strings, or a comma-separated string
+            expand: Also include skills implied by the known ones
+
+        Returns:
+            set: Skill ids and fallback keywords
+        """
+        if not skills:
+            return set()
+        if isinstance(skills, str):
+            skills = skills.split(",")
+
+        matcher, text_matcher, by_id = self._current()
+        keys = set()
+        for item in skills:
+            item = str(item)
+            skill_id = matcher.lookup(item)
+            found = [skill_id] if skill_id else text_matcher.find_all(item)
+            keys.update(found or tokenize(item))
+
+        if expand:
+            pending = [key for key in keys if key in by_id]
+            while pending:
+                for implied in by_id[pending.pop()]["implies"]:
+                    if implied not in keys and implied in by_id:
+                        keys.add(implied)
+                        pending.append(implied)
+
+        return keys
+
+
+_taxonomy = None
+_taxonomy_lock = threading.Lock()
+
+
+def get_skill_taxonomy():
+    """Shared taxonomy for the process"""
+    global _taxonomy
+    if _taxonomy is None:
+        with _taxonomy_lock:
+            if _taxonomy is None:
+                _taxonomy = SkillTaxonomy()
+    return _taxonomy
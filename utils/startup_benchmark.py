@@ -0,0 +1,155 @@
+# utils/startup_benchmark.py
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Runs in a fresh interpreter so every measurement is a cold import
+IMPORT_PROBE = """
+import json, resource, sys, time
+started = time.perf_counter()
+try:
+    __import__(sys.argv[1])
+    error = None
+except Exception as e:
+    error = f"{type(e).__name__}: {e}"
+elapsed = time.perf_counter() - started
+if len(sys.argv) > 2 and not error:
+    from utils.nlp import get_nlp
+    nlp_started = time.perf_counter()
+    get_nlp()
+    nlp_elapsed = time.perf_counter() - nlp_started
+else:
+    nlp_elapsed = None
+print(json.dumps({
+    "seconds": elapsed,
+    "nlp_seconds": nlp_elapsed,
+    "rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    "error": error
+}))
+"""
+
+# Imports the app in a fresh interpreter and times the first response
+FIRST_REQUEST_PROBE = """
+import json, sys, time
+started = time.perf_counter()
+try:
+    from wsgi import app
+    imported = time.perf_counter()
+    status = app.test_client().get(sys.argv[1]).status_code
+    error = None
+except Exception as e:
+    imported = time.perf_counter()
+    status = None
+    error = f"{type(e).__name__}: {e}"
+print(json.dumps({
+    "seconds": time.perf_counter() - started,
+    "import_seconds": imported - started,
+    "status": status,
+    "error": error
+}))
+"""
+
+
+def _run_probe(probe, args, env=None):
+    output = subprocess.run(
+        [sys.executable, "-c", probe] + args, cwd=PROJECT_ROOT, capture_output=True, text=True,
+        env={**os.environ, **(env or {})}
+    )
+    lines = output.stdout.strip().splitlines()
+    if not lines:
+        return {"error": output.stderr.strip().splitlines()[-1:]}
+    return json.loads(lines[-1])
+
+
+def measure_import(module, runs=5, load_nlp=False, env=None):
+    """
+    Time a cold import of module in fresh interpreters
+
+    Args:
+        module: Module name, e.g. "app" or "utils.pdf_parser"
+        runs: Number of interpreters to start
+        load_nlp: Also time the first get_nlp() call after the import
+        env: Extra environment variables
+
+    Returns:
+        dict: Median import seconds, peak RSS and the first error (if any)
+    """
+    args = [module] + (["nlp"] if load_nlp else [])
+    results = []
+    for _ in range(runs):
+        result = _run_probe(IMPORT_PROBE, args, env)
+        if "seconds" not in result:
+            return {"module": module, "error": result["error"]}
+        results.append(result)
+
+    nlp_times = [result["nlp_seconds"] for result in results if result["nlp_seconds"] is not None]
+    return {
+        "module": module,
+        "seconds": statistics.median(result["seconds"] for result in results),
+        "nlp_seconds": statistics.median(nlp_times) if nlp_times else None,
+        "rss_mb": max(result["rss_mb"] for result in results),
+        "error": results[0]["error"]
+    }
+
+
+def measure_first_request(path="/admin/login", runs=5, env=None):
+    """
+    Time from a cold start to the first response
+    
+    Database connections are opened lazily, so a page that does not touch the
+    databases measures the app's own startup cost.
+
+    Args:
+        path: URL requested through the Flask test client
+        runs: Number of interpreters to start
+        env: Extra environment variables
+
+    Returns:
+        dict: Median seconds to the first response, median import seconds, status and error
+    """
+    results = []
+    for _ in range(runs):
+        result = _run_probe(FIRST_REQUEST_PROBE, [path], env)
+        if "seconds" not in result:
+            return {"module": "wsgi", "error": result["error"]}
+        results.append(result)
+
+    return {
+        "module": "wsgi",
+        "seconds": statistics.median(result["seconds"] for result in results),
+        "import_seconds": statistics.median(result["import_seconds"] for result in results),
+        "status": results[0]["status"],
+        "error": results[0]["error"]
+    }
+
+
+def print_result(label, result):
+    if result.get("seconds") is None:
+        print(f"{label:<40} failed: {result['error']}")
+        return
+
+    line = f"{label:<40} {result['seconds'] * 1000:8.1f} ms"
+    if result.get("rss_mb") is not None:
+        line += f"   peak RSS {result['rss_mb']:7.1f} MB"
+    if result.get("import_seconds") is not None:
+        line += f"   (import {result['import_seconds'] * 1000:.1f} ms, HTTP {result['status']})"
+    if result.get("nlp_seconds") is not None:
+        line += f"   first get_nlp() {result['nlp_seconds'] * 1000:.1f} ms"
+    if result.get("error"):
+        line += f"   ({result['error']})"
+    print(line)
+
+
+if __name__ == "__main__":
+    runs = int(os.getenv("STARTUP_BENCHMARK_RUNS", "5"))
+
+    print_result("import utils.pdf_parser", measure_import("utils.pdf_parser", runs))
+    print_result("import utils.pdf_parser + get_nlp()", measure_import("utils.pdf_parser", runs, load_nlp=True))
+    print_result("import app", measure_import("app", runs))
+    print_result("import wsgi (create_app)", measure_import("wsgi", runs))
+    print_result("import wsgi (PRELOAD_SPACY=1)", measure_import("wsgi", runs, env={"PRELOAD_SPACY": "1"}))
+    print_result("time to first request", measure_first_request(runs=runs))
@@ -0,0 +1,158 @@
+# utils/synthetic_data.py
+import random
+
+# Building blocks for fake resumes used by benchmarks
+FIRST_NAMES = ["Aarav", "Priya", "John", "Maria", "Wei", "Fatima", "Lucas", "Ananya", "David", "Sofia"]
+LAST_NAMES = ["Sharma", "Patel", "Smith", "Garcia", "Chen", "Khan", "Silva", "Reddy", "Brown", "Rossi"]
+SKILLS = [
+    "Python", "Java", "JavaScript", "React", "Node.js", "SQL", "MongoDB", "Docker",
+    "Kubernetes", "AWS", "Azure", "Machine Learning", "TensorFlow", "Flask", "Django",
+    "Git", "Linux", "C++", "Data Analysis", "Spring Boot"
+]
+COMPANIES = ["Infosys", "TCS", "Acme Corp", "Globex", "Initech", "Wipro", "Umbrella Labs", "Hooli"]
+TITLES = ["Software Engineer", "Data Scientist", "Backend Developer", "Full Stack Developer", "DevOps Engineer"]
+DEGREES = ["Bachelor of Technology in Computer Science", "Master of Science in Data Science", "MBA", "PhD in Physics"]
+
+LINES_PER_PAGE = 48
+
+
+def _escape_pdf_text(text):
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def build_pdf(pages):
+    """
+    Build a minimal PDF with one text page per entry
+
+    Args:
+        pages: List of page texts (lines separated by newlines)
+
+    Returns:
+        bytes: The PDF file contents
+    """
+    page_count = len(pages)
+    font_id = 3 + 2 * page_count
+    kids = " ".join(f"{3 + 2 * i} 0 R" for i in range(page_count))
+
+    objects = [
+        "<< /Type /Catalog /Pages 2 0 R >>",
+        f"<< /Type /Pages /Kids [{kids}] /Count {page_count} >>"
+    ]
+    for i, page_text in enumerate(pages):
+        lines = " ".join(f"({_escape_pdf_text(line)}) '" for line in page_text.split("\n"))
+        content = f"BT /F1 10 Tf 50 760 Td 14 TL {lines} ET"
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 {font_id} 0 R >> >> /Contents {4 + 2 * i} 0 R >>"
+        )
+        objects.append(f"<< /Length {len(content)} >>\nstream\n{content}\nendstream")
+    objects.append("<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+
+    output = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(output))
+        output += f"{number} 0 obj\n{body}\nendobj\n".encode("latin-1")
+
+    xref_offset = len(output)
+    output += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode("latin-1")
+    for offset in offsets:
+        output += f"{offset:010d} 00000 n \n".encode("latin-1")
+    output += (
+        f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\n"
+        f"startxref\n{xref_offset}\n%%EOF\n"
+    ).encode("latin-1")
+
+    return bytes(output)
+
+
+def synthetic_resume_text(rng=None, pages=1):
+    """
+    Generate resume-like text
+
+    Args:
+        rng: Optional random.Random for reproducible output
+        pages: Roughly how many pages of text to produce
+
+    Returns:
+        str: Resume text with the usual sections
+    """
+    rng = rng or random.Random()
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+
+    lines = [
+        name,
+        f"{name.lower().replace(' ', '.')}@example.com | +91 98{rng.randint(10000000, 99999999)}",
+        "",
+        "SUMMARY",
+        f"{rng.choice(TITLES)} with {rng.randint(1, 15)} years of experience building web services.",
+        "",
+        "SKILLS",
+        ", ".join(rng.sample(SKILLS, 8)),
+        "",
+        "EDUCATION",
+        f"{rng.choice(DEGREES)}, {rng.randint(2005, 2022)}",
+        "",
+        "EXPERIENCE"
+    ]
+
+    while len(lines) < LINES_PER_PAGE * pages:
+        lines.append(f"{rng.choice(TITLES)} - {rng.choice(COMPANIES)} ({rng.randint(2010, 2020)} - {rng.randint(2021, 2024)})")
+        for _ in range(3):
+            lines.append(f"- Worked with {rng.choice(SKILLS)} and {rng.choice(SKILLS)} to ship features for {rng.randint(2, 50)}k users")
+
+    return "\n".join(lines)
+
+
+def synthetic_resume_pdf(rng=None, pages=1):
+    """Generate a resume PDF with the given number of pages"""
+    rng = rng or random.Random()
+    lines = synthetic_resume_text(rng, pages).split("\n")
+    page_texts = [
+        "\n".join(lines[start:start + LINES_PER_PAGE])
+        for start in range(0, len(lines), LINES_PER_PAGE)
+    ]
+    return build_pdf(page_texts[:pages])
+
+
+def synthetic_job_description(rng=None):
+    """
+    Generate a job title and description
+
+    Args:
+        rng: Optional random.Random for reproducible output
+
+    Returns:
+        tuple: (title, description)
+    """
+    rng = rng or random.Random()
+    title = rng.choice(TITLES)
+    skills = rng.sample(SKILLS, 6)
+    description = "\n".join([
+        f"{rng.choice(COMPANIES)} is hiring a {title} to join a team of {rng.randint(4, 20)} engineers.",
+        "",
+        "Requirements:",
+        *[f"- Experience with {skill}" for skill in skills[:4]],
+        f"- {rng.randint(1, 8)}+ years of professional experience",
+        f"- {rng.choice(DEGREES)} or equivalent",
+        "",
+        "Nice to have:",
+        *[f"- {skill}" for skill in skills[4:]]
+    ])
+    return title, description
+
+
+def synthetic_resume_corpus(count, seed=42, max_pages=3):
+    """
+    Generate a reproducible set of resume PDFs
+
+    Args:
+        count: Number of PDFs
+        seed: Random seed
+        max_pages: Maximum pages per resume
+
+    Returns:
+        list: PDF contents as bytes
+    """
+    rng = random.Random(seed)
+    return [synthetic_resume_pdf(rng, rng.randint(1, max_pages)) for _ in range(count)]
@@ -0,0 +1,264 @@
+# utils/text_budget.py
+import json
+import os
+import re
+from collections import Counter
+
+# Rough characters-per-token ratio for English prose (good enough for budgeting)
+CHARS_PER_TOKEN = 4
+
+# Default prompt budget for resume text, leaving room for instructions and the answer
+RESUME_TOKEN_BUDGET = int(os.getenv("RESUME_TOKEN_BUDGET", "3000"))
+
+# Separator the PDF extractors put between pages, so headers/footers can be found
+PAGE_BREAK = "\f"
+
+PAGE_NUMBER_PATTERN = re.compile(
+    r'^\s*(?:page\s*\d+(?:\s*(?:of|/)\s*\d+)?|\d+\s*(?:of|/)\s*\d+|-\s*\d+\s*-|\d{1,3})\s*$',
+    re.IGNORECASE
+)
+HORIZONTAL_SPACE_PATTERN = re.compile(r'[ \t\f\v ]+')
+BLANK_LINES_PATTERN = re.compile(r'\n{3,}')
+DIGITS_PATTERN = re.compile(r'\d+')
+
+# First/last lines of a page repeated on this many pages are running headers/footers
+REPEATED_LINE_THRESHOLD = 2
+REPEATED_LINE_LENGTH = (8, 80)
+
+EDUCATION_RANKING = [
+    ("phd", 5), ("doctor", 5),
+    ("master", 4), ("m.tech", 4), ("mba", 4),
+    ("bachelor", 3), ("b.tech", 3), ("undergraduate", 3),
+    ("associate", 2), ("diploma", 2),
+    ("high school", 1)
+]
+
+
+def estimate_tokens(text):
+    """
+    Estimate the number of tokens in a piece of text
+
+    Args:
+        text: The text to estimate
+
+    Returns:
+        int: Approximate token count
+    """
+    if not text:
+        return 0
+    return max(1, len(text) // CHARS_PER_TOKEN)
+
+
+def normalize_whitespace(text):
+    """Collapse runs of spaces and blank lines left behind by PDF extraction"""
+    lines = [HORIZONTAL_SPACE_PATTERN.sub(" ", line).strip() for line in text.splitlines()]
+    return BLANK_LINES_PATTERN.sub("\n\n", "\n".join(lines)).strip()
+
+
+def _page_edges(lines):
+    """Indexes of the first and last non-empty lines of a page"""
+    filled = [index for index, line in enumerate(lines) if line]
+    if not filled:
+        return []
+    return sorted({filled[0], filled[-1]})
+
+
+def strip_boilerplate(pages):
+    """
+    Drop page numbers and running headers/footers from the edges of each page
+
+    Only the first and last line of a page are candidates, so titles, dates
+    and bare numbers that repeat inside the body are left alone.
+
+    Args:
+        pages: List of whitespace-normalized page texts
+
+    Returns:
+        str: The pages joined back together without their boilerplate
+    """
+    page_lines = [page.split("\n") for page in pages]
+
+    # Compare lines with digits removed so "Page 1" / "Page 2" footers count as repeats
+    min_length, max_length = REPEATED_LINE_LENGTH
+    counts = Counter()
+    for lines in page_lines:
+        for index in _page_edges(lines):
+            if min_length <= len(lines[index]) <= max_length:
+                counts[DIGITS_PATTERN.sub("#", lines[index]).lower()] += 1
+
+    kept_pages = []
+    seen_repeated = set()
+    for lines in page_lines:
+        dropped = set()
+        for index in _page_edges(lines):
+            line = lines[index]
+            if PAGE_NUMBER_PATTERN.match(line):
+                dropped.add(index)
+                continue
+
+            key = DIGITS_PATTERN.sub("#", line).lower()
+            if counts[key] >= REPEATED_LINE_THRESHOLD:
+                # Keep the first occurrence, it is often the candidate's name
+                if key in seen_repeated:
+                    dropped.add(index)
+                seen_repeated.add(key)
+
+        kept_pages.append("\n".join(line for index, line in enumerate(lines) if index not in dropped))
+
+    return BLANK_LINES_PATTERN.sub("\n\n", "\n\n".join(kept_pages)).strip()
+
+
+def chunk_text(text, max_tokens):
+    """
+    Split text into chunks under a token budget, on paragraph boundaries where possible
+
+    Args:
+        text: Text to split
+        max_tokens: Maximum estimated tokens per chunk
+
+    Returns:
+        list: Text chunks
+    """
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    pieces = []
+    for paragraph in text.split("\n\n"):
+        if len(paragraph) <= max_chars:
+            pieces.append(paragraph)
+            continue
+
+        # Oversized paragraph: fall back to lines, then to hard splits
+        for line in paragraph.split("\n"):
+            while len(line) > max_chars:
+                pieces.append(line[:max_chars])
+                line = line[max_chars:]
+            pieces.append(line)
+
+    chunks = []
+    current = []
+    current_len = 0
+    for piece in pieces:
+        if current and current_len + len(piece) + 2 > max_chars:
+            chunks.append("\n\n".join(current))
+            current = []
+            current_len = 0
+        current.append(piece)
+        current_len += len(piece) + 2
+
+    if current:
+        chunks.append("\n\n".join(current))
+
+    return [chunk for chunk in chunks if chunk.strip()]
+
+
+def prepare_text(text, max_tokens=None):
+    """
+    Clean resume text and split it when it is over the token budget
+
+    Page headers/footers are only stripped when the text is over budget;
+    shorter resumes are sent as extracted, apart from whitespace.
+
+    Args:
+        text: Raw resume text
+        max_tokens: Token budget per LLM call (defaults to RESUME_TOKEN_BUDGET)
+
+    Returns:
+        tuple: (chunks, report) where chunks is a list with the cleaned text
+               (one entry when within budget) and report holds token counts
+    """
+    max_tokens = max_tokens or RESUME_TOKEN_BUDGET
+    original_tokens = estimate_tokens(text)
+
+    pages = [normalize_whitespace(page) for page in (text or "").split(PAGE_BREAK)]
+    cleaned = "\n\n".join(page for page in pages if page)
+    if estimate_tokens(cleaned) > max_tokens:
+        cleaned = strip_boilerplate(pages)
+    tokens = estimate_tokens(cleaned)
+
+    chunks = [cleaned] if tokens <= max_tokens else chunk_text(cleaned, max_tokens)
+
+    report = {
+        "original_tokens": original_tokens,
+        "tokens": tokens,
+        "tokens_saved": original_tokens - tokens,
+        "chunks": len(chunks)
+    }
+    return chunks, report
+
+
+def _education_rank(value):
+    value = str(value).lower()
+    return max((rank for keyword, rank in EDUCATION_RANKING if keyword in value), default=0)
+
+
+def _list_key(item):
+    if isinstance(item, str):
+        return item.strip().lower()
+    return json.dumps(item, sort_keys=True, default=str)
+
+
+def merge_extractions(results):
+    """
+    Merge structured extractions from several chunks of the same document
+
+    Lists are unioned in order, numbers take the maximum, dicts are merged
+    field by field, education strings keep the highest degree and other
+    strings keep the first non-empty value.
+
+    Args:
+        results: List of extraction dicts
+
+    Returns:
+        dict: The merged extraction
+    """
+    usable = [result for result in results if isinstance(result, dict) and not result.get("error")]
+    if not usable:
+        return results[0] if results else {}
+
+    merged = {}
+    for result in usable:
+        for key, value in result.items():
+            if key not in merged or merged[key] in (None, "", [], {}):
+                merged[key] = value.copy() if isinstance(value, (list, dict)) else value
+                continue
+
+            current = merged[key]
+            if isinstance(current, list) and isinstance(value, list):
+                seen = {_list_key(item) for item in current}
+                for item in value:
+                    if _list_key(item) not in seen:
+                        seen.add(_list_key(item))
+                        current.append(item)
+            elif isinstance(current, dict) and isinstance(value, dict):
+                for field, field_value in value.items():
+                    if not current.get(field):
+                        current[field] = field_value
+            elif isinstance(current, (int, float)) and isinstance(value, (int, float)) and not isinstance(value, bool):
+                merged[key] = max(current, value)
+            elif key.startswith("education") and isinstance(value, str):
+                if _education_rank(value) > _education_rank(current):
+                    merged[key] = value
+
+    return merged
+
+
+def map_reduce_extract(text, extract_fn, max_tokens=None, merge_fn=merge_extractions):
+    """
+    Run an extraction over budget-limited text, chunking long documents
+
+    Args:
+        text: Raw document text
+        extract_fn: Function(text) -> dict that performs one LLM extraction
+        max_tokens: Token budget per call (defaults to RESUME_TOKEN_BUDGET)
+        merge_fn: Function(list of dicts) -> dict combining chunk results
+
+    Returns:
+        tuple: (result, report) with the (merged) extraction and token report
+    """
+    chunks, report = prepare_text(text, max_tokens)
+    if not chunks:
+        return extract_fn(""), report
+
+    if len(chunks) == 1:
+        return extract_fn(chunks[0]), report
+
+    return merge_fn([extract_fn(chunk) for chunk in chunks]), report
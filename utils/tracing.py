@@ -0,0 +1,375 @@
+# utils/tracing.py
+import atexit
+import contextvars
+import json
+import logging
+import os
+import queue
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+# Set TRACING=0 to make start_trace() and span() no-ops
+TRACING = os.getenv("TRACING", "1").lower() not in ("0", "false", "no")
+
+# Set to append finished traces to this file as OTLP/JSON lines, e.g. data/traces.jsonl
+TRACE_EXPORT_PATH = os.getenv("TRACE_EXPORT_PATH", "")
+
+# The export file is moved to <path>.1 (replacing the previous one) once it grows past this size
+TRACE_EXPORT_MAX_BYTES = int(os.getenv("TRACE_EXPORT_MAX_BYTES", str(50 * 1024 * 1024)))
+
+# Finished traces kept in memory for the waterfall view
+TRACE_BUFFER_SIZE = int(os.getenv("TRACE_BUFFER_SIZE", "500"))
+
+SERVICE_NAME = os.getenv("TRACE_SERVICE_NAME", "recruitment-app")
+
+_current_span = contextvars.ContextVar("current_span", default=None)
+
+logger = logging.getLogger(__name__)
+
+
+class Trace:
+    """Spans of one unit of work (usually one request) sharing a trace ID"""
+
+    def __init__(self):
+        self.trace_id = secrets.token_hex(16)
+        self.spans = []
+        self.keys = {}
+        self.lock = threading.Lock()
+
+
+class Span:
+    """One timed stage; attributes hold counts such as tokens or cache hits"""
+
+    def __init__(self, name, trace, parent=None, attributes=None):
+        self.name = name
+        self.trace = trace
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent.span_id if parent else None
+        self.attributes = dict(attributes or {})
+        self.start = time.time()
+        self.end = None
+        self.error = None
+
+    def set(self, key, value):
+        self.attributes[key] = value
+
+    def add(self, key, amount=1):
+        self.attributes[key] = self.attributes.get(key, 0) + amount
+
+    def to_dict(self):
+        return {
+            "name": self.name,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start": self.start,
+            "end": self.end,
+            "attributes": self.attributes,
+            "error": self.error
+        }
+
+
+@contextmanager
+def start_trace(name, **attributes):
+    """
+    Time a block as the root span of a new trace, e.g. one request
+
+    Args:
+        name: Root span name shown in the waterfall
+        **attributes: Initial span attributes
+
+    Yields:
+        Span: The root span, or None when tracing is disabled
+    """
+    if not TRACING:
+        yield None
+        return
+
+    with _open_span(name, Trace(), None, attributes) as current:
+        yield current
+
+
+@contextmanager
+def span(name, **attributes):
+    """
+    Time a block as a child of the current span
+
+    Outside a trace (background jobs, CLI commands) this does nothing, so
+    shared code can be instrumented without every caller becoming a trace.
+
+    Args:
+        name: Stage name shown in the waterfall
+        **attributes: Initial span attributes
+
+    Yields:
+        Span: The new span, or None outside a trace or when tracing is disabled
+    """
+    parent = _current_span.get()
+    if not TRACING or parent is None:
+        yield None
+        return
+
+    with _open_span(name, parent.trace, parent, attributes) as current:
+        yield current
+
+
+@contextmanager
+def _open_span(name, trace, parent, attributes):
+    current = Span(name, trace, parent, attributes)
+    token = _current_span.set(current)
+    try:
+        yield current
+    except BaseException as e:
+        current.error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        current.end = time.time()
+        _current_span.reset(token)
+        with current.trace.lock:
+            current.trace.spans.append(current.to_dict())
+        if parent is None:
+            trace_store.finish(current.trace)
+
+
+def current_span():
+    """The innermost open span in this context, or None"""
+    return _current_span.get()
+
+
+def annotate(**attributes):
+    """Set attributes on the current span, if there is one"""
+    current = _current_span.get()
+    if current is not None:
+        current.attributes.update(attributes)
+
+
+def count(key, amount=1):
+    """Add to a counter attribute of the current span, if there is one"""
+    current = _current_span.get()
+    if current is not None:
+        current.add(key, amount)
+
+
+def record_llm_usage(usage):
+    """
+    Count an LLM response's token usage on the current span
+
+    Args:
+        usage: The completion's usage object (prompt_tokens, completion_tokens), may be None
+    """
+    if usage is None:
+        return
+    count("llm.calls")
+    count("llm.prompt_tokens", getattr(usage, "prompt_tokens", 0) or 0)
+    count("llm.completion_tokens", getattr(usage, "completion_tokens", 0) or 0)
+
+
+def record_cache(cache_name, hit):
+    """Count a cache lookup on the current span"""
+    count(f"cache.{cache_name}.{'hits' if hit else 'misses'}")
+
+
+def tag_trace(key, value):
+    """
+    Make the current trace findable by key, e.g. tag_trace("application.id", candidate_id)
+
+    The tag is also set on the current span, so call this from the root span.
+    """
+    current = _current_span.get()
+    if current is None:
+        return
+    current.trace.keys[key] = value
+    current.set(key, value)
+
+
+def _otlp_value(value):
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _plain_value(value):
+    if "intValue" in value:
+        return int(value["intValue"])
+    return next(iter(value.values()), None)
+
+
+def to_otlp(trace_id, spans):
+    """One trace as an OTLP/JSON ExportTraceServiceRequest"""
+    otlp_spans = []
+    for item in spans:
+        otlp_span = {
+            "traceId": trace_id,
+            "spanId": item["span_id"],
+            "name": item["name"],
+            "kind": 1,
+            "startTimeUnixNano": str(int(item["start"] * 1e9)),
+            "endTimeUnixNano": str(int(item["end"] * 1e9)),
+            "attributes": [{"key": key, "value": _otlp_value(value)} for key, value in item["attributes"].items()],
+            "status": {"code": 2, "message": item["error"]} if item["error"] else {"code": 1}
+        }
+        if item["parent_id"]:
+            otlp_span["parentSpanId"] = item["parent_id"]
+        otlp_spans.append(otlp_span)
+
+    return {
+        "resourceSpans": [{
+            "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": SERVICE_NAME}}]},
+            "scopeSpans": [{"scope": {"name": "utils.tracing"}, "spans": otlp_spans}]
+        }]
+    }
+
+
+def from_otlp(document):
+    """Spans of an OTLP/JSON document in the form span() records them"""
+    spans = []
+    for resource_spans in document.get("resourceSpans", []):
+        for scope_spans in resource_spans.get("scopeSpans", []):
+            for item in scope_spans.get("spans", []):
+                status = item.get("status", {})
+                spans.append({
+                    "name": item["name"],
+                    "span_id": item["spanId"],
+                    "parent_id": item.get("parentSpanId"),
+                    "start": int(item["startTimeUnixNano"]) / 1e9,
+                    "end": int(item["endTimeUnixNano"]) / 1e9,
+                    "attributes": {attr["key"]: _plain_value(attr["value"]) for attr in item.get("attributes", [])},
+                    "error": status.get("message") if status.get("code") == 2 else None
+                })
+    return spans
+
+
+class TraceStore:
+    """
+    Keeps recent traces in memory and, if an export path is set, appends them to a file
+
+    Exported traces are put on a queue and written by a background thread, so
+    finishing a trace never waits on the disk.
+    """
+
+    def __init__(self, export_path=None, max_traces=None, max_export_bytes=None):
+        self.export_path = TRACE_EXPORT_PATH if export_path is None else export_path
+        self.max_traces = TRACE_BUFFER_SIZE if max_traces is None else max_traces
+        self.max_export_bytes = TRACE_EXPORT_MAX_BYTES if max_export_bytes is None else max_export_bytes
+        self._traces = OrderedDict()
+        self._by_key = {}
+        self._lock = threading.Lock()
+        self._exports = None
+        self._exporter = None
+        if self.export_path:
+            # Write out what is still queued before the interpreter exits
+            atexit.register(self.flush)
+
+    def finish(self, trace):
+        with self._lock:
+            self._traces[trace.trace_id] = (dict(trace.keys), trace.spans)
+            for key, value in trace.keys.items():
+                self._by_key[(key, value)] = trace.trace_id
+            while len(self._traces) > self.max_traces:
+                _, (keys, _) = self._traces.popitem(last=False)
+                for key, value in keys.items():
+                    self._by_key.pop((key, value), None)
+
+            if self.export_path:
+                if self._exporter is None:
+                    self._exports = queue.SimpleQueue()
+                    self._exporter = threading.Thread(target=self._export_loop, args=(self._exports,),
+                                                      name="trace-exporter", daemon=True)
+                    self._exporter.start()
+                self._exports.put((trace.trace_id, trace.spans))
+
+    def _export_loop(self, exports):
+        while True:
+            item = exports.get()
+            if item is None:
+                return
+            trace_id, spans = item
+            try:
+                self._append(json.dumps(to_otlp(trace_id, spans)) + "\n")
+            except Exception as e:
+                logger.error("Error exporting trace: %s", e)
+
+    def _append(self, line):
+        os.makedirs(os.path.dirname(self.export_path) or ".", exist_ok=True)
+        if self.max_export_bytes and os.path.exists(self.export_path) \
+                and os.path.getsize(self.export_path) + len(line) > self.max_export_bytes:
+            os.replace(self.export_path, self.export_path + ".1")
+        with open(self.export_path, "a") as f:
+            f.write(line)
+
+    def flush(self):
+        """Write out the queued exports and stop the exporter thread"""
+        with self._lock:
+            exporter, self._exporter = self._exporter, None
+            if exporter is not None:
+                self._exports.put(None)
+        if exporter is not None:
+            exporter.join()
+
+    def find(self, key, value):
+        """
+        Spans of the latest trace tagged key=value
+
+        The in-memory buffer is checked first; only traces that have already
+        left it are searched for in the export file and its rotated copy.
+
+        Returns:
+            list: Span dicts ordered by start time, or None if no such trace was recorded
+        """
+        with self._lock:
+            trace_id = self._by_key.get((key, value))
+            if trace_id in self._traces:
+                return sorted(self._traces[trace_id][1], key=lambda item: item["start"])
+
+        if not self.export_path:
+            return None
+
+        found = None
+        # Oldest first, so the latest matching trace wins
+        for path in (self.export_path + ".1", self.export_path):
+            if not os.path.exists(path):
+                continue
+            with open(path) as f:
+                for line in f:
+                    if str(value) not in line:
+                        continue
+                    spans = from_otlp(json.loads(line))
+                    if any(item["attributes"].get(key) == value for item in spans):
+                        found = spans
+        return sorted(found, key=lambda item: item["start"]) if found else None
+
+
+trace_store = TraceStore()
+
+
+def waterfall(spans):
+    """
+    Lay out spans for a waterfall chart
+
+    Returns:
+        list: Span dicts with depth, offset_ms, duration_ms and offset/width percentages
+    """
+    if not spans:
+        return []
+    started = min(item["start"] for item in spans)
+    total = max(max(item["end"] for item in spans) - started, 1e-6)
+    depths = {}
+    rows = []
+    for item in sorted(spans, key=lambda item: item["start"]):
+        depth = depths.get(item["parent_id"], -1) + 1
+        depths[item["span_id"]] = depth
+        rows.append(dict(
+            item,
+            depth=depth,
+            offset_ms=round((item["start"] - started) * 1000, 1),
+            duration_ms=round((item["end"] - item["start"]) * 1000, 1),
+            offset_pct=round((item["start"] - started) / total * 100, 2),
+            width_pct=max(round((item["end"] - item["start"]) / total * 100, 2), 0.5)
+        ))
+    return rows
@@ -0,0 +1,4 @@
+# wsgi.py - Application instance for WSGI servers and the flask CLI, e.g. `gunicorn wsgi:app`
+from app import create_app
+
+app = create_app()